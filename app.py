@@ -1,5 +1,7 @@
 import streamlit as st
+import core.config
 from core.config import setup_environment
+from core.gpt_metricas import iniciar_servidor_metricas
 from core.state import inicializar_session_state
 from core.auth import is_authenticated, render_login_page, get_api_key
 from core.utils import inicializar_cliente_openai
@@ -24,6 +26,7 @@ from ui.screens.fase_exports_completo import fase_exports_completo
 from ui.chat import fase_chat
 
 setup_environment()
+iniciar_servidor_metricas(core.config.config.GPT_METRICS_PORT)
 
 st.set_page_config(
     page_title="Protocolo Nóbile",
@@ -0,0 +1,145 @@
+"""
+Cache de resultados do Score ATS endereçado por conteúdo.
+
+Os resultados do ATS ficavam apenas no ``st.session_state``
+(``score_ats_inicial``, ``reality_ats_resultado``, ``score_ats_final``) e se
+perdiam ao fim da sessão: o mesmo CV para o mesmo cargo pagava de novo as
+chamadas GPT em outra sessão.
+
+A chave é o hash SHA-256 de (CV normalizado, cargo_alvo, texto_vaga,
+objetivo, cargo_atual, modo LLM/offline, versão do scorer, modelo da rota
+``analise_ats`` e identidade dos motores TF-IDF em disco). O cache é
+compartilhado por todas as sessões do processo, limitado por LRU/TTL e
+persistido em SQLite (core.cache_store), sobrevivendo a reinícios.
+
+Configuração (core.config.Config / variáveis de ambiente):
+- ATS_CACHE_ENABLED: liga/desliga o cache (padrão: ligado)
+- ATS_CACHE_PATH: arquivo SQLite (padrão: cache/ats_cache.sqlite)
+- ATS_CACHE_TTL: validade em segundos (padrão: 7 dias)
+- ATS_CACHE_MAX_ITEMS: limite de itens LRU (padrão: 5000)
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from typing import Dict, Optional
+
+import core.config
+from core.cache_store import CacheSQLite
+
+logger = logging.getLogger(__name__)
+
+_cache_ats: Optional[CacheSQLite] = None
+_lock_cache = threading.Lock()
+
+
+def normalizar_texto_cache(texto: Optional[str]) -> str:
+    """
+    Normaliza um texto para a chave do cache.
+
+    Colapsa espaços e quebras de linha para que o mesmo CV extraído com
+    diferenças de whitespace gere a mesma chave. Não altera maiúsculas,
+    pois o texto enviado à LLM preserva a caixa original.
+    """
+    if not texto:
+        return ""
+    return re.sub(r'\s+', ' ', str(texto)).strip()
+
+
+def gerar_chave_ats(
+    cv_texto: str,
+    cargo_alvo: str,
+    texto_vaga: Optional[str],
+    objetivo: Optional[str],
+    cargo_atual: Optional[str],
+    modo: str,
+    versao_scorer: str,
+    modelo: str = "",
+    motor: str = ""
+) -> str:
+    """
+    Gera a chave SHA-256 de uma análise ATS.
+
+    Args:
+        cv_texto: Texto do CV
+        cargo_alvo: Cargo alvo
+        texto_vaga: Texto da vaga real (opcional)
+        objetivo: Tipo de movimentação (opcional)
+        cargo_atual: Cargo atual (opcional)
+        modo: 'llm' (com client OpenAI) ou 'offline'
+        versao_scorer: Versão do ATS Scorer (invalida o cache ao mudar)
+        modelo: Modelo e max_tokens da análise LLM (vazio no modo offline)
+        motor: Identidade dos motores TF-IDF (core.ats_engine.identidade_motores)
+
+    Returns:
+        Hash hexadecimal
+    """
+    payload = json.dumps(
+        [
+            versao_scorer,
+            modo,
+            modelo,
+            motor,
+            normalizar_texto_cache(cv_texto),
+            normalizar_texto_cache(cargo_alvo).lower(),
+            normalizar_texto_cache(texto_vaga),
+            normalizar_texto_cache(objetivo),
+            normalizar_texto_cache(cargo_atual).lower(),
+        ],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def obter_cache_ats() -> Optional[CacheSQLite]:
+    """
+    Retorna o cache ATS do processo (criado na primeira chamada).
+
+    Returns:
+        CacheSQLite ou None se o cache estiver desligado ou indisponível
+    """
+    global _cache_ats
+
+    cfg = core.config.config
+    if not cfg.ATS_CACHE_ENABLED:
+        return None
+
+    if _cache_ats is None:
+        with _lock_cache:
+            if _cache_ats is None:
+                try:
+                    _cache_ats = CacheSQLite(
+                        cfg.ATS_CACHE_PATH,
+                        max_itens=cfg.ATS_CACHE_MAX_ITEMS,
+                        ttl_segundos=cfg.ATS_CACHE_TTL,
+                        nome="ats"
+                    )
+                    logger.info(f"Cache ATS persistente aberto em {cfg.ATS_CACHE_PATH}")
+                except Exception as e:
+                    logger.error(f"Não foi possível abrir o cache ATS: {e}", exc_info=True)
+                    return None
+    return _cache_ats
+
+
+def estatisticas_cache_ats() -> Dict:
+    """
+    Estatísticas de hit/miss do cache ATS neste processo.
+
+    Returns:
+        Dict com hits, misses, hit_rate, itens etc. ou {'ativo': False}
+    """
+    cache = obter_cache_ats()
+    if cache is None:
+        return {'ativo': False}
+    return {'ativo': True, **cache.estatisticas()}
+
+
+def resetar_cache_ats() -> None:
+    """Fecha o cache do processo (a próxima chamada reabre com a config atual)."""
+    global _cache_ats
+    with _lock_cache:
+        if _cache_ats is not None:
+            _cache_ats.fechar()
+        _cache_ats = None
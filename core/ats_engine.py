@@ -0,0 +1,363 @@
+"""
+Motor TF-IDF pré-treinado para o ATS Scorer.
+
+Até a v5.1 o fallback TF-IDF criava um ``TfidfVectorizer`` novo a cada
+chamada e fazia ``fit`` em apenas dois documentos (CV + JD). Além do custo
+do ``fit`` repetido, com dois documentos o IDF praticamente não carrega
+informação (todo termo aparece em 1 ou 2 documentos).
+
+Este módulo separa as duas etapas:
+- **Offline:** o vocabulário e o IDF são aprendidos a partir de um corpus de
+  referência (JDs e CVs) de uma área e salvos em disco com joblib.
+- **Online:** o motor é carregado uma única vez por processo e cada score
+  vira apenas um ``transform`` + produto escalar esparso.
+
+Construção offline (um arquivo .txt por documento, ou diretórios de .txt):
+
+    python -m core.ats_engine --area vendas corpus/vendas/
+
+Os motores ficam em ``Config.ATS_ENGINE_DIR`` como ``<area>.joblib``.
+O motor ``geral`` é usado quando não existe motor específico para a área.
+"""
+
+import argparse
+import hashlib
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import core.config
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato do motor salvo em disco (incrementar se mudar a estrutura)
+VERSAO_MOTOR = "1"
+
+# Área usada quando não há motor específico
+AREA_PADRAO = "geral"
+
+# Nome de área aceito como arquivo de motor (a área vem de texto livre do LLM)
+_RE_AREA = re.compile(r'[a-z0-9_]+')
+
+# Cache de motores carregados neste processo: {area: MotorTfidf | None}
+# (só áreas com arquivo em ATS_ENGINE_DIR, então o tamanho é limitado)
+_motores_carregados: Dict[str, Optional["MotorTfidf"]] = {}
+# {area: mtime_ns do arquivo} dos motores em ATS_ENGINE_DIR, lido uma vez por processo
+_areas_em_disco: Optional[Dict[str, int]] = None
+_lock_motores = threading.Lock()
+
+
+@dataclass
+class MotorTfidf:
+    """
+    Vetorizador TF-IDF já treinado em um corpus de referência.
+
+    Attributes:
+        vectorizer: TfidfVectorizer com vocabulário e IDF aprendidos
+        area: Área do corpus (ex: 'vendas', 'tecnologia', 'geral')
+        n_documentos: Quantidade de documentos usados no treino
+        versao: Versão do formato do motor
+    """
+    vectorizer: TfidfVectorizer
+    area: str = AREA_PADRAO
+    n_documentos: int = 0
+    versao: str = VERSAO_MOTOR
+    _feature_names: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    _impressao: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def feature_names(self) -> np.ndarray:
+        """Termos do vocabulário, indexados pela coluna da matriz TF-IDF."""
+        if self._feature_names is None:
+            self._feature_names = self.vectorizer.get_feature_names_out()
+        return self._feature_names
+
+    @property
+    def impressao_digital(self) -> str:
+        """
+        Hash BLAKE2b do vocabulário (em ordem de coluna) e do IDF.
+
+        Dois motores com a mesma impressão vetorizam qualquer texto da mesma
+        forma; índices salvos (core.cv_index) só valem para essa impressão.
+        """
+        if self._impressao is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update("\n".join(self.feature_names).encode("utf-8"))
+            h.update(np.ascontiguousarray(self.vectorizer.idf_, dtype=np.float64).tobytes())
+            self._impressao = h.hexdigest()
+        return self._impressao
+
+    def transformar(self, textos: List[str]) -> sparse.csr_matrix:
+        """
+        Vetoriza textos já limpos (sem refit).
+
+        Args:
+            textos: Textos já passados por ``_limpar_texto``
+
+        Returns:
+            Matriz CSR (n_textos × vocabulário) com linhas L2-normalizadas
+        """
+        return self.vectorizer.transform(textos)
+
+    def similaridade(self, texto_a: str, texto_b: str) -> float:
+        """Similaridade de cosseno entre dois textos limpos."""
+        matriz = self.transformar([texto_a, texto_b])
+        return similaridade_cosseno(matriz[0], matriz[1])
+
+
+def similaridade_cosseno(linha_a: sparse.csr_matrix, linha_b: sparse.csr_matrix) -> float:
+    """
+    Similaridade de cosseno entre duas linhas TF-IDF.
+
+    Como o TfidfVectorizer normaliza as linhas com norma L2, o cosseno é
+    apenas o produto escalar esparso (linhas vazias resultam em 0.0).
+    """
+    return float(linha_a.multiply(linha_b).sum())
+
+
+def construir_motor(
+    corpus: Iterable[str],
+    area: str = AREA_PADRAO,
+    min_df: int = 1,
+    max_df: float = 1.0
+) -> MotorTfidf:
+    """
+    Treina um motor TF-IDF a partir de um corpus de referência.
+
+    Usa o mesmo pré-processamento (``_limpar_texto``) e as mesmas stopwords
+    (``STOPWORDS_PT_EN``) do ATS Scorer, com n-grams de 1 a 3.
+
+    Args:
+        corpus: Textos de JDs e CVs da área
+        area: Nome da área do corpus
+        min_df: Frequência mínima de documento para um termo entrar no vocabulário
+        max_df: Frequência máxima (proporção) de documento
+
+    Returns:
+        MotorTfidf treinado
+
+    Raises:
+        ValueError: Se o corpus estiver vazio após limpeza
+    """
+    from core.ats_scorer import _limpar_texto, STOPWORDS_PT_EN
+
+    documentos = [doc for doc in (_limpar_texto(t) for t in corpus) if doc]
+    if not documentos:
+        raise ValueError("Corpus vazio — nenhum documento com texto após limpeza")
+
+    logger.info(f"Treinando motor TF-IDF '{area}' com {len(documentos)} documentos")
+
+    vectorizer = TfidfVectorizer(
+        stop_words=STOPWORDS_PT_EN,
+        ngram_range=(1, 3),
+        min_df=min_df,
+        max_df=max_df
+    )
+    vectorizer.fit(documentos)
+
+    # stop_words_ guarda todos os termos podados por min_df/max_df e pode ser
+    # enorme com trigramas; não é usado no transform (ver docs do sklearn)
+    if hasattr(vectorizer, 'stop_words_'):
+        delattr(vectorizer, 'stop_words_')
+
+    motor = MotorTfidf(vectorizer=vectorizer, area=area, n_documentos=len(documentos))
+    logger.info(f"Motor '{area}' treinado: {len(motor.feature_names)} termos no vocabulário")
+    return motor
+
+
+def salvar_motor(motor: MotorTfidf, caminho) -> Path:
+    """
+    Salva o motor em disco (joblib comprimido).
+
+    Args:
+        motor: Motor treinado
+        caminho: Arquivo de destino (.joblib)
+
+    Returns:
+        Path do arquivo salvo
+    """
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(
+        {
+            'versao': motor.versao,
+            'area': motor.area,
+            'n_documentos': motor.n_documentos,
+            'vectorizer': motor.vectorizer,
+        },
+        caminho,
+        compress=3
+    )
+    logger.info(f"Motor TF-IDF '{motor.area}' salvo em {caminho}")
+    return caminho
+
+
+def carregar_motor(caminho) -> Optional[MotorTfidf]:
+    """
+    Carrega um motor salvo com ``salvar_motor``.
+
+    Args:
+        caminho: Arquivo .joblib
+
+    Returns:
+        MotorTfidf ou None se o arquivo não existir, for inválido ou de outra versão
+    """
+    caminho = Path(caminho)
+    if not caminho.is_file():
+        return None
+
+    try:
+        dados = joblib.load(caminho)
+    except Exception as e:
+        logger.error(f"Erro ao carregar motor TF-IDF de {caminho}: {e}", exc_info=True)
+        return None
+
+    if not isinstance(dados, dict) or dados.get('versao') != VERSAO_MOTOR:
+        logger.warning(f"Motor TF-IDF em {caminho} tem versão incompatível — ignorando")
+        return None
+
+    return MotorTfidf(
+        vectorizer=dados['vectorizer'],
+        area=dados.get('area', AREA_PADRAO),
+        n_documentos=dados.get('n_documentos', 0),
+        versao=dados['versao']
+    )
+
+
+def _caminho_motor(area: str) -> Path:
+    """Arquivo do motor de uma área dentro de Config.ATS_ENGINE_DIR."""
+    return Path(core.config.config.ATS_ENGINE_DIR) / f"{area}.joblib"
+
+
+def obter_motor(area: Optional[str] = None) -> Optional[MotorTfidf]:
+    """
+    Retorna o motor TF-IDF da área, carregado uma única vez por processo.
+
+    Se não existir motor para a área, usa o motor ``geral``. Se nenhum motor
+    estiver disponível retorna None e o ATS Scorer volta ao fit por chamada.
+
+    A área só vira nome de arquivo se casar com ``[a-z0-9_]+`` e existir um
+    ``<area>.joblib`` em ATS_ENGINE_DIR: ela vem do arquétipo gerado pelo
+    LLM (influenciável pelo CV) e o arquivo é lido com joblib (pickle).
+
+    Args:
+        area: Área/arquétipo do cargo (opcional, case-insensitive)
+
+    Returns:
+        MotorTfidf ou None
+    """
+    area = resolver_area(area)
+
+    motor = _carregar_area(area)
+    if motor is None and area != AREA_PADRAO:
+        motor = _carregar_area(AREA_PADRAO)
+    return motor
+
+
+def resolver_area(area: Optional[str]) -> str:
+    """
+    Mapeia uma área em texto livre para um motor existente em disco.
+
+    Returns:
+        A própria área (minúscula) se houver ``<area>.joblib`` válido em
+        ATS_ENGINE_DIR; senão AREA_PADRAO
+    """
+    area = (area or "").strip().lower()
+    if area in _listar_areas():
+        return area
+    return AREA_PADRAO
+
+
+def _listar_areas() -> Dict[str, int]:
+    """Áreas com arquivo de motor em ATS_ENGINE_DIR e seus mtimes (lido uma vez por processo)."""
+    global _areas_em_disco
+    if _areas_em_disco is None:
+        with _lock_motores:
+            if _areas_em_disco is None:
+                diretorio = Path(core.config.config.ATS_ENGINE_DIR)
+                arquivos = diretorio.glob('*.joblib') if diretorio.is_dir() else []
+                _areas_em_disco = {a.stem: a.stat().st_mtime_ns for a in arquivos if _RE_AREA.fullmatch(a.stem)}
+    return _areas_em_disco
+
+
+def identidade_motores() -> str:
+    """
+    Identifica os motores que este processo usa, para chaves de cache.
+
+    Como a área do motor só é conhecida depois da análise (arquétipo do
+    LLM), a identidade cobre todos os motores em disco: versão do formato
+    e ``area@mtime`` de cada arquivo. Trocar, treinar de novo ou remover
+    um motor muda a identidade.
+
+    Returns:
+        String estável (ex.: ``"1:geral@1712345678901234567"``) ou
+        ``"1:"`` se não houver motor (fit por chamada)
+    """
+    areas = _listar_areas()
+    return f"{VERSAO_MOTOR}:" + ",".join(f"{area}@{areas[area]}" for area in sorted(areas))
+
+
+def _carregar_area(area: str) -> Optional[MotorTfidf]:
+    """Carrega (ou reaproveita do cache do processo) o motor de uma área."""
+    if area in _motores_carregados:
+        return _motores_carregados[area]
+    if area not in _listar_areas():
+        return None
+
+    with _lock_motores:
+        if area not in _motores_carregados:
+            motor = carregar_motor(_caminho_motor(area))
+            if motor:
+                logger.info(f"Motor TF-IDF '{area}' carregado ({len(motor.feature_names)} termos)")
+            _motores_carregados[area] = motor
+        return _motores_carregados[area]
+
+
+def recarregar_motores() -> None:
+    """Descarta os motores em memória (próxima chamada relê do disco)."""
+    global _areas_em_disco
+    with _lock_motores:
+        _motores_carregados.clear()
+        _areas_em_disco = None
+    logger.info("Cache de motores TF-IDF limpo")
+
+
+def _ler_corpus(caminhos: List[str]) -> List[str]:
+    """Lê arquivos .txt (ou diretórios com .txt) como documentos do corpus."""
+    textos = []
+    for caminho in map(Path, caminhos):
+        arquivos = sorted(caminho.rglob('*.txt')) if caminho.is_dir() else [caminho]
+        for arquivo in arquivos:
+            textos.append(arquivo.read_text(encoding='utf-8', errors='ignore'))
+    return textos
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada CLI para construir um motor offline."""
+    parser = argparse.ArgumentParser(description="Constrói o motor TF-IDF do ATS a partir de um corpus")
+    parser.add_argument('corpus', nargs='+', help="Arquivos .txt ou diretórios com .txt (JDs e CVs)")
+    parser.add_argument('--area', default=AREA_PADRAO, help="Área do corpus (padrão: geral)")
+    parser.add_argument('--saida', help="Arquivo de saída (padrão: <ATS_ENGINE_DIR>/<area>.joblib)")
+    parser.add_argument('--min-df', type=int, default=1)
+    parser.add_argument('--max-df', type=float, default=1.0)
+    args = parser.parse_args(argv)
+    if not _RE_AREA.fullmatch(args.area):
+        parser.error("--area deve conter apenas letras minúsculas, dígitos e _")
+
+    motor = construir_motor(_ler_corpus(args.corpus), area=args.area, min_df=args.min_df, max_df=args.max_df)
+    destino = salvar_motor(motor, args.saida or _caminho_motor(motor.area))
+    print(f"Motor '{motor.area}': {motor.n_documentos} documentos, "
+          f"{len(motor.feature_names)} termos -> {destino}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
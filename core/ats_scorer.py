@@ -12,6 +12,12 @@ v5.1: Context-Aware Gap Detection for Senior Profiles:
   for senior profiles if role requires hands-on operation
 - Considers strategic/management experience as equivalent to tactical tool usage
 
+v5.2: Análise LLM com saída estruturada (JSON schema); prompt e formato de
+saída mudaram, então resultados da v5.1 em cache são descartados.
+
+v5.3: Texto do CV/vaga normalizado por core.normalizacao_texto (visão
+memoizada por conteúdo, compartilhada com os analisadores do otimizador).
+
 v4.0: Análise contextual via LLM (GPT-4o) com fallback TF-IDF.
 - Quando OpenAI client disponível: análise semântica inteligente
 - Quando offline: TF-IDF + Cosine Similarity (v3.2)
@@ -24,14 +30,16 @@ v3.2 (fallback):
 Retorna: Score + Pontos Fortes + Gaps + Plano de Ação + Arquétipo + Transparência.
 """
 
-import re
-import json
+import time
+import uuid
 import logging
-from typing import Dict, Optional, List
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Dict, Optional, List, Tuple
 
-import pandas as pd
+import numpy as np
+from pydantic import BaseModel, ValidationError
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import nltk
 
 # Garantir download dos stopwords na primeira execução
@@ -42,10 +50,41 @@ except LookupError:
 
 from nltk.corpus import stopwords
 
+import core.config
 from core.utils import chamar_gpt
+from core.gpt_metricas import propagar_contexto
+from core.roteamento_modelos import (
+    ROTA_ANALISE_ATS,
+    ROTA_EXTRACAO_CARGO,
+    ROTA_JOB_DESCRIPTION,
+    ROTA_REPARO_JSON,
+    ROTA_VARIACOES_CARGO,
+    resolver_rota,
+)
+from core.ats_engine import identidade_motores, obter_motor, similaridade_cosseno
+from core.ats_cache import obter_cache_ats, gerar_chave_ats
+from core.jd_library import obter_jd, guardar_jd, obter_variacoes, guardar_variacoes
+from core.normalizacao_texto import limpar_texto, visao_texto
 
 logger = logging.getLogger(__name__)
 
+# Versão do scorer (faz parte da chave do cache ATS: mudar invalida resultados antigos)
+VERSAO_SCORER = "5.3"
+
+# Pool para rodar a análise LLM e a geração da JD do breakdown em paralelo
+MAX_WORKERS_ATS = 8
+_executor_ats = ThreadPoolExecutor(max_workers=MAX_WORKERS_ATS, thread_name_prefix="ats")
+
+# Pool separado para o refinamento LLM do modo progressivo (que por sua vez
+# usa o _executor_ats; pools distintos evitam deadlock por esgotamento)
+MAX_WORKERS_REFINAMENTO = 4
+_executor_refinamento = ThreadPoolExecutor(max_workers=MAX_WORKERS_REFINAMENTO, thread_name_prefix="ats-refino")
+
+# Resultados em segundo plano (breakdowns fora do prazo e refinamentos LLM): id -> Future
+MAX_PENDENTES = 256
+_pendentes: Dict[str, Future] = {}
+_lock_pendentes = threading.Lock()
+
 # ─── STOPWORDS: NLTK (PT + EN) + Termos customizados de CV/JD ───
 # Base robusta do NLTK (~400 stopwords PT + EN)
 _nltk_stops = set(stopwords.words('portuguese')).union(set(stopwords.words('english')))
@@ -145,11 +184,8 @@ _termos_genericos_gap = {
 
 
 def _limpar_texto(texto: str) -> str:
-    """Padroniza o texto para análise."""
-    texto = str(texto).lower()
-    texto = re.sub(r'[^\w\s]', '', texto)
-    texto = re.sub(r'\s+', ' ', texto).strip()
-    return texto
+    """Padroniza o texto para análise (ver core.normalizacao_texto.limpar_texto)."""
+    return limpar_texto(texto)
 
 
 def _is_senior_position(cargo: str) -> bool:
@@ -223,7 +259,7 @@ def _should_skip_gap_for_senior(gap_name: str, cargo: str, cv_texto: str) -> tup
         return (False, "")
     
     # É posição sênior E ferramenta tática - verificar se candidato tem exp estratégica
-    cv_lower = cv_texto.lower()
+    cv_lower = visao_texto(cv_texto).minusculo
     
     # Indicadores de experiência estratégica/gestão
     strategic_indicators = [
@@ -244,54 +280,72 @@ def _should_skip_gap_for_senior(gap_name: str, cargo: str, cv_texto: str) -> tup
     return (False, "")
 
 
-def _analisar_compatibilidade(cv_texto: str, vaga_texto: str) -> Dict:
+def _analisar_compatibilidade(cv_texto: str, vaga_texto: str, area: Optional[str] = None) -> Dict:
     """
     Executa análise completa: Score + Gaps + Pontos Fortes + Plano de Ação.
     
-    Cria uma NOVA instância do TfidfVectorizer a cada chamada.
+    Usa o motor TF-IDF pré-treinado (vocabulário + IDF de um corpus de
+    referência, ver core.ats_engine) quando disponível: apenas transform.
+    Sem motor em disco, cria um TfidfVectorizer e faz fit nos dois textos.
     
     Args:
         cv_texto: Texto completo do CV
         vaga_texto: Job Description para comparação
+        area: Área/arquétipo do cargo para escolher o motor (opcional)
         
     Returns:
         Dict com score, pontos_fortes, gaps_identificados, plano_acao
     """
-    cv_limpo = _limpar_texto(cv_texto)
-    vaga_limpa = _limpar_texto(vaga_texto)
+    cv_limpo = visao_texto(cv_texto).limpo
+    vaga_limpa = visao_texto(vaga_texto).limpo
     
     if not cv_limpo or not vaga_limpa:
         logger.warning("CV ou JD vazio após limpeza")
-        return {
-            "score": 0.0,
-            "pontos_fortes": [],
-            "gaps_identificados": [],
-            "plano_acao": ["❌ Texto insuficiente para análise."]
-        }
+        return _analise_texto_insuficiente()
+    
+    motor = obter_motor(area)
     
     try:
-        vectorizer = TfidfVectorizer(
-            stop_words=STOPWORDS_PT_EN,
-            ngram_range=(1, 3),
-            min_df=1
-        )
-        
-        tfidf_matrix = vectorizer.fit_transform([cv_limpo, vaga_limpa])
-        feature_names = vectorizer.get_feature_names_out()
+        if motor:
+            tfidf_matrix = motor.transformar([cv_limpo, vaga_limpa])
+            feature_names = motor.feature_names
+        else:
+            vectorizer = TfidfVectorizer(
+                stop_words=STOPWORDS_PT_EN,
+                ngram_range=(1, 3),
+                min_df=1
+            )
+            
+            tfidf_matrix = vectorizer.fit_transform([cv_limpo, vaga_limpa])
+            feature_names = vectorizer.get_feature_names_out()
         
     except ValueError as e:
         logger.error(f"Erro na vetorização: {e}")
-        return {
-            "score": 0.0,
-            "pontos_fortes": [],
-            "gaps_identificados": [],
-            "plano_acao": ["❌ Texto insuficiente para análise."]
-        }
+        return _analise_texto_insuficiente()
+    
+    # Score (Cosine Similarity — linhas já normalizadas L2)
+    raw_similarity = similaridade_cosseno(tfidf_matrix[0], tfidf_matrix[1])
     
-    # Score (Cosine Similarity)
-    raw_similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+    logger.debug(
+        f"Vocabulário: {len(feature_names)} termos (após stopwords), "
+        f"motor: {motor.area if motor else 'fit por chamada'}"
+    )
     
-    # Escalar para faixa realista
+    return _montar_analise(tfidf_matrix[0], tfidf_matrix[1], feature_names, raw_similarity)
+
+
+def _analise_texto_insuficiente() -> Dict:
+    """Resultado padrão quando CV ou JD não têm texto analisável."""
+    return {
+        "score": 0.0,
+        "pontos_fortes": [],
+        "gaps_identificados": [],
+        "plano_acao": ["❌ Texto insuficiente para análise."]
+    }
+
+
+def _escalar_score(raw_similarity: float) -> float:
+    """Escala a similaridade de cosseno (0-1) para a faixa realista de score (0-95)."""
     if raw_similarity <= 0.0:
         score_final = 0.0
     elif raw_similarity >= 0.35:
@@ -299,56 +353,110 @@ def _analisar_compatibilidade(cv_texto: str, vaga_texto: str) -> Dict:
     else:
         score_final = (raw_similarity / 0.35) * 90.0 + 5.0
     
-    score_final = round(score_final, 1)
-    
-    logger.debug(f"Raw similarity: {raw_similarity:.4f}, Scaled score: {score_final}")
-    logger.debug(f"Vocabulário: {len(feature_names)} termos (após stopwords)")
-    
-    # Análise de termos
-    dense = tfidf_matrix.todense()
-    lista_cv = dense[0].tolist()[0]
-    lista_vaga = dense[1].tolist()[0]
-    
-    df_analise = pd.DataFrame({
-        'termo': feature_names,
-        'peso_vaga': lista_vaga,
-        'peso_cv': lista_cv
-    })
-    
-    # Gaps: termos da vaga que NÃO estão no CV
-    termos_faltantes_raw = df_analise[
-        (df_analise['peso_vaga'] > 0) & (df_analise['peso_cv'] == 0)
-    ].sort_values(by='peso_vaga', ascending=False)
-    
-    # Filtrar: remover termos genéricos e n-grams que são apenas títulos de cargo
-    def _is_generic_term(termo: str) -> bool:
-        """Verifica se um termo deve ser filtrado dos gaps."""
-        # Remover siglas muito curtas
-        if len(termo) <= 2:
-            return True
-        
-        # Remover se é termo genérico standalone
-        if termo in _termos_genericos_gap:
+    return round(score_final, 1)
+
+
+def _is_generic_term(termo: str) -> bool:
+    """Verifica se um termo deve ser filtrado dos gaps."""
+    # Remover siglas muito curtas
+    if len(termo) <= 2:
+        return True
+    
+    # Remover se é termo genérico standalone
+    if termo in _termos_genericos_gap:
+        return True
+    
+    # Remover n-grams que contêm palavras genéricas
+    palavras_termo = termo.split()
+    for palavra in palavras_termo:
+        if palavra in _termos_genericos_gap:
             return True
+    
+    return False
+
+
+def _csr_ordenada(linha):
+    """Linha CSR com índices de coluna ordenados (ordem do vocabulário)."""
+    linha = linha.tocsr()
+    return linha if linha.has_sorted_indices else linha.sorted_indices()
+
+
+def _ordenar_por_peso(pesos: np.ndarray) -> np.ndarray:
+    """
+    Posições de ``pesos`` em ordem decrescente de peso.
+    
+    Empates ficam na ordem original (ordem alfabética do vocabulário),
+    para que gaps e pontos fortes sejam determinísticos.
+    """
+    return np.argsort(-pesos, kind='stable')
+
+
+def _top_n_por_peso(pesos: np.ndarray, n: int) -> np.ndarray:
+    """
+    Posições dos ``n`` maiores pesos em ordem decrescente (empates na ordem original).
+    
+    Usa argpartition para não ordenar o vetor inteiro; todos os empatados com o
+    n-ésimo peso entram na ordenação final para manter o desempate estável.
+    """
+    if n <= 0 or pesos.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if pesos.size <= n:
+        return _ordenar_por_peso(pesos)
+    
+    limiar = pesos[np.argpartition(-pesos, n - 1)[n - 1]]
+    candidatos = np.flatnonzero(pesos >= limiar)
+    return candidatos[_ordenar_por_peso(pesos[candidatos])][:n]
+
+
+def _montar_analise(linha_cv, linha_vaga, feature_names, raw_similarity: float) -> Dict:
+    """
+    Monta Score + Gaps + Pontos Fortes + Plano de Ação a partir dos vetores TF-IDF.
+    
+    Args:
+        linha_cv: Linha TF-IDF (1 × vocabulário) do CV
+        linha_vaga: Linha TF-IDF (1 × vocabulário) da vaga
+        feature_names: Termos do vocabulário
+        raw_similarity: Similaridade de cosseno entre as duas linhas
         
-        # Remover n-grams que contêm palavras genéricas
-        palavras_termo = termo.split()
-        for palavra in palavras_termo:
-            if palavra in _termos_genericos_gap:
-                return True
-        
-        return False
+    Returns:
+        Dict com score, pontos_fortes, gaps_identificados, plano_acao
+    """
+    score_final = _escalar_score(raw_similarity)
     
-    termos_faltantes = termos_faltantes_raw[
-        ~termos_faltantes_raw['termo'].apply(_is_generic_term)
-    ].head(10)
+    logger.debug(f"Raw similarity: {raw_similarity:.4f}, Scaled score: {score_final}")
     
-    # Pontos fortes: termos que ambos têm
-    pontos_fortes = df_analise[
-        (df_analise['peso_vaga'] > 0) & (df_analise['peso_cv'] > 0)
-    ].sort_values(by='peso_cv', ascending=False).head(8)
+    # Análise de termos direto nos índices CSR (sem densificar o vocabulário)
+    linha_cv = _csr_ordenada(linha_cv)
+    linha_vaga = _csr_ordenada(linha_vaga)
+    idx_cv = linha_cv.indices
+    idx_vaga = linha_vaga.indices
+    pesos_vaga = linha_vaga.data
+    no_cv = np.isin(idx_vaga, idx_cv, assume_unique=True)
+    
+    # Gaps: termos da vaga que NÃO estão no CV (diferença de índices),
+    # sem termos genéricos / títulos de cargo, top 10 por peso na vaga
+    idx_faltantes = np.array(
+        [i for i in idx_vaga[~no_cv] if not _is_generic_term(feature_names[i])],
+        dtype=idx_vaga.dtype
+    )
+    pesos_faltantes = pesos_vaga[np.isin(idx_vaga, idx_faltantes, assume_unique=True)]
+    lista_gaps = [str(feature_names[idx_faltantes[pos]]) for pos in _top_n_por_peso(pesos_faltantes, 10)]
+    
+    # Pontos fortes: termos que ambos têm (interseção), top 8 por peso no CV
+    idx_comuns = idx_vaga[no_cv]
+    pesos_comuns = linha_cv.data[np.searchsorted(idx_cv, idx_comuns)]
+    pontos_fortes = [str(feature_names[idx_comuns[pos]]) for pos in _top_n_por_peso(pesos_comuns, 8)]
     
-    # Plano de ação
+    return {
+        "score": score_final,
+        "pontos_fortes": pontos_fortes,
+        "gaps_identificados": lista_gaps,
+        "plano_acao": _gerar_plano_acao(score_final, lista_gaps)
+    }
+
+
+def _gerar_plano_acao(score_final: float, lista_gaps: List[str]) -> List[str]:
+    """Gera o plano de ação do fallback TF-IDF a partir do score e dos gaps."""
     plano = []
     
     if score_final >= 70:
@@ -360,21 +468,102 @@ def _analisar_compatibilidade(cv_texto: str, vaga_texto: str) -> Dict:
     else:
         plano.append("❌ Risco de eliminação automática. Seu perfil precisa de uma revisão estrutural para este cargo.")
     
-    if not termos_faltantes.empty:
-        lista_gaps = termos_faltantes['termo'].tolist()
+    if lista_gaps:
         plano.append(
             f"🔍 Palavras-chave ausentes no seu perfil: **{', '.join(lista_gaps[:7]).upper()}**. "
             f"Tente incluí-las no Resumo, Competências ou Experiência."
         )
     
+    return plano
+
+
+class AnaliseLLM(BaseModel):
+    """Formato da resposta JSON de _analisar_com_llm (v5.0)."""
+    score: float
+    arquetipo_cargo: str = 'N/A'
+    pontos_fortes: List[str]
+    gaps_identificados: List[str]
+    gaps_falsos_ignorados: List[str] = []
+    plano_acao: List[str]
+
+
+def _schema_estrito(modelo) -> Dict:
+    """
+    JSON schema de um modelo pydantic no formato do structured output da API.
+    
+    O modo ``strict`` exige todos os campos em ``required``,
+    ``additionalProperties: false`` e não aceita ``default``/``title``.
+    """
+    propriedades = {
+        nome: {k: v for k, v in prop.items() if k not in ('title', 'default')}
+        for nome, prop in modelo.model_json_schema()['properties'].items()
+    }
     return {
-        "score": score_final,
-        "pontos_fortes": pontos_fortes['termo'].tolist(),
-        "gaps_identificados": termos_faltantes['termo'].tolist(),
-        "plano_acao": plano
+        "type": "object",
+        "properties": propriedades,
+        "required": list(propriedades),
+        "additionalProperties": False,
     }
 
 
+FORMATO_ANALISE_LLM = {
+    "type": "json_schema",
+    "json_schema": {"name": "analise_ats", "strict": True, "schema": _schema_estrito(AnaliseLLM)},
+}
+
+
+def _interpretar_analise_llm(resposta: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Valida a resposta da LLM contra AnaliseLLM.
+    
+    Aceita também JSON dentro de bloco markdown (respostas antigas em cache).
+    
+    Returns:
+        (dict validado, None) ou (None, descrição do erro)
+    """
+    resposta_limpa = resposta.strip()
+    if resposta_limpa.startswith("```json"):
+        resposta_limpa = resposta_limpa.split("```json", 1)[1].rsplit("```", 1)[0]
+    elif resposta_limpa.startswith("```"):
+        resposta_limpa = resposta_limpa.split("```", 1)[1].rsplit("```", 1)[0]
+    
+    try:
+        return AnaliseLLM.model_validate_json(resposta_limpa.strip()).model_dump(), None
+    except ValidationError as e:
+        return None, str(e)
+
+
+def _reparar_analise_llm(client, resposta: str, erro: str) -> Optional[Dict]:
+    """
+    Corrige uma resposta fora do schema com uma chamada curta ao modelo rápido.
+    
+    Só a resposta inválida e o erro de validação são enviados (sem CV nem
+    vaga), em vez de repetir a análise completa.
+    """
+    logger.warning(f"Resposta da LLM fora do schema, tentando reparo: {erro[:300]}")
+    msgs = [
+        {"role": "system", "content": (
+            "Você corrige respostas JSON inválidas. Devolva o MESMO conteúdo ajustado ao schema, "
+            "sem inventar, remover ou reescrever informações."
+        )},
+        {"role": "user", "content": (
+            f"ERROS DE VALIDAÇÃO:\n{erro[:1500]}\n\n"
+            f"RESPOSTA ORIGINAL:\n{resposta[:8000]}"
+        )}
+    ]
+    reparada = chamar_gpt(client, msgs, temperature=0, seed=42, rota=ROTA_REPARO_JSON,
+                          response_format=FORMATO_ANALISE_LLM)
+    if not reparada:
+        return None
+    
+    resultado, erro = _interpretar_analise_llm(reparada)
+    if resultado is None:
+        logger.error(f"Reparo do JSON da LLM falhou: {erro[:300]}")
+    else:
+        logger.info("JSON da LLM reparado com sucesso")
+    return resultado
+
+
 def _analisar_com_llm(
     client, 
     cv_texto: str, 
@@ -577,59 +766,22 @@ def _analisar_com_llm(
         {"role": "user", "content": user_prompt}
     ]
     
-    # Chamar LLM com temperatura baixa e seed fixo para consistência e reprodutibilidade
-    resposta = chamar_gpt(client, msgs, temperature=0.2, seed=42)
+    # Chamar LLM com temperatura baixa e seed fixo para consistência e reprodutibilidade.
+    # Structured output: a API garante o JSON no schema de AnaliseLLM.
+    resposta = chamar_gpt(client, msgs, temperature=0.2, seed=42, rota=ROTA_ANALISE_ATS,
+                          response_format=FORMATO_ANALISE_LLM)
     
     if not resposta:
         logger.warning("Falha ao obter resposta da LLM")
         return None
     
-    # Parse do JSON da resposta
     try:
-        # A resposta pode vir com blocos ```json ou JSON puro
-        resposta_limpa = resposta.strip()
-        
-        # Remover blocos markdown se existirem
-        if resposta_limpa.startswith("```json"):
-            resposta_limpa = resposta_limpa.split("```json", 1)[1]
-            resposta_limpa = resposta_limpa.rsplit("```", 1)[0]
-        elif resposta_limpa.startswith("```"):
-            resposta_limpa = resposta_limpa.split("```", 1)[1]
-            resposta_limpa = resposta_limpa.rsplit("```", 1)[0]
-        
-        resposta_limpa = resposta_limpa.strip()
-        
-        # Parse do JSON
-        resultado = json.loads(resposta_limpa)
-        
-        # Validar estrutura esperada (campos obrigatórios v5.0)
-        campos_obrigatorios = ['score', 'pontos_fortes', 'gaps_identificados', 'plano_acao']
-        if not all(k in resultado for k in campos_obrigatorios):
-            logger.error("Resposta LLM não contém todas as chaves obrigatórias")
-            return None
-        
-        # Validar tipos
-        if not isinstance(resultado['score'], (int, float)):
-            logger.error("Score não é numérico")
-            return None
-        if not isinstance(resultado['pontos_fortes'], list):
-            logger.error("pontos_fortes não é lista")
-            return None
-        if not isinstance(resultado['gaps_identificados'], list):
-            logger.error("gaps_identificados não é lista")
-            return None
-        if not isinstance(resultado['plano_acao'], list):
-            logger.error("plano_acao não é lista")
-            return None
-        
-        # Adicionar campos v5.0 com defaults se não existirem
-        if 'arquetipo_cargo' not in resultado:
-            resultado['arquetipo_cargo'] = 'N/A'
-            logger.warning("LLM não retornou arquetipo_cargo, usando 'N/A'")
-        
-        if 'gaps_falsos_ignorados' not in resultado:
-            resultado['gaps_falsos_ignorados'] = []
-            logger.warning("LLM não retornou gaps_falsos_ignorados, usando lista vazia")
+        resultado, erro = _interpretar_analise_llm(resposta)
+        if resultado is None:
+            resultado = _reparar_analise_llm(client, resposta, erro)
+            if resultado is None:
+                logger.debug(f"Resposta recebida: {resposta[:500]}")
+                return None
         
         # Post-processing: Filter out copied/paraphrased example values from gaps_falsos_ignorados
         gaps_falsos_originais = resultado['gaps_falsos_ignorados']
@@ -687,22 +839,41 @@ def _analisar_com_llm(
         )
         return resultado
         
-    except json.JSONDecodeError as e:
-        logger.error(f"Erro ao fazer parse do JSON da LLM: {e}")
-        logger.debug(f"Resposta recebida: {resposta[:500]}")
-        return None
     except Exception as e:
         logger.error(f"Erro inesperado ao processar resposta da LLM: {e}", exc_info=True)
         return None
 
 
-def buscar_variacoes_cargo(client, cargo: str) -> List[str]:
+def buscar_variacoes_cargo(client, cargo: str, forcar: bool = False) -> List[str]:
     """
     Usa IA para encontrar variações REAIS de mercado de um cargo.
+    
+    Consulta antes a biblioteca compartilhada (core.jd_library); com
+    ``forcar=True`` regenera e sobrescreve a entrada da biblioteca.
     """
+    if not forcar:
+        variacoes = obter_variacoes(cargo)
+        if variacoes:
+            logger.info(f"Variações de '{cargo}' obtidas da biblioteca de JDs")
+            return variacoes
+    
     logger.info(f"Buscando variações de mercado para: {cargo}")
     
-    msgs = [
+    resposta = chamar_gpt(client, _mensagens_variacoes_cargo(cargo), temperature=0.3, seed=42,
+                          rota=ROTA_VARIACOES_CARGO)
+    
+    if not resposta:
+        logger.warning("Falha ao buscar variações — usando cargo original")
+        return [cargo]
+    
+    variacoes = _processar_variacoes_cargo(cargo, resposta)
+    guardar_variacoes(cargo, variacoes)
+    return variacoes
+
+
+def _mensagens_variacoes_cargo(cargo: str) -> List[Dict]:
+    """Mensagens do prompt de variações de mercado de um cargo."""
+    return [
         {"role": "system", "content": (
             "Você é um especialista em recrutamento no Brasil e mercado de trabalho. "
             "Dado um cargo, liste entre 5 e 8 variações REAIS desse cargo como aparecem "
@@ -714,13 +885,10 @@ def buscar_variacoes_cargo(client, cargo: str) -> List[str]:
         )},
         {"role": "user", "content": f"Cargo: {cargo}"}
     ]
-    
-    resposta = chamar_gpt(client, msgs, temperature=0.3, seed=42)
-    
-    if not resposta:
-        logger.warning("Falha ao buscar variações — usando cargo original")
-        return [cargo]
-    
+
+
+def _processar_variacoes_cargo(cargo: str, resposta: str) -> List[str]:
+    """Converte a resposta da LLM em lista de variações (cargo original primeiro)."""
     variacoes = [v.strip() for v in resposta.strip().split('\n') if v.strip()]
     if cargo not in variacoes:
         variacoes.insert(0, cargo)
@@ -729,17 +897,42 @@ def buscar_variacoes_cargo(client, cargo: str) -> List[str]:
     return variacoes
 
 
-def gerar_job_description(client, cargo: str) -> Optional[str]:
+def gerar_job_description(client, cargo: str, forcar: bool = False) -> Optional[str]:
     """
     Gera uma Job Description focada em TERMOS TÉCNICOS reais do cargo,
     sem exemplos genéricos que contaminam a análise.
+    
+    A JD é compartilhada entre usuários pela biblioteca de JDs
+    (core.jd_library), por cargo normalizado. Com ``forcar=True`` ela é
+    regenerada e a entrada da biblioteca sobrescrita.
     """
+    if not forcar:
+        jd = obter_jd(cargo)
+        if jd:
+            logger.info(f"JD de '{cargo}' obtida da biblioteca ({len(jd)} chars)")
+            return jd
+    
     logger.info(f"Gerando Job Description técnica para: {cargo}")
     
-    variacoes = buscar_variacoes_cargo(client, cargo)
+    variacoes = buscar_variacoes_cargo(client, cargo, forcar=forcar)
+    
+    jd = chamar_gpt(client, _mensagens_job_description(cargo, variacoes), temperature=0.3, seed=42,
+                    rota=ROTA_JOB_DESCRIPTION)
+    
+    if jd:
+        logger.info(f"JD técnica gerada ({len(jd)} chars)")
+        guardar_jd(cargo, jd)
+    else:
+        logger.error("Falha ao gerar JD")
+    
+    return jd
+
+
+def _mensagens_job_description(cargo: str, variacoes: List[str]) -> List[Dict]:
+    """Mensagens do prompt de Job Description técnica (cargo + variações de mercado)."""
     variacoes_texto = "\n".join(f"- {v}" for v in variacoes)
     
-    msgs = [
+    return [
         {"role": "system", "content": (
             "Você é um especialista em recrutamento técnico e sistemas ATS no Brasil.\n\n"
             "Gere uma Job Description para o cargo informado focada EXCLUSIVAMENTE em:\n"
@@ -768,38 +961,27 @@ def gerar_job_description(client, cargo: str) -> Optional[str]:
             f"para esse cargo específico e suas variações."
         )}
     ]
-    
-    jd = chamar_gpt(client, msgs, temperature=0.3, seed=42)
-    
-    if jd:
-        logger.info(f"JD técnica gerada ({len(jd)} chars)")
-    else:
-        logger.error("Falha ao gerar JD")
-    
-    return jd
 
 
-def _gerar_breakdown_tfidf(cv_texto: str, cargo_alvo: str, client) -> Dict:
+def _montar_breakdown_tfidf(cv_texto: str, jd: Optional[str], area: Optional[str] = None) -> Dict:
     """
     Gera breakdown detalhado usando TF-IDF para complementar análise LLM.
     
     Roda silenciosamente para popular campos que a UI espera, mesmo quando
-    a análise principal vem da LLM.
+    a análise principal vem da LLM. A JD é gerada em paralelo com a análise
+    LLM (ver ``_calcular_score_ats_sem_cache``).
     
     Args:
         cv_texto: Texto do CV
-        cargo_alvo: Cargo alvo
-        client: Cliente OpenAI (para gerar JD se necessário)
+        jd: Job Description (None quando a geração falhou)
+        area: Arquétipo do cargo, usado para escolher o motor TF-IDF (opcional)
         
     Returns:
         Dict com detalhes do breakdown ou estrutura vazia com campos presentes
     """
     try:
-        # Tentar gerar JD e rodar TF-IDF
-        jd = gerar_job_description(client, cargo_alvo) if client else None
-        
         if jd:
-            analise = _analisar_compatibilidade(cv_texto, jd)
+            analise = _analisar_compatibilidade(cv_texto, jd, area=area)
             # Retornar estrutura com dados reais do TF-IDF
             return {
                 'metodo': 'LLM Score + TF-IDF Breakdown',
@@ -827,9 +1009,13 @@ def _gerar_breakdown_tfidf(cv_texto: str, cargo_alvo: str, client) -> Dict:
     except Exception as e:
         logger.warning(f"Falha ao gerar breakdown TF-IDF: {e}")
     
-    # Fallback: estrutura vazia mas com campos presentes (UI não crasha)
+    return _breakdown_vazio()
+
+
+def _breakdown_vazio(metodo: str = 'LLM Only (breakdown não disponível)') -> Dict:
+    """Estrutura vazia mas com campos presentes (UI não crasha)."""
     return {
-        'metodo': 'LLM Only (breakdown não disponível)',
+        'metodo': metodo,
         'modelo': 'GPT-4o',
         'fallback': False,
         'secoes': {'score': 0, 'encontradas': 0, 'total': 0},
@@ -840,6 +1026,112 @@ def _gerar_breakdown_tfidf(cv_texto: str, cargo_alvo: str, client) -> Dict:
     }
 
 
+def _coletar_breakdown(futuro_jd: Future, cv_texto: str, area: Optional[str], timeout: float) -> Dict:
+    """
+    Aguarda a JD do breakdown até o fim do prazo.
+    
+    Se a JD não chegar a tempo, retorna o breakdown marcado como pendente
+    (``pendente=True`` + ``breakdown_id``) e registra um Future que monta o
+    breakdown quando a JD ficar pronta (ver ``obter_breakdown_pendente``).
+    """
+    try:
+        jd = futuro_jd.result(timeout=timeout)
+    except FuturesTimeoutError:
+        breakdown_id = _registrar_breakdown_pendente(futuro_jd, cv_texto, area)
+        logger.warning(f"Breakdown TF-IDF fora do prazo — marcado como pendente ({breakdown_id})")
+        detalhes = _breakdown_vazio('LLM Score (breakdown TF-IDF pendente)')
+        detalhes['pendente'] = True
+        detalhes['breakdown_id'] = breakdown_id
+        return detalhes
+    except Exception as e:
+        logger.warning(f"Falha ao gerar JD para o breakdown TF-IDF: {e}")
+        jd = None
+    
+    return _montar_breakdown_tfidf(cv_texto, jd, area)
+
+
+def _registrar_breakdown_pendente(futuro_jd: Future, cv_texto: str, area: Optional[str]) -> str:
+    """Encadeia a montagem do breakdown na JD em andamento e guarda o Future."""
+    pendente: Future = Future()
+    
+    def _ao_concluir_jd(futuro: Future) -> None:
+        try:
+            jd = futuro.result()
+        except Exception as e:
+            logger.warning(f"Falha ao gerar JD para o breakdown TF-IDF pendente: {e}")
+            jd = None
+        pendente.set_result(_montar_breakdown_tfidf(cv_texto, jd, area))
+    
+    breakdown_id = _registrar_pendente(pendente)
+    futuro_jd.add_done_callback(_ao_concluir_jd)
+    return breakdown_id
+
+
+def _registrar_pendente(futuro: Future) -> str:
+    """Guarda um Future de resultado em segundo plano e retorna seu id."""
+    pendente_id = uuid.uuid4().hex
+    with _lock_pendentes:
+        _pendentes[pendente_id] = futuro
+        while len(_pendentes) > MAX_PENDENTES:
+            descartado = next(iter(_pendentes))
+            del _pendentes[descartado]
+            logger.debug(f"Resultado pendente {descartado} descartado (limite do registro)")
+    return pendente_id
+
+
+def _obter_pendente(pendente_id: str, timeout: float) -> Optional[Dict]:
+    """Retorna o resultado pronto (removendo-o do registro) ou None."""
+    with _lock_pendentes:
+        futuro = _pendentes.get(pendente_id)
+    if futuro is None:
+        return None
+    
+    try:
+        resultado = futuro.result(timeout=timeout)
+    except FuturesTimeoutError:
+        return None
+    
+    with _lock_pendentes:
+        _pendentes.pop(pendente_id, None)
+    return resultado
+
+
+def resultado_pendente(pendente_id: Optional[str]) -> bool:
+    """True se o id (breakdown ou refinamento) ainda está no registro."""
+    with _lock_pendentes:
+        return bool(pendente_id) and pendente_id in _pendentes
+
+
+def obter_breakdown_pendente(breakdown_id: str, timeout: float = 0.0) -> Optional[Dict]:
+    """
+    Retorna o breakdown TF-IDF que ficou pendente no calcular_score_ats.
+    
+    Args:
+        breakdown_id: Valor de ``resultado['detalhes']['breakdown_id']``
+        timeout: Segundos para aguardar (0 = não bloqueia)
+        
+    Returns:
+        Dict do breakdown quando pronto (e o remove do registro), ou None se
+        ainda estiver em andamento ou o id for desconhecido
+    """
+    return _obter_pendente(breakdown_id, timeout)
+
+
+def obter_refinamento_ats(refinamento_id: str, timeout: float = 0.0) -> Optional[Dict]:
+    """
+    Retorna o resultado LLM (v5.0) de um calcular_score_ats progressivo.
+    
+    Args:
+        refinamento_id: Valor de ``resultado['refinamento_id']``
+        timeout: Segundos para aguardar (0 = não bloqueia)
+        
+    Returns:
+        Resultado completo quando pronto (e o remove do registro), ou None se
+        ainda estiver em andamento ou o id for desconhecido
+    """
+    return _obter_pendente(refinamento_id, timeout)
+
+
 def extrair_cargo_do_cv(client, cv_texto: str) -> Optional[str]:
     """
     Extrai o cargo atual/mais recente do candidato a partir do CV.
@@ -855,7 +1147,7 @@ def extrair_cargo_do_cv(client, cv_texto: str) -> Optional[str]:
         {"role": "user", "content": f"CV:\n{cv_texto[:3000]}"}
     ]
     
-    cargo = chamar_gpt(client, msgs, temperature=0.1, seed=42)
+    cargo = chamar_gpt(client, msgs, temperature=0.1, seed=42, rota=ROTA_EXTRACAO_CARGO)
     
     if cargo:
         cargo = cargo.strip().strip('"').strip("'")
@@ -872,7 +1164,9 @@ def calcular_score_ats(
     client=None,
     texto_vaga: Optional[str] = None,
     objetivo: Optional[str] = None,
-    cargo_atual: Optional[str] = None
+    cargo_atual: Optional[str] = None,
+    usar_cache: bool = True,
+    progressivo: bool = False
 ) -> Dict:
     """
     Calcula Score ATS completo com análise de gaps técnicos.
@@ -882,6 +1176,15 @@ def calcular_score_ats(
     - Cenário B: Título + arquétipo + double-check (client != None)
     - Cenário C: Fallback TF-IDF offline
     
+    Resultados passam pelo cache persistente endereçado por conteúdo
+    (core.ats_cache): o mesmo CV/cargo/vaga/objetivo não é recalculado em
+    outra sessão nem após reinício do servidor.
+    
+    Modo progressivo (``progressivo=True`` com client): se o resultado LLM
+    não estiver em cache, retorna na hora o resultado offline TF-IDF (v3.2)
+    com ``refinamento_pendente=True`` e ``refinamento_id``; a análise LLM
+    (v5.0) segue em segundo plano e é obtida com ``obter_refinamento_ats``.
+    
     Args:
         cv_texto: Texto completo do CV
         cargo_alvo: Cargo para gerar a Job Description ou classificar
@@ -889,18 +1192,126 @@ def calcular_score_ats(
         texto_vaga: Texto da vaga real (opcional) para análise ultra-precisa
         objetivo: Tipo de movimentação (Recolocação, Transição, Promoção Interna, Trabalho Internacional)
         cargo_atual: Cargo atual do candidato (opcional)
+        usar_cache: Se False, ignora o cache e força novo cálculo
+        progressivo: Se True, não bloqueia na análise LLM (ver acima)
         
     Returns:
         Dict com score_total, percentual, nivel, pontos_fortes,
         gaps_identificados, gaps_falsos_ignorados, plano_acao, 
         arquetipo_cargo, fonte_vaga, metodo e detalhes
     """
+    cache = obter_cache_ats() if usar_cache else None
+    chave = None
+    
+    if cache is not None:
+        chave = gerar_chave_ats(
+            cv_texto, cargo_alvo, texto_vaga, objetivo, cargo_atual,
+            modo='llm' if client else 'offline',
+            versao_scorer=VERSAO_SCORER,
+            modelo=_modelo_analise() if client else "",
+            motor=identidade_motores()
+        )
+        
+        resultado = cache.obter(chave)
+        if resultado is not None:
+            logger.info(f"Cache ATS: hit para cargo '{cargo_alvo}' (score {resultado.get('score_total')})")
+            return resultado
+        
+        logger.info(f"Cache ATS: miss para cargo '{cargo_alvo}'")
+    
+    if progressivo and client:
+        return _iniciar_refinamento_ats(
+            cv_texto, cargo_alvo, client, texto_vaga, objetivo, cargo_atual, usar_cache, cache, chave
+        )
+    
+    return _calcular_e_gravar(cv_texto, cargo_alvo, client, texto_vaga, objetivo, cargo_atual, cache, chave)
+
+
+def _modelo_analise() -> str:
+    """Modelo e max_tokens da rota da análise LLM (OPENAI_MODEL_ROUTES), para a chave do cache."""
+    _, modelo, max_tokens = resolver_rota(ROTA_ANALISE_ATS)
+    return f"{modelo}:{max_tokens}"
+
+
+def _calcular_e_gravar(cv_texto, cargo_alvo, client, texto_vaga, objetivo, cargo_atual, cache, chave) -> Dict:
+    """Calcula o resultado e o grava no cache ATS (se houver e se for completo)."""
+    resultado = _calcular_score_ats_sem_cache(cv_texto, cargo_alvo, client, texto_vaga, objetivo, cargo_atual)
+    
+    if cache is None:
+        return resultado
+    
+    # Com client, o fallback TF-IDF indica falha da LLM: não persistir resultado degradado
+    if client and resultado.get('fonte_vaga') == 'tfidf_fallback':
+        logger.info("Cache ATS: resultado de fallback não será gravado")
+    elif resultado.get('detalhes', {}).get('pendente'):
+        logger.info("Cache ATS: resultado com breakdown pendente não será gravado")
+    else:
+        cache.definir(chave, resultado)
+    
+    return resultado
+
+
+def _iniciar_refinamento_ats(
+    cv_texto, cargo_alvo, client, texto_vaga, objetivo, cargo_atual, usar_cache, cache, chave
+) -> Dict:
+    """
+    Dispara a análise LLM em segundo plano e retorna o resultado offline na hora.
+    """
+    futuro = _executor_refinamento.submit(
+        propagar_contexto(_calcular_e_gravar), cv_texto, cargo_alvo, client, texto_vaga, objetivo, cargo_atual, cache, chave
+    )
+    refinamento_id = _registrar_pendente(futuro)
+    
+    preliminar = dict(calcular_score_ats(
+        cv_texto, cargo_alvo, None, texto_vaga, objetivo, cargo_atual, usar_cache=usar_cache
+    ))
+    preliminar['refinamento_pendente'] = True
+    preliminar['refinamento_id'] = refinamento_id
+    
+    logger.info(
+        f"Score ATS preliminar (TF-IDF): {preliminar['score_total']}/100 — "
+        f"refinamento LLM em segundo plano ({refinamento_id})"
+    )
+    return preliminar
+
+
+def _calcular_score_ats_sem_cache(
+    cv_texto: str, 
+    cargo_alvo: str, 
+    client=None,
+    texto_vaga: Optional[str] = None,
+    objetivo: Optional[str] = None,
+    cargo_atual: Optional[str] = None
+) -> Dict:
+    """
+    Executa os cenários A/B/C do calcular_score_ats sem consultar o cache.
+    
+    Com client, a análise LLM e a JD do breakdown TF-IDF (variações + JD,
+    duas chamadas GPT) rodam em paralelo no pool do ATS, limitadas pelo
+    prazo total ``Config.ATS_DEADLINE``. Se a JD não chegar a tempo, o
+    resultado volta com ``detalhes['pendente'] = True``.
+    """
     logger.info(f"Calculando score ATS v5.0 para cargo: {cargo_alvo}, objetivo: {objetivo}")
     
+    futuro_jd = None
+    
     # ─── TENTATIVA 1: Análise LLM (v5.0) ───
     if client:
         logger.info("Client OpenAI disponível - usando análise LLM (v5.0)")
-        analise_llm = _analisar_com_llm(client, cv_texto, cargo_alvo, texto_vaga, objetivo, cargo_atual)
+        prazo = time.monotonic() + core.config.config.ATS_DEADLINE
+        futuro_jd = _executor_ats.submit(propagar_contexto(gerar_job_description), client, cargo_alvo)
+        futuro_llm = _executor_ats.submit(
+            propagar_contexto(_analisar_com_llm), client, cv_texto, cargo_alvo, texto_vaga, objetivo, cargo_atual
+        )
+        
+        try:
+            analise_llm = futuro_llm.result(timeout=core.config.config.ATS_DEADLINE)
+        except FuturesTimeoutError:
+            logger.warning(f"Análise LLM excedeu o prazo de {core.config.config.ATS_DEADLINE}s")
+            analise_llm = None
+        except Exception as e:
+            logger.error(f"Erro na análise LLM: {e}", exc_info=True)
+            analise_llm = None
         
         if analise_llm:
             # Usar resultado da LLM
@@ -915,8 +1326,12 @@ def calcular_score_ats(
                 f"Arquétipo: {arquetipo}, Fonte: {fonte_vaga}"
             )
             
-            # Tentar rodar TF-IDF silenciosamente para gerar breakdown detalhado
-            detalhes_breakdown = _gerar_breakdown_tfidf(cv_texto, cargo_alvo, client)
+            # Breakdown TF-IDF com a JD gerada em paralelo (até o fim do prazo)
+            detalhes_breakdown = _coletar_breakdown(
+                futuro_jd, cv_texto,
+                area=arquetipo if arquetipo != 'N/A' else None,
+                timeout=max(0.0, prazo - time.monotonic())
+            )
             
             return {
                 'score_total': score,
@@ -941,8 +1356,13 @@ def calcular_score_ats(
     
     # ─── FALLBACK: Análise TF-IDF (v3.2) ───
     job_description = None
-    if client:
-        job_description = gerar_job_description(client, cargo_alvo)
+    if futuro_jd is not None:
+        try:
+            job_description = futuro_jd.result(timeout=max(0.0, prazo - time.monotonic()))
+        except FuturesTimeoutError:
+            logger.warning("JD não ficou pronta dentro do prazo do ATS")
+        except Exception as e:
+            logger.warning(f"Falha ao gerar JD para o fallback: {e}")
     
     if not job_description:
         logger.warning("Usando JD simplificada")
@@ -985,6 +1405,97 @@ def calcular_score_ats(
     return resultado
 
 
+def calcular_score_ats_lote(
+    cv_texto: str,
+    vagas: List[str],
+    area: Optional[str] = None
+) -> List[Dict]:
+    """
+    Calcula o Score ATS de um CV contra várias vagas reais de uma só vez.
+    
+    Vetoriza CV + todas as vagas em uma única passada (transform do motor
+    pré-treinado ou um único fit no lote) e calcula todas as similaridades
+    de cosseno com um único produto de matriz esparsa.
+    
+    Nota: sem motor pré-treinado, o IDF é aprendido no lote inteiro, então o
+    score de cada vaga pode diferir levemente do calcular_score_ats individual.
+    
+    Args:
+        cv_texto: Texto completo do CV
+        vagas: Textos das vagas (Job Descriptions)
+        area: Área/arquétipo para escolher o motor TF-IDF (opcional)
+        
+    Returns:
+        Lista (mesma ordem de ``vagas``) de dicts com indice, score_total,
+        max_score, percentual, nivel, pontos_fortes, gaps_identificados,
+        plano_acao e metodo
+    """
+    logger.info(f"Calculando score ATS em lote: {len(vagas)} vagas")
+    
+    analises = [_analise_texto_insuficiente() for _ in vagas]
+    
+    cv_limpo = visao_texto(cv_texto).limpo
+    vagas_limpas = [_limpar_texto(v) for v in vagas]
+    indices_validos = [i for i, v in enumerate(vagas_limpas) if v]
+    
+    if not cv_limpo or not indices_validos:
+        logger.warning("CV vazio ou nenhuma vaga com texto após limpeza")
+        return [_resultado_lote(i, a) for i, a in enumerate(analises)]
+    
+    documentos = [cv_limpo] + [vagas_limpas[i] for i in indices_validos]
+    motor = obter_motor(area)
+    
+    try:
+        if motor:
+            tfidf_matrix = motor.transformar(documentos)
+            feature_names = motor.feature_names
+        else:
+            vectorizer = TfidfVectorizer(
+                stop_words=STOPWORDS_PT_EN,
+                ngram_range=(1, 3),
+                min_df=1
+            )
+            tfidf_matrix = vectorizer.fit_transform(documentos)
+            feature_names = vectorizer.get_feature_names_out()
+    except ValueError as e:
+        logger.error(f"Erro na vetorização em lote: {e}")
+        return [_resultado_lote(i, a) for i, a in enumerate(analises)]
+    
+    tfidf_matrix = tfidf_matrix.tocsr()
+    linha_cv = tfidf_matrix[0]
+    
+    # Todas as similaridades CV × vagas em um único produto esparso
+    similaridades = (tfidf_matrix[1:] @ linha_cv.T).toarray().ravel()
+    
+    for posicao, indice in enumerate(indices_validos):
+        analises[indice] = _montar_analise(
+            linha_cv, tfidf_matrix[posicao + 1], feature_names, float(similaridades[posicao])
+        )
+    
+    resultados = [_resultado_lote(i, a) for i, a in enumerate(analises)]
+    logger.info(
+        f"Score ATS em lote concluído: {len(indices_validos)}/{len(vagas)} vagas analisadas, "
+        f"motor: {motor.area if motor else 'fit no lote'}"
+    )
+    return resultados
+
+
+def _resultado_lote(indice: int, analise: Dict) -> Dict:
+    """Converte a análise TF-IDF de uma vaga no formato de resultado do lote."""
+    score = analise['score']
+    return {
+        'indice': indice,
+        'score_total': score,
+        'max_score': 100,
+        'percentual': score,
+        'nivel': classificar_score(score),
+        'pontos_fortes': analise['pontos_fortes'],
+        'gaps_identificados': analise['gaps_identificados'],
+        'plano_acao': analise['plano_acao'],
+        'metodo': 'TF-IDF Lote (v3.2)',
+    }
+
+
 def classificar_score(score: float) -> str:
     """Classifica o score ATS em níveis qualitativos."""
     if score >= 70:
@@ -0,0 +1,105 @@
+"""
+Cache de extrações de arquivos enviados, endereçado pelo conteúdo.
+
+``extrair_texto_pdf`` usava ``st.cache_data``, que faz o hash do objeto
+``UploadedFile``: o cache era por processo, sumia a cada reinício e não
+cobria DOCX nem TXT.
+
+Aqui a chave é o BLAKE2b dos bytes do arquivo (mais o formato e a versão
+dos extratores), calculado uma vez em core.pipeline_upload. O valor
+guarda o texto extraído e metadados (páginas, encoding, caracteres,
+tamanho). O cache é compartilhado por todas as sessões, limitado por
+LRU/TTL e persistido em SQLite (core.cache_store): reenvios e reinícios
+não reprocessam o mesmo arquivo.
+
+Configuração (core.config.Config / variáveis de ambiente):
+- EXTRACTION_CACHE_ENABLED: liga/desliga o cache (padrão: ligado)
+- EXTRACTION_CACHE_PATH: arquivo SQLite (padrão: cache/extracao_cache.sqlite)
+- EXTRACTION_CACHE_TTL: validade em segundos (padrão: 30 dias)
+- EXTRACTION_CACHE_MAX_ITEMS: limite de itens LRU (padrão: 2000)
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+import core.config
+from core.cache_store import CacheSQLite
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando um extrator mudar o texto produzido (invalida o cache)
+VERSAO_EXTRATORES = "4"
+
+_cache_extracao: Optional[CacheSQLite] = None
+_lock_cache = threading.Lock()
+
+
+def gerar_chave_extracao(dados: bytes, formato: str) -> str:
+    """
+    Gera a chave BLAKE2b de um arquivo.
+
+    Args:
+        dados: Conteúdo bruto do arquivo
+        formato: Formato do extrator ('pdf', 'docx' ou 'txt')
+
+    Returns:
+        Hash hexadecimal (256 bits)
+    """
+    h = hashlib.blake2b(digest_size=32, person=b"extracao-cv")
+    h.update(f"{VERSAO_EXTRATORES}:{formato}:".encode("utf-8"))
+    h.update(dados)
+    return h.hexdigest()
+
+
+def obter_cache_extracao() -> Optional[CacheSQLite]:
+    """
+    Retorna o cache de extrações do processo (criado na primeira chamada).
+
+    Returns:
+        CacheSQLite ou None se o cache estiver desligado ou indisponível
+    """
+    global _cache_extracao
+
+    cfg = core.config.config
+    if not cfg.EXTRACTION_CACHE_ENABLED:
+        return None
+
+    if _cache_extracao is None:
+        with _lock_cache:
+            if _cache_extracao is None:
+                try:
+                    _cache_extracao = CacheSQLite(
+                        cfg.EXTRACTION_CACHE_PATH,
+                        max_itens=cfg.EXTRACTION_CACHE_MAX_ITEMS,
+                        ttl_segundos=cfg.EXTRACTION_CACHE_TTL,
+                        nome="extracao"
+                    )
+                    logger.info(f"Cache de extrações aberto em {cfg.EXTRACTION_CACHE_PATH}")
+                except Exception as e:
+                    logger.error(f"Não foi possível abrir o cache de extrações: {e}", exc_info=True)
+                    return None
+    return _cache_extracao
+
+
+def estatisticas_cache_extracao() -> Dict:
+    """
+    Estatísticas de hit/miss do cache de extrações neste processo.
+
+    Returns:
+        Dict com hits, misses, hit_rate, itens etc. ou {'ativo': False}
+    """
+    cache = obter_cache_extracao()
+    if cache is None:
+        return {'ativo': False}
+    return {'ativo': True, **cache.estatisticas()}
+
+
+def resetar_cache_extracao() -> None:
+    """Fecha o cache do processo (a próxima chamada reabre com a config atual)."""
+    global _cache_extracao
+    with _lock_cache:
+        if _cache_extracao is not None:
+            _cache_extracao.fechar()
+        _cache_extracao = None
@@ -0,0 +1,284 @@
+"""
+Armazenamento de cache em disco (SQLite) compartilhado entre sessões.
+
+O ``st.session_state`` só vive enquanto a sessão do usuário existe. Para
+resultados caros e determinísticos (score ATS, JDs geradas, extrações de
+arquivos) usamos um cache chave → valor JSON persistido em SQLite, comum a
+todas as sessões do servidor e que sobrevive a reinícios.
+
+Características:
+- Limite de itens com despejo LRU (pelo último acesso)
+- TTL opcional por cache
+- Estatísticas de hit/miss em memória
+- Seguro para threads (uma conexão por cache protegida por lock)
+
+Também há um backend em memória (CacheMemoriaLRU) com a mesma interface,
+para caches que não precisam sobreviver a reinícios.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheSQLite:
+    """
+    Cache chave → valor (JSON) em SQLite com LRU e TTL.
+
+    Args:
+        caminho: Arquivo SQLite (diretórios são criados se necessário)
+        max_itens: Número máximo de itens (0 = sem limite)
+        ttl_segundos: Validade dos itens em segundos (0 = sem expiração)
+        nome: Nome do cache para logs
+
+    Examples:
+        >>> cache = CacheSQLite("cache/ats.sqlite", max_itens=1000, ttl_segundos=86400)
+        >>> cache.definir("abc", {"score": 72.5})
+        >>> cache.obter("abc")
+        {'score': 72.5}
+    """
+
+    def __init__(self, caminho, max_itens: int = 0, ttl_segundos: int = 0, nome: str = "cache"):
+        self.caminho = Path(caminho)
+        self.max_itens = max_itens
+        self.ttl_segundos = ttl_segundos
+        self.nome = nome
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'gravacoes': 0, 'expirados': 0, 'despejados': 0}
+
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.caminho), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS itens ("
+            " chave TEXT PRIMARY KEY,"
+            " valor TEXT NOT NULL,"
+            " criado_em REAL NOT NULL,"
+            " acessado_em REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_itens_acesso ON itens (acessado_em)")
+        self._conn.commit()
+        logger.debug(f"Cache '{nome}' aberto em {self.caminho}")
+
+    def obter(self, chave: str) -> Optional[Any]:
+        """
+        Retorna o valor da chave ou None (ausente ou expirado).
+
+        Args:
+            chave: Chave do item
+
+        Returns:
+            Valor desserializado ou None
+        """
+        agora = time.time()
+        try:
+            with self._lock:
+                linha = self._conn.execute(
+                    "SELECT valor, criado_em FROM itens WHERE chave = ?", (chave,)
+                ).fetchone()
+
+                if linha is None:
+                    self._stats['misses'] += 1
+                    return None
+
+                valor, criado_em = linha
+                if self.ttl_segundos and agora - criado_em > self.ttl_segundos:
+                    self._conn.execute("DELETE FROM itens WHERE chave = ?", (chave,))
+                    self._conn.commit()
+                    self._stats['misses'] += 1
+                    self._stats['expirados'] += 1
+                    return None
+
+                self._conn.execute("UPDATE itens SET acessado_em = ? WHERE chave = ?", (agora, chave))
+                self._conn.commit()
+                self._stats['hits'] += 1
+        except sqlite3.Error as e:
+            logger.error(f"Cache '{self.nome}': erro ao ler chave {chave[:12]}…: {e}")
+            return None
+
+        try:
+            return json.loads(valor)
+        except json.JSONDecodeError:
+            logger.warning(f"Cache '{self.nome}': valor corrompido para chave {chave[:12]}… — descartando")
+            self.remover(chave)
+            return None
+
+    def definir(self, chave: str, valor: Any) -> None:
+        """
+        Grava (ou substitui) um valor serializável em JSON.
+
+        Args:
+            chave: Chave do item
+            valor: Valor serializável em JSON
+
+        Erros de disco/SQLite são logados e não propagados (o cache é best-effort).
+        """
+        serializado = json.dumps(valor, ensure_ascii=False, default=str)
+        agora = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO itens (chave, valor, criado_em, acessado_em) VALUES (?, ?, ?, ?)",
+                    (chave, serializado, agora, agora)
+                )
+                self._stats['gravacoes'] += 1
+                self._despejar_excedentes()
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Cache '{self.nome}': erro ao gravar chave {chave[:12]}…: {e}")
+
+    def _despejar_excedentes(self) -> None:
+        """Remove os itens menos recentemente acessados acima de max_itens (lock já adquirido)."""
+        if not self.max_itens:
+            return
+        total = self._conn.execute("SELECT COUNT(*) FROM itens").fetchone()[0]
+        excedente = total - self.max_itens
+        if excedente > 0:
+            self._conn.execute(
+                "DELETE FROM itens WHERE chave IN "
+                "(SELECT chave FROM itens ORDER BY acessado_em ASC LIMIT ?)",
+                (excedente,)
+            )
+            self._stats['despejados'] += excedente
+            logger.debug(f"Cache '{self.nome}': {excedente} itens despejados (LRU)")
+
+    def remover(self, chave: str) -> bool:
+        """Remove uma chave. Retorna True se ela existia."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM itens WHERE chave = ?", (chave,))
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def limpar(self) -> None:
+        """Remove todos os itens do cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM itens")
+            self._conn.commit()
+        logger.info(f"Cache '{self.nome}' limpo")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM itens").fetchone()[0]
+
+    def __contains__(self, chave: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM itens WHERE chave = ?", (chave,)
+            ).fetchone() is not None
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Estatísticas de uso deste cache desde a abertura.
+
+        Returns:
+            Dict com hits, misses, gravacoes, expirados, despejados, itens e hit_rate
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        consultas = stats['hits'] + stats['misses']
+        stats['itens'] = len(self)
+        stats['hit_rate'] = round(stats['hits'] / consultas, 4) if consultas else 0.0
+        return stats
+
+    def fechar(self) -> None:
+        """Fecha a conexão com o arquivo SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+class CacheMemoriaLRU:
+    """
+    Cache chave → valor em memória com LRU e TTL (mesma interface do CacheSQLite).
+
+    Útil quando não é necessário sobreviver a reinícios, ou para testes.
+    Os valores são guardados como JSON, como no SQLite, para que quem lê
+    não compartilhe objetos mutáveis com o cache.
+
+    Args:
+        max_itens: Número máximo de itens (0 = sem limite)
+        ttl_segundos: Validade dos itens em segundos (0 = sem expiração)
+        nome: Nome do cache para logs
+    """
+
+    def __init__(self, max_itens: int = 0, ttl_segundos: int = 0, nome: str = "cache"):
+        self.max_itens = max_itens
+        self.ttl_segundos = ttl_segundos
+        self.nome = nome
+        self._lock = threading.Lock()
+        self._itens: "OrderedDict[str, tuple]" = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'gravacoes': 0, 'expirados': 0, 'despejados': 0}
+
+    def obter(self, chave: str) -> Optional[Any]:
+        """Retorna o valor da chave ou None (ausente ou expirado)."""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self._stats['misses'] += 1
+                return None
+
+            valor, criado_em = item
+            if self.ttl_segundos and time.time() - criado_em > self.ttl_segundos:
+                del self._itens[chave]
+                self._stats['misses'] += 1
+                self._stats['expirados'] += 1
+                return None
+
+            self._itens.move_to_end(chave)
+            self._stats['hits'] += 1
+        return json.loads(valor)
+
+    def definir(self, chave: str, valor: Any) -> None:
+        """Grava (ou substitui) um valor serializável em JSON."""
+        serializado = json.dumps(valor, ensure_ascii=False, default=str)
+        with self._lock:
+            self._itens[chave] = (serializado, time.time())
+            self._itens.move_to_end(chave)
+            self._stats['gravacoes'] += 1
+            while self.max_itens and len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+                self._stats['despejados'] += 1
+
+    def remover(self, chave: str) -> bool:
+        """Remove uma chave. Retorna True se ela existia."""
+        with self._lock:
+            return self._itens.pop(chave, None) is not None
+
+    def limpar(self) -> None:
+        """Remove todos os itens do cache."""
+        with self._lock:
+            self._itens.clear()
+        logger.info(f"Cache '{self.nome}' limpo")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._itens)
+
+    def __contains__(self, chave: str) -> bool:
+        with self._lock:
+            return chave in self._itens
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Estatísticas de uso deste cache desde a criação.
+
+        Returns:
+            Dict com hits, misses, gravacoes, expirados, despejados, itens e hit_rate
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['itens'] = len(self._itens)
+        consultas = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / consultas, 4) if consultas else 0.0
+        return stats
+
+    def fechar(self) -> None:
+        """Sem recursos externos: apenas descarta os itens."""
+        with self._lock:
+            self._itens.clear()
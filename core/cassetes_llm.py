@@ -0,0 +1,241 @@
+"""
+Gravação e reprodução ("cassetes") do tráfego com a OpenAI.
+
+Percorrer o fluxo completo (upload → diagnóstico → reality → chat →
+validação → exports) exige chamadas reais à API: lento, caro e não
+determinístico. Com os cassetes:
+
+- modo 'gravar': cada resposta da API é guardada em disco pela chave da
+  requisição (hash de modelo + mensagens + parâmetros, ver
+  core.llm_cache.gerar_chave_llm), com a latência e o uso de tokens
+- modo 'reproduzir': as respostas saem do disco, sem rede, com latência
+  simulada opcional (fração da latência gravada)
+
+A troca acontece só no ponto em que ``client.chat.completions.create``
+seria chamado: limitador, coalescência, retries, formatação, streaming e
+métricas rodam como em produção, o que permite perfilar e fazer testes de
+carga numa máquina sem rede. Requisições sem gravação falham na entrada
+de chamar_gpt / chamar_gpt_stream / chamar_gpt_async, como um erro da API.
+
+Configuração (core.config.Config / variáveis de ambiente):
+- LLM_CASSETTE_MODE: '' (desligado), 'gravar' ou 'reproduzir'
+- LLM_CASSETTE_PATH: arquivo SQLite dos cassetes
+- LLM_CASSETTE_LATENCY: fator da latência gravada na reprodução (0 = instantâneo)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional
+
+import core.config
+from core.cache_store import CacheSQLite
+from core.gpt_metricas import extrair_uso
+from core.llm_cache import gerar_chave_llm
+
+logger = logging.getLogger(__name__)
+
+MODO_DESLIGADO = ""
+MODO_GRAVAR = "gravar"
+MODO_REPRODUZIR = "reproduzir"
+MODOS = (MODO_DESLIGADO, MODO_GRAVAR, MODO_REPRODUZIR)
+
+_cassete = None
+_lock_cassete = threading.Lock()
+
+
+class CasseteLLM:
+    """
+    Armazena e devolve respostas da API por chave de requisição.
+
+    Args:
+        caminho: Arquivo SQLite dos cassetes
+        modo: MODO_GRAVAR ou MODO_REPRODUZIR
+        fator_latencia: Fração da latência gravada simulada na reprodução
+
+    Examples:
+        >>> cassete = CasseteLLM("cache/cassetes_llm.sqlite", MODO_REPRODUZIR, fator_latencia=1.0)
+        >>> response = cassete.criar_resposta(client, params)
+    """
+
+    def __init__(self, caminho, modo: str, fator_latencia: float = 0.0):
+        self.modo = modo
+        self.fator_latencia = fator_latencia
+        self._armazenamento = CacheSQLite(caminho, nome="cassete_llm")
+        self._lock = threading.Lock()
+        self._stats = {'gravadas': 0, 'reproduzidas': 0, 'ausentes': 0}
+
+    def _contar(self, campo: str) -> None:
+        with self._lock:
+            self._stats[campo] += 1
+
+    @property
+    def reproduzindo(self) -> bool:
+        return self.modo == MODO_REPRODUZIR
+
+    def gravar(self, params: Dict[str, Any], texto: str, latencia: float, usage: Any = None) -> None:
+        """Guarda a resposta bruta da API (antes de corrigir_formatacao)."""
+        self._armazenamento.definir(gerar_chave_llm(params), {
+            'modelo': params.get('model'),
+            'texto': texto,
+            'latencia': round(latencia, 4),
+            'uso': extrair_uso(usage),
+        })
+        self._contar('gravadas')
+
+    def obter(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Gravação da requisição ou None."""
+        return self._armazenamento.obter(gerar_chave_llm(params))
+
+    def gravacao_ausente(self, params: Dict[str, Any]) -> bool:
+        """True se está reproduzindo e a requisição não tem gravação."""
+        if not self.reproduzindo or gerar_chave_llm(params) in self._armazenamento:
+            return False
+        self._contar('ausentes')
+        logger.error(f"Cassete LLM sem gravação para a requisição ({params.get('model')}, "
+                     f"{len(params.get('messages', []))} mensagens) — grave com LLM_CASSETTE_MODE=gravar")
+        return True
+
+    def _latencia(self, gravacao: Dict[str, Any]) -> float:
+        return gravacao.get('latencia', 0.0) * self.fator_latencia
+
+    def criar_resposta(self, client, params: Dict[str, Any]) -> Any:
+        """Substituto de ``client.chat.completions.create(**params)``."""
+        if self.reproduzindo:
+            gravacao = self.obter(params)
+            self._contar('reproduzidas')
+            if params.get('stream'):
+                return _chunks_reproduzidos(gravacao, self._latencia(gravacao))
+            time.sleep(self._latencia(gravacao))
+            return _resposta_reproduzida(gravacao)
+
+        inicio = time.perf_counter()
+        response = client.chat.completions.create(**params)
+        if params.get('stream'):
+            return self._gravar_stream(response, params, inicio)
+        self.gravar(params, response.choices[0].message.content, time.perf_counter() - inicio,
+                    getattr(response, 'usage', None))
+        return response
+
+    async def criar_resposta_async(self, client, params: Dict[str, Any]) -> Any:
+        """Substituto de ``await client.chat.completions.create(**params)`` (sem streaming)."""
+        if self.reproduzindo:
+            gravacao = self.obter(params)
+            self._contar('reproduzidas')
+            await asyncio.sleep(self._latencia(gravacao))
+            return _resposta_reproduzida(gravacao)
+
+        inicio = time.perf_counter()
+        response = await client.chat.completions.create(**params)
+        self.gravar(params, response.choices[0].message.content, time.perf_counter() - inicio,
+                    getattr(response, 'usage', None))
+        return response
+
+    def _gravar_stream(self, stream, params: Dict[str, Any], inicio: float) -> Iterator[Any]:
+        """Repassa os chunks e grava a resposta completa quando o stream termina."""
+        partes = []
+        uso = None
+        for chunk in stream:
+            uso = getattr(chunk, 'usage', None) or uso
+            if chunk.choices and chunk.choices[0].delta.content:
+                partes.append(chunk.choices[0].delta.content)
+            yield chunk
+        self.gravar(params, "".join(partes), time.perf_counter() - inicio, uso)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Respostas gravadas/reproduzidas/ausentes e itens no arquivo."""
+        with self._lock:
+            stats = dict(self._stats)
+        return {**stats, 'modo': self.modo, 'itens': len(self._armazenamento)}
+
+    def fechar(self) -> None:
+        self._armazenamento.fechar()
+
+
+def _uso_reproduzido(gravacao: Dict[str, Any]) -> SimpleNamespace:
+    """``response.usage`` equivalente ao gravado."""
+    uso = gravacao.get('uso') or {}
+    return SimpleNamespace(
+        prompt_tokens=uso.get('tokens_prompt', 0),
+        completion_tokens=uso.get('tokens_resposta', 0),
+        prompt_tokens_details=SimpleNamespace(cached_tokens=uso.get('tokens_cache', 0)),
+    )
+
+
+def _resposta_reproduzida(gravacao: Dict[str, Any]) -> SimpleNamespace:
+    """Objeto com a forma de ``ChatCompletion`` usada por chamar_gpt."""
+    mensagem = SimpleNamespace(content=gravacao['texto'], role='assistant')
+    return SimpleNamespace(
+        model=gravacao.get('modelo'),
+        choices=[SimpleNamespace(index=0, message=mensagem, finish_reason='stop')],
+        usage=_uso_reproduzido(gravacao),
+    )
+
+
+def _chunk(conteudo: Optional[str], usage: Any = None) -> SimpleNamespace:
+    escolhas = [SimpleNamespace(index=0, delta=SimpleNamespace(content=conteudo))] if conteudo else []
+    return SimpleNamespace(choices=escolhas, usage=usage)
+
+
+def _chunks_reproduzidos(gravacao: Dict[str, Any], latencia: float) -> Iterator[SimpleNamespace]:
+    """Stream linha a linha, com a latência distribuída entre os trechos."""
+    linhas = gravacao['texto'].splitlines(keepends=True) or [""]
+    pausa = latencia / len(linhas)
+    for linha in linhas:
+        time.sleep(pausa)
+        yield _chunk(linha)
+    yield _chunk(None, _uso_reproduzido(gravacao))
+
+
+def obter_cassete() -> Optional[CasseteLLM]:
+    """
+    Retorna o cassete do processo (criado na primeira chamada).
+
+    Returns:
+        CasseteLLM ou None se LLM_CASSETTE_MODE estiver desligado
+    """
+    global _cassete
+
+    cfg = core.config.config
+    if cfg.LLM_CASSETTE_MODE == MODO_DESLIGADO:
+        return None
+
+    if _cassete is None:
+        with _lock_cassete:
+            if _cassete is None:
+                _cassete = CasseteLLM(cfg.LLM_CASSETTE_PATH, cfg.LLM_CASSETTE_MODE, cfg.LLM_CASSETTE_LATENCY)
+                logger.info(f"Cassetes LLM em modo '{cfg.LLM_CASSETTE_MODE}' ({cfg.LLM_CASSETTE_PATH})")
+    return _cassete
+
+
+def resetar_cassete() -> None:
+    """Fecha e descarta o cassete do processo (o próximo uso recria com a config atual)."""
+    global _cassete
+    with _lock_cassete:
+        if _cassete is not None:
+            _cassete.fechar()
+        _cassete = None
+
+
+def criar_resposta(client, params: Dict[str, Any]) -> Any:
+    """``client.chat.completions.create(**params)`` passando pelo cassete, se ligado."""
+    cassete = obter_cassete()
+    if cassete is None:
+        return client.chat.completions.create(**params)
+    return cassete.criar_resposta(client, params)
+
+
+async def criar_resposta_async(client, params: Dict[str, Any]) -> Any:
+    """Versão assíncrona de criar_resposta."""
+    cassete = obter_cassete()
+    if cassete is None:
+        return await client.chat.completions.create(**params)
+    return await cassete.criar_resposta_async(client, params)
+
+
+def gravacao_ausente(params: Dict[str, Any]) -> bool:
+    """True se o cassete está reproduzindo e não tem a requisição."""
+    cassete = obter_cassete()
+    return cassete is not None and cassete.gravacao_ausente(params)
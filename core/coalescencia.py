@@ -0,0 +1,116 @@
+"""
+Coalescência de chamadas idênticas em andamento ("single-flight").
+
+Quando várias sessões pedem a mesma JD, as mesmas variações de cargo ou a
+mesma análise ao mesmo tempo (ex.: logo após um workshop em que todos
+miram o mesmo cargo), cada uma dispararia a sua chamada GPT. O cache de
+respostas só ajuda depois que a primeira termina.
+
+``CoalescedorChamadas`` garante que, para uma mesma chave (hash de modelo +
+mensagens + parâmetros, ver core.llm_cache.gerar_chave_llm), só uma chamada
+fique em andamento: quem chega enquanto ela roda aguarda e recebe o mesmo
+resultado. Nada é guardado depois que a chamada termina — isso é papel do
+cache.
+
+Configuração (core.config.Config / variáveis de ambiente):
+- GPT_SINGLE_FLIGHT_ENABLED: liga a coalescência em chamar_gpt (padrão: ligada)
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _ChamadaEmAndamento:
+    """Chamada em andamento: evento de término, resultado/erro e nº de seguidores."""
+
+    __slots__ = ('concluida', 'resultado', 'erro', 'seguidores')
+
+    def __init__(self):
+        self.concluida = threading.Event()
+        self.resultado = None
+        self.erro: Optional[BaseException] = None
+        self.seguidores = 0
+
+
+class CoalescedorChamadas:
+    """
+    Agrupa chamadas concorrentes com a mesma chave em uma única execução.
+
+    Examples:
+        >>> coalescedor = CoalescedorChamadas()
+        >>> resultado, compartilhado = coalescedor.executar("chave", lambda: chamar_api())
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._em_andamento: Dict[str, _ChamadaEmAndamento] = {}
+        self._stats = {'execucoes': 0, 'compartilhadas': 0}
+
+    def executar(self, chave: str, funcao: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Executa ``funcao`` ou aguarda a execução idêntica já em andamento.
+
+        Exceções da execução líder são propagadas para todos que a aguardam.
+
+        Args:
+            chave: Identidade da chamada
+            funcao: Chamada sem argumentos (só roda no líder)
+
+        Returns:
+            (resultado, True se o resultado veio de outra execução)
+        """
+        with self._lock:
+            chamada = self._em_andamento.get(chave)
+            lider = chamada is None
+            if lider:
+                chamada = _ChamadaEmAndamento()
+                self._em_andamento[chave] = chamada
+                self._stats['execucoes'] += 1
+            else:
+                chamada.seguidores += 1
+                self._stats['compartilhadas'] += 1
+
+        if not lider:
+            logger.debug(f"Aguardando chamada idêntica em andamento ({chave[:12]}…)")
+            chamada.concluida.wait()
+            if chamada.erro is not None:
+                raise chamada.erro
+            return chamada.resultado, True
+
+        try:
+            chamada.resultado = funcao()
+            return chamada.resultado, False
+        except BaseException as e:
+            chamada.erro = e
+            raise
+        finally:
+            with self._lock:
+                del self._em_andamento[chave]
+            if chamada.seguidores:
+                logger.info(f"Chamada {chave[:12]}… compartilhada com {chamada.seguidores} pedido(s) idêntico(s)")
+            chamada.concluida.set()
+
+    def em_andamento(self) -> int:
+        """Número de chaves com chamada em andamento."""
+        with self._lock:
+            return len(self._em_andamento)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Execuções reais, pedidos atendidos por compartilhamento e taxa de economia."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['em_andamento'] = len(self._em_andamento)
+        total = stats['execucoes'] + stats['compartilhadas']
+        stats['taxa_compartilhada'] = round(stats['compartilhadas'] / total, 4) if total else 0.0
+        return stats
+
+
+_coalescedor = CoalescedorChamadas()
+
+
+def obter_coalescedor() -> CoalescedorChamadas:
+    """Coalescedor do processo, compartilhado por todas as sessões."""
+    return _coalescedor
@@ -5,6 +5,14 @@ from dataclasses import dataclass
 from typing import Optional
 
 
+def _env_bool(nome: str, padrao: bool) -> bool:
+    """Lê uma variável de ambiente booleana ('1', 'true', 'sim', 'on')."""
+    valor = os.environ.get(nome)
+    if valor is None:
+        return padrao
+    return valor.strip().lower() in ("1", "true", "yes", "sim", "on")
+
+
 @dataclass
 class Config:
     """
@@ -19,6 +27,45 @@ class Config:
         MAX_RETRIES: Número máximo de tentativas em caso de erro
         LOG_LEVEL: Nível de logging (DEBUG, INFO, WARNING, ERROR)
         MAX_PDF_SIZE_MB: Tamanho máximo de PDF em MB
+        ATS_ENGINE_DIR: Diretório dos motores TF-IDF pré-treinados do ATS
+        ATS_CACHE_ENABLED: Liga o cache persistente de resultados do ATS
+        ATS_CACHE_PATH: Arquivo SQLite do cache de resultados do ATS
+        ATS_CACHE_TTL: Validade (segundos) dos resultados em cache
+        ATS_CACHE_MAX_ITEMS: Número máximo de resultados em cache (LRU)
+        ATS_DEADLINE: Prazo total (segundos) da análise LLM + breakdown do ATS
+        JD_LIBRARY_ENABLED: Liga a biblioteca persistente de Job Descriptions
+        JD_LIBRARY_PATH: Arquivo SQLite da biblioteca de Job Descriptions
+        JD_LIBRARY_TTL: Validade (segundos) das JDs e variações de cargo
+        JD_LIBRARY_MAX_ITEMS: Número máximo de itens na biblioteca (LRU)
+        EXTRACTION_CACHE_ENABLED: Liga o cache persistente de textos extraídos de arquivos
+        EXTRACTION_CACHE_PATH: Arquivo SQLite do cache de textos extraídos
+        EXTRACTION_CACHE_TTL: Validade (segundos) das extrações em cache
+        EXTRACTION_CACHE_MAX_ITEMS: Número máximo de extrações em cache (LRU)
+        LLM_CACHE_ENABLED: Liga o cache de respostas determinísticas do GPT (opt-in)
+        LLM_CACHE_BACKEND: Backend do cache de respostas ('memoria' ou 'sqlite')
+        LLM_CACHE_PATH: Arquivo SQLite do cache de respostas (backend 'sqlite')
+        LLM_CACHE_TTL: Validade (segundos) das respostas em cache
+        LLM_CACHE_MAX_ITEMS: Número máximo de respostas em cache (LRU)
+        LLM_CACHE_MAX_TEMPERATURE: Temperatura máxima para uma chamada ser cacheável
+        CHAT_CONTEXT_MAX_TOKENS: Orçamento de tokens de entrada por chamada do chat
+        CHAT_CONTEXT_RECENT_MESSAGES: Mensagens recentes do chat enviadas na íntegra
+        GPT_METRICS_PORT: Porta do endpoint local de métricas GPT (0 = desligado)
+        GPT_RATE_LIMIT_RPM: Requisições GPT por minuto no processo (0 = sem limite)
+        GPT_RATE_LIMIT_TPM: Tokens GPT por minuto no processo (0 = sem limite)
+        GPT_RATE_LIMIT_MAX_WAIT: Espera máxima (segundos) na fila do limitador
+        GPT_SINGLE_FLIGHT_ENABLED: Chamadas GPT idênticas simultâneas compartilham uma só requisição
+        MODEL_FAST: Modelo das rotas rápidas (extração de cargo, variações, perguntas)
+        MODEL_ROUTES: Rotas de modelo extras/sobrescritas ('rota=modelo:max_tokens,...')
+        GPT_HTTP_MAX_CONNECTIONS: Conexões simultâneas no pool HTTP compartilhado da OpenAI
+        GPT_HTTP_MAX_KEEPALIVE: Conexões ociosas mantidas abertas no pool HTTP
+        GPT_HTTP_KEEPALIVE_EXPIRY: Segundos até fechar uma conexão ociosa do pool HTTP
+        LLM_CASSETTE_MODE: Cassetes de respostas da API ('' desligado, 'gravar' ou 'reproduzir')
+        LLM_CASSETTE_PATH: Arquivo SQLite dos cassetes de respostas
+        LLM_CASSETTE_LATENCY: Fração da latência gravada simulada ao reproduzir (0 = instantâneo)
+        PDF_MAX_PAGES: Máximo de páginas lidas de um PDF (as excedentes são ignoradas)
+        PDF_PAGE_TIMEOUT: Segundos de extração por página antes de desistir dela
+        PDF_WORKERS: Processos de extração de páginas de PDF (0 = sempre em série)
+        PDF_PARALLEL_MIN_PAGES: Páginas a partir das quais a extração usa o pool de processos
     """
     OPENAI_API_KEY: Optional[str] = None
     MODEL: str = "gpt-4o"
@@ -28,6 +75,45 @@ class Config:
     MAX_RETRIES: int = 3
     LOG_LEVEL: str = "INFO"
     MAX_PDF_SIZE_MB: int = 10
+    ATS_ENGINE_DIR: str = "data/ats_engine"
+    ATS_CACHE_ENABLED: bool = True
+    ATS_CACHE_PATH: str = "cache/ats_cache.sqlite"
+    ATS_CACHE_TTL: int = 7 * 24 * 3600
+    ATS_CACHE_MAX_ITEMS: int = 5000
+    ATS_DEADLINE: float = 60.0
+    JD_LIBRARY_ENABLED: bool = True
+    JD_LIBRARY_PATH: str = "cache/jd_library.sqlite"
+    JD_LIBRARY_TTL: int = 30 * 24 * 3600
+    JD_LIBRARY_MAX_ITEMS: int = 2000
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_PATH: str = "cache/extracao_cache.sqlite"
+    EXTRACTION_CACHE_TTL: int = 30 * 24 * 3600
+    EXTRACTION_CACHE_MAX_ITEMS: int = 2000
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_BACKEND: str = "memoria"
+    LLM_CACHE_PATH: str = "cache/llm_cache.sqlite"
+    LLM_CACHE_TTL: int = 24 * 3600
+    LLM_CACHE_MAX_ITEMS: int = 1000
+    LLM_CACHE_MAX_TEMPERATURE: float = 0.3
+    CHAT_CONTEXT_MAX_TOKENS: int = 12000
+    CHAT_CONTEXT_RECENT_MESSAGES: int = 6
+    GPT_METRICS_PORT: int = 0
+    GPT_RATE_LIMIT_RPM: int = 0
+    GPT_RATE_LIMIT_TPM: int = 0
+    GPT_RATE_LIMIT_MAX_WAIT: float = 30.0
+    GPT_SINGLE_FLIGHT_ENABLED: bool = True
+    MODEL_FAST: str = "gpt-4o-mini"
+    MODEL_ROUTES: str = ""
+    GPT_HTTP_MAX_CONNECTIONS: int = 100
+    GPT_HTTP_MAX_KEEPALIVE: int = 20
+    GPT_HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    LLM_CASSETTE_MODE: str = ""
+    LLM_CASSETTE_PATH: str = "cache/cassetes_llm.sqlite"
+    LLM_CASSETTE_LATENCY: float = 0.0
+    PDF_MAX_PAGES: int = 40
+    PDF_PAGE_TIMEOUT: float = 15.0
+    PDF_WORKERS: int = 4
+    PDF_PARALLEL_MIN_PAGES: int = 4
     
     @classmethod
     def from_env(cls) -> "Config":
@@ -45,7 +131,46 @@ class Config:
             TIMEOUT=int(os.environ.get("OPENAI_TIMEOUT", "30")),
             MAX_RETRIES=int(os.environ.get("OPENAI_MAX_RETRIES", "3")),
             LOG_LEVEL=os.environ.get("LOG_LEVEL", "INFO"),
-            MAX_PDF_SIZE_MB=int(os.environ.get("MAX_PDF_SIZE_MB", "10"))
+            MAX_PDF_SIZE_MB=int(os.environ.get("MAX_PDF_SIZE_MB", "10")),
+            ATS_ENGINE_DIR=os.environ.get("ATS_ENGINE_DIR", "data/ats_engine"),
+            ATS_CACHE_ENABLED=_env_bool("ATS_CACHE_ENABLED", True),
+            ATS_CACHE_PATH=os.environ.get("ATS_CACHE_PATH", "cache/ats_cache.sqlite"),
+            ATS_CACHE_TTL=int(os.environ.get("ATS_CACHE_TTL", str(7 * 24 * 3600))),
+            ATS_CACHE_MAX_ITEMS=int(os.environ.get("ATS_CACHE_MAX_ITEMS", "5000")),
+            ATS_DEADLINE=float(os.environ.get("ATS_DEADLINE", "60")),
+            JD_LIBRARY_ENABLED=_env_bool("JD_LIBRARY_ENABLED", True),
+            JD_LIBRARY_PATH=os.environ.get("JD_LIBRARY_PATH", "cache/jd_library.sqlite"),
+            JD_LIBRARY_TTL=int(os.environ.get("JD_LIBRARY_TTL", str(30 * 24 * 3600))),
+            JD_LIBRARY_MAX_ITEMS=int(os.environ.get("JD_LIBRARY_MAX_ITEMS", "2000")),
+            EXTRACTION_CACHE_ENABLED=_env_bool("EXTRACTION_CACHE_ENABLED", True),
+            EXTRACTION_CACHE_PATH=os.environ.get("EXTRACTION_CACHE_PATH", "cache/extracao_cache.sqlite"),
+            EXTRACTION_CACHE_TTL=int(os.environ.get("EXTRACTION_CACHE_TTL", str(30 * 24 * 3600))),
+            EXTRACTION_CACHE_MAX_ITEMS=int(os.environ.get("EXTRACTION_CACHE_MAX_ITEMS", "2000")),
+            LLM_CACHE_ENABLED=_env_bool("LLM_CACHE_ENABLED", False),
+            LLM_CACHE_BACKEND=os.environ.get("LLM_CACHE_BACKEND", "memoria"),
+            LLM_CACHE_PATH=os.environ.get("LLM_CACHE_PATH", "cache/llm_cache.sqlite"),
+            LLM_CACHE_TTL=int(os.environ.get("LLM_CACHE_TTL", str(24 * 3600))),
+            LLM_CACHE_MAX_ITEMS=int(os.environ.get("LLM_CACHE_MAX_ITEMS", "1000")),
+            LLM_CACHE_MAX_TEMPERATURE=float(os.environ.get("LLM_CACHE_MAX_TEMPERATURE", "0.3")),
+            CHAT_CONTEXT_MAX_TOKENS=int(os.environ.get("CHAT_CONTEXT_MAX_TOKENS", "12000")),
+            CHAT_CONTEXT_RECENT_MESSAGES=int(os.environ.get("CHAT_CONTEXT_RECENT_MESSAGES", "6")),
+            GPT_METRICS_PORT=int(os.environ.get("GPT_METRICS_PORT", "0")),
+            GPT_RATE_LIMIT_RPM=int(os.environ.get("GPT_RATE_LIMIT_RPM", "0")),
+            GPT_RATE_LIMIT_TPM=int(os.environ.get("GPT_RATE_LIMIT_TPM", "0")),
+            GPT_RATE_LIMIT_MAX_WAIT=float(os.environ.get("GPT_RATE_LIMIT_MAX_WAIT", "30")),
+            GPT_SINGLE_FLIGHT_ENABLED=_env_bool("GPT_SINGLE_FLIGHT_ENABLED", True),
+            MODEL_FAST=os.environ.get("OPENAI_MODEL_FAST", "gpt-4o-mini"),
+            MODEL_ROUTES=os.environ.get("OPENAI_MODEL_ROUTES", ""),
+            GPT_HTTP_MAX_CONNECTIONS=int(os.environ.get("GPT_HTTP_MAX_CONNECTIONS", "100")),
+            GPT_HTTP_MAX_KEEPALIVE=int(os.environ.get("GPT_HTTP_MAX_KEEPALIVE", "20")),
+            GPT_HTTP_KEEPALIVE_EXPIRY=float(os.environ.get("GPT_HTTP_KEEPALIVE_EXPIRY", "60")),
+            LLM_CASSETTE_MODE=os.environ.get("LLM_CASSETTE_MODE", ""),
+            LLM_CASSETTE_PATH=os.environ.get("LLM_CASSETTE_PATH", "cache/cassetes_llm.sqlite"),
+            LLM_CASSETTE_LATENCY=float(os.environ.get("LLM_CASSETTE_LATENCY", "0")),
+            PDF_MAX_PAGES=int(os.environ.get("PDF_MAX_PAGES", "40")),
+            PDF_PAGE_TIMEOUT=float(os.environ.get("PDF_PAGE_TIMEOUT", "15")),
+            PDF_WORKERS=int(os.environ.get("PDF_WORKERS", "4")),
+            PDF_PARALLEL_MIN_PAGES=int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "4"))
         )
     
     def validate(self) -> None:
@@ -69,6 +194,60 @@ class Config:
         
         if self.MAX_PDF_SIZE_MB < 1 or self.MAX_PDF_SIZE_MB > 100:
             raise ValueError(f"MAX_PDF_SIZE_MB deve estar entre 1 e 100, recebido: {self.MAX_PDF_SIZE_MB}")
+        
+        if self.ATS_CACHE_TTL < 0 or self.ATS_CACHE_MAX_ITEMS < 0:
+            raise ValueError("ATS_CACHE_TTL e ATS_CACHE_MAX_ITEMS não podem ser negativos")
+        
+        if self.ATS_DEADLINE <= 0:
+            raise ValueError(f"ATS_DEADLINE deve ser maior que 0, recebido: {self.ATS_DEADLINE}")
+        
+        if self.JD_LIBRARY_TTL < 0 or self.JD_LIBRARY_MAX_ITEMS < 0:
+            raise ValueError("JD_LIBRARY_TTL e JD_LIBRARY_MAX_ITEMS não podem ser negativos")
+        
+        if self.EXTRACTION_CACHE_TTL < 0 or self.EXTRACTION_CACHE_MAX_ITEMS < 0:
+            raise ValueError("EXTRACTION_CACHE_TTL e EXTRACTION_CACHE_MAX_ITEMS não podem ser negativos")
+        
+        if self.LLM_CACHE_BACKEND not in ("memoria", "sqlite"):
+            raise ValueError(f"LLM_CACHE_BACKEND deve ser 'memoria' ou 'sqlite', recebido: {self.LLM_CACHE_BACKEND}")
+        
+        if self.LLM_CACHE_TTL < 0 or self.LLM_CACHE_MAX_ITEMS < 0:
+            raise ValueError("LLM_CACHE_TTL e LLM_CACHE_MAX_ITEMS não podem ser negativos")
+        
+        if self.CHAT_CONTEXT_MAX_TOKENS < 1 or self.CHAT_CONTEXT_RECENT_MESSAGES < 1:
+            raise ValueError("CHAT_CONTEXT_MAX_TOKENS e CHAT_CONTEXT_RECENT_MESSAGES devem ser maiores que 0")
+        
+        if self.GPT_METRICS_PORT < 0 or self.GPT_METRICS_PORT > 65535:
+            raise ValueError(f"GPT_METRICS_PORT deve estar entre 0 e 65535, recebido: {self.GPT_METRICS_PORT}")
+        
+        if self.GPT_RATE_LIMIT_RPM < 0 or self.GPT_RATE_LIMIT_TPM < 0:
+            raise ValueError("GPT_RATE_LIMIT_RPM e GPT_RATE_LIMIT_TPM não podem ser negativos")
+        
+        if self.GPT_RATE_LIMIT_MAX_WAIT <= 0:
+            raise ValueError(f"GPT_RATE_LIMIT_MAX_WAIT deve ser maior que 0, recebido: {self.GPT_RATE_LIMIT_MAX_WAIT}")
+        
+        from core.roteamento_modelos import interpretar_rotas
+        interpretar_rotas(self.MODEL_ROUTES)
+        
+        if self.GPT_HTTP_MAX_CONNECTIONS < 1 or self.GPT_HTTP_MAX_KEEPALIVE < 0:
+            raise ValueError("GPT_HTTP_MAX_CONNECTIONS deve ser maior que 0 e GPT_HTTP_MAX_KEEPALIVE não pode ser negativo")
+        
+        if self.GPT_HTTP_KEEPALIVE_EXPIRY < 0:
+            raise ValueError(f"GPT_HTTP_KEEPALIVE_EXPIRY não pode ser negativo, recebido: {self.GPT_HTTP_KEEPALIVE_EXPIRY}")
+        
+        if self.LLM_CASSETTE_MODE not in ("", "gravar", "reproduzir"):
+            raise ValueError(f"LLM_CASSETTE_MODE deve ser '', 'gravar' ou 'reproduzir', recebido: {self.LLM_CASSETTE_MODE}")
+        
+        if self.LLM_CASSETTE_LATENCY < 0:
+            raise ValueError(f"LLM_CASSETTE_LATENCY não pode ser negativo, recebido: {self.LLM_CASSETTE_LATENCY}")
+        
+        if self.PDF_MAX_PAGES < 1:
+            raise ValueError(f"PDF_MAX_PAGES deve ser maior que 0, recebido: {self.PDF_MAX_PAGES}")
+        
+        if self.PDF_PAGE_TIMEOUT <= 0:
+            raise ValueError(f"PDF_PAGE_TIMEOUT deve ser maior que 0, recebido: {self.PDF_PAGE_TIMEOUT}")
+        
+        if self.PDF_WORKERS < 0 or self.PDF_PARALLEL_MIN_PAGES < 1:
+            raise ValueError("PDF_WORKERS não pode ser negativo e PDF_PARALLEL_MIN_PAGES deve ser maior que 0")
 
 
 # Instância global de configuração
@@ -12,6 +12,7 @@ import logging
 import streamlit as st
 from typing import Optional
 from core.utils import chamar_gpt
+from core.limitador_taxa import PRIORIDADE_SEGUNDO_PLANO, prioridade_gpt
 
 logger = logging.getLogger(__name__)
 
@@ -194,4 +195,5 @@ def inicializar_cache_cv_async(client):
     """
     if 'cv_resumo_cache' not in st.session_state:
         logger.info("Inicializando cache do CV em background")
-        obter_resumo_cv_cached(client, force_regenerate=True)
+        with prioridade_gpt(PRIORIDADE_SEGUNDO_PLANO):
+            obter_resumo_cv_cached(client, force_regenerate=True)
@@ -0,0 +1,298 @@
+"""
+Índice de CVs para busca pelo lado do recrutador (JD → top-k CVs).
+
+O caminho do candidato (calcular_score_ats) compara UM CV com UMA vaga.
+Para ranquear milhares de CVs armazenados contra uma vaga, chamar
+``_analisar_compatibilidade`` por CV é lento demais (um fit por par).
+
+Este índice guarda os CVs já vetorizados em uma matriz esparsa CSR usando o
+motor TF-IDF pré-treinado (core.ats_engine), com o mesmo pipeline
+``_limpar_texto`` + ``STOPWORDS_PT_EN`` do ATS Scorer. Uma busca é:
+- 1 ``transform`` da vaga (sem refit)
+- 1 produto matriz esparsa × vetor para todas as similaridades
+- ``argpartition`` para o top-k
+- interseção/diferença de índices CSR para termos encontrados e faltantes
+
+Suporta inclusão e remoção incrementais e persistência em disco (joblib).
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+from scipy import sparse
+
+from core.ats_engine import MotorTfidf, construir_motor, obter_motor
+from core.ats_scorer import _limpar_texto, _is_generic_term, _escalar_score
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato do índice salvo em disco
+VERSAO_INDICE = "2"
+
+# Quantidade máxima de termos encontrados/faltantes retornados por CV
+MAX_TERMOS_RESULTADO = 10
+
+# Compacta a matriz quando a proporção de CVs removidos passa deste limite
+PROPORCAO_COMPACTACAO = 0.25
+
+
+class IndiceCVs:
+    """
+    Índice incremental de CVs vetorizados com um motor TF-IDF fixo.
+
+    Examples:
+        >>> indice = IndiceCVs.construir({'cv1': texto1, 'cv2': texto2})
+        >>> indice.buscar(texto_vaga, k=5)
+        [{'cv_id': 'cv2', 'score': 71.3, ...}, ...]
+    """
+
+    def __init__(self, motor: MotorTfidf):
+        self.motor = motor
+        self._n_termos = len(motor.feature_names)
+        self._ids: List[str] = []
+        self._posicoes: Dict[str, int] = {}
+        self._matriz = sparse.csr_matrix((0, self._n_termos), dtype=np.float64)
+        self._ativos = np.zeros(0, dtype=bool)
+        self._pendentes: List[sparse.csr_matrix] = []
+        self._lock = threading.RLock()
+
+    @classmethod
+    def construir(
+        cls,
+        cvs: Dict[str, str],
+        motor: Optional[MotorTfidf] = None,
+        area: Optional[str] = None
+    ) -> "IndiceCVs":
+        """
+        Cria um índice a partir de um dicionário {cv_id: texto}.
+
+        Usa o motor informado, ou o motor pré-treinado da área. Se nenhum
+        motor existir em disco, treina um a partir dos próprios CVs.
+
+        Args:
+            cvs: CVs a indexar
+            motor: Motor TF-IDF (opcional)
+            area: Área para buscar o motor pré-treinado (opcional)
+
+        Returns:
+            IndiceCVs com todos os CVs adicionados
+        """
+        motor = motor or obter_motor(area)
+        if motor is None:
+            logger.info("Nenhum motor TF-IDF em disco — treinando a partir dos CVs indexados")
+            motor = construir_motor(cvs.values(), area=area or 'cvs')
+
+        indice = cls(motor)
+        indice.adicionar_varios(cvs)
+        return indice
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._posicoes)
+
+    def __contains__(self, cv_id: str) -> bool:
+        with self._lock:
+            return cv_id in self._posicoes
+
+    def adicionar(self, cv_id: str, texto: str) -> None:
+        """
+        Adiciona (ou substitui) um CV no índice.
+
+        Args:
+            cv_id: Identificador único do CV
+            texto: Texto completo do CV
+        """
+        self.adicionar_varios({cv_id: texto})
+
+    def adicionar_varios(self, cvs: Dict[str, str]) -> None:
+        """Adiciona (ou substitui) vários CVs com um único transform."""
+        if not cvs:
+            return
+
+        ids = list(cvs.keys())
+        linhas = self.motor.transformar([_limpar_texto(t) for t in cvs.values()]).tocsr()
+
+        with self._lock:
+            for cv_id in ids:
+                self._desativar(cv_id)
+            inicio = len(self._ids)
+            for deslocamento, cv_id in enumerate(ids):
+                self._ids.append(cv_id)
+                self._posicoes[cv_id] = inicio + deslocamento
+            self._pendentes.append(linhas)
+            self._ativos = np.concatenate([self._ativos, np.ones(len(ids), dtype=bool)])
+
+        logger.debug(f"{len(ids)} CV(s) adicionados ao índice (total: {len(self)})")
+
+    def remover(self, cv_id: str) -> bool:
+        """
+        Remove um CV do índice.
+
+        Args:
+            cv_id: Identificador do CV
+
+        Returns:
+            True se o CV existia e foi removido
+        """
+        with self._lock:
+            removido = self._desativar(cv_id)
+        if removido:
+            logger.debug(f"CV '{cv_id}' removido do índice")
+        return removido
+
+    def _desativar(self, cv_id: str) -> bool:
+        """Marca a linha do CV como removida (compactada depois)."""
+        posicao = self._posicoes.pop(cv_id, None)
+        if posicao is None:
+            return False
+        self._ativos[posicao] = False
+        return True
+
+    def _consolidar(self) -> None:
+        """Empilha as linhas pendentes e compacta linhas removidas se necessário."""
+        if self._pendentes:
+            self._matriz = sparse.vstack([self._matriz] + self._pendentes, format='csr')
+            self._pendentes = []
+
+        total = len(self._ids)
+        removidos = total - int(self._ativos.sum())
+        if removidos and removidos >= PROPORCAO_COMPACTACAO * total:
+            manter = np.flatnonzero(self._ativos)
+            self._matriz = self._matriz[manter]
+            self._ids = [self._ids[i] for i in manter]
+            self._posicoes = {cv_id: i for i, cv_id in enumerate(self._ids)}
+            self._ativos = np.ones(len(self._ids), dtype=bool)
+            logger.debug(f"Índice compactado: {removidos} linhas removidas")
+
+    def buscar(self, texto_vaga: str, k: int = 10) -> List[Dict]:
+        """
+        Retorna os k CVs mais aderentes à vaga.
+
+        Args:
+            texto_vaga: Texto da Job Description
+            k: Quantidade de CVs a retornar
+
+        Returns:
+            Lista ordenada por similaridade (desc) de dicts com cv_id, score
+            (escala do ATS, 0-95), similaridade, termos_encontrados e
+            termos_faltantes (ordenados pelo peso na vaga)
+        """
+        consulta = self.motor.transformar([_limpar_texto(texto_vaga)]).tocsr()
+        if consulta.nnz == 0 or k <= 0:
+            return []
+
+        with self._lock:
+            self._consolidar()
+            if not self._posicoes:
+                return []
+
+            similaridades = (self._matriz @ consulta.T).toarray().ravel()
+            similaridades[~self._ativos] = 0.0
+            candidatos = np.flatnonzero(similaridades > 0)
+            if candidatos.size == 0:
+                return []
+
+            k = min(k, candidatos.size)
+            top = candidatos[np.argpartition(-similaridades[candidatos], k - 1)[:k]]
+            top = top[np.argsort(-similaridades[top], kind='stable')]
+
+            termos_vaga = consulta.indices[np.argsort(-consulta.data, kind='stable')]
+            resultados = []
+            for posicao in top:
+                linha = self._matriz[posicao]
+                presentes = np.isin(termos_vaga, linha.indices, assume_unique=True)
+                similaridade = float(similaridades[posicao])
+                resultados.append({
+                    'cv_id': self._ids[posicao],
+                    'score': _escalar_score(similaridade),
+                    'similaridade': round(similaridade, 4),
+                    'termos_encontrados': self._nomes_termos(termos_vaga[presentes]),
+                    'termos_faltantes': self._nomes_termos(termos_vaga[~presentes], filtrar_genericos=True),
+                })
+
+        return resultados
+
+    def _nomes_termos(self, indices: np.ndarray, filtrar_genericos: bool = False) -> List[str]:
+        """Converte índices de colunas em termos (na ordem recebida)."""
+        nomes = []
+        for termo in self.motor.feature_names[indices]:
+            if filtrar_genericos and _is_generic_term(termo):
+                continue
+            nomes.append(str(termo))
+            if len(nomes) >= MAX_TERMOS_RESULTADO:
+                break
+        return nomes
+
+    def salvar(self, caminho) -> Path:
+        """
+        Salva o índice em disco (sem o motor, que é salvo à parte).
+
+        Args:
+            caminho: Arquivo de destino (.joblib)
+
+        Returns:
+            Path do arquivo salvo
+        """
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._consolidar()
+            joblib.dump(
+                {
+                    'versao': VERSAO_INDICE,
+                    'area': self.motor.area,
+                    'n_termos': self._n_termos,
+                    'impressao_motor': self.motor.impressao_digital,
+                    'ids': self._ids,
+                    'matriz': self._matriz,
+                    'ativos': self._ativos,
+                },
+                caminho,
+                compress=3
+            )
+        logger.info(f"Índice de CVs salvo em {caminho} ({len(self)} CVs)")
+        return caminho
+
+    @classmethod
+    def carregar(cls, caminho, motor: MotorTfidf) -> Optional["IndiceCVs"]:
+        """
+        Carrega um índice salvo, validando que foi criado com o mesmo vocabulário.
+
+        Compara a impressão digital do motor (vocabulário + IDF), não só o
+        número de termos: um motor retreinado com o mesmo tamanho de
+        vocabulário daria top-k errados silenciosamente.
+
+        Args:
+            caminho: Arquivo .joblib salvo com ``salvar``
+            motor: Motor TF-IDF usado na construção do índice
+
+        Returns:
+            IndiceCVs ou None se o arquivo não existir ou for incompatível
+        """
+        caminho = Path(caminho)
+        if not caminho.is_file():
+            return None
+
+        try:
+            dados = joblib.load(caminho)
+        except Exception as e:
+            logger.error(f"Erro ao carregar índice de CVs de {caminho}: {e}", exc_info=True)
+            return None
+
+        if (not isinstance(dados, dict) or dados.get('versao') != VERSAO_INDICE
+                or dados.get('n_termos') != len(motor.feature_names)
+                or dados.get('impressao_motor') != motor.impressao_digital):
+            logger.warning(f"Índice em {caminho} incompatível com o motor '{motor.area}' — ignorando")
+            return None
+
+        indice = cls(motor)
+        indice._ids = list(dados['ids'])
+        indice._matriz = dados['matriz'].tocsr()
+        indice._ativos = np.asarray(dados['ativos'], dtype=bool)
+        indice._posicoes = {cv_id: i for i, cv_id in enumerate(indice._ids) if indice._ativos[i]}
+        logger.info(f"Índice de CVs carregado de {caminho} ({len(indice)} CVs)")
+        return indice
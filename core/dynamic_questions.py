@@ -13,6 +13,7 @@ import streamlit as st
 from typing import List, Dict, Optional
 from core.cv_cache import get_cv_contexto_para_prompt
 from core.gpt_telemetry import chamar_gpt_com_telemetria
+from core.roteamento_modelos import ROTA_PERGUNTA_DINAMICA
 
 logger = logging.getLogger(__name__)
 
@@ -168,7 +169,8 @@ def gerar_proxima_pergunta_dinamica(
             msgs,
             contexto=contexto_gpt,
             temperature=0.4,  # Alguma criatividade mas controlada
-            seed=None  # Sem seed para variar perguntas
+            seed=None,  # Sem seed para variar perguntas
+            rota=ROTA_PERGUNTA_DINAMICA
         )
         
         if pergunta:
@@ -0,0 +1,211 @@
+"""
+Extração de texto de DOCX em streaming, sem o modelo de objetos do python-docx.
+
+``docx.Document`` carrega e monta o documento inteiro em memória; depois
+o extrator percorria os parágrafos e, separadamente, cada célula de cada
+tabela. ``row.cells`` repete a célula mesclada em todas as posições que
+ela ocupa, então o texto de células mescladas saía duplicado, e a ordem
+do documento se perdia (todas as tabelas iam para o fim).
+
+Aqui o ``word/document.xml`` é lido direto do zip com ``iterparse``:
+
+- o texto sai na ordem do documento (parágrafos e tabelas intercalados)
+- células mescladas aparecem uma vez: ``gridSpan`` já é uma célula só no
+  XML e as continuações de ``vMerge`` são ignoradas
+- o conteúdo de ``mc:Fallback`` (cópia de caixas de texto para leitores
+  antigos) é ignorado para não duplicar o de ``mc:Choice``
+- cada bloco do corpo é descartado após processado: a memória não cresce
+  com o tamanho do documento
+
+O python-docx fica só como fallback para os casos que o leitor não
+entende (sem ``word/document.xml`` no caminho padrão ou XML inválido).
+
+Benchmark contra o python-docx (sem arquivo, gera um CV sintético)::
+
+    python -m core.extracao_docx [cv.docx] --tabelas 300 --repeticoes 5
+"""
+
+import argparse
+import io
+import logging
+import statistics
+import time
+import tracemalloc
+import zipfile
+from typing import Iterator, List, Optional
+from xml.etree.ElementTree import ParseError, iterparse
+
+logger = logging.getLogger(__name__)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+_PARAGRAFO = f"{_W}p"
+_TEXTO = f"{_W}t"
+_TABULACAO = f"{_W}tab"
+_QUEBRAS = (f"{_W}br", f"{_W}cr")
+_CELULA = f"{_W}tc"
+_MESCLA_VERTICAL = f"{_W}vMerge"
+_CORPO = f"{_W}body"
+_FALLBACK = f"{_MC}Fallback"
+_VAL = f"{_W}val"
+
+
+def iterar_textos_docx(dados: bytes) -> Iterator[str]:
+    """
+    Gera o texto de cada parágrafo não vazio, na ordem do documento.
+
+    Parágrafos de células de tabela saem no ponto em que a tabela aparece;
+    continuações de células mescladas verticalmente não geram texto.
+
+    Args:
+        dados: Conteúdo do arquivo .docx
+
+    Yields:
+        Texto de um parágrafo
+
+    Raises:
+        zipfile.BadZipFile: Se o arquivo não for um zip (ex.: .doc antigo)
+        KeyError: Se não houver ``word/document.xml``
+        xml.etree.ElementTree.ParseError: Se o XML for inválido
+    """
+    with zipfile.ZipFile(io.BytesIO(dados)) as pacote, pacote.open("word/document.xml") as xml:
+        paragrafos: List[List[str]] = []
+        celulas_continuadas: List[bool] = []
+        corpo = None
+        ignorando = 0  # profundidade dentro de mc:Fallback
+
+        for evento, elemento in iterparse(xml, events=("start", "end")):
+            tag = elemento.tag
+
+            if evento == "start":
+                if ignorando or tag == _FALLBACK:
+                    ignorando += 1
+                elif tag == _PARAGRAFO:
+                    paragrafos.append([])
+                elif tag == _CELULA:
+                    celulas_continuadas.append(False)
+                elif tag == _MESCLA_VERTICAL and elemento.get(_VAL, "continue") == "continue":
+                    # Continuação de célula mesclada: o texto já saiu na primeira célula
+                    celulas_continuadas[-1] = True
+                elif tag == _CORPO:
+                    corpo = elemento
+                continue
+
+            if ignorando:
+                ignorando -= 1
+            elif tag == _TEXTO and paragrafos:
+                paragrafos[-1].append(elemento.text or "")
+            elif tag == _TABULACAO and paragrafos:
+                paragrafos[-1].append("\t")
+            elif tag in _QUEBRAS and paragrafos:
+                paragrafos[-1].append("\n")
+            elif tag == _CELULA:
+                celulas_continuadas.pop()
+            elif tag == _PARAGRAFO:
+                texto = "".join(paragrafos.pop())
+                elemento.clear()
+                if texto.strip() and not any(celulas_continuadas):
+                    yield texto
+
+            if corpo is not None and len(corpo) > 1:
+                # Libera os blocos do corpo já processados
+                del corpo[:-1]
+
+
+def _textos_python_docx(dados: bytes) -> List[str]:
+    """Fallback: parágrafos e depois as células das tabelas, via python-docx."""
+    import docx
+    documento = docx.Document(io.BytesIO(dados))
+
+    textos = [p.text for p in documento.paragraphs if p.text.strip()]
+    vistas = set()
+    for tabela in documento.tables:
+        for linha in tabela.rows:
+            for celula in linha.cells:
+                # row.cells repete a célula mesclada em cada posição que ocupa
+                if celula._tc not in vistas and celula.text.strip():
+                    vistas.add(celula._tc)
+                    textos.append(celula.text)
+    return textos
+
+
+def extrair_textos_docx(dados: bytes) -> List[str]:
+    """
+    Parágrafos não vazios de um .docx, na ordem do documento.
+
+    Usa o leitor em streaming; cai para o python-docx se o pacote não tiver
+    ``word/document.xml`` no caminho padrão ou se o XML não for entendido.
+
+    Args:
+        dados: Conteúdo do arquivo .docx
+
+    Returns:
+        Lista de textos (vazia se o documento não tiver texto)
+
+    Raises:
+        zipfile.BadZipFile: Se o arquivo não for um zip (ex.: .doc antigo)
+    """
+    try:
+        return list(iterar_textos_docx(dados))
+    except (KeyError, ParseError) as e:
+        logger.info(f"DOCX fora do formato esperado ({e}); usando python-docx")
+        return _textos_python_docx(dados)
+
+
+def _gerar_cv_sintetico(tabelas: int) -> bytes:
+    """CV .docx com uma tabela (com células mescladas) por experiência."""
+    import docx
+    documento = docx.Document()
+    documento.add_heading("Maria Souza — Gerente de Projetos", level=1)
+    for i in range(tabelas):
+        documento.add_paragraph(f"Experiência {i + 1}: Gerente de Projetos na Empresa {i}")
+        tabela = documento.add_table(rows=4, cols=3)
+        tabela.cell(0, 0).merge(tabela.cell(0, 2)).text = f"Empresa {i} | 2015 - 2020"
+        tabela.cell(1, 0).merge(tabela.cell(3, 0)).text = "Responsabilidades"
+        for linha in range(1, 4):
+            tabela.cell(linha, 1).text = f"Liderou {linha * 3} squads com Scrum e Jira"
+            tabela.cell(linha, 2).text = f"Reduziu custos em {linha * 5}% com PMO"
+    saida = io.BytesIO()
+    documento.save(saida)
+    return saida.getvalue()
+
+
+def _medir(funcao, dados: bytes, repeticoes: int):
+    """Tempos de cada repetição e pico de memória alocada (tracemalloc)."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(dados)
+        tempos.append(time.perf_counter() - inicio)
+    tracemalloc.start()
+    funcao(dados)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return resultado, tempos, pico
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada CLI: compara o leitor em streaming com o python-docx."""
+    parser = argparse.ArgumentParser(description="Benchmark da extração de DOCX: streaming vs. python-docx")
+    parser.add_argument('docx', nargs='?', help="Arquivo .docx (padrão: CV sintético)")
+    parser.add_argument('--tabelas', type=int, default=200, help="Tabelas do CV sintético")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.docx:
+        with open(args.docx, "rb") as arquivo:
+            dados = arquivo.read()
+    else:
+        dados = _gerar_cv_sintetico(args.tabelas)
+
+    print(f"{args.docx or f'CV sintético ({args.tabelas} tabelas)'}: {len(dados) / 1024:.0f} KB")
+    for nome, funcao in (('python-docx', _textos_python_docx), ('streaming', extrair_textos_docx)):
+        textos, tempos, pico = _medir(funcao, dados, args.repeticoes)
+        print(f"  {nome:<11} mediana {statistics.median(tempos):.3f}s  mín {min(tempos):.3f}s  "
+              f"pico {pico / 1024 / 1024:.1f} MB  {len(textos)} textos, {sum(map(len, textos))} caracteres")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
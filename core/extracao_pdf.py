@@ -0,0 +1,293 @@
+"""
+Extração de texto de PDF página a página, em paralelo e em streaming.
+
+O ``extrair_texto_pdf`` original rodava o PyPDF2 em série sobre todas as
+páginas, dentro da thread do script Streamlit: CVs longos e exports do
+LinkedIn (10–20 páginas, fontes embutidas) custavam segundos de CPU com a
+tela parada no spinner.
+
+Aqui cada página é extraída num pool de processos (o ``extract_text`` do
+PyPDF2 é Python puro e não libera o GIL, então threads não ajudariam):
+
+- o PDF é gravado uma vez num arquivo temporário; cada processo abre o
+  leitor uma vez por arquivo e extrai as páginas que receber
+- extrair_paginas_pdf gera ``(indice, total, texto)`` à medida que as
+  páginas terminam, para a tela de upload mostrar o progresso
+- cada chamada tem o seu pool: página que passa de PDF_PAGE_TIMEOUT é
+  desistida (texto None, para não entrar no cache de extrações) e só o processo que a extraía é morto; as
+  páginas que estavam no mesmo pool são reenviadas a um pool novo. Outras
+  sessões extraindo ao mesmo tempo não são afetadas
+- só as primeiras PDF_MAX_PAGES páginas são lidas
+- PDFs com menos de PDF_PARALLEL_MIN_PAGES páginas (ou PDF_WORKERS = 0)
+  são extraídos em série no próprio processo, sem o custo de IPC; nesse
+  caminho o timeout por página não se aplica
+
+Configuração (core.config.Config / variáveis de ambiente):
+- PDF_MAX_PAGES: máximo de páginas lidas
+- PDF_PAGE_TIMEOUT: segundos de extração por página
+- PDF_WORKERS: processos do pool (limitado ao número de CPUs)
+- PDF_PARALLEL_MIN_PAGES: páginas a partir das quais o pool é usado
+
+Benchmark contra o caminho em série::
+
+    python -m core.extracao_pdf perfil_linkedin.pdf --repeticoes 5
+"""
+
+import argparse
+import io
+import logging
+import multiprocessing
+import os
+import signal
+import statistics
+import tempfile
+import time
+from concurrent.futures import (FIRST_COMPLETED, BrokenExecutor, CancelledError, Future,
+                                ProcessPoolExecutor, wait)
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import PyPDF2
+
+import core.config
+
+logger = logging.getLogger(__name__)
+
+# Intervalo de verificação dos timeouts enquanto as páginas são extraídas
+_INTERVALO_VERIFICACAO = 0.05
+
+# 'spawn': o servidor Streamlit tem várias threads, e ``fork`` copiaria locks
+# possivelmente travados para os filhos
+_CONTEXTO = multiprocessing.get_context("spawn")
+
+# Vezes que uma página é reenviada após o pool quebrar (processo morto)
+_MAX_TENTATIVAS = 3
+
+# Leitor aberto em cada processo do pool: (caminho, PdfReader)
+_leitor_processo: Tuple[Optional[str], Optional[PyPDF2.PdfReader]] = (None, None)
+
+# Fila em que cada processo do pool avisa (página, pid) ao começar uma página
+_fila_processo = None
+
+
+def _texto_pagina(leitor: PyPDF2.PdfReader, indice: int) -> str:
+    """Texto de uma página; página com erro vira texto vazio."""
+    try:
+        return leitor.pages[indice].extract_text() or ""
+    except Exception as e:
+        logger.warning(f"Falha ao extrair a página {indice + 1} do PDF: {e}")
+        return ""
+
+
+def _extrair_pagina(caminho: str, indice: int) -> str:
+    """Tarefa do pool: extrai uma página, reaproveitando o leitor do processo."""
+    global _leitor_processo
+    if _leitor_processo[0] != caminho:
+        _leitor_processo = (caminho, PyPDF2.PdfReader(caminho))
+    return _texto_pagina(_leitor_processo[1], indice)
+
+
+def _inicializar_processo(fila) -> None:
+    """Inicializador dos processos do pool."""
+    global _fila_processo
+    _fila_processo = fila
+
+
+def _executar_pagina(extrator: Callable[[str, int], str], caminho: str, indice: int) -> str:
+    """Avisa qual processo pegou a página (para matar só ele no timeout) e extrai."""
+    _fila_processo.put((indice, os.getpid()))
+    return extrator(caminho, indice)
+
+
+def _numero_workers() -> int:
+    return min(core.config.config.PDF_WORKERS, os.cpu_count() or 1)
+
+
+def _criar_pool(workers: int, fila) -> ProcessPoolExecutor:
+    """Cria o pool de extração de uma chamada (nunca compartilhado entre sessões)."""
+    return ProcessPoolExecutor(max_workers=workers, mp_context=_CONTEXTO,
+                               initializer=_inicializar_processo, initargs=(fila,))
+
+
+def _matar_processo(pid: int) -> None:
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError as e:
+        logger.debug(f"Processo {pid} do pool de PDF já tinha saído: {e}")
+
+
+def _resultado(futuro: Future, indice: int) -> Optional[str]:
+    """Texto da página, ou None se o pool quebrou antes dela terminar (reenviar)."""
+    try:
+        return futuro.result()
+    except (BrokenExecutor, CancelledError):
+        return None
+    except Exception as e:
+        logger.warning(f"Falha ao extrair a página {indice + 1} do PDF no pool: {e}")
+        return ""
+
+
+def _extrair_em_paralelo(caminho: str, total: int, timeout_pagina: float,
+                         extrator: Callable[[str, int], str] = _extrair_pagina
+                         ) -> Iterator[Tuple[int, int, Optional[str]]]:
+    """
+    Distribui as páginas por um pool próprio da chamada e gera cada uma ao terminar.
+
+    O relógio de uma página começa quando um processo avisa que a pegou
+    (``_executar_pagina``), não quando ela entra na fila de chamadas do
+    pool; se passar de ``timeout_pagina``, a página sai com texto None e só
+    o processo que a extraía é morto. Isso quebra o pool da chamada: as
+    páginas que estavam nele são reenviadas a um pool novo (uma página que
+    derruba o processo sozinha desiste após _MAX_TENTATIVAS).
+    """
+    workers = max(_numero_workers(), 1)
+    restantes = list(range(total))
+    tentativas = dict.fromkeys(restantes, 0)
+    while restantes:
+        fila = _CONTEXTO.SimpleQueue()
+        pool = _criar_pool(min(workers, len(restantes)), fila)
+        futuros: Dict[Future, int] = {pool.submit(_executar_pagina, extrator, caminho, i): i
+                                      for i in restantes}
+        # Página -> (pid do processo que a extrai, início da extração)
+        iniciadas: Dict[int, Tuple[int, float]] = {}
+        expiradas: List[Future] = []
+        try:
+            while futuros and not expiradas:
+                prontos, _ = wait(futuros, timeout=_INTERVALO_VERIFICACAO, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    indice = futuros.pop(futuro)
+                    texto = _resultado(futuro, indice)
+                    if texto is None:
+                        tentativas[indice] += 1
+                        if tentativas[indice] < _MAX_TENTATIVAS:
+                            continue
+                        logger.warning(f"Página {indice + 1} do PDF derrubou o pool "
+                                       f"{_MAX_TENTATIVAS} vezes e foi ignorada")
+                    restantes.remove(indice)
+                    yield indice, total, texto
+
+                agora = time.monotonic()
+                while not fila.empty():
+                    indice, pid = fila.get()
+                    iniciadas[indice] = (pid, agora)
+                expiradas = [f for f, indice in futuros.items()
+                             if indice in iniciadas and agora - iniciadas[indice][1] > timeout_pagina]
+
+            for futuro in expiradas:
+                indice = futuros.pop(futuro)
+                restantes.remove(indice)
+                logger.warning(f"Página {indice + 1} do PDF passou de {timeout_pagina}s e foi ignorada")
+                _matar_processo(iniciadas[indice][0])
+                yield indice, total, None
+        finally:
+            # Com páginas pendentes (timeout ou consumidor parou) não espera o pool
+            pool.shutdown(wait=not (futuros or expiradas), cancel_futures=True)
+
+
+def extrair_paginas_pdf(dados: bytes, paralelo: bool = True) -> Iterator[Tuple[int, int, Optional[str]]]:
+    """
+    Extrai as páginas de um PDF, gerando cada uma assim que termina.
+
+    As páginas chegam fora de ordem no caminho paralelo; use o índice para
+    remontar o documento (ou extrair_texto_paginado).
+
+    Args:
+        dados: Conteúdo do arquivo PDF
+        paralelo: False força o caminho em série
+
+    Yields:
+        Tupla (indice da página, total de páginas lidas, texto da página);
+        o texto é None quando a página foi desistida (timeout ou processo
+        derrubado), diferente de "" de uma página sem texto
+
+    Raises:
+        PyPDF2.errors.PdfReadError: Se o arquivo não for um PDF válido
+    """
+    cfg = core.config.config
+    leitor = PyPDF2.PdfReader(io.BytesIO(dados))
+    paginas_pdf = len(leitor.pages)
+    total = min(paginas_pdf, cfg.PDF_MAX_PAGES)
+    if total < paginas_pdf:
+        logger.warning(f"PDF com {paginas_pdf} páginas: apenas as primeiras {total} serão lidas")
+
+    if not paralelo or _numero_workers() < 1 or total < cfg.PDF_PARALLEL_MIN_PAGES:
+        logger.debug(f"Extraindo {total} páginas de PDF em série")
+        for indice in range(total):
+            yield indice, total, _texto_pagina(leitor, indice)
+        return
+
+    logger.debug(f"Extraindo {total} páginas de PDF no pool de processos")
+    descritor, caminho = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(dados)
+        yield from _extrair_em_paralelo(caminho, total, cfg.PDF_PAGE_TIMEOUT)
+    finally:
+        os.unlink(caminho)
+
+
+def extrair_texto_paginado(dados: bytes, progresso: Optional[Callable[[int, int], None]] = None,
+                           paralelo: bool = True, desistidas: Optional[List[int]] = None) -> str:
+    """
+    Texto completo do PDF, na ordem das páginas.
+
+    Args:
+        dados: Conteúdo do arquivo PDF
+        progresso: Chamado com (páginas prontas, total) a cada página extraída
+        paralelo: False força o caminho em série
+        desistidas: Lista que recebe os índices das páginas desistidas
+            (texto incompleto: não deve ir para cache)
+
+    Returns:
+        Texto das páginas concatenado (vazio se nenhuma tiver texto)
+    """
+    paginas: Dict[int, str] = {}
+    for indice, total, texto in extrair_paginas_pdf(dados, paralelo=paralelo):
+        if texto is None and desistidas is not None:
+            desistidas.append(indice)
+        paginas[indice] = texto or ""
+        if progresso is not None:
+            progresso(len(paginas), total)
+    return "".join(paginas[i] for i in sorted(paginas))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ponto de entrada CLI: compara a extração em série com a do pool."""
+    parser = argparse.ArgumentParser(description="Benchmark da extração de PDF em série vs. pool de processos")
+    parser.add_argument('pdf', help="Arquivo PDF (ex.: export do LinkedIn)")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--workers', type=int, help="Processos do pool (padrão: PDF_WORKERS)")
+    args = parser.parse_args(argv)
+
+    with open(args.pdf, "rb") as arquivo:
+        dados = arquivo.read()
+    cfg = core.config.config
+    cfg.PDF_PARALLEL_MIN_PAGES = 1
+    if args.workers is not None:
+        cfg.PDF_WORKERS = args.workers
+    workers = max(_numero_workers(), 1)
+
+    inicio = time.perf_counter()
+    with _criar_pool(workers, _CONTEXTO.SimpleQueue()) as pool:
+        pool.submit(int).result()
+    partida = time.perf_counter() - inicio
+
+    tempos = {'série': [], 'pool': []}
+    textos = {}
+    for _ in range(args.repeticoes):
+        for nome, paralelo in (('série', False), ('pool', True)):
+            inicio = time.perf_counter()
+            textos[nome] = extrair_texto_paginado(dados, paralelo=paralelo)
+            tempos[nome].append(time.perf_counter() - inicio)
+
+    paginas = len(PyPDF2.PdfReader(io.BytesIO(dados)).pages)
+    print(f"{args.pdf}: {paginas} páginas, {len(textos['série'])} caracteres, "
+          f"{workers} processos (partida do pool, incluída a cada extração: {partida:.2f}s)")
+    for nome, valores in tempos.items():
+        print(f"  {nome:<6} mediana {statistics.median(valores):.3f}s  mín {min(valores):.3f}s")
+    print(f"  aceleração: {statistics.median(tempos['série']) / statistics.median(tempos['pool']):.2f}x"
+          f"  texto idêntico: {textos['série'] == textos['pool']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
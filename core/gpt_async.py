@@ -0,0 +1,207 @@
+"""
+Caminho assíncrono (AsyncOpenAI) para chamadas GPT independentes.
+
+Todas as chamadas do projeto são síncronas (chamar_gpt): prompts
+independentes sempre rodam em série. Este módulo oferece:
+
+- ``chamar_gpt_async``: contraparte de chamar_gpt com AsyncOpenAI, com o
+  mesmo retry/backoff, cache de respostas e corrigir_formatacao
+- ``chamar_gpt_varios_async``: roda N listas de mensagens em paralelo
+  (``asyncio.gather``) com limite de concorrência, preservando a ordem
+- ``chamar_gpt_varios``: ponte síncrona para as telas Streamlit, que
+  recebe o client síncrono da sessão e devolve a lista de respostas
+
+O tempo total de N chamadas independentes cai para aproximadamente o da
+chamada mais longa.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, List, Optional
+
+from openai import AsyncOpenAI
+
+from core.cassetes_llm import criar_resposta_async, gravacao_ausente
+from core.gpt_metricas import propagar_contexto, registrar_chamada_gpt
+from core.utils import (
+    corrigir_formatacao,
+    _parametros_gpt,
+    _consultar_cache_llm,
+    _aguardar_vez,
+    _ajustar_reserva,
+    _decidir_nova_tentativa,
+)
+
+logger = logging.getLogger(__name__)
+
+# Número padrão de chamadas simultâneas em um fan-out
+MAX_CONCORRENCIA_PADRAO = 5
+
+
+async def chamar_gpt_async(
+    client: AsyncOpenAI,
+    msgs: list,
+    max_retries: int = 3,
+    timeout: int = 30,
+    temperature: float = 0.7,
+    seed: Optional[int] = None,
+    usar_cache: bool = True,
+    rota: Optional[str] = None
+) -> Optional[str]:
+    """
+    Chama a API do GPT de forma assíncrona, com retry automático.
+
+    Mesma semântica de ``core.utils.chamar_gpt`` (backoff exponencial,
+    retry de rate limit com Retry-After, limitador de taxa, cache de
+    respostas, corrigir_formatacao).
+
+    Args:
+        client: Cliente AsyncOpenAI
+        msgs: Lista de mensagens no formato esperado pela API
+        max_retries: Número máximo de tentativas (padrão: 3)
+        timeout: Timeout em segundos por requisição (padrão: 30)
+        temperature: Controle de criatividade (padrão: 0.7)
+        seed: Seed para reprodutibilidade (opcional)
+        usar_cache: Se False, ignora o cache de respostas
+        rota: Rota de modelo (core.roteamento_modelos); padrão: pelo contexto
+
+    Returns:
+        Resposta do GPT formatada ou None em caso de erro
+    """
+    logger.info(f"Chamando GPT (async) com {len(msgs)} mensagens")
+
+    params, rota = _parametros_gpt(msgs, temperature, timeout, seed, rota)
+    inicio = time.perf_counter()
+    if gravacao_ausente(params):
+        registrar_chamada_gpt(params["model"], 0.0, sucesso=False, rota=rota)
+        return None
+    cache, chave = _consultar_cache_llm(params, usar_cache)
+    if chave and cache is not None:
+        resposta = cache.obter(chave)
+        if resposta is not None:
+            logger.info(f"Resposta obtida do cache de respostas GPT ({len(resposta)} caracteres)")
+            registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, do_cache=True, rota=rota)
+            return resposta
+
+    for tentativa in range(1, max_retries + 1):
+        # A fila do limitador bloqueia: espera fora do event loop (com a sessão
+        # Streamlit, para o aviso de fila cheia chegar ao usuário)
+        if not await asyncio.to_thread(propagar_contexto(_aguardar_vez), params):
+            registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, tentativas=tentativa, sucesso=False, rota=rota)
+            return None
+
+        try:
+            logger.debug(f"Tentativa {tentativa}/{max_retries} (async)")
+            response = await criar_resposta_async(client, params)
+
+            texto_raw = response.choices[0].message.content
+            logger.info(f"Resposta (async) recebida com sucesso ({len(texto_raw)} caracteres)")
+            resposta = corrigir_formatacao(texto_raw)
+            registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, getattr(response, "usage", None), tentativas=tentativa, rota=rota)
+            _ajustar_reserva(params, getattr(response, "usage", None))
+            if chave and resposta:
+                cache.definir(chave, resposta)
+            return resposta
+
+        except Exception as e:
+            tempo_espera = _decidir_nova_tentativa(e, tentativa, max_retries, " (async)")
+            if tempo_espera is None:
+                registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, tentativas=tentativa, sucesso=False, rota=rota)
+                return None
+            await asyncio.sleep(tempo_espera)
+
+    return None
+
+
+async def chamar_gpt_varios_async(
+    client: AsyncOpenAI,
+    lista_msgs: List[list],
+    max_concorrencia: int = MAX_CONCORRENCIA_PADRAO,
+    **kwargs
+) -> List[Optional[str]]:
+    """
+    Executa várias chamadas GPT independentes em paralelo.
+
+    Args:
+        client: Cliente AsyncOpenAI
+        lista_msgs: Uma lista de mensagens por chamada
+        max_concorrencia: Máximo de chamadas simultâneas
+        **kwargs: Argumentos de chamar_gpt_async (temperature, seed...)
+
+    Returns:
+        Respostas na mesma ordem de ``lista_msgs`` (None nas que falharam)
+    """
+    semaforo = asyncio.Semaphore(max(1, max_concorrencia))
+
+    async def _chamar(msgs: list) -> Optional[str]:
+        async with semaforo:
+            return await chamar_gpt_async(client, msgs, **kwargs)
+
+    logger.info(f"Fan-out de {len(lista_msgs)} chamadas GPT (concorrência máx.: {max_concorrencia})")
+    return list(await asyncio.gather(*(_chamar(msgs) for msgs in lista_msgs)))
+
+
+def criar_cliente_async(client) -> AsyncOpenAI:
+    """
+    Cria um AsyncOpenAI com as mesmas credenciais de um client síncrono.
+
+    O AsyncOpenAI fica preso ao event loop em que é usado, então a ponte
+    cria um por execução em vez de reaproveitar.
+    """
+    return AsyncOpenAI(
+        api_key=client.api_key,
+        organization=getattr(client, 'organization', None),
+        base_url=getattr(client, 'base_url', None),
+    )
+
+
+def executar_async(coro: Awaitable) -> Any:
+    """
+    Executa uma corrotina a partir de código síncrono (telas Streamlit).
+
+    Sem event loop ativo na thread atual (caso normal do script Streamlit),
+    usa ``asyncio.run`` na própria thread — assim ``st.*`` continua
+    funcionando. Se já houver um loop rodando, executa em outra thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def chamar_gpt_varios(
+    client,
+    lista_msgs: List[list],
+    max_concorrencia: int = MAX_CONCORRENCIA_PADRAO,
+    **kwargs
+) -> List[Optional[str]]:
+    """
+    Ponte síncrona: executa várias chamadas GPT em paralelo.
+
+    Args:
+        client: Cliente OpenAI síncrono (o da sessão) ou AsyncOpenAI
+        lista_msgs: Uma lista de mensagens por chamada
+        max_concorrencia: Máximo de chamadas simultâneas
+        **kwargs: Argumentos de chamar_gpt_async (temperature, seed...)
+
+    Returns:
+        Respostas na mesma ordem de ``lista_msgs`` (None nas que falharam)
+
+    Examples:
+        >>> cartas = chamar_gpt_varios(client, [msgs_a, msgs_b], temperature=0.3, seed=42)
+    """
+    if not lista_msgs:
+        return []
+
+    async def _executar():
+        if isinstance(client, AsyncOpenAI):
+            return await chamar_gpt_varios_async(client, lista_msgs, max_concorrencia, **kwargs)
+        async with criar_cliente_async(client) as client_async:
+            return await chamar_gpt_varios_async(client_async, lista_msgs, max_concorrencia, **kwargs)
+
+    return executar_async(_executar())
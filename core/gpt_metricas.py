@@ -0,0 +1,496 @@
+"""
+Métricas de tokens, latência e custo das chamadas GPT.
+
+``core.gpt_telemetry`` conta chamadas por contexto na sessão. Este módulo
+registra, para cada chamada de ``chamar_gpt`` / ``chamar_gpt_stream`` /
+``chamar_gpt_async``:
+- tokens de prompt, de resposta e de prompt em cache (``response.usage``)
+- latência de parede (incluindo retries), número de tentativas e modelo
+- custo estimado (tabela PRECOS_MODELOS, USD por 1M tokens)
+
+Os dados são agregados no processo por contexto (diagnostico,
+coleta_focada, reescrita, linkedin, validacao, outros), por rota de modelo
+(core.roteamento_modelos) e por sessão Streamlit, com histograma de
+latência (buckets no estilo Prometheus) e percentis p50/p95/p99 sobre as
+amostras recentes.
+
+O contexto da chamada vem de ``contexto_gpt`` (usado pelos wrappers de
+core.gpt_telemetry); chamadas diretas ficam em 'outros'.
+
+O snapshot (mais o uso do pool HTTP de core.transporte_http) pode ser
+exportado em JSON ou no formato texto do Prometheus, e servido por um endpoint HTTP local (GPT_METRICS_PORT, desligado por padrão):
+
+    GET http://127.0.0.1:<porta>/metrics       -> Prometheus
+    GET http://127.0.0.1:<porta>/metrics.json  -> JSON
+"""
+
+import bisect
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import threading
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+CONTEXTO_PADRAO = "outros"
+SESSAO_DESCONHECIDA = "sem_sessao"
+
+# Limites superiores (segundos) dos buckets do histograma de latência
+BUCKETS_LATENCIA = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+# Amostras de latência guardadas por contexto para os percentis
+MAX_AMOSTRAS_LATENCIA = 1000
+
+# Sessões mantidas no agregado (as mais antigas saem primeiro)
+MAX_SESSOES = 500
+
+# Preço em USD por 1M tokens: (prompt, prompt em cache, resposta)
+PRECOS_MODELOS = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+}
+
+_contexto_atual: ContextVar[str] = ContextVar("contexto_gpt", default=CONTEXTO_PADRAO)
+
+
+@contextlib.contextmanager
+def contexto_gpt(contexto: str) -> Iterator[None]:
+    """Define o contexto (fase) atribuído às chamadas GPT dentro do bloco."""
+    token = _contexto_atual.set(contexto or CONTEXTO_PADRAO)
+    try:
+        yield
+    finally:
+        _contexto_atual.reset(token)
+
+
+def contexto_gpt_atual() -> str:
+    """Contexto atribuído às chamadas GPT neste ponto da execução."""
+    return _contexto_atual.get()
+
+
+def estimar_custo(modelo: str, tokens_prompt: int, tokens_resposta: int, tokens_cache: int = 0) -> float:
+    """
+    Custo estimado de uma chamada em USD.
+
+    Modelos fora da tabela usam o preço do prefixo mais longo conhecido
+    (ex.: 'gpt-4o-2024-08-06' → 'gpt-4o'); desconhecidos custam 0.
+    """
+    precos = None
+    for nome in sorted(PRECOS_MODELOS, key=len, reverse=True):
+        if modelo == nome or modelo.startswith(nome + "-"):
+            precos = PRECOS_MODELOS[nome]
+            break
+    if precos is None:
+        return 0.0
+    preco_prompt, preco_cache, preco_resposta = precos
+    tokens_cache = min(tokens_cache, tokens_prompt)
+    return (
+        (tokens_prompt - tokens_cache) * preco_prompt
+        + tokens_cache * preco_cache
+        + tokens_resposta * preco_resposta
+    ) / 1_000_000
+
+
+def extrair_uso(usage: Any) -> Dict[str, int]:
+    """
+    Lê prompt/completion/cached tokens de ``response.usage`` (ou None).
+
+    Campos ausentes ou não numéricos contam como 0.
+    """
+    def _inteiro(valor) -> int:
+        return valor if isinstance(valor, int) and not isinstance(valor, bool) else 0
+
+    detalhes = getattr(usage, 'prompt_tokens_details', None)
+    return {
+        'tokens_prompt': _inteiro(getattr(usage, 'prompt_tokens', 0)),
+        'tokens_resposta': _inteiro(getattr(usage, 'completion_tokens', 0)),
+        'tokens_cache': _inteiro(getattr(detalhes, 'cached_tokens', 0)),
+    }
+
+
+def _script_run_ctx():
+    """ScriptRunContext do Streamlit na thread atual (None fora de uma sessão)."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        return None
+
+
+def _id_sessao() -> str:
+    """Id da sessão Streamlit da thread atual (ou SESSAO_DESCONHECIDA)."""
+    ctx = _script_run_ctx()
+    return ctx.session_id if ctx else SESSAO_DESCONHECIDA
+
+
+def propagar_contexto(funcao: Callable) -> Callable:
+    """
+    Prende ``funcao`` ao contexto de quem chama, para rodar em outra thread.
+
+    Threads de pool não herdam os ContextVars (contexto_gpt, prioridade do
+    limitador) nem o ScriptRunContext do Streamlit: sem isso as chamadas GPT
+    feitas nelas caem em 'outros'/SESSAO_DESCONHECIDA e o ``st.error`` some.
+
+    Examples:
+        >>> executor.submit(propagar_contexto(gerar_job_description), client, cargo)
+    """
+    contexto = contextvars.copy_context()
+    ctx = _script_run_ctx()
+
+    @functools.wraps(funcao)
+    def _executar(*args, **kwargs):
+        if ctx is None:
+            return contexto.run(funcao, *args, **kwargs)
+        from streamlit.runtime.scriptrunner import add_script_run_ctx
+        thread = threading.current_thread()
+        anterior = _script_run_ctx()
+        add_script_run_ctx(thread, ctx)
+        try:
+            return contexto.run(funcao, *args, **kwargs)
+        finally:
+            if anterior is not None:
+                add_script_run_ctx(thread, anterior)
+            else:
+                # A thread do pool volta sem sessão (não há API para remover)
+                for nome, valor in list(vars(thread).items()):
+                    if valor is ctx:
+                        delattr(thread, nome)
+
+    return _executar
+
+
+def _agregado_vazio() -> Dict[str, Any]:
+    return {
+        'chamadas': 0,
+        'falhas': 0,
+        'cache_hits': 0,
+        'tentativas': 0,
+        'tokens_prompt': 0,
+        'tokens_resposta': 0,
+        'tokens_cache': 0,
+        'custo_usd': 0.0,
+        'latencia_soma': 0.0,
+        'buckets': [0] * (len(BUCKETS_LATENCIA) + 1),
+        'amostras': deque(maxlen=MAX_AMOSTRAS_LATENCIA),
+        'modelos': {},
+    }
+
+
+def _percentil(amostras_ordenadas, p: float) -> Optional[float]:
+    """Percentil por posição mais próxima (None sem amostras)."""
+    if not amostras_ordenadas:
+        return None
+    indice = max(0, min(len(amostras_ordenadas) - 1, int(round(p / 100 * len(amostras_ordenadas))) - 1))
+    return round(amostras_ordenadas[indice], 4)
+
+
+class RegistroMetricasGPT:
+    """
+    Agregador de métricas de chamadas GPT (seguro para threads).
+
+    Examples:
+        >>> registro = RegistroMetricasGPT()
+        >>> registro.registrar("gpt-4o", 1.2, contexto="diagnostico", tokens_prompt=900, tokens_resposta=300)
+        >>> registro.snapshot()['por_contexto']['diagnostico']['chamadas']
+        1
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._por_contexto: Dict[str, Dict[str, Any]] = {}
+        self._por_rota: Dict[str, Dict[str, Any]] = {}
+        self._por_sessao: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def registrar(
+        self,
+        modelo: str,
+        latencia: float,
+        contexto: Optional[str] = None,
+        sessao: Optional[str] = None,
+        rota: Optional[str] = None,
+        tokens_prompt: int = 0,
+        tokens_resposta: int = 0,
+        tokens_cache: int = 0,
+        tentativas: int = 1,
+        sucesso: bool = True,
+        do_cache: bool = False
+    ) -> None:
+        """
+        Registra uma chamada GPT.
+
+        Args:
+            modelo: Modelo chamado
+            latencia: Tempo de parede em segundos (incluindo retries)
+            contexto: Fase da chamada (padrão: contexto_gpt_atual())
+            sessao: Id da sessão (padrão: sessão Streamlit atual)
+            rota: Rota de modelo da chamada (padrão: 'padrao')
+            tokens_prompt / tokens_resposta / tokens_cache: De response.usage
+            tentativas: Tentativas feitas (1 = sem retry)
+            sucesso: False se a chamada terminou sem resposta
+            do_cache: True se a resposta veio do cache de respostas (sem rede)
+        """
+        contexto = contexto or contexto_gpt_atual()
+        sessao = sessao or _id_sessao()
+        rota = rota or "padrao"
+        custo = estimar_custo(modelo, tokens_prompt, tokens_resposta, tokens_cache)
+
+        with self._lock:
+            if sessao not in self._por_sessao:
+                self._por_sessao[sessao] = _agregado_vazio()
+                while len(self._por_sessao) > MAX_SESSOES:
+                    self._por_sessao.popitem(last=False)
+            self._por_sessao.move_to_end(sessao)
+
+            agregados = (
+                self._por_contexto.setdefault(contexto, _agregado_vazio()),
+                self._por_rota.setdefault(rota, _agregado_vazio()),
+                self._por_sessao[sessao],
+            )
+            for agregado in agregados:
+                agregado['chamadas'] += 1
+                agregado['modelos'][modelo] = agregado['modelos'].get(modelo, 0) + 1
+                if do_cache:
+                    agregado['cache_hits'] += 1
+                    continue
+                if not sucesso:
+                    agregado['falhas'] += 1
+                agregado['tentativas'] += tentativas
+                agregado['tokens_prompt'] += tokens_prompt
+                agregado['tokens_resposta'] += tokens_resposta
+                agregado['tokens_cache'] += tokens_cache
+                agregado['custo_usd'] += custo
+                agregado['latencia_soma'] += latencia
+                agregado['buckets'][bisect.bisect_left(BUCKETS_LATENCIA, latencia)] += 1
+                agregado['amostras'].append(latencia)
+
+    @staticmethod
+    def _resumir(agregado: Dict[str, Any]) -> Dict[str, Any]:
+        """Versão serializável de um agregado (percentis no lugar das amostras)."""
+        amostras = sorted(agregado['amostras'])
+        acumulado = 0
+        histograma = {}
+        for limite, quantidade in zip(BUCKETS_LATENCIA + (float('inf'),), agregado['buckets']):
+            acumulado += quantidade
+            histograma['+Inf' if limite == float('inf') else str(limite)] = acumulado
+        return {
+            'chamadas': agregado['chamadas'],
+            'falhas': agregado['falhas'],
+            'cache_hits': agregado['cache_hits'],
+            'tentativas': agregado['tentativas'],
+            'tokens_prompt': agregado['tokens_prompt'],
+            'tokens_resposta': agregado['tokens_resposta'],
+            'tokens_cache': agregado['tokens_cache'],
+            'custo_usd': round(agregado['custo_usd'], 6),
+            'modelos': dict(agregado['modelos']),
+            'latencia': {
+                'soma': round(agregado['latencia_soma'], 4),
+                'p50': _percentil(amostras, 50),
+                'p95': _percentil(amostras, 95),
+                'p99': _percentil(amostras, 99),
+                'histograma': histograma,
+            },
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retrato atual das métricas.
+
+        Returns:
+            Dict com 'por_contexto', 'por_rota', 'por_sessao' e 'total' (mesmos campos)
+        """
+        with self._lock:
+            por_contexto = {c: self._resumir(a) for c, a in self._por_contexto.items()}
+            por_rota = {r: self._resumir(a) for r, a in self._por_rota.items()}
+            por_sessao = {s: self._resumir(a) for s, a in self._por_sessao.items()}
+            total = _agregado_vazio()
+            for agregado in self._por_contexto.values():
+                for campo in ('chamadas', 'falhas', 'cache_hits', 'tentativas', 'tokens_prompt',
+                              'tokens_resposta', 'tokens_cache', 'custo_usd', 'latencia_soma'):
+                    total[campo] += agregado[campo]
+                total['buckets'] = [a + b for a, b in zip(total['buckets'], agregado['buckets'])]
+                total['amostras'].extend(agregado['amostras'])
+                for modelo, quantidade in agregado['modelos'].items():
+                    total['modelos'][modelo] = total['modelos'].get(modelo, 0) + quantidade
+        return {
+            'total': self._resumir(total),
+            'por_contexto': por_contexto,
+            'por_rota': por_rota,
+            'por_sessao': por_sessao,
+        }
+
+    def sessao(self, sessao: Optional[str] = None) -> Dict[str, Any]:
+        """Métricas de uma sessão (padrão: a sessão Streamlit atual)."""
+        sessao = sessao or _id_sessao()
+        with self._lock:
+            agregado = self._por_sessao.get(sessao)
+            return self._resumir(agregado if agregado is not None else _agregado_vazio())
+
+    def resetar(self) -> None:
+        """Descarta todas as métricas."""
+        with self._lock:
+            self._por_contexto.clear()
+            self._por_rota.clear()
+            self._por_sessao.clear()
+
+
+registro_metricas = RegistroMetricasGPT()
+
+
+def registrar_chamada_gpt(modelo: str, latencia: float, usage: Any = None, **kwargs) -> None:
+    """Registra uma chamada no registro do processo a partir de ``response.usage``."""
+    try:
+        registro_metricas.registrar(modelo, latencia, **extrair_uso(usage), **kwargs)
+    except Exception as e:
+        # Métricas nunca podem derrubar a chamada GPT
+        logger.warning(f"Falha ao registrar métricas da chamada GPT: {e}")
+
+
+def _estatisticas_pool_http() -> Optional[Dict[str, Any]]:
+    """Estatísticas do pool HTTP compartilhado (core.transporte_http), se já criado."""
+    from core.transporte_http import estatisticas_pool
+    return estatisticas_pool()
+
+
+def exportar_json(snapshot: Optional[Dict] = None) -> str:
+    """Snapshot das métricas (e do pool HTTP) em JSON."""
+    dados = dict(snapshot or registro_metricas.snapshot())
+    dados['pool_http'] = _estatisticas_pool_http()
+    return json.dumps(dados, ensure_ascii=False, indent=2)
+
+
+def _escapar_rotulo(valor: str) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def exportar_prometheus(snapshot: Optional[Dict] = None) -> str:
+    """
+    Snapshot das métricas no formato texto de exposição do Prometheus.
+
+    Séries por contexto (rótulo ``contexto``) e latência por rota de modelo
+    (rótulo ``rota``); as sessões ficam só no JSON para não explodir a
+    cardinalidade.
+    """
+    snapshot = snapshot or registro_metricas.snapshot()
+    por_contexto = snapshot['por_contexto']
+    linhas = []
+
+    contadores = (
+        ('gpt_chamadas_total', 'chamadas', "Chamadas GPT"),
+        ('gpt_falhas_total', 'falhas', "Chamadas GPT sem resposta"),
+        ('gpt_cache_hits_total', 'cache_hits', "Respostas servidas pelo cache de respostas"),
+        ('gpt_tentativas_total', 'tentativas', "Tentativas de requisição (inclui retries)"),
+        ('gpt_tokens_prompt_total', 'tokens_prompt', "Tokens de prompt"),
+        ('gpt_tokens_resposta_total', 'tokens_resposta', "Tokens de resposta"),
+        ('gpt_tokens_cache_total', 'tokens_cache', "Tokens de prompt servidos pelo cache da OpenAI"),
+        ('gpt_custo_usd_total', 'custo_usd', "Custo estimado em USD"),
+    )
+    for nome, campo, ajuda in contadores:
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} counter")
+        for contexto, dados in sorted(por_contexto.items()):
+            linhas.append(f'{nome}{{contexto="{_escapar_rotulo(contexto)}"}} {dados[campo]}')
+
+    histogramas = (
+        ('gpt_latencia_segundos', 'contexto', por_contexto, "Latência de parede das chamadas GPT"),
+        ('gpt_rota_latencia_segundos', 'rota', snapshot.get('por_rota', {}),
+         "Latência de parede das chamadas GPT por rota de modelo"),
+    )
+    for nome, rotulo_nome, series, ajuda in histogramas:
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} histogram")
+        for serie, dados in sorted(series.items()):
+            rotulo = f'{rotulo_nome}="{_escapar_rotulo(serie)}"'
+            latencia = dados['latencia']
+            for limite, acumulado in latencia['histograma'].items():
+                linhas.append(f'{nome}_bucket{{{rotulo},le="{limite}"}} {acumulado}')
+            linhas.append(f'{nome}_sum{{{rotulo}}} {latencia["soma"]}')
+            linhas.append(f'{nome}_count{{{rotulo}}} {latencia["histograma"]["+Inf"]}')
+
+    pool = _estatisticas_pool_http()
+    if pool is not None:
+        series_pool = (
+            ('gpt_http_requisicoes_total', 'counter', 'requisicoes', "Requisições HTTP à OpenAI"),
+            ('gpt_http_conexoes_novas_total', 'counter', 'conexoes_novas', "Requisições que abriram conexão nova"),
+            ('gpt_http_conexoes_reutilizadas_total', 'counter', 'conexoes_reutilizadas',
+             "Requisições que reutilizaram conexão do pool"),
+            ('gpt_http_aguardaram_total', 'counter', 'aguardaram', "Requisições que esperaram conexão livre no pool"),
+            ('gpt_http_espera_pool_segundos_total', 'counter', 'espera_segundos',
+             "Tempo total de espera por conexão livre no pool"),
+        )
+        for nome, tipo, campo, ajuda in series_pool:
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+            linhas.append(f"{nome} {pool[campo]}")
+
+    return "\n".join(linhas) + "\n"
+
+
+class _HandlerMetricas(BaseHTTPRequestHandler):
+    """Serve /metrics (Prometheus) e /metrics.json."""
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            corpo, tipo = exportar_prometheus(), 'text/plain; version=0.0.4; charset=utf-8'
+        elif self.path == '/metrics.json':
+            corpo, tipo = exportar_json(), 'application/json; charset=utf-8'
+        else:
+            self.send_error(404)
+            return
+        dados = corpo.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Endpoint de métricas: {format % args}")
+
+
+_servidor: Optional[ThreadingHTTPServer] = None
+_lock_servidor = threading.Lock()
+
+
+def iniciar_servidor_metricas(porta: int, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """
+    Sobe o endpoint local de métricas em uma thread daemon (uma vez por processo).
+
+    Args:
+        porta: Porta TCP (0 = desligado)
+        host: Interface de escuta (padrão: só local)
+
+    Returns:
+        Servidor em execução ou None se desligado/indisponível
+    """
+    global _servidor
+
+    if not porta:
+        return None
+    with _lock_servidor:
+        if _servidor is None:
+            try:
+                _servidor = ThreadingHTTPServer((host, porta), _HandlerMetricas)
+            except OSError as e:
+                logger.error(f"Não foi possível abrir o endpoint de métricas em {host}:{porta}: {e}")
+                return None
+            threading.Thread(target=_servidor.serve_forever, name="gpt-metricas", daemon=True).start()
+            logger.info(f"Endpoint de métricas GPT em http://{host}:{porta}/metrics")
+    return _servidor
+
+
+def parar_servidor_metricas() -> None:
+    """Derruba o endpoint de métricas, se ativo."""
+    global _servidor
+    with _lock_servidor:
+        if _servidor is not None:
+            _servidor.shutdown()
+            _servidor.server_close()
+            _servidor = None
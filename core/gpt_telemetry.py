@@ -3,15 +3,19 @@ Módulo de telemetria de chamadas GPT - rastreamento de uso da API.
 
 Este módulo fornece funções para rastrear e exibir o número de chamadas
 GPT realizadas durante uma sessão, permitindo visibilidade sobre o uso
-da API e custos associados.
+da API e custos associados. Tokens, latência e custo de cada chamada são
+registrados em core.gpt_metricas, atribuídos ao contexto do wrapper.
 
 HEADHUNTER ELITE: Telemetria transparente de chamadas GPT.
 """
 
 import logging
 import streamlit as st
-from typing import Optional
+from typing import Iterator, Optional
 from core.utils import chamar_gpt as chamar_gpt_original
+from core.utils import chamar_gpt_stream as chamar_gpt_stream_original
+from core.gpt_metricas import contexto_gpt, registro_metricas
+from core.transporte_http import estatisticas_pool
 
 logger = logging.getLogger(__name__)
 
@@ -91,13 +95,48 @@ def chamar_gpt_com_telemetria(
     
     # Fazer a chamada GPT
     try:
-        resposta = chamar_gpt_original(client, msgs, **kwargs)
+        with contexto_gpt(contexto):
+            resposta = chamar_gpt_original(client, msgs, **kwargs)
         return resposta
     except Exception as e:
         logger.error(f"Erro na chamada GPT com telemetria (contexto: {contexto}): {e}", exc_info=True)
         raise  # Re-raise para manter comportamento original
 
 
+def chamar_gpt_stream_com_telemetria(
+    client,
+    msgs: list,
+    contexto: str = CONTEXTO_OUTROS,
+    **kwargs
+) -> Iterator[str]:
+    """
+    Wrapper para chamar_gpt_stream que incrementa o contador de telemetria.
+    
+    Args:
+        client: Cliente OpenAI
+        msgs: Lista de mensagens
+        contexto: Contexto da chamada para categorização
+        **kwargs: Argumentos adicionais passados para chamar_gpt_stream
+        
+    Yields:
+        Trechos da resposta do GPT
+    """
+    incrementar_contador_gpt(contexto)
+    
+    try:
+        gerador = chamar_gpt_stream_original(client, msgs, **kwargs)
+        while True:
+            # O contexto vale só enquanto o gerador roda (não vaza entre os yields)
+            with contexto_gpt(contexto):
+                trecho = next(gerador, None)
+            if trecho is None:
+                return
+            yield trecho
+    except Exception as e:
+        logger.error(f"Erro na chamada GPT (streaming) com telemetria (contexto: {contexto}): {e}", exc_info=True)
+        raise
+
+
 def obter_contador_gpt() -> int:
     """
     Obtém o número total de chamadas GPT na sessão.
@@ -202,3 +241,25 @@ def renderizar_detalhes_telemetria():
         
         st.markdown("---")
         st.markdown(f"**Total Geral:** {stats['total']}")
+        
+        metricas = registro_metricas.sessao()
+        if metricas['chamadas']:
+            latencia = metricas['latencia']
+            st.caption(
+                f"Tokens: {metricas['tokens_prompt']} prompt "
+                f"({metricas['tokens_cache']} em cache) + {metricas['tokens_resposta']} resposta · "
+                f"Custo estimado: US$ {metricas['custo_usd']:.4f} · "
+                f"Latência p50/p95: {latencia['p50'] or 0:.1f}s / {latencia['p95'] or 0:.1f}s"
+            )
+        
+        pool = estatisticas_pool()
+        if pool and pool['requisicoes']:
+            st.caption(
+                f"Pool HTTP (processo): {pool['requisicoes']} requisições · "
+                f"reuso {pool['taxa_reuso']:.0%} · {pool['aguardaram']} requisições aguardaram o pool "
+                f"({pool['espera_segundos']:.1f}s)"
+            )
+        
+        economizados = st.session_state.get('contexto_tokens_economizados', 0)
+        if economizados:
+            st.caption(f"Tokens economizados pelo gerenciador de contexto: ~{economizados}")
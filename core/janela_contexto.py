@@ -0,0 +1,196 @@
+"""
+Gerenciador da janela de contexto do chat (``st.session_state.mensagens``).
+
+As fases do chat enviam o histórico inteiro a cada chamada, incluindo os
+prompts internos que repetem o CV completo e diagnósticos. Numa sessão de
+15-20 minutos o prompt cresce a cada turno (latência e custo).
+
+``montar_contexto`` aplica um orçamento de tokens por chamada:
+- mensagens de sistema (SYSTEM_PROMPT + CV) seguem sem alteração
+- os turnos recentes seguem literalmente
+- blocos repetidos do CV são substituídos por uma referência curta
+- turnos antigos viram um resumo compacto (o mais antigo sai primeiro)
+
+O relatório de cada chamada informa os tokens economizados.
+
+Configuração (core.config.Config / variáveis de ambiente):
+- CHAT_CONTEXT_MAX_TOKENS: orçamento de tokens de entrada por chamada
+- CHAT_CONTEXT_RECENT_MESSAGES: mensagens recentes mantidas na íntegra
+"""
+
+import logging
+import math
+from typing import Dict, List, Optional, Tuple
+
+import core.config
+
+logger = logging.getLogger(__name__)
+
+# Média de caracteres por token em português (aproximação sem tokenizer)
+CARACTERES_POR_TOKEN = 4
+
+# Custo fixo aproximado de cada mensagem no formato de chat (role, separadores)
+TOKENS_POR_MENSAGEM = 4
+
+# CVs menores que isto não valem a deduplicação
+MIN_CARACTERES_CV_DEDUP = 200
+
+# Tamanho máximo de cada turno antigo dentro do resumo
+MAX_CARACTERES_TURNO_RESUMIDO = 300
+
+REFERENCIA_CV = "[CV do candidato omitido — já enviado no contexto do sistema]"
+CABECALHO_RESUMO = "RESUMO DOS TURNOS ANTERIORES DA CONVERSA (compactado):"
+
+_ROTULOS = {'user': 'Usuário', 'assistant': 'Assistente', 'system': 'Sistema'}
+
+
+def estimar_tokens(texto: Optional[str]) -> int:
+    """Estimativa de tokens de um texto (~4 caracteres por token)."""
+    if not texto:
+        return 0
+    return math.ceil(len(texto) / CARACTERES_POR_TOKEN)
+
+
+def tokens_mensagens(mensagens: List[Dict]) -> int:
+    """Estimativa de tokens de uma lista de mensagens no formato de chat."""
+    return sum(TOKENS_POR_MENSAGEM + estimar_tokens(m.get('content')) for m in mensagens)
+
+
+def _deduplicar_cv(mensagens: List[Dict], cv_texto: Optional[str]) -> Tuple[List[Dict], int]:
+    """
+    Mantém só a primeira ocorrência do CV; as seguintes viram REFERENCIA_CV.
+
+    Returns:
+        (mensagens, número de blocos removidos)
+    """
+    cv = (cv_texto or "").strip()
+    if len(cv) < MIN_CARACTERES_CV_DEDUP:
+        return mensagens, 0
+
+    resultado = []
+    visto = False
+    removidos = 0
+    for msg in mensagens:
+        conteudo = msg['content']
+        if cv in conteudo:
+            if visto:
+                removidos += conteudo.count(cv)
+                conteudo = conteudo.replace(cv, REFERENCIA_CV)
+            else:
+                visto = True
+                primeira, _, resto = conteudo.partition(cv)
+                removidos += resto.count(cv)
+                conteudo = primeira + cv + resto.replace(cv, REFERENCIA_CV)
+        resultado.append({**msg, 'content': conteudo})
+    return resultado, removidos
+
+
+def _linha_resumo(msg: Dict) -> str:
+    """Uma linha do resumo para um turno antigo."""
+    texto = " ".join(msg['content'].split())
+    if len(texto) > MAX_CARACTERES_TURNO_RESUMIDO:
+        texto = texto[:MAX_CARACTERES_TURNO_RESUMIDO].rstrip() + "…"
+    rotulo = _ROTULOS.get(msg['role'], msg['role'])
+    if msg.get('internal'):
+        rotulo = "Instrução interna da etapa"
+    return f"- {rotulo}: {texto}"
+
+
+def _resumir_turnos(antigos: List[Dict], orcamento: int) -> Tuple[Optional[Dict], int]:
+    """
+    Compacta turnos antigos em uma mensagem de sistema dentro do orçamento.
+
+    O resumo é rolante: se não couber, os turnos mais antigos saem primeiro.
+
+    Returns:
+        (mensagem de resumo ou None, número de turnos que ficaram de fora)
+    """
+    linhas = [_linha_resumo(m) for m in antigos]
+    descartados = 0
+    while linhas:
+        conteudo = CABECALHO_RESUMO + "\n" + "\n".join(linhas)
+        if TOKENS_POR_MENSAGEM + estimar_tokens(conteudo) <= orcamento:
+            return {'role': 'system', 'content': conteudo}, descartados
+        linhas.pop(0)
+        descartados += 1
+    return None, descartados
+
+
+def montar_contexto(
+    mensagens: List[Dict],
+    cv_texto: Optional[str] = None,
+    max_tokens: Optional[int] = None,
+    mensagens_recentes: Optional[int] = None
+) -> Tuple[List[Dict], Dict]:
+    """
+    Monta a lista de mensagens a enviar ao GPT respeitando o orçamento de tokens.
+
+    A lista original não é alterada (o histórico exibido na tela continua
+    completo). Campos extras como ``internal`` são removidos do envio.
+
+    Args:
+        mensagens: Histórico completo (st.session_state.mensagens)
+        cv_texto: Texto do CV, para deduplicar blocos repetidos
+        max_tokens: Orçamento de tokens de entrada (padrão: config)
+        mensagens_recentes: Mensagens finais mantidas na íntegra (padrão: config)
+
+    Returns:
+        (mensagens para a API, relatório com tokens_originais, tokens_enviados,
+        tokens_economizados, blocos_cv_removidos, turnos_resumidos)
+    """
+    cfg = core.config.config
+    max_tokens = max_tokens or cfg.CHAT_CONTEXT_MAX_TOKENS
+    mensagens_recentes = mensagens_recentes or cfg.CHAT_CONTEXT_RECENT_MESSAGES
+
+    normalizadas = [
+        {'role': m.get('role', 'user'), 'content': str(m.get('content') or ''), 'internal': bool(m.get('internal'))}
+        for m in mensagens
+    ]
+    tokens_originais = tokens_mensagens(normalizadas)
+
+    normalizadas, blocos_cv = _deduplicar_cv(normalizadas, cv_texto)
+
+    # Mensagens de sistema do início (SYSTEM_PROMPT + CV) ficam fixas
+    inicio = 0
+    while inicio < len(normalizadas) and normalizadas[inicio]['role'] == 'system':
+        inicio += 1
+    sistema = normalizadas[:inicio]
+    conversa = normalizadas[inicio:]
+
+    recentes = conversa[-mensagens_recentes:]
+    antigos = conversa[:-mensagens_recentes] if len(conversa) > mensagens_recentes else []
+
+    resumo = None
+    turnos_resumidos = 0
+    if tokens_mensagens(sistema + antigos + recentes) > max_tokens:
+        # Orçamento apertado: encurtar os recentes, preservando sempre a última mensagem
+        while len(recentes) > 1 and tokens_mensagens(sistema + recentes) > max_tokens:
+            antigos.append(recentes.pop(0))
+
+        if antigos:
+            disponivel = max_tokens - tokens_mensagens(sistema + recentes)
+            resumo, _ = _resumir_turnos(antigos, disponivel)
+            turnos_resumidos = len(antigos)
+            antigos = []
+
+    finais = sistema + ([resumo] if resumo else []) + antigos + recentes
+    enviadas = [{'role': m['role'], 'content': m['content']} for m in finais]
+
+    tokens_enviados = tokens_mensagens(enviadas)
+    if tokens_enviados > max_tokens:
+        logger.warning(f"Contexto do chat acima do orçamento mesmo após compactar: "
+                       f"{tokens_enviados} > {max_tokens} tokens")
+
+    relatorio = {
+        'tokens_originais': tokens_originais,
+        'tokens_enviados': tokens_enviados,
+        'tokens_economizados': max(0, tokens_originais - tokens_enviados),
+        'blocos_cv_removidos': blocos_cv,
+        'turnos_resumidos': turnos_resumidos,
+    }
+    logger.info(
+        f"Contexto do chat: {tokens_enviados}/{tokens_originais} tokens "
+        f"({relatorio['tokens_economizados']} economizados, {blocos_cv} blocos de CV, "
+        f"{turnos_resumidos} turnos resumidos)"
+    )
+    return enviadas, relatorio
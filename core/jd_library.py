@@ -0,0 +1,290 @@
+"""
+Biblioteca de Job Descriptions compartilhada entre sessões.
+
+``gerar_job_description`` faz duas chamadas GPT sequenciais (variações de
+cargo + JD) com temperature 0.3 e seed 42: para o mesmo cargo, todos os
+usuários recebem essencialmente a mesma resposta. Esta biblioteca guarda
+JDs e variações por cargo normalizado em SQLite (core.cache_store), com
+versão e TTL, para que "Gerente de Vendas" seja gerado uma vez por servidor
+e não a cada usuário.
+
+Também permite pré-aquecer a biblioteca com uma lista de cargos e atualizá-la
+em segundo plano (thread ou job em lote via CLI):
+
+    python -m core.jd_library "Gerente de Vendas" "Head de RevOps"
+    python -m core.jd_library --arquivo cargos.txt --forcar
+
+Configuração (core.config.Config / variáveis de ambiente):
+- JD_LIBRARY_ENABLED: liga/desliga a biblioteca (padrão: ligada)
+- JD_LIBRARY_PATH: arquivo SQLite (padrão: cache/jd_library.sqlite)
+- JD_LIBRARY_TTL: validade em segundos (padrão: 30 dias)
+- JD_LIBRARY_MAX_ITEMS: limite de itens LRU (padrão: 2000)
+"""
+
+import argparse
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import core.config
+from core.cache_store import CacheSQLite
+from core.normalizacao_texto import dobrar_acentos
+from core.roteamento_modelos import ROTA_JOB_DESCRIPTION, ROTA_VARIACOES_CARGO, resolver_rota
+
+logger = logging.getLogger(__name__)
+
+# Versão da biblioteca (mudar os prompts de JD/variações ou normalizar_cargo exige incrementar)
+# v2: normalizar_cargo usa dobrar_acentos (símbolos e letras sem decomposição não são mais descartados)
+VERSAO_BIBLIOTECA_JD = "2"
+
+# Rota de modelo que gera cada tipo de item
+_ROTAS_ITENS = {'jd': ROTA_JOB_DESCRIPTION, 'variacoes': ROTA_VARIACOES_CARGO}
+
+_biblioteca: Optional[CacheSQLite] = None
+_lock_biblioteca = threading.Lock()
+
+
+def normalizar_cargo(cargo: Optional[str]) -> str:
+    """
+    Normaliza o nome do cargo para a chave da biblioteca.
+
+    Remove acentos, caixa e espaços extras: "Gerente  de Vendas" e
+    "gerente de vendas" compartilham a mesma JD.
+    """
+    if not cargo:
+        return ""
+    return ' '.join(dobrar_acentos(str(cargo)).lower().split())
+
+
+def _chave(tipo: str, cargo: str) -> str:
+    """
+    Chave de um item da biblioteca ('jd' ou 'variacoes').
+
+    Inclui o modelo e o max_tokens da rota que gera o item: mudar
+    OPENAI_MODEL_ROUTES não serve itens gerados com outra configuração.
+    """
+    _, modelo, max_tokens = resolver_rota(_ROTAS_ITENS[tipo])
+    return f"v{VERSAO_BIBLIOTECA_JD}:{tipo}:{modelo}:{max_tokens}:{normalizar_cargo(cargo)}"
+
+
+def obter_biblioteca_jd() -> Optional[CacheSQLite]:
+    """
+    Retorna a biblioteca de JDs do processo (criada na primeira chamada).
+
+    Returns:
+        CacheSQLite ou None se a biblioteca estiver desligada ou indisponível
+    """
+    global _biblioteca
+
+    cfg = core.config.config
+    if not cfg.JD_LIBRARY_ENABLED:
+        return None
+
+    if _biblioteca is None:
+        with _lock_biblioteca:
+            if _biblioteca is None:
+                try:
+                    _biblioteca = CacheSQLite(
+                        cfg.JD_LIBRARY_PATH,
+                        max_itens=cfg.JD_LIBRARY_MAX_ITEMS,
+                        ttl_segundos=cfg.JD_LIBRARY_TTL,
+                        nome="jd_library"
+                    )
+                    logger.info(f"Biblioteca de JDs aberta em {cfg.JD_LIBRARY_PATH}")
+                except Exception as e:
+                    logger.error(f"Não foi possível abrir a biblioteca de JDs: {e}", exc_info=True)
+                    return None
+    return _biblioteca
+
+
+def resetar_biblioteca_jd() -> None:
+    """Fecha a biblioteca do processo (a próxima chamada reabre com a config atual)."""
+    global _biblioteca
+    with _lock_biblioteca:
+        if _biblioteca is not None:
+            _biblioteca.fechar()
+        _biblioteca = None
+
+
+def estatisticas_biblioteca_jd() -> Dict:
+    """
+    Estatísticas de hit/miss da biblioteca de JDs neste processo.
+
+    Returns:
+        Dict com hits, misses, hit_rate, itens etc. ou {'ativo': False}
+    """
+    biblioteca = obter_biblioteca_jd()
+    if biblioteca is None:
+        return {'ativo': False}
+    return {'ativo': True, **biblioteca.estatisticas()}
+
+
+def obter_jd(cargo: str) -> Optional[str]:
+    """Retorna a JD do cargo na biblioteca, ou None."""
+    biblioteca = obter_biblioteca_jd()
+    if biblioteca is None or not normalizar_cargo(cargo):
+        return None
+    return biblioteca.obter(_chave('jd', cargo))
+
+
+def guardar_jd(cargo: str, jd: str) -> None:
+    """Grava a JD do cargo na biblioteca (ignorado se desligada ou JD vazia)."""
+    biblioteca = obter_biblioteca_jd()
+    if biblioteca is None or not jd or not normalizar_cargo(cargo):
+        return
+    biblioteca.definir(_chave('jd', cargo), jd)
+
+
+def obter_variacoes(cargo: str) -> Optional[List[str]]:
+    """Retorna as variações de mercado do cargo na biblioteca, ou None."""
+    biblioteca = obter_biblioteca_jd()
+    if biblioteca is None or not normalizar_cargo(cargo):
+        return None
+    return biblioteca.obter(_chave('variacoes', cargo))
+
+
+def guardar_variacoes(cargo: str, variacoes: List[str]) -> None:
+    """Grava as variações de mercado do cargo na biblioteca."""
+    biblioteca = obter_biblioteca_jd()
+    if biblioteca is None or not variacoes or not normalizar_cargo(cargo):
+        return
+    biblioteca.definir(_chave('variacoes', cargo), list(variacoes))
+
+
+def pre_aquecer(client, cargos: Iterable[str], forcar: bool = False) -> Dict[str, bool]:
+    """
+    Gera e grava as JDs de uma lista de cargos.
+
+    Cargos já presentes na biblioteca são pulados, exceto com ``forcar=True``
+    (usado pela atualização periódica para renovar o TTL e o conteúdo).
+
+    As chamadas de cargos diferentes são independentes: rodam em paralelo
+    (core.gpt_async) em duas rodadas — variações de todos os cargos, depois
+    as JDs de todos os cargos.
+
+    Args:
+        client: Cliente OpenAI
+        cargos: Cargos a gerar
+        forcar: Se True, regenera mesmo os cargos já presentes
+
+    Returns:
+        Dict {cargo: True se a JD está disponível na biblioteca}
+    """
+    # Import tardio: ats_scorer importa este módulo
+    from core.ats_scorer import (
+        _mensagens_job_description,
+        _mensagens_variacoes_cargo,
+        _processar_variacoes_cargo,
+    )
+    from core.gpt_async import chamar_gpt_varios
+    from core.limitador_taxa import PRIORIDADE_SEGUNDO_PLANO, prioridade_gpt
+
+    resultado = {}
+    pendentes = []
+    vistos = set()
+    for cargo in cargos:
+        normalizado = normalizar_cargo(cargo)
+        if not normalizado or normalizado in vistos:
+            continue
+        vistos.add(normalizado)
+
+        if not forcar and obter_jd(cargo):
+            resultado[cargo] = True
+        else:
+            pendentes.append(cargo)
+
+    if pendentes:
+        # Pré-aquecimento cede a vez ao chat interativo no limitador de taxa
+        with prioridade_gpt(PRIORIDADE_SEGUNDO_PLANO):
+            try:
+                # Rodada 1: variações de mercado (reaproveita as da biblioteca)
+                variacoes = {c: None if forcar else obter_variacoes(c) for c in pendentes}
+                sem_variacoes = [c for c in pendentes if not variacoes[c]]
+                respostas = chamar_gpt_varios(
+                    client, [_mensagens_variacoes_cargo(c) for c in sem_variacoes],
+                    temperature=0.3, seed=42, rota=ROTA_VARIACOES_CARGO
+                )
+                for cargo, resposta in zip(sem_variacoes, respostas):
+                    if resposta:
+                        variacoes[cargo] = _processar_variacoes_cargo(cargo, resposta)
+                        guardar_variacoes(cargo, variacoes[cargo])
+                    else:
+                        logger.warning(f"Falha ao buscar variações de '{cargo}' — usando cargo original")
+                        variacoes[cargo] = [cargo]
+
+                # Rodada 2: JDs
+                jds = chamar_gpt_varios(
+                    client, [_mensagens_job_description(c, variacoes[c]) for c in pendentes],
+                    temperature=0.3, seed=42, rota=ROTA_JOB_DESCRIPTION
+                )
+                for cargo, jd in zip(pendentes, jds):
+                    guardar_jd(cargo, jd)
+                    resultado[cargo] = bool(jd)
+            except Exception as e:
+                logger.error(f"Erro ao pré-aquecer JDs: {e}", exc_info=True)
+                for cargo in pendentes:
+                    resultado.setdefault(cargo, False)
+
+    gerados = sum(resultado.values())
+    logger.info(f"Biblioteca de JDs pré-aquecida: {gerados}/{len(resultado)} cargos disponíveis")
+    return resultado
+
+
+def atualizar_em_segundo_plano(client, cargos: Iterable[str], forcar: bool = True) -> threading.Thread:
+    """
+    Atualiza a biblioteca em uma thread daemon, sem bloquear o app.
+
+    Args:
+        client: Cliente OpenAI
+        cargos: Cargos a (re)gerar
+        forcar: Se True (padrão), regenera mesmo os cargos já presentes
+
+    Returns:
+        Thread iniciada (use ``join()`` para aguardar)
+    """
+    cargos = list(cargos)
+    thread = threading.Thread(
+        target=pre_aquecer,
+        args=(client, cargos),
+        kwargs={'forcar': forcar},
+        name="jd-library-refresh",
+        daemon=True
+    )
+    thread.start()
+    logger.info(f"Atualização da biblioteca de JDs iniciada em segundo plano ({len(cargos)} cargos)")
+    return thread
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: pré-aquece/atualiza a biblioteca de JDs a partir de uma lista de cargos."""
+    parser = argparse.ArgumentParser(description="Pré-aquece a biblioteca de Job Descriptions")
+    parser.add_argument('cargos', nargs='*', help="Cargos a gerar")
+    parser.add_argument('--arquivo', help="Arquivo texto com um cargo por linha")
+    parser.add_argument('--forcar', action='store_true', help="Regenera cargos já presentes")
+    args = parser.parse_args(argv)
+
+    cargos = list(args.cargos)
+    if args.arquivo:
+        with open(args.arquivo, encoding='utf-8') as f:
+            cargos.extend(linha.strip() for linha in f if linha.strip())
+
+    if not cargos:
+        parser.error("informe ao menos um cargo ou --arquivo")
+
+    core.config.setup_environment()
+    if not core.config.config.OPENAI_API_KEY:
+        logger.error("OPENAI_API_KEY não configurada")
+        return 1
+
+    from openai import OpenAI
+    client = OpenAI(api_key=core.config.config.OPENAI_API_KEY)
+
+    resultado = pre_aquecer(client, cargos, forcar=args.forcar)
+    for cargo, ok in resultado.items():
+        print(f"{'OK ' if ok else 'ERRO'} {cargo}")
+    return 0 if all(resultado.values()) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
@@ -0,0 +1,292 @@
+"""
+Limitador de taxa (token bucket) e backoff das chamadas GPT.
+
+Todas as sessões Streamlit de um servidor rodam no mesmo processo e
+dividem o limite da organização na OpenAI (requisições/min e tokens/min).
+Sem coordenação, sessões concorrentes estouram o limite e os usuários veem
+erro de rate limit em vez de uma espera curta.
+
+``LimitadorTaxa`` mantém dois baldes (requisições e tokens) compartilhados
+pelo processo. Quem chama entra numa fila com prioridade (chat interativo
+antes de pré-carregamentos em segundo plano) e prazo máximo de espera.
+
+``calcular_espera`` implementa o backoff exponencial com jitter que
+respeita o cabeçalho ``Retry-After`` das respostas 429; um 429 também
+pausa o balde inteiro, para que as outras sessões não insistam.
+
+Configuração (core.config.Config / variáveis de ambiente):
+- GPT_RATE_LIMIT_RPM: requisições por minuto (0 = sem limite)
+- GPT_RATE_LIMIT_TPM: tokens por minuto (0 = sem limite)
+- GPT_RATE_LIMIT_MAX_WAIT: espera máxima na fila, em segundos
+"""
+
+import contextlib
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator, Optional
+
+import core.config
+
+logger = logging.getLogger(__name__)
+
+# Prioridades (menor = atendido primeiro)
+PRIORIDADE_INTERATIVA = 0
+PRIORIDADE_SEGUNDO_PLANO = 10
+
+# Backoff padrão (segundos)
+BACKOFF_BASE = 1.0
+BACKOFF_MAXIMO = 30.0
+
+_prioridade_atual: ContextVar[int] = ContextVar("prioridade_gpt", default=PRIORIDADE_INTERATIVA)
+
+_limitador = None
+_lock_limitador = threading.Lock()
+
+
+@contextlib.contextmanager
+def prioridade_gpt(prioridade: int) -> Iterator[None]:
+    """Define a prioridade na fila do limitador para as chamadas GPT do bloco."""
+    token = _prioridade_atual.set(prioridade)
+    try:
+        yield
+    finally:
+        _prioridade_atual.reset(token)
+
+
+def prioridade_gpt_atual() -> int:
+    """Prioridade das chamadas GPT neste ponto da execução."""
+    return _prioridade_atual.get()
+
+
+class LimitadorTaxa:
+    """
+    Token bucket de requisições/min e tokens/min com fila por prioridade.
+
+    Args:
+        requisicoes_por_minuto: Capacidade de requisições (0 = sem limite)
+        tokens_por_minuto: Capacidade de tokens (0 = sem limite)
+        relogio: Função de tempo monotônico (injetável nos testes)
+
+    Examples:
+        >>> limitador = LimitadorTaxa(requisicoes_por_minuto=60, tokens_por_minuto=30000)
+        >>> limitador.adquirir(tokens=1500, prazo=10)
+        True
+    """
+
+    def __init__(self, requisicoes_por_minuto: int = 0, tokens_por_minuto: int = 0,
+                 relogio: Callable[[], float] = time.monotonic):
+        self.requisicoes_por_minuto = requisicoes_por_minuto
+        self.tokens_por_minuto = tokens_por_minuto
+        self._relogio = relogio
+        self._condicao = threading.Condition()
+        self._requisicoes = float(requisicoes_por_minuto)
+        self._tokens = float(tokens_por_minuto)
+        self._atualizado_em = relogio()
+        self._pausado_ate = 0.0
+        self._fila = []
+        self._sequencia = itertools.count()
+        self._stats = {'concedidas': 0, 'recusadas': 0, 'espera_total': 0.0, 'pausas': 0}
+
+    def _reabastecer(self, agora: float) -> None:
+        """Repõe os baldes proporcionalmente ao tempo decorrido (lock adquirido)."""
+        decorrido = max(0.0, agora - self._atualizado_em)
+        self._atualizado_em = agora
+        if self.requisicoes_por_minuto:
+            self._requisicoes = min(
+                float(self.requisicoes_por_minuto),
+                self._requisicoes + decorrido * self.requisicoes_por_minuto / 60
+            )
+        if self.tokens_por_minuto:
+            self._tokens = min(
+                float(self.tokens_por_minuto),
+                self._tokens + decorrido * self.tokens_por_minuto / 60
+            )
+
+    def _espera_necessaria(self, tokens: int, agora: float) -> float:
+        """Segundos até haver saldo para a requisição (0 = pode seguir)."""
+        espera = max(0.0, self._pausado_ate - agora)
+        if self.requisicoes_por_minuto and self._requisicoes < 1:
+            espera = max(espera, (1 - self._requisicoes) * 60 / self.requisicoes_por_minuto)
+        if self.tokens_por_minuto and self._tokens < tokens:
+            espera = max(espera, (tokens - self._tokens) * 60 / self.tokens_por_minuto)
+        return espera
+
+    def adquirir(self, tokens: int = 0, prioridade: Optional[int] = None, prazo: Optional[float] = None) -> bool:
+        """
+        Aguarda na fila até haver saldo para uma requisição de ``tokens`` tokens.
+
+        Args:
+            tokens: Tokens estimados da requisição (prompt + max_tokens)
+            prioridade: Posição na fila (padrão: prioridade_gpt_atual())
+            prazo: Espera máxima em segundos (None = sem prazo)
+
+        Returns:
+            True se a requisição foi liberada, False se o prazo acabou
+        """
+        if prioridade is None:
+            prioridade = prioridade_gpt_atual()
+        if self.tokens_por_minuto:
+            # Requisição maior que o balde nunca passaria: limita à capacidade
+            tokens = min(tokens, self.tokens_por_minuto)
+
+        inicio = self._relogio()
+        limite = inicio + prazo if prazo is not None else None
+        entrada = (prioridade, next(self._sequencia))
+
+        with self._condicao:
+            heapq.heappush(self._fila, entrada)
+            try:
+                while True:
+                    agora = self._relogio()
+                    self._reabastecer(agora)
+
+                    espera = None
+                    if self._fila[0] == entrada:
+                        espera = self._espera_necessaria(tokens, agora)
+                        if espera <= 0:
+                            if self.requisicoes_por_minuto:
+                                self._requisicoes -= 1
+                            if self.tokens_por_minuto:
+                                self._tokens -= tokens
+                            self._stats['concedidas'] += 1
+                            self._stats['espera_total'] += agora - inicio
+                            return True
+
+                    if limite is not None:
+                        restante = limite - agora
+                        if restante <= 0:
+                            self._stats['recusadas'] += 1
+                            logger.warning(f"Limitador GPT: prazo de {prazo}s esgotado na fila "
+                                           f"(prioridade {prioridade})")
+                            return False
+                        espera = restante if espera is None else min(espera, restante)
+
+                    self._condicao.wait(espera)
+            finally:
+                if entrada in self._fila:
+                    self._fila.remove(entrada)
+                    heapq.heapify(self._fila)
+                self._condicao.notify_all()
+
+    def devolver_tokens(self, quantidade: int) -> None:
+        """
+        Corrige o balde de tokens com o uso real (positivo devolve, negativo cobra).
+
+        A reserva é feita com a estimativa prompt + max_tokens; após a
+        resposta, a diferença para ``response.usage`` volta ao balde.
+        """
+        if not self.tokens_por_minuto or not quantidade:
+            return
+        with self._condicao:
+            self._reabastecer(self._relogio())
+            self._tokens = min(float(self.tokens_por_minuto), self._tokens + quantidade)
+            self._condicao.notify_all()
+
+    def pausar(self, segundos: float) -> None:
+        """Suspende todas as liberações por ``segundos`` (ex.: Retry-After de um 429)."""
+        if segundos <= 0:
+            return
+        with self._condicao:
+            self._pausado_ate = max(self._pausado_ate, self._relogio() + segundos)
+            self._stats['pausas'] += 1
+            self._condicao.notify_all()
+        logger.info(f"Limitador GPT pausado por {segundos:.1f}s (rate limit da API)")
+
+    def estatisticas(self) -> dict:
+        """Requisições concedidas/recusadas, espera média, fila e saldos atuais."""
+        with self._condicao:
+            self._reabastecer(self._relogio())
+            stats = dict(self._stats)
+            stats['na_fila'] = len(self._fila)
+            stats['saldo_requisicoes'] = round(self._requisicoes, 2) if self.requisicoes_por_minuto else None
+            stats['saldo_tokens'] = round(self._tokens) if self.tokens_por_minuto else None
+        stats['espera_media'] = round(stats['espera_total'] / stats['concedidas'], 4) if stats['concedidas'] else 0.0
+        return stats
+
+
+def obter_limitador() -> Optional[LimitadorTaxa]:
+    """
+    Retorna o limitador do processo (criado na primeira chamada).
+
+    Returns:
+        LimitadorTaxa ou None se RPM e TPM estiverem desligados
+    """
+    global _limitador
+
+    cfg = core.config.config
+    if not cfg.GPT_RATE_LIMIT_RPM and not cfg.GPT_RATE_LIMIT_TPM:
+        return None
+
+    if _limitador is None:
+        with _lock_limitador:
+            if _limitador is None:
+                _limitador = LimitadorTaxa(cfg.GPT_RATE_LIMIT_RPM, cfg.GPT_RATE_LIMIT_TPM)
+                logger.info(f"Limitador GPT ativo: {cfg.GPT_RATE_LIMIT_RPM} req/min, "
+                            f"{cfg.GPT_RATE_LIMIT_TPM} tokens/min")
+    return _limitador
+
+
+def resetar_limitador() -> None:
+    """Descarta o limitador do processo (o próximo uso recria com a config atual)."""
+    global _limitador
+    with _lock_limitador:
+        _limitador = None
+
+
+def retry_after(erro: Exception) -> Optional[float]:
+    """
+    Segundos pedidos pela API no cabeçalho Retry-After (ou retry-after-ms).
+
+    Returns:
+        Segundos de espera ou None se o erro não trouxer o cabeçalho
+    """
+    resposta = getattr(erro, 'response', None)
+    cabecalhos = getattr(resposta, 'headers', None)
+    if not cabecalhos:
+        return None
+
+    try:
+        valor_ms = cabecalhos.get('retry-after-ms')
+        if valor_ms is not None:
+            return max(0.0, float(valor_ms) / 1000)
+
+        valor = cabecalhos.get('retry-after')
+        if valor is None:
+            return None
+        try:
+            return max(0.0, float(valor))
+        except ValueError:
+            # Formato HTTP-date
+            return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def calcular_espera(tentativa: int, erro: Optional[Exception] = None,
+                    base: float = BACKOFF_BASE, maximo: float = BACKOFF_MAXIMO) -> float:
+    """
+    Espera antes da próxima tentativa: Retry-After ou backoff exponencial com jitter.
+
+    Sem Retry-After usa "full jitter" (uniforme entre 0 e base·2^tentativa,
+    limitado a ``maximo``), o que espalha os retries de sessões concorrentes.
+    Com Retry-After espera o pedido pela API mais até 10% de jitter.
+
+    Args:
+        tentativa: Número da tentativa que falhou (1, 2, ...)
+        erro: Exceção da tentativa (para ler Retry-After)
+        base: Espera base em segundos
+        maximo: Teto da espera em segundos
+
+    Returns:
+        Segundos de espera
+    """
+    pedido = retry_after(erro) if erro is not None else None
+    if pedido is not None:
+        return min(maximo, pedido + random.uniform(0, pedido * 0.1))
+    return random.uniform(0, min(maximo, base * 2 ** tentativa))
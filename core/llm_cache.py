@@ -0,0 +1,125 @@
+"""
+Cache de respostas determinísticas do GPT.
+
+Várias chamadas passam por ``chamar_gpt`` com ``temperature <= 0.3`` e
+``seed=42`` (extrair_cargo_do_cv, buscar_variacoes_cargo,
+gerar_job_description, _analisar_com_llm, executar_analise_cv, análise do
+upload). Para as mesmas mensagens essas chamadas são, na prática, funções
+puras: repetir a análise não precisa ir à rede.
+
+A chave é o hash SHA-256 de modelo + mensagens + parâmetros de geração. Só
+são cacheáveis chamadas com seed e temperatura até
+``LLM_CACHE_MAX_TEMPERATURE``. O backend é plugável (core.cache_store):
+- 'memoria': LRU em memória do processo (padrão)
+- 'sqlite': arquivo SQLite compartilhado, sobrevive a reinícios
+
+Configuração (core.config.Config / variáveis de ambiente):
+- LLM_CACHE_ENABLED: liga o cache (padrão: desligado — opt-in)
+- LLM_CACHE_BACKEND: 'memoria' ou 'sqlite'
+- LLM_CACHE_PATH: arquivo SQLite (backend 'sqlite')
+- LLM_CACHE_TTL: validade em segundos (padrão: 24h)
+- LLM_CACHE_MAX_ITEMS: limite de itens LRU (padrão: 1000)
+- LLM_CACHE_MAX_TEMPERATURE: temperatura máxima cacheável (padrão: 0.3)
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import core.config
+from core.cache_store import CacheMemoriaLRU, CacheSQLite
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros da chamada que não mudam a resposta (ficam fora da chave)
+_PARAMETROS_IGNORADOS = {'timeout', 'stream', 'stream_options'}
+
+_cache_llm = None
+_lock_cache = threading.Lock()
+
+
+def chamada_cacheavel(temperature: Optional[float], seed: Optional[int]) -> bool:
+    """True se a chamada é determinística o bastante para ir ao cache."""
+    cfg = core.config.config
+    return (
+        seed is not None
+        and temperature is not None
+        and temperature <= cfg.LLM_CACHE_MAX_TEMPERATURE
+    )
+
+
+def gerar_chave_llm(params: Dict[str, Any]) -> str:
+    """
+    Gera a chave SHA-256 de uma chamada ao GPT.
+
+    Args:
+        params: Parâmetros de ``client.chat.completions.create`` (model,
+            messages, temperature, seed, max_tokens...)
+
+    Returns:
+        Hash hexadecimal
+    """
+    relevantes = {k: v for k, v in params.items() if k not in _PARAMETROS_IGNORADOS}
+    payload = json.dumps(relevantes, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def obter_cache_llm():
+    """
+    Retorna o cache de respostas do processo (criado na primeira chamada).
+
+    Returns:
+        CacheMemoriaLRU/CacheSQLite ou None se o cache estiver desligado
+    """
+    global _cache_llm
+
+    cfg = core.config.config
+    if not cfg.LLM_CACHE_ENABLED:
+        return None
+
+    if _cache_llm is None:
+        with _lock_cache:
+            if _cache_llm is None:
+                try:
+                    if cfg.LLM_CACHE_BACKEND == 'sqlite':
+                        _cache_llm = CacheSQLite(
+                            cfg.LLM_CACHE_PATH,
+                            max_itens=cfg.LLM_CACHE_MAX_ITEMS,
+                            ttl_segundos=cfg.LLM_CACHE_TTL,
+                            nome="llm"
+                        )
+                    else:
+                        _cache_llm = CacheMemoriaLRU(
+                            max_itens=cfg.LLM_CACHE_MAX_ITEMS,
+                            ttl_segundos=cfg.LLM_CACHE_TTL,
+                            nome="llm"
+                        )
+                    logger.info(f"Cache de respostas GPT ativo (backend: {cfg.LLM_CACHE_BACKEND})")
+                except Exception as e:
+                    logger.error(f"Não foi possível abrir o cache de respostas GPT: {e}", exc_info=True)
+                    return None
+    return _cache_llm
+
+
+def estatisticas_cache_llm() -> Dict:
+    """
+    Estatísticas de hit/miss do cache de respostas neste processo.
+
+    Returns:
+        Dict com hits, misses, hit_rate, itens etc. ou {'ativo': False}
+    """
+    cache = obter_cache_llm()
+    if cache is None:
+        return {'ativo': False}
+    return {'ativo': True, 'backend': core.config.config.LLM_CACHE_BACKEND, **cache.estatisticas()}
+
+
+def resetar_cache_llm() -> None:
+    """Fecha o cache do processo (a próxima chamada reabre com a config atual)."""
+    global _cache_llm
+    with _lock_cache:
+        if _cache_llm is not None:
+            _cache_llm.fechar()
+        _cache_llm = None
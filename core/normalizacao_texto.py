@@ -0,0 +1,186 @@
+"""
+Normalização de texto compartilhada por extração, score ATS e pós-processamento do GPT.
+
+Vários pontos varriam o mesmo texto com regexes próprias: corrigir_formatacao
+rodava três ``re.sub`` em cada resposta do GPT, ``_limpar_texto`` do ATS
+baixava a caixa e tirava a pontuação, e o classificador de perfil e o
+analisador de bullets baixavam a caixa e re-separavam o CV em linhas a cada
+tela e a cada rerun do Streamlit.
+
+Aqui ficam os padrões pré-compilados e a visão normalizada de um documento
+(VisaoTexto): cada forma (minúsculas, limpa, linhas, bullets, tokens) é
+calculada na primeira vez que alguém pede e guardada. As visões
+são memoizadas pelo hash BLAKE2b do conteúdo (LRU em memória), então o
+mesmo CV é normalizado uma vez por processo, não por tela.
+"""
+
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import cached_property
+from typing import Optional, Tuple
+
+# Visões mantidas em memória (CVs e vagas das sessões ativas)
+MAX_VISOES = 64
+
+_RE_MOEDA = re.compile(r'\bR\$\s*|\bR\s+')
+_RE_ESPACOS_HORIZONTAIS = re.compile(r'[ \t]{2,}')
+_RE_PONTUACAO = re.compile(r'[^\w\s]')
+_RE_BULLET = re.compile(r'^[\s]*[•\-\*]\s*(.+)$')
+# Letras de outros alfabetos que podem ter marcas combinantes (fallback NFKD)
+_RE_FORA_DA_TABELA = re.compile(r'[ƀ-ɏḀ-ỿ]|[̀-ͯ]')
+
+# Letras acentuadas do Latin-1 e Latin Extended-A → letra base
+_TABELA_ACENTOS = {
+    codigo: base
+    for codigo in range(0xC0, 0x180)
+    if (base := unicodedata.normalize('NFKD', chr(codigo))[0]) != chr(codigo) and base.isascii()
+}
+
+_visoes: "OrderedDict[str, VisaoTexto]" = OrderedDict()
+_lock_visoes = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def corrigir_formatacao(texto: Optional[str]) -> Optional[str]:
+    """
+    Corrige a formatação de texto removendo prefixos de moeda e normalizando espaços.
+
+    Args:
+        texto: Texto a ser formatado
+
+    Returns:
+        Texto formatado ou None se entrada for None
+
+    Examples:
+        >>> corrigir_formatacao("R$ 5.000")
+        "5.000"
+        >>> corrigir_formatacao(None)
+        None
+    """
+    if not texto:
+        return texto
+
+    # Remove qualquer prefixo de moeda (R$ ou R)
+    if 'R' in texto:
+        texto = _RE_MOEDA.sub('', texto)
+
+    # Mantém quebras de linha (não usar \s aqui)
+    texto = _RE_ESPACOS_HORIZONTAIS.sub(' ', texto)
+
+    # Normaliza quebras do Windows
+    return texto.replace('\r\n', '\n')
+
+
+def dobrar_acentos(texto: str) -> str:
+    """
+    Remove acentos de letras latinas ("Gestão" → "Gestao").
+
+    Usa uma tabela pré-calculada (``str.translate``) para o Latin-1 e o
+    Latin Extended-A e só cai para NFKD em outros alfabetos. Outros
+    caracteres (•, –, emojis) são mantidos.
+    """
+    if texto.isascii():
+        return texto
+    texto = texto.translate(_TABELA_ACENTOS)
+    if not _RE_FORA_DA_TABELA.search(texto):
+        return texto
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def limpar_texto(texto: str) -> str:
+    """Minúsculas, sem pontuação e com espaços colapsados (entrada do TF-IDF do ATS)."""
+    return _limpar_minusculo(str(texto).lower())
+
+
+def _limpar_minusculo(minusculo: str) -> str:
+    return ' '.join(_RE_PONTUACAO.sub('', minusculo).split())
+
+
+class VisaoTexto:
+    """
+    Formas normalizadas de um documento, calculadas sob demanda uma única vez.
+
+    Não crie diretamente: use visao_texto, que memoiza pelo conteúdo.
+
+    Attributes:
+        texto: Texto original
+        chave: Hash BLAKE2b do texto
+    """
+
+    def __init__(self, texto: str, chave: str):
+        self.texto = texto
+        self.chave = chave
+
+    @cached_property
+    def minusculo(self) -> str:
+        return self.texto.lower()
+
+    @cached_property
+    def limpo(self) -> str:
+        """Mesmo resultado de limpar_texto(texto)."""
+        return _limpar_minusculo(self.minusculo)
+
+    @cached_property
+    def tokens(self) -> Tuple[str, ...]:
+        return tuple(self.limpo.split())
+
+    @cached_property
+    def linhas(self) -> Tuple[str, ...]:
+        """Linhas do texto, sem espaços nas pontas."""
+        return tuple(linha.strip() for linha in self.texto.split('\n'))
+
+    @cached_property
+    def bullets(self) -> Tuple[str, ...]:
+        """Conteúdo das linhas que começam com •, - ou *."""
+        return tuple(m.group(1).strip() for m in map(_RE_BULLET.match, self.linhas) if m)
+
+
+def gerar_chave_texto(texto: str) -> str:
+    """Hash BLAKE2b (128 bits) do conteúdo do texto."""
+    return hashlib.blake2b(texto.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+
+def visao_texto(texto: Optional[str]) -> VisaoTexto:
+    """
+    Visão normalizada de um documento, memoizada pelo conteúdo.
+
+    Args:
+        texto: CV, vaga ou outro documento (None vira "")
+
+    Returns:
+        VisaoTexto compartilhada por todos os chamadores com o mesmo conteúdo
+
+    Examples:
+        >>> visao = visao_texto(cv_texto)
+        >>> 'gestão' in visao.minusculo, len(visao.bullets)
+    """
+    texto = texto or ""
+    chave = gerar_chave_texto(texto)
+    with _lock_visoes:
+        visao = _visoes.get(chave)
+        if visao is not None:
+            _visoes.move_to_end(chave)
+            _stats['hits'] += 1
+            return visao
+        _stats['misses'] += 1
+        visao = _visoes[chave] = VisaoTexto(texto, chave)
+        if len(_visoes) > MAX_VISOES:
+            _visoes.popitem(last=False)
+    return visao
+
+
+def estatisticas_visoes() -> dict:
+    """Hits/misses da memoização de visões e quantas estão em memória."""
+    with _lock_visoes:
+        return {**_stats, 'itens': len(_visoes)}
+
+
+def resetar_visoes() -> None:
+    """Descarta as visões memoizadas."""
+    with _lock_visoes:
+        _visoes.clear()
+        _stats.update(hits=0, misses=0)
@@ -0,0 +1,339 @@
+"""
+Pipeline de upload de CV: valida, detecta o tipo, calcula o hash e extrai
+o texto numa única leitura do arquivo.
+
+Antes, um upload era lido várias vezes: validar_arquivo_cv olhava tamanho e
+extensão, validar_pdf voltava ao início para ler o cabeçalho,
+extrair_texto_txt relia e decodificava o arquivo inteiro para cada um de
+quatro encodings e o extrator ainda fazia o parse de novo.
+
+Aqui os bytes são lidos uma vez (``UploadedFile.getvalue()`` devolve o
+buffer interno do BytesIO, sem cópia) e todas as etapas trabalham sobre o
+mesmo objeto, fatiado por ``memoryview``:
+
+1. leitura e validação de tamanho
+2. detecção do tipo real pelos magic bytes (%PDF, zip do OOXML, OLE2 do
+   .doc antigo, texto); a extensão só decide se o upload é aceito
+3. hash BLAKE2b do conteúdo (core.cache_extracao) e consulta ao cache
+4. extração pelo extrator do tipo real; TXT detecta BOM e encoding e
+   decodifica uma única vez
+
+O resultado é um ResultadoUpload com o texto, os metadados e o tempo de
+cada etapa. As mensagens de erro são as exibidas ao usuário; quem chama
+decide como mostrá-las (core.utils.extrair_texto_universal usa st.error).
+"""
+
+import codecs
+import logging
+import re
+import time
+import zipfile
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+import PyPDF2
+
+import core.config
+from core.cache_extracao import gerar_chave_extracao, obter_cache_extracao
+from core.extracao_docx import extrair_textos_docx
+from core.extracao_pdf import extrair_texto_paginado
+
+logger = logging.getLogger(__name__)
+
+FORMATO_PDF = "pdf"
+FORMATO_DOCX = "docx"
+FORMATO_DOC = "doc"
+FORMATO_TXT = "txt"
+
+# Extensões aceitas no upload
+EXTENSOES_SUPORTADAS = ("pdf", "docx", "doc", "txt")
+
+# Tamanho máximo de arquivos que não são PDF (Word pode ser maior)
+TAMANHO_MAX_MB = 15
+
+# BOMs em ordem de verificação (UTF-32 antes de UTF-16: FF FE 00 00 começa com FF FE)
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Bytes que no latin-1 são caracteres de controle C1 e no cp1252 são aspas, travessões etc.
+_BYTES_CP1252 = re.compile(rb"[\x80-\x9f]")
+
+_OLE2 = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_ZIP = b"PK\x03\x04"
+
+
+class ErroUpload(Exception):
+    """Falha do upload com a mensagem a exibir ao usuário."""
+
+
+@dataclass
+class ResultadoUpload:
+    """
+    Resultado de processar_upload.
+
+    Attributes:
+        nome: Nome do arquivo enviado
+        extensao: Extensão declarada no nome
+        formato: Tipo real detectado pelos magic bytes ('pdf', 'docx', 'doc', 'txt')
+        tamanho: Tamanho em bytes
+        chave: Hash BLAKE2b do conteúdo (chave do cache de extrações)
+        texto: Texto extraído ou None em caso de erro
+        metadados: Páginas (PDF), parágrafos (DOCX), encoding e BOM (TXT)
+        do_cache: True se o texto veio do cache de extrações
+        erro: Mensagem para o usuário ou None
+        tempos: Segundos gastos em cada etapa e no total
+    """
+
+    nome: str = ""
+    extensao: str = ""
+    formato: Optional[str] = None
+    tamanho: int = 0
+    chave: Optional[str] = None
+    texto: Optional[str] = None
+    metadados: Dict = field(default_factory=dict)
+    do_cache: bool = False
+    erro: Optional[str] = None
+    tempos: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def valido(self) -> bool:
+        return self.erro is None and self.texto is not None
+
+
+def ler_bytes(arquivo) -> bytes:
+    """
+    Conteúdo bruto de um UploadedFile (ou outro objeto de arquivo), lido uma vez.
+
+    ``BytesIO.getvalue()`` compartilha o buffer interno enquanto ninguém
+    escreve no arquivo; ``io.BytesIO(dados)`` nos extratores também não copia.
+    """
+    if isinstance(arquivo, (bytes, bytearray)):
+        return bytes(arquivo)
+    if hasattr(arquivo, 'getvalue'):
+        dados = arquivo.getvalue()
+    else:
+        arquivo.seek(0)
+        dados = arquivo.read()
+    return dados.encode('utf-8') if isinstance(dados, str) else dados
+
+
+def detectar_formato(buffer: memoryview) -> Optional[str]:
+    """
+    Tipo real do arquivo pelos magic bytes.
+
+    Args:
+        buffer: Conteúdo do arquivo
+
+    Returns:
+        'pdf', 'docx' (qualquer zip: o extrator confere o pacote), 'doc'
+        (OLE2), 'txt' (sem bytes nulos ou com BOM) ou None se desconhecido
+    """
+    cabecalho = bytes(buffer[:1024])
+    # A especificação tolera lixo antes do %PDF- no primeiro KB
+    if b"%PDF-" in cabecalho:
+        return FORMATO_PDF
+    if cabecalho.startswith(_ZIP):
+        return FORMATO_DOCX
+    if cabecalho.startswith(_OLE2):
+        return FORMATO_DOC
+    if detectar_bom(buffer) or b"\x00" not in bytes(buffer[:8192]):
+        return FORMATO_TXT
+    return None
+
+
+def detectar_bom(buffer: memoryview) -> Optional[str]:
+    """Codec do BOM no início do buffer (que também o remove) ou None."""
+    inicio = bytes(buffer[:4])
+    for bom, codec in _BOMS:
+        if inicio.startswith(bom):
+            return codec
+    return None
+
+
+def decodificar_texto(buffer: memoryview) -> Tuple[str, str, bool]:
+    """
+    Decodifica um arquivo de texto com uma única decodificação completa.
+
+    BOM define o encoding; sem BOM tenta UTF-8 e, se falhar, cp1252 quando
+    houver bytes 0x80–0x9F (aspas e travessões do Windows) ou latin-1.
+
+    Returns:
+        Tupla (texto, encoding, tinha_bom)
+    """
+    codec = detectar_bom(buffer)
+    if codec:
+        return str(buffer, codec), codec, True
+    try:
+        return str(buffer, "utf-8"), "utf-8", False
+    except UnicodeDecodeError:
+        pass
+    if _BYTES_CP1252.search(buffer):
+        try:
+            return str(buffer, "cp1252"), "cp1252", False
+        except UnicodeDecodeError:
+            pass  # 0x81, 0x8D, 0x8F, 0x90 e 0x9D não existem no cp1252
+    return str(buffer, "latin-1"), "latin-1", False
+
+
+def _extrair_pdf(dados: bytes, buffer: memoryview, progresso) -> Tuple[str, Dict]:
+    paginas = {'total': 0}
+    desistidas = []
+
+    def _acompanhar(prontas: int, total: int) -> None:
+        paginas['total'] = total
+        if progresso is not None:
+            progresso(prontas, total)
+
+    try:
+        texto = extrair_texto_paginado(dados, progresso=_acompanhar, desistidas=desistidas)
+    except PyPDF2.errors.PdfReadError as e:
+        logger.error(f"Erro ao ler PDF (arquivo corrompido ou inválido): {e}")
+        raise ErroUpload("Erro ao ler PDF: arquivo pode estar corrompido ou protegido por senha")
+    except Exception as e:
+        logger.error(f"Erro inesperado ao extrair texto do PDF: {e}", exc_info=True)
+        raise ErroUpload(f"Erro ao ler PDF: {e}")
+
+    if not texto or not texto.strip():
+        logger.warning("PDF não contém texto extraível")
+        raise ErroUpload("O PDF não contém texto extraível. Certifique-se de que não é uma imagem escaneada.")
+    return texto, {'paginas': paginas['total'], 'paginas_vazias_por_timeout': len(desistidas)}
+
+
+def _extrair_docx(dados: bytes, buffer: memoryview, progresso) -> Tuple[str, Dict]:
+    try:
+        # Parágrafos e tabelas na ordem do documento (core.extracao_docx)
+        textos = extrair_textos_docx(dados)
+    except zipfile.BadZipFile:
+        logger.error("Tentativa de processar arquivo .doc antigo (formato binário não suportado)")
+        raise ErroUpload("❌ Arquivo .doc antigo detectado. Por favor, converta para .docx ou use formato PDF/TXT")
+    except Exception as e:
+        logger.error(f"Erro ao extrair DOCX: {e}", exc_info=True)
+        raise ErroUpload(f"❌ Erro ao ler arquivo Word: {e}")
+
+    texto = "\n".join(textos)
+    if not texto.strip():
+        logger.warning("DOCX extraído está vazio")
+        raise ErroUpload("⚠️ Arquivo Word vazio ou sem texto extraível")
+    return texto, {'paragrafos': len(textos)}
+
+
+def _extrair_doc(dados: bytes, buffer: memoryview, progresso) -> Tuple[str, Dict]:
+    logger.error("Tentativa de processar arquivo .doc antigo (formato binário não suportado)")
+    raise ErroUpload("❌ Arquivo .doc antigo detectado. Por favor, converta para .docx ou use formato PDF/TXT")
+
+
+def _extrair_txt(dados: bytes, buffer: memoryview, progresso) -> Tuple[str, Dict]:
+    texto, encoding, bom = decodificar_texto(buffer)
+    if not texto.strip():
+        logger.warning("TXT extraído está vazio")
+        raise ErroUpload("⚠️ Arquivo TXT vazio")
+    return texto, {'encoding': encoding, 'bom': bom}
+
+
+_EXTRATORES: Dict[str, Callable[[bytes, memoryview, Optional[Callable[[int, int], None]]], Tuple[str, Dict]]] = {
+    FORMATO_PDF: _extrair_pdf,
+    FORMATO_DOCX: _extrair_docx,
+    FORMATO_DOC: _extrair_doc,
+    FORMATO_TXT: _extrair_txt,
+}
+
+
+def _tamanho_maximo(formato: str) -> int:
+    mb = core.config.config.MAX_PDF_SIZE_MB if formato == FORMATO_PDF else TAMANHO_MAX_MB
+    return mb * 1024 * 1024
+
+
+def processar_upload(arquivo, extensao: Optional[str] = None,
+                     progresso: Optional[Callable[[int, int], None]] = None,
+                     usar_cache: bool = True) -> ResultadoUpload:
+    """
+    Processa um upload numa única leitura: valida, detecta, hasheia e extrai.
+
+    Args:
+        arquivo: UploadedFile do Streamlit (ou objeto de arquivo / bytes)
+        extensao: Extensão declarada (padrão: a do nome do arquivo)
+        progresso: Callback (páginas prontas, total) da extração de PDF
+        usar_cache: Consulta e grava o cache de extrações
+
+    Returns:
+        ResultadoUpload; em caso de falha ``erro`` traz a mensagem ao usuário
+    """
+    inicio = time.perf_counter()
+    nome = getattr(arquivo, 'name', '') or ''
+    extensao = (extensao or nome.rsplit('.', 1)[-1]).lower()
+    resultado = ResultadoUpload(nome=nome, extensao=extensao)
+    tempos = resultado.tempos
+
+    def _marcar(etapa: str, desde: float) -> float:
+        agora = time.perf_counter()
+        tempos[etapa] = round(agora - desde, 6)
+        return agora
+
+    try:
+        if extensao not in EXTENSOES_SUPORTADAS:
+            raise ErroUpload(f"❌ Formato não suportado: {extensao}")
+
+        dados = ler_bytes(arquivo)
+        buffer = memoryview(dados)
+        resultado.tamanho = len(buffer)
+        passo = _marcar('leitura', inicio)
+
+        if not resultado.tamanho:
+            raise ErroUpload("❌ Arquivo vazio")
+        formato = detectar_formato(buffer)
+        if formato is None:
+            raise ErroUpload(f"❌ Conteúdo do arquivo não reconhecido como {extensao.upper()}")
+        if formato != extensao and not (formato == FORMATO_DOCX and extensao == FORMATO_DOC):
+            logger.warning(f"Arquivo '{nome}' declarado como .{extensao} é {formato.upper()} pelo conteúdo")
+        resultado.formato = formato
+        if resultado.tamanho > _tamanho_maximo(formato):
+            raise ErroUpload(f"Arquivo muito grande ({resultado.tamanho / (1024 * 1024):.1f}MB). "
+                             f"Máximo: {_tamanho_maximo(formato) // (1024 * 1024)}MB")
+        passo = _marcar('deteccao', passo)
+
+        resultado.chave = gerar_chave_extracao(buffer, formato)
+        passo = _marcar('hash', passo)
+
+        cache = obter_cache_extracao() if usar_cache else None
+        if cache is not None:
+            extracao = cache.obter(resultado.chave)
+            passo = _marcar('cache', passo)
+            if extracao is not None:
+                resultado.texto = extracao.pop('texto')
+                resultado.metadados = extracao
+                resultado.do_cache = True
+                return resultado
+
+        logger.info(f"Iniciando extração de texto de {formato.upper()}")
+        resultado.texto, metadados = _EXTRATORES[formato](dados, buffer, progresso)
+        passo = _marcar('extracao', passo)
+        resultado.metadados = {
+            'formato': formato,
+            'caracteres': len(resultado.texto),
+            'bytes': resultado.tamanho,
+            **metadados,
+        }
+        if metadados.get('paginas_vazias_por_timeout'):
+            # Extração degradada (páginas desistidas): o próximo envio tenta de novo
+            logger.warning(f"{metadados['paginas_vazias_por_timeout']} página(s) de '{nome}' "
+                           f"desistidas por timeout: extração não vai para o cache")
+        elif cache is not None:
+            cache.definir(resultado.chave, {'texto': resultado.texto, **resultado.metadados})
+        logger.info(f"{formato.upper()} extraído com sucesso: {len(resultado.texto)} caracteres")
+        return resultado
+
+    except ErroUpload as e:
+        resultado.erro = str(e)
+        return resultado
+    except Exception as e:
+        logger.error(f"Erro ao processar upload '{nome}': {e}", exc_info=True)
+        resultado.erro = f"❌ Erro ao ler o arquivo: {e}"
+        return resultado
+    finally:
+        _marcar('total', inicio)
+        logger.debug(f"Upload '{nome}' ({resultado.formato}, {resultado.tamanho} bytes): tempos {tempos}")
@@ -0,0 +1,125 @@
+"""
+Roteamento de modelos: qual modelo e limite de tokens cada chamada GPT usa.
+
+Tarefas curtas e estruturadas (extrair o cargo do CV, listar variações de
+cargo, gerar a próxima pergunta dinâmica, reparar um JSON) não precisam do
+modelo principal: um modelo rápido responde em menos tempo e custa uma
+fração. Respostas com schema (análise ATS) têm max_tokens do tamanho do
+schema. Cada chamada é resolvida para uma rota:
+
+1. a rota explícita passada pelo ponto de chamada (``rota=...``)
+2. senão, o contexto de telemetria (diagnostico, coleta_focada, reescrita,
+   linkedin, validacao...), se houver rota com esse nome
+3. senão, a rota 'padrao' (Config.MODEL / Config.MAX_TOKENS)
+
+A latência é medida por rota em core.gpt_metricas, para ajuste fino.
+
+Configuração (core.config.Config / variáveis de ambiente):
+- OPENAI_MODEL / OPENAI_MAX_TOKENS: modelo e limite da rota 'padrao'
+- OPENAI_MODEL_FAST: modelo das rotas rápidas (padrão: gpt-4o-mini)
+- OPENAI_MODEL_ROUTES: sobrescreve/cria rotas, no formato
+  ``rota=modelo:max_tokens,rota2=modelo`` (ex.: ``validacao=gpt-4o-mini:800``)
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import core.config
+from core.gpt_metricas import contexto_gpt_atual
+
+logger = logging.getLogger(__name__)
+
+ROTA_PADRAO = "padrao"
+ROTA_EXTRACAO_CARGO = "extracao_cargo"
+ROTA_VARIACOES_CARGO = "variacoes_cargo"
+ROTA_PERGUNTA_DINAMICA = "pergunta_dinamica"
+ROTA_ANALISE_ATS = "analise_ats"
+ROTA_REPARO_JSON = "reparo_json"
+ROTA_JOB_DESCRIPTION = "job_description"
+
+# Marcador para "o modelo rápido da configuração" (OPENAI_MODEL_FAST)
+MODELO_RAPIDO = "rapido"
+
+# rota -> (modelo, max_tokens); None = valor da rota 'padrao'
+ROTAS_PADRAO: Dict[str, Tuple[Optional[str], Optional[int]]] = {
+    ROTA_PADRAO: (None, None),
+    ROTA_EXTRACAO_CARGO: (MODELO_RAPIDO, 60),
+    ROTA_VARIACOES_CARGO: (MODELO_RAPIDO, 400),
+    ROTA_PERGUNTA_DINAMICA: (MODELO_RAPIDO, 600),
+    # JSON do schema AnaliseLLM (core.ats_scorer): ~1k tokens com folga
+    ROTA_ANALISE_ATS: (None, 1500),
+    ROTA_REPARO_JSON: (MODELO_RAPIDO, 1500),
+    # JD técnica da biblioteca (core.jd_library): rota fixa, não a do contexto de quem pede
+    ROTA_JOB_DESCRIPTION: (None, None),
+}
+
+
+def interpretar_rotas(texto: Optional[str]) -> Dict[str, Tuple[Optional[str], Optional[int]]]:
+    """
+    Interpreta OPENAI_MODEL_ROUTES (``rota=modelo:max_tokens,...``).
+
+    Modelo ou limite podem ficar vazios (``rota=:300`` muda só o limite).
+
+    Raises:
+        ValueError: Se o texto estiver mal formatado
+    """
+    rotas = {}
+    for item in (texto or "").split(','):
+        item = item.strip()
+        if not item:
+            continue
+        nome, separador, valor = item.partition('=')
+        if not separador or not nome.strip():
+            raise ValueError(f"Rota de modelo inválida: '{item}' (esperado rota=modelo:max_tokens)")
+        modelo, _, limite = valor.partition(':')
+        try:
+            max_tokens = int(limite) if limite.strip() else None
+        except ValueError:
+            raise ValueError(f"max_tokens inválido na rota '{nome.strip()}': '{limite}'")
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError(f"max_tokens da rota '{nome.strip()}' deve ser maior que 0")
+        rotas[nome.strip()] = (modelo.strip() or None, max_tokens)
+    return rotas
+
+
+def tabela_rotas() -> Dict[str, Tuple[str, int]]:
+    """
+    Tabela efetiva de rotas (padrões + OPENAI_MODEL_ROUTES), já resolvida.
+
+    Returns:
+        Dict rota -> (modelo, max_tokens)
+    """
+    cfg = core.config.config
+    combinadas = dict(ROTAS_PADRAO)
+    try:
+        for nome, (modelo, max_tokens) in interpretar_rotas(cfg.MODEL_ROUTES).items():
+            modelo_base, limite_base = combinadas.get(nome, (None, None))
+            combinadas[nome] = (modelo or modelo_base, max_tokens or limite_base)
+    except ValueError as e:
+        logger.warning(f"OPENAI_MODEL_ROUTES ignorado: {e}")
+
+    tabela = {}
+    for nome, (modelo, max_tokens) in combinadas.items():
+        if modelo == MODELO_RAPIDO:
+            modelo = cfg.MODEL_FAST
+        tabela[nome] = (modelo or cfg.MODEL, max_tokens or cfg.MAX_TOKENS)
+    return tabela
+
+
+def resolver_rota(rota: Optional[str] = None) -> Tuple[str, str, int]:
+    """
+    Resolve a rota de uma chamada GPT.
+
+    Args:
+        rota: Rota explícita do ponto de chamada (opcional)
+
+    Returns:
+        (nome da rota, modelo, max_tokens)
+    """
+    tabela = tabela_rotas()
+    for candidata in (rota, contexto_gpt_atual()):
+        if candidata and candidata in tabela:
+            return (candidata, *tabela[candidata])
+    if rota:
+        logger.debug(f"Rota GPT '{rota}' desconhecida — usando '{ROTA_PADRAO}'")
+    return (ROTA_PADRAO, *tabela[ROTA_PADRAO])
@@ -0,0 +1,367 @@
+"""
+Servidor local que imita o endpoint de chat completions da OpenAI.
+
+Serve para medir retry, rate limit, streaming e concorrência de
+core.utils / core.gpt_telemetry sob falhas realistas, sem o serviço real
+(e sem custo). Implementa ``POST /v1/chat/completions`` com e sem
+``stream=True`` (SSE, com o chunk final de ``usage`` quando pedido), e
+injeta:
+
+- latência por distribuição: ``fixa:S``, ``uniforme:A,B``,
+  ``normal:MEDIA,DESVIO`` ou ``lognormal:MEDIANA,SIGMA`` (segundos)
+- HTTP 429 com Retry-After (rate limit) e 429 ``insufficient_quota``
+- timeouts (a resposta demora mais que o timeout do cliente)
+- HTTP 500
+
+As respostas são modelos (``string.Template``) por tipo de requisição,
+com o formato das saídas reais: JSON da análise ATS (_analisar_com_llm),
+Job Description, variações de cargo e um eco genérico. Variáveis:
+``$cargo``, ``$modelo`` e ``$ultima_mensagem``.
+
+Uso (o SDK lê ``OPENAI_BASE_URL``):
+
+    python -m core.servidor_llm_falso --porta 8765 --latencia lognormal:1.5,0.5 --taxa-429 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run app.py
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from typing import Callable, Dict, List, Optional
+
+from core.janela_contexto import estimar_tokens
+
+logger = logging.getLogger(__name__)
+
+TIPO_ANALISE_ATS = "analise_ats"
+TIPO_JOB_DESCRIPTION = "job_description"
+TIPO_VARIACOES_CARGO = "variacoes_cargo"
+TIPO_GENERICO = "generico"
+
+RESPOSTAS_PADRAO: Dict[str, str] = {
+    TIPO_ANALISE_ATS: json.dumps({
+        "score": 68.0,
+        "arquetipo_cargo": "VENDAS",
+        "pontos_fortes": ["CRM Salesforce", "Pipeline Management", "Forecast de vendas"],
+        "gaps_identificados": ["HubSpot", "MEDDIC", "Gong"],
+        "gaps_falsos_ignorados": ["Outreach (candidato usa ferramenta similar de sales engagement)"],
+        "plano_acao": [
+            "🔍 Inclua HubSpot e MEDDIC no resumo para $cargo",
+            "📊 Quantifique a evolução do pipeline",
+        ],
+    }, ensure_ascii=False),
+    TIPO_JOB_DESCRIPTION: (
+        "$cargo\n\n"
+        "Ferramentas: Salesforce, HubSpot, Power BI, Excel avançado, SAP.\n"
+        "Metodologias: MEDDIC, SPIN Selling, OKR, Forecast.\n"
+        "Certificações: PMP, Scrum Master.\n"
+        "Conceitos: pipeline, CAC, LTV, churn, ticket médio, KPI."
+    ),
+    TIPO_VARIACOES_CARGO: "$cargo\n$cargo Sênior\nHead de $cargo\n$cargo (Manager)\nCoordenador de $cargo",
+    TIPO_GENERICO: "Resposta simulada ($modelo) para: $ultima_mensagem",
+}
+
+_PADRAO_CARGO = re.compile(r"^(?:Cargo principal|CARGO ALVO|Cargo):\s*(.+)$", re.MULTILINE)
+
+
+def interpretar_latencia(especificacao: str) -> Callable[[random.Random], float]:
+    """
+    Converte ``tipo:parametros`` em um sorteador de latência (segundos).
+
+    Raises:
+        ValueError: Distribuição desconhecida ou parâmetros inválidos
+    """
+    tipo, _, parametros = especificacao.partition(':')
+    try:
+        valores = [float(v) for v in parametros.split(',')] if parametros else []
+    except ValueError:
+        raise ValueError(f"Parâmetros de latência inválidos: '{especificacao}'")
+
+    distribuicoes = {
+        'fixa': (1, lambda rng, s: s),
+        'uniforme': (2, lambda rng, a, b: rng.uniform(a, b)),
+        'normal': (2, lambda rng, media, desvio: max(0.0, rng.gauss(media, desvio))),
+        'lognormal': (2, lambda rng, mediana, sigma: rng.lognormvariate(math.log(mediana), sigma)),
+    }
+    if tipo not in distribuicoes or len(valores) != distribuicoes[tipo][0]:
+        raise ValueError(f"Latência inválida: '{especificacao}' (use fixa:S, uniforme:A,B, "
+                         f"normal:MEDIA,DESVIO ou lognormal:MEDIANA,SIGMA)")
+    if tipo == 'lognormal' and valores[0] <= 0:
+        raise ValueError("A mediana da lognormal deve ser maior que 0")
+    funcao = distribuicoes[tipo][1]
+    return lambda rng: funcao(rng, *valores)
+
+
+@dataclass
+class CenarioServidorFalso:
+    """
+    Comportamento do servidor falso.
+
+    Attributes:
+        latencia: Distribuição da latência até a resposta (ou 1º trecho do stream)
+        atraso_trecho: Segundos entre trechos do stream
+        taxa_429: Fração das requisições respondidas com 429 (rate limit)
+        retry_after: Valor do cabeçalho Retry-After dos 429 (segundos)
+        taxa_sem_cota: Fração respondida com 429 insufficient_quota
+        taxa_timeout: Fração que demora ``atraso_timeout`` antes de responder
+        atraso_timeout: Espera das requisições em timeout (segundos)
+        taxa_500: Fração respondida com HTTP 500
+        respostas: Modelos de resposta por tipo (sobrescrevem RESPOSTAS_PADRAO)
+        semente: Semente do sorteio (None = aleatório)
+    """
+    latencia: str = "fixa:0"
+    atraso_trecho: float = 0.0
+    taxa_429: float = 0.0
+    retry_after: float = 1.0
+    taxa_sem_cota: float = 0.0
+    taxa_timeout: float = 0.0
+    atraso_timeout: float = 60.0
+    taxa_500: float = 0.0
+    respostas: Dict[str, str] = field(default_factory=dict)
+    semente: Optional[int] = None
+
+
+def classificar_requisicao(corpo: Dict) -> str:
+    """Tipo de resposta a gerar para o corpo de uma requisição de chat."""
+    formato = corpo.get('response_format') or {}
+    if formato.get('json_schema', {}).get('name') == TIPO_ANALISE_ATS:
+        return TIPO_ANALISE_ATS
+    sistema = " ".join(m.get('content') or "" for m in corpo.get('messages', []) if m.get('role') == 'system')
+    if "Especialista Sênior em ATS" in sistema:
+        return TIPO_ANALISE_ATS
+    if "Gere uma Job Description" in sistema:
+        return TIPO_JOB_DESCRIPTION
+    if "variações REAIS" in sistema:
+        return TIPO_VARIACOES_CARGO
+    return TIPO_GENERICO
+
+
+class ServidorLLMFalso:
+    """
+    Servidor HTTP (thread daemon) com a API de chat completions simulada.
+
+    Examples:
+        >>> servidor = ServidorLLMFalso(CenarioServidorFalso(latencia="uniforme:0.2,0.8", taxa_429=0.1))
+        >>> servidor.iniciar()
+        >>> client = OpenAI(api_key="sk-falso", base_url=servidor.url)
+        >>> servidor.parar()
+    """
+
+    def __init__(self, cenario: Optional[CenarioServidorFalso] = None, host: str = "127.0.0.1", porta: int = 0):
+        self.cenario = cenario or CenarioServidorFalso()
+        self._sortear_latencia = interpretar_latencia(self.cenario.latencia)
+        self._rng = random.Random(self.cenario.semente)
+        self._lock = threading.Lock()
+        self._stats = {'requisicoes': 0, 'respostas': 0, 'streams': 0,
+                       'erros_429': 0, 'sem_cota': 0, 'timeouts': 0, 'erros_500': 0}
+        self._httpd = ThreadingHTTPServer((host, porta), self._criar_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL para ``OpenAI(base_url=...)``."""
+        host, porta = self._httpd.server_address[:2]
+        return f"http://{host}:{porta}/v1"
+
+    def iniciar(self) -> "ServidorLLMFalso":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={'poll_interval': 0.1},
+                                        name="servidor-llm-falso", daemon=True)
+        self._thread.start()
+        logger.info(f"Servidor LLM falso em {self.url}")
+        return self
+
+    def parar(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "ServidorLLMFalso":
+        return self.iniciar()
+
+    def __exit__(self, *exc) -> None:
+        self.parar()
+
+    def estatisticas(self) -> Dict[str, int]:
+        """Contadores de requisições, streams e falhas injetadas."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _contar(self, campo: str) -> None:
+        with self._lock:
+            self._stats[campo] += 1
+
+    def _sortear(self) -> Dict[str, float]:
+        """Sorteia falha e latência de uma requisição (sob lock: rng compartilhado)."""
+        with self._lock:
+            return {'falha': self._rng.random(), 'latencia': self._sortear_latencia(self._rng)}
+
+    def gerar_texto(self, corpo: Dict) -> str:
+        """Texto da resposta a partir do modelo do tipo da requisição."""
+        tipo = classificar_requisicao(corpo)
+        modelo = self.cenario.respostas.get(tipo) or RESPOSTAS_PADRAO[tipo]
+        mensagens = corpo.get('messages', [])
+        texto_usuario = "\n".join(m.get('content') or "" for m in mensagens if m.get('role') == 'user')
+        encontrado = _PADRAO_CARGO.search(texto_usuario)
+        ultima = (mensagens[-1].get('content') or "") if mensagens else ""
+        return Template(modelo).safe_substitute(
+            cargo=encontrado.group(1).strip() if encontrado else "Cargo",
+            modelo=corpo.get('model', ''),
+            ultima_mensagem=" ".join(ultima.split())[:200],
+        )
+
+    def _criar_handler(self):
+        servidor = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                if self.path.rstrip('/') not in ('/v1/chat/completions', '/chat/completions'):
+                    self._json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                    return
+                tamanho = int(self.headers.get('Content-Length') or 0)
+                corpo = json.loads(self.rfile.read(tamanho) or b"{}")
+                servidor._contar('requisicoes')
+                try:
+                    servidor._responder(self, corpo)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Cliente desistiu (timeout do lado dele)
+                    pass
+
+            def _json(self, status: int, dados: Dict, cabecalhos: Optional[Dict[str, str]] = None):
+                conteudo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(conteudo)))
+                for nome, valor in (cabecalhos or {}).items():
+                    self.send_header(nome, valor)
+                self.end_headers()
+                self.wfile.write(conteudo)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Servidor LLM falso: {format % args}")
+
+        return _Handler
+
+    def _responder(self, handler, corpo: Dict) -> None:
+        """Aplica o cenário (falhas, latência) e envia a resposta."""
+        cenario = self.cenario
+        sorteio = self._sortear()
+        limite = 0.0
+        for campo, taxa in (('erros_429', cenario.taxa_429), ('sem_cota', cenario.taxa_sem_cota),
+                            ('timeouts', cenario.taxa_timeout), ('erros_500', cenario.taxa_500)):
+            limite += taxa
+            if sorteio['falha'] < limite:
+                self._contar(campo)
+                self._falhar(handler, campo)
+                return
+
+        time.sleep(sorteio['latencia'])
+        texto = self.gerar_texto(corpo)
+        tokens_prompt = sum(4 + estimar_tokens(m.get('content')) for m in corpo.get('messages', []))
+        uso = {"prompt_tokens": tokens_prompt, "completion_tokens": estimar_tokens(texto),
+               "total_tokens": tokens_prompt + estimar_tokens(texto),
+               "prompt_tokens_details": {"cached_tokens": 0}}
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex[:24]}", "created": int(time.time()),
+                "model": corpo.get('model', 'gpt-4o')}
+
+        if corpo.get('stream'):
+            self._contar('streams')
+            self._enviar_stream(handler, corpo, base, texto, uso)
+        else:
+            self._contar('respostas')
+            handler._json(200, {**base, "object": "chat.completion", "usage": uso, "choices": [{
+                "index": 0, "finish_reason": "stop",
+                "message": {"role": "assistant", "content": texto, "refusal": None},
+            }]})
+
+    def _falhar(self, handler, tipo: str) -> None:
+        """Envia a falha sorteada."""
+        if tipo == 'erros_429':
+            handler._json(429, {"error": {"message": "Rate limit reached (simulado)", "type": "requests",
+                                          "code": "rate_limit_exceeded"}},
+                          {'retry-after': str(self.cenario.retry_after),
+                           'retry-after-ms': str(int(self.cenario.retry_after * 1000))})
+        elif tipo == 'sem_cota':
+            handler._json(429, {"error": {"message": "You exceeded your current quota (simulado)",
+                                          "type": "insufficient_quota", "code": "insufficient_quota"}})
+        elif tipo == 'timeouts':
+            time.sleep(self.cenario.atraso_timeout)
+            handler._json(504, {"error": {"message": "Timeout (simulado)", "type": "server_error"}})
+        else:
+            handler._json(500, {"error": {"message": "Internal error (simulado)", "type": "server_error"}})
+
+    def _enviar_stream(self, handler, corpo: Dict, base: Dict, texto: str, uso: Dict) -> None:
+        """Envia a resposta em SSE, palavra a palavra."""
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'text/event-stream')
+        handler.send_header('Cache-Control', 'no-cache')
+        handler.send_header('Connection', 'close')
+        handler.end_headers()
+        handler.close_connection = True
+
+        def enviar(dados) -> None:
+            carga = dados if isinstance(dados, str) else json.dumps(dados, ensure_ascii=False)
+            handler.wfile.write(f"data: {carga}\n\n".encode('utf-8'))
+            handler.wfile.flush()
+
+        chunk = {**base, "object": "chat.completion.chunk"}
+        enviar({**chunk, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""},
+                                      "finish_reason": None}]})
+        for parte in re.findall(r'\S+\s*|\s+', texto):
+            enviar({**chunk, "choices": [{"index": 0, "delta": {"content": parte}, "finish_reason": None}]})
+            if self.cenario.atraso_trecho:
+                time.sleep(self.cenario.atraso_trecho)
+        enviar({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if (corpo.get('stream_options') or {}).get('include_usage'):
+            enviar({**chunk, "choices": [], "usage": uso})
+        enviar("[DONE]")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: sobe o servidor falso até Ctrl+C."""
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API de chat completions da OpenAI")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--latencia', default="fixa:0", help="fixa:S | uniforme:A,B | normal:M,D | lognormal:MED,SIGMA")
+    parser.add_argument('--atraso-trecho', type=float, default=0.0, help="Segundos entre trechos do stream")
+    parser.add_argument('--taxa-429', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--taxa-sem-cota', type=float, default=0.0)
+    parser.add_argument('--taxa-timeout', type=float, default=0.0)
+    parser.add_argument('--atraso-timeout', type=float, default=60.0)
+    parser.add_argument('--taxa-500', type=float, default=0.0)
+    parser.add_argument('--semente', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    cenario = CenarioServidorFalso(
+        latencia=args.latencia, atraso_trecho=args.atraso_trecho,
+        taxa_429=args.taxa_429, retry_after=args.retry_after, taxa_sem_cota=args.taxa_sem_cota,
+        taxa_timeout=args.taxa_timeout, atraso_timeout=args.atraso_timeout,
+        taxa_500=args.taxa_500, semente=args.semente,
+    )
+    servidor = ServidorLLMFalso(cenario, host=args.host, porta=args.porta).iniciar()
+    print(f"OPENAI_BASE_URL={servidor.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(servidor.estatisticas(), indent=2))
+        servidor.parar()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
@@ -0,0 +1,152 @@
+"""
+Transporte HTTP compartilhado pelos clientes OpenAI de todas as sessões.
+
+Cada sessão Streamlit criava o seu ``OpenAI`` e, com ele, o seu pool de
+conexões: a primeira chamada de cada sessão pagava DNS + TCP + TLS até a
+API, e as conexões ociosas de sessões abandonadas ficavam abertas.
+
+Aqui há um único ``httpx.Client`` por processo, com limites de pool e
+keep-alive ajustáveis. Cada sessão continua com o seu ``OpenAI`` (API key
+própria e atribuição por sessão nas métricas), mas todos usam o mesmo pool.
+
+``TransporteInstrumentado`` conta as conexões novas, as reutilizadas e as
+requisições que de fato esperaram por uma conexão livre (e quanto tempo).
+
+Configuração (core.config.Config / variáveis de ambiente):
+- GPT_HTTP_MAX_CONNECTIONS: conexões simultâneas no pool
+- GPT_HTTP_MAX_KEEPALIVE: conexões ociosas mantidas abertas
+- GPT_HTTP_KEEPALIVE_EXPIRY: segundos até fechar uma conexão ociosa
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+import core.config
+
+logger = logging.getLogger(__name__)
+
+# Espera até a primeira etapa da requisição acima da qual ela conta como "aguardou o pool"
+LIMIAR_ESPERA_POOL = 0.005
+
+_http_client = None
+_transporte = None
+_lock_http = threading.Lock()
+
+
+class TransporteInstrumentado(httpx.HTTPTransport):
+    """
+    ``httpx.HTTPTransport`` que registra o uso do pool de conexões.
+
+    Tudo vem da extensão ``trace`` do httpcore, sem olhar o pool por dentro:
+
+    - conexão nova: houve o evento ``connection.connect_tcp``; sem ele, a
+      requisição reutilizou uma conexão do pool
+    - espera pelo pool: tempo entre a entrada em ``handle_request`` e o
+      primeiro evento da requisição (abrir conexão ou enviar cabeçalhos),
+      que só acontece depois que o pool entrega uma conexão
+    """
+
+    def __init__(self, limites: httpx.Limits, **kwargs):
+        super().__init__(limits=limites, **kwargs)
+        self.limites = limites
+        self._lock = threading.Lock()
+        self._stats = {'requisicoes': 0, 'conexoes_novas': 0, 'conexoes_reutilizadas': 0,
+                       'aguardaram': 0, 'espera_segundos': 0.0}
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        nova = []
+        primeiro_evento = []
+        trace_original = request.extensions.get('trace')
+
+        def trace(evento: str, info: Dict[str, Any]) -> None:
+            if not primeiro_evento:
+                primeiro_evento.append(time.perf_counter())
+            if evento == 'connection.connect_tcp.complete':
+                nova.append(True)
+            if trace_original is not None:
+                trace_original(evento, info)
+
+        request.extensions['trace'] = trace
+        inicio = time.perf_counter()
+        try:
+            return super().handle_request(request)
+        finally:
+            espera = primeiro_evento[0] - inicio if primeiro_evento else 0.0
+            with self._lock:
+                self._stats['requisicoes'] += 1
+                self._stats['conexoes_novas' if nova else 'conexoes_reutilizadas'] += 1
+                if espera > LIMIAR_ESPERA_POOL:
+                    self._stats['aguardaram'] += 1
+                    self._stats['espera_segundos'] += espera
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Contadores de uso do pool e taxa de reuso de conexões."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['espera_segundos'] = round(stats['espera_segundos'], 6)
+        total = stats['conexoes_novas'] + stats['conexoes_reutilizadas']
+        stats['taxa_reuso'] = round(stats['conexoes_reutilizadas'] / total, 4) if total else 0.0
+        return stats
+
+
+def obter_http_client() -> httpx.Client:
+    """
+    Retorna o ``httpx.Client`` do processo (criado na primeira chamada).
+
+    Usa os padrões do SDK da OpenAI (timeouts, redirects) com os limites
+    de pool da configuração.
+    """
+    global _http_client, _transporte
+
+    if _http_client is None:
+        with _lock_http:
+            if _http_client is None:
+                cfg = core.config.config
+                limites = httpx.Limits(
+                    max_connections=cfg.GPT_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=cfg.GPT_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=cfg.GPT_HTTP_KEEPALIVE_EXPIRY,
+                )
+                _transporte = TransporteInstrumentado(limites)
+                _http_client = DefaultHttpxClient(transport=_transporte)
+                logger.info(f"Pool HTTP da OpenAI criado: {cfg.GPT_HTTP_MAX_CONNECTIONS} conexões, "
+                            f"{cfg.GPT_HTTP_MAX_KEEPALIVE} em keep-alive por {cfg.GPT_HTTP_KEEPALIVE_EXPIRY}s")
+    return _http_client
+
+
+def criar_cliente_openai(api_key: str) -> OpenAI:
+    """
+    Cria o ``OpenAI`` de uma sessão sobre o pool compartilhado.
+
+    Criar o cliente é barato; as conexões vêm do pool do processo. Não
+    chame ``close()`` nele: isso fecharia o pool de todas as sessões.
+    """
+    return OpenAI(api_key=api_key, http_client=obter_http_client())
+
+
+def estatisticas_pool() -> Optional[Dict[str, Any]]:
+    """
+    Estatísticas do pool HTTP compartilhado.
+
+    Returns:
+        Dict com requisicoes, conexoes_novas, conexoes_reutilizadas,
+        aguardaram, espera_segundos e taxa_reuso, ou None se o pool ainda
+        não foi criado
+    """
+    transporte = _transporte
+    return transporte.estatisticas() if transporte is not None else None
+
+
+def resetar_http_client() -> None:
+    """Fecha e descarta o pool do processo (o próximo uso recria com a config atual)."""
+    global _http_client, _transporte
+    with _lock_http:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _transporte = None
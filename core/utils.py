@@ -1,59 +1,53 @@
-import re
 import time
 import logging
 from functools import lru_cache
-from typing import Optional, List
+from typing import Callable, Iterator, Optional, List, Tuple
 
 import streamlit as st
-import PyPDF2
 import streamlit.components.v1 as components
 from openai import OpenAI, APITimeoutError, RateLimitError
 
 from core.data import CIDADES_BRASIL
+from core.llm_cache import chamada_cacheavel, gerar_chave_llm, obter_cache_llm
+from core.gpt_metricas import registrar_chamada_gpt, extrair_uso
+from core.janela_contexto import tokens_mensagens
+from core.limitador_taxa import calcular_espera, obter_limitador
+from core.coalescencia import obter_coalescedor
+from core.roteamento_modelos import resolver_rota
+from core.transporte_http import criar_cliente_openai
+from core.cassetes_llm import criar_resposta, gravacao_ausente
+from core.pipeline_upload import processar_upload
+from core.normalizacao_texto import corrigir_formatacao
+import core.config
 
 # Configurar logger para este módulo
 logger = logging.getLogger(__name__)
 
-def corrigir_formatacao(texto: Optional[str]) -> Optional[str]:
-    """
-    Corrige a formatação de texto removendo prefixos de moeda e normalizando espaços.
-    
-    Args:
-        texto: Texto a ser formatado
-        
-    Returns:
-        Texto formatado ou None se entrada for None
-        
-    Examples:
-        >>> corrigir_formatacao("R$ 5.000")
-        "5.000"
-        >>> corrigir_formatacao(None)
-        None
-    """
-    if not texto:
-        return texto
 
-    # Remove qualquer prefixo de moeda (R$ ou R)
-    texto = re.sub(r'\bR\$\s*', '', texto)
-    texto = re.sub(r'\bR\s+', '', texto)
+class RespostaInterrompida(Exception):
+    """O stream do GPT falhou depois de já ter entregado parte da resposta."""
 
-    # Mantém quebras de linha (não usar \s aqui)
-    texto = re.sub(r'[ \t]{2,}', ' ', texto)
 
-    # Normaliza quebras do Windows
-    texto = texto.replace('\r\n', '\n')
+def _texto_do_upload(arquivo, extensao: str, progresso: Optional[Callable[[int, int], None]] = None,
+                     usar_cache: bool = True) -> Optional[str]:
+    """Roda o pipeline de upload e exibe o erro, se houver."""
+    resultado = processar_upload(arquivo, extensao, progresso=progresso, usar_cache=usar_cache)
+    if resultado.erro:
+        st.error(resultado.erro)
+        return None
+    return resultado.texto
 
-    return texto
 
-@st.cache_data(ttl=3600)
-def extrair_texto_pdf(arquivo) -> Optional[str]:
+def extrair_texto_pdf(arquivo, progresso: Optional[Callable[[int, int], None]] = None) -> Optional[str]:
     """
     Extrai texto de um arquivo PDF.
     
-    Utiliza cache de 1 hora para evitar reprocessamento do mesmo arquivo.
+    As páginas são extraídas em paralelo (ver core.extracao_pdf). Sem cache:
+    use extrair_texto_universal para passar pelo cache de extrações.
     
     Args:
         arquivo: Objeto de arquivo PDF (UploadedFile do Streamlit)
+        progresso: Chamado com (páginas prontas, total) a cada página extraída
         
     Returns:
         Texto extraído do PDF ou None em caso de erro
@@ -61,39 +55,14 @@ def extrair_texto_pdf(arquivo) -> Optional[str]:
     Raises:
         Nenhuma exceção é propagada; erros são logados e exibidos ao usuário
     """
-    logger.info("Iniciando extração de texto de PDF")
-    
-    try:
-        pdf_reader = PyPDF2.PdfReader(arquivo)
-        num_pages = len(pdf_reader.pages)
-        logger.debug(f"PDF possui {num_pages} páginas")
-        
-        texto = "".join([p.extract_text() for p in pdf_reader.pages])
-        
-        # Validar se o arquivo tem conteúdo
-        if not texto or not texto.strip():
-            logger.warning("PDF não contém texto extraível")
-            st.error("O PDF não contém texto extraível. Certifique-se de que não é uma imagem escaneada.")
-            return None
-        
-        logger.info(f"Texto extraído com sucesso ({len(texto)} caracteres)")
-        return texto
-        
-    except PyPDF2.errors.PdfReadError as e:
-        logger.error(f"Erro ao ler PDF (arquivo corrompido ou inválido): {e}")
-        st.error(f"Erro ao ler PDF: arquivo pode estar corrompido ou protegido por senha")
-        return None
-    except Exception as e:
-        logger.error(f"Erro inesperado ao extrair texto do PDF: {e}", exc_info=True)
-        st.error(f"Erro ao ler PDF: {e}")
-        return None
+    return _texto_do_upload(arquivo, 'pdf', progresso=progresso, usar_cache=False)
 
 def extrair_texto_docx(arquivo):
     """
     Extrai texto de arquivo Word (.docx).
     
     Nota: Apenas arquivos .docx (Office Open XML) são suportados.
-    Arquivos .doc legados (formato binário antigo) não são suportados pela biblioteca python-docx.
+    Arquivos .doc legados (formato binário antigo) não são suportados.
     
     Args:
         arquivo: Arquivo uploaded do Streamlit
@@ -101,50 +70,12 @@ def extrair_texto_docx(arquivo):
     Returns:
         str: Texto extraído ou None em caso de erro
     """
-    logger = logging.getLogger(__name__)
-    logger.info("Iniciando extração de texto de DOCX")
-    
-    try:
-        import docx
-        doc = docx.Document(arquivo)
-        
-        # Extrai todos os parágrafos
-        texto_completo = []
-        for paragrafo in doc.paragraphs:
-            if paragrafo.text.strip():
-                texto_completo.append(paragrafo.text)
-        
-        # Extrai tabelas (comum em CVs)
-        for tabela in doc.tables:
-            for linha in tabela.rows:
-                for celula in linha.cells:
-                    if celula.text.strip():
-                        texto_completo.append(celula.text)
-        
-        texto = "\n".join(texto_completo)
-        
-        if not texto.strip():
-            st.error("⚠️ Arquivo Word vazio ou sem texto extraível")
-            logger.warning("DOCX extraído está vazio")
-            return None
-        
-        logger.info(f"DOCX extraído com sucesso: {len(texto)} caracteres")
-        return texto
-        
-    except Exception as e:
-        error_msg = str(e)
-        if "is not a zip file" in error_msg or "BadZipFile" in error_msg:
-            st.error("❌ Arquivo .doc antigo detectado. Por favor, converta para .docx ou use formato PDF/TXT")
-            logger.error("Tentativa de processar arquivo .doc antigo (formato binário não suportado)")
-        else:
-            st.error(f"❌ Erro ao ler arquivo Word: {e}")
-            logger.error(f"Erro ao extrair DOCX: {e}", exc_info=True)
-        return None
+    return _texto_do_upload(arquivo, 'docx', usar_cache=False)
 
 
 def extrair_texto_txt(arquivo):
     """
-    Extrai texto de arquivo TXT.
+    Extrai texto de arquivo TXT (BOM ou UTF-8, com fallback cp1252/latin-1).
     
     Args:
         arquivo: Arquivo uploaded do Streamlit
@@ -152,62 +83,26 @@ def extrair_texto_txt(arquivo):
     Returns:
         str: Texto extraído ou None em caso de erro
     """
-    logger = logging.getLogger(__name__)
-    logger.info("Iniciando extração de texto de TXT")
-    
-    try:
-        # Tenta diferentes encodings
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-        
-        for encoding in encodings:
-            try:
-                arquivo.seek(0)  # Reset file pointer
-                texto = arquivo.read().decode(encoding)
-                
-                if not texto.strip():
-                    st.error("⚠️ Arquivo TXT vazio")
-                    logger.warning("TXT extraído está vazio")
-                    return None
-                
-                logger.info(f"TXT extraído com sucesso ({encoding}): {len(texto)} caracteres")
-                return texto
-                
-            except (UnicodeDecodeError, AttributeError):
-                continue
-        
-        # Se nenhum encoding funcionou
-        st.error("❌ Não foi possível decodificar o arquivo TXT")
-        logger.error("Falha em todos os encodings para TXT")
-        return None
-        
-    except Exception as e:
-        st.error(f"❌ Erro ao ler arquivo TXT: {e}")
-        logger.error(f"Erro ao extrair TXT: {e}", exc_info=True)
-        return None
+    return _texto_do_upload(arquivo, 'txt', usar_cache=False)
 
 
-def extrair_texto_universal(arquivo, tipo_arquivo):
+def extrair_texto_universal(arquivo, tipo_arquivo, progresso: Optional[Callable[[int, int], None]] = None):
     """
     Função universal que detecta o tipo e extrai o texto.
     
+    O arquivo é lido uma vez pelo pipeline de upload (core.pipeline_upload):
+    o tipo real vem dos magic bytes e extrações já feitas (nesta ou em outra
+    sessão, antes ou depois de um reinício) saem do cache de extrações.
+    
     Args:
         arquivo: Arquivo uploaded do Streamlit
         tipo_arquivo: Extensão do arquivo (ex: 'pdf', 'docx', 'txt')
+        progresso: Callback (páginas prontas, total) da extração de PDF
     
     Returns:
         str: Texto extraído ou None em caso de erro
     """
-    tipo_arquivo = tipo_arquivo.lower()
-    
-    if tipo_arquivo == 'pdf':
-        return extrair_texto_pdf(arquivo)
-    elif tipo_arquivo in ['docx', 'doc']:
-        return extrair_texto_docx(arquivo)
-    elif tipo_arquivo == 'txt':
-        return extrair_texto_txt(arquivo)
-    else:
-        st.error(f"❌ Formato não suportado: {tipo_arquivo}")
-        return None
+    return _texto_do_upload(arquivo, tipo_arquivo, progresso=progresso)
 
 def inicializar_cliente_openai(key: str) -> Optional[OpenAI]:
     """
@@ -235,7 +130,8 @@ def inicializar_cliente_openai(key: str) -> Optional[OpenAI]:
         st.warning("API key parece estar em formato inválido (deve começar com 'sk-')")
     
     try:
-        client = OpenAI(api_key=key)
+        # Cliente da sessão sobre o pool HTTP compartilhado do processo
+        client = criar_cliente_openai(key)
         
         # Fazer teste básico de conexão (list models é rápido e barato)
         try:
@@ -258,13 +154,23 @@ def chamar_gpt(
     max_retries: int = 3, 
     timeout: int = 30,
     temperature: float = 0.7,
-    seed: Optional[int] = None
+    seed: Optional[int] = None,
+    usar_cache: bool = True,
+    rota: Optional[str] = None,
+    response_format: Optional[dict] = None
 ) -> Optional[str]:
     """
     Chama a API do GPT com retry automático e tratamento robusto de erros.
     
-    Implementa backoff exponencial para timeouts e trata especificamente
-    erros de rate limit e timeout.
+    Implementa backoff exponencial com jitter para timeouts e erros de rate
+    limit (respeitando o Retry-After da API). Antes de cada tentativa a
+    chamada entra na fila do limitador de taxa do processo
+    (core.limitador_taxa), compartilhado por todas as sessões.
+    
+    Chamadas determinísticas (com seed e temperatura baixa) passam pelo
+    cache de respostas (core.llm_cache), quando ligado em LLM_CACHE_ENABLED.
+    Pedidos idênticos simultâneos (mesmo modelo, mensagens e parâmetros)
+    aguardam uma única chamada em andamento (core.coalescencia).
     
     Args:
         client: Cliente OpenAI inicializado
@@ -273,6 +179,9 @@ def chamar_gpt(
         timeout: Timeout em segundos por requisição (padrão: 30)
         temperature: Controle de criatividade (0=determinístico, 1=criativo, padrão: 0.7)
         seed: Seed para reprodutibilidade (opcional)
+        usar_cache: Se False, ignora o cache de respostas
+        rota: Rota de modelo (core.roteamento_modelos); padrão: pelo contexto
+        response_format: Formato estruturado da resposta (ex.: json_schema)
         
     Returns:
         Resposta do GPT formatada ou None em caso de erro
@@ -289,65 +198,301 @@ def chamar_gpt(
     """
     logger.info(f"Chamando GPT com {len(msgs)} mensagens")
     
+    params, rota = _parametros_gpt(msgs, temperature, timeout, seed, rota)
+    if response_format is not None:
+        params["response_format"] = response_format
+    inicio = time.perf_counter()
+    if gravacao_ausente(params):
+        registrar_chamada_gpt(params["model"], 0.0, sucesso=False, rota=rota)
+        st.error("Erro ao chamar GPT: resposta não gravada no cassete.")
+        return None
+    cache, chave = _consultar_cache_llm(params, usar_cache)
+    if chave and cache is not None:
+        resposta = cache.obter(chave)
+        if resposta is not None:
+            logger.info(f"Resposta obtida do cache de respostas GPT ({len(resposta)} caracteres)")
+            registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, do_cache=True, rota=rota)
+            return resposta
+    
+    if not core.config.config.GPT_SINGLE_FLIGHT_ENABLED:
+        return _chamar_gpt_com_retry(client, params, rota, max_retries, inicio, cache, chave)
+    
+    # Pedidos idênticos em andamento (outras sessões) compartilham uma só chamada
+    resposta, compartilhada = obter_coalescedor().executar(
+        gerar_chave_llm(params),
+        lambda: _chamar_gpt_com_retry(client, params, rota, max_retries, inicio, cache, chave)
+    )
+    if compartilhada:
+        logger.info("Resposta compartilhada de uma chamada GPT idêntica em andamento")
+        if resposta is None:
+            st.error("Erro ao chamar GPT. Tente novamente.")
+    return resposta
+
+def _chamar_gpt_com_retry(client, params: dict, rota: str, max_retries: int, inicio: float, cache, chave) -> Optional[str]:
+    """Laço de tentativas de chamar_gpt (limitador, retry/backoff, métricas e gravação no cache)."""
     for tentativa in range(1, max_retries + 1):
+        if not _aguardar_vez(params):
+            registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, tentativas=tentativa, sucesso=False, rota=rota)
+            return None
+        
         try:
             logger.debug(f"Tentativa {tentativa}/{max_retries}")
-            if seed is not None:
-                logger.debug(f"Temperature: {temperature}, Seed: {seed}")
-            else:
-                logger.debug(f"Temperature: {temperature}")
-            
-            # Construir parâmetros da chamada
-            params = {
-                "model": "gpt-4o",
-                "messages": msgs,
-                "temperature": temperature,
-                "max_tokens": 4000,
-                "timeout": timeout
-            }
+            logger.debug(f"Temperature: {params['temperature']}, Seed: {params.get('seed')}")
             
-            # Adicionar seed apenas se fornecido
-            if seed is not None:
-                params["seed"] = seed
-            
-            response = client.chat.completions.create(**params)
+            response = criar_resposta(client, params)
             
             texto_raw = response.choices[0].message.content
             logger.info(f"Resposta recebida com sucesso ({len(texto_raw)} caracteres)")
-            return corrigir_formatacao(texto_raw)
-            
-        except APITimeoutError as e:
-            logger.warning(f"Timeout na tentativa {tentativa}/{max_retries}: {e}")
-            
-            if tentativa < max_retries:
-                # Backoff exponencial: 2^tentativa segundos
-                tempo_espera = 2 ** tentativa
-                logger.info(f"Aguardando {tempo_espera}s antes de tentar novamente...")
-                time.sleep(tempo_espera)
-            else:
-                logger.error("Todas as tentativas falharam por timeout")
-                st.error("Erro: Timeout ao chamar GPT. Tente novamente mais tarde.")
-                return None
-                
-        except RateLimitError as e:
-            logger.error(f"Rate limit atingido: {e}")
-            st.error("Erro: Limite de requisições atingido. Por favor, aguarde alguns minutos e tente novamente.")
-            return None
+            resposta = corrigir_formatacao(texto_raw)
+            registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, getattr(response, "usage", None), tentativas=tentativa, rota=rota)
+            _ajustar_reserva(params, getattr(response, "usage", None))
+            if chave and resposta:
+                cache.definir(chave, resposta)
+            return resposta
             
         except Exception as e:
-            logger.error(f"Erro inesperado na tentativa {tentativa}/{max_retries}: {e}", exc_info=True)
-            
-            if tentativa < max_retries:
-                tempo_espera = 2 ** tentativa
-                logger.info(f"Aguardando {tempo_espera}s antes de tentar novamente...")
-                time.sleep(tempo_espera)
-            else:
-                logger.error("Todas as tentativas falharam")
-                st.error(f"Erro ao chamar GPT: {e}")
+            tempo_espera = _decidir_nova_tentativa(e, tentativa, max_retries)
+            if tempo_espera is None:
+                registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, tentativas=tentativa, sucesso=False, rota=rota)
                 return None
+            time.sleep(tempo_espera)
     
     return None
 
+def _parametros_gpt(msgs: list, temperature: float, timeout: int, seed: Optional[int],
+                    rota: Optional[str] = None) -> Tuple[dict, str]:
+    """
+    Monta os parâmetros de client.chat.completions.create (compartilhado sync/stream/async).
+    
+    Modelo e max_tokens vêm da rota resolvida em core.roteamento_modelos.
+    
+    Returns:
+        (parâmetros da API, nome da rota)
+    """
+    nome_rota, modelo, max_tokens = resolver_rota(rota)
+    params = {
+        "model": modelo,
+        "messages": msgs,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "timeout": timeout
+    }
+    
+    # Adicionar seed apenas se fornecido
+    if seed is not None:
+        params["seed"] = seed
+    
+    return params, nome_rota
+
+def _consultar_cache_llm(params: dict, usar_cache: bool):
+    """Retorna (cache, chave) se a chamada for cacheável, senão (None, None)."""
+    if not usar_cache or not chamada_cacheavel(params.get("temperature"), params.get("seed")):
+        return None, None
+    cache = obter_cache_llm()
+    if cache is None:
+        return None, None
+    return cache, gerar_chave_llm(params)
+
+def _tokens_reservados(params: dict) -> int:
+    """Tokens reservados no limitador: prompt estimado + max_tokens (como a OpenAI conta)."""
+    return tokens_mensagens(params["messages"]) + params.get("max_tokens", 0)
+
+def _aguardar_vez(params: dict) -> bool:
+    """
+    Entra na fila do limitador de taxa do processo (core.limitador_taxa).
+    
+    Returns:
+        True se a requisição pode ser feita; False se o prazo de espera acabou
+    """
+    limitador = obter_limitador()
+    if limitador is None:
+        return True
+    if limitador.adquirir(_tokens_reservados(params), prazo=core.config.config.GPT_RATE_LIMIT_MAX_WAIT):
+        return True
+    st.error("Erro: Servidor com muitas requisições simultâneas ao GPT. Tente novamente em instantes.")
+    return False
+
+def _ajustar_reserva(params: dict, usage) -> None:
+    """Devolve ao limitador a diferença entre a reserva e o uso real de tokens."""
+    limitador = obter_limitador()
+    uso = extrair_uso(usage)
+    if limitador is None or not uso['tokens_prompt']:
+        return
+    limitador.devolver_tokens(_tokens_reservados(params) - uso['tokens_prompt'] - uso['tokens_resposta'])
+
+def _rate_limit_recuperavel(erro: Exception) -> bool:
+    """False para falta de crédito (insufficient_quota): esperar não resolve."""
+    return getattr(erro, 'code', None) != 'insufficient_quota'
+
+def _pausar_por_rate_limit(tentativa: int, erro: Exception) -> float:
+    """Calcula a espera (respeitando Retry-After) e pausa o limitador do processo."""
+    tempo_espera = calcular_espera(tentativa, erro)
+    limitador = obter_limitador()
+    if limitador is not None:
+        limitador.pausar(tempo_espera)
+    return tempo_espera
+
+def _decidir_nova_tentativa(erro: Exception, tentativa: int, max_retries: int, sufixo: str = "",
+                            interrompida: bool = False) -> Optional[float]:
+    """
+    Decide o que fazer após uma tentativa que falhou (compartilhado sync/stream/async).
+    
+    Timeouts e outros erros são repetidos com backoff; rate limit respeita o
+    Retry-After e pausa o limitador, exceto por falta de crédito.
+    
+    Args:
+        erro: Exceção da tentativa
+        tentativa: Número da tentativa (1 = primeira)
+        max_retries: Número máximo de tentativas
+        sufixo: Identifica o caminho nos logs (ex.: " (streaming)")
+        interrompida: True se parte da resposta já foi entregue (não repetir)
+        
+    Returns:
+        Segundos a aguardar antes da próxima tentativa, ou None para desistir
+        (nesse caso o erro já foi exibido ao usuário)
+    """
+    if isinstance(erro, APITimeoutError):
+        logger.warning(f"Timeout na tentativa {tentativa}/{max_retries}{sufixo}: {erro}")
+        recuperavel = True
+        motivo = "Todas as tentativas falharam por timeout"
+        mensagem = "Erro: Timeout ao chamar GPT. Tente novamente mais tarde."
+    elif isinstance(erro, RateLimitError):
+        logger.warning(f"Rate limit na tentativa {tentativa}/{max_retries}{sufixo}: {erro}")
+        recuperavel = _rate_limit_recuperavel(erro)
+        motivo = f"Rate limit atingido: {erro}"
+        mensagem = "Erro: Limite de requisições atingido. Por favor, aguarde alguns minutos e tente novamente."
+    else:
+        logger.error(f"Erro inesperado na tentativa {tentativa}/{max_retries}{sufixo}: {erro}", exc_info=True)
+        recuperavel = True
+        motivo = "Todas as tentativas falharam"
+        mensagem = f"Erro ao chamar GPT: {erro}"
+    
+    if interrompida:
+        st.error("Erro: A resposta do GPT foi interrompida. Tente novamente.")
+        return None
+    if tentativa < max_retries and recuperavel:
+        if isinstance(erro, RateLimitError):
+            tempo_espera = _pausar_por_rate_limit(tentativa, erro)
+        else:
+            tempo_espera = calcular_espera(tentativa, erro)
+        logger.info(f"Aguardando {tempo_espera:.1f}s antes de tentar novamente...")
+        return tempo_espera
+    logger.error(motivo)
+    st.error(mensagem)
+    return None
+
+def chamar_gpt_stream(
+    client: OpenAI, 
+    msgs: list, 
+    max_retries: int = 3, 
+    timeout: int = 30,
+    temperature: float = 0.7,
+    seed: Optional[int] = None,
+    usar_cache: bool = True,
+    rota: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Variante de chamar_gpt com streaming (``stream=True``): gera a resposta aos poucos.
+    
+    Mantém o retry com backoff exponencial (apenas enquanto nenhum trecho foi
+    entregue — depois disso não dá para repetir sem duplicar texto) e aplica
+    ``corrigir_formatacao`` linha a linha, então cada trecho gerado é uma ou
+    mais linhas completas (o resto sai no final). Usa o mesmo cache de
+    respostas do chamar_gpt: um hit entrega a resposta inteira de uma vez.
+    
+    Args:
+        client: Cliente OpenAI inicializado
+        msgs: Lista de mensagens no formato esperado pela API
+        max_retries: Número máximo de tentativas (padrão: 3)
+        timeout: Timeout em segundos por requisição (padrão: 30)
+        temperature: Controle de criatividade (padrão: 0.7)
+        seed: Seed para reprodutibilidade (opcional)
+        usar_cache: Se False, ignora o cache de respostas
+        rota: Rota de modelo (core.roteamento_modelos); padrão: pelo contexto
+        
+    Yields:
+        Trechos da resposta já formatados
+        
+    Raises:
+        RespostaInterrompida: se o stream falhar depois do primeiro trecho (o
+            texto já entregue está incompleto e não deve ser usado). Os demais
+            erros não são propagados; são logados e exibidos ao usuário
+        
+    Examples:
+        >>> resposta = st.write_stream(chamar_gpt_stream(client, msgs))
+    """
+    logger.info(f"Chamando GPT (streaming) com {len(msgs)} mensagens")
+    
+    params, rota = _parametros_gpt(msgs, temperature, timeout, seed, rota)
+    params["stream"] = True
+    params["stream_options"] = {"include_usage": True}
+    inicio = time.perf_counter()
+    if gravacao_ausente(params):
+        registrar_chamada_gpt(params["model"], 0.0, sucesso=False, rota=rota)
+        st.error("Erro ao chamar GPT: resposta não gravada no cassete.")
+        return
+    
+    cache, chave = _consultar_cache_llm(params, usar_cache)
+    if chave and cache is not None:
+        resposta = cache.obter(chave)
+        if resposta is not None:
+            logger.info(f"Resposta obtida do cache de respostas GPT ({len(resposta)} caracteres)")
+            registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, do_cache=True, rota=rota)
+            yield resposta
+            return
+    
+    for tentativa in range(1, max_retries + 1):
+        entregue = False
+        buffer = ""
+        total = 0
+        trechos = []
+        uso = None
+        if not _aguardar_vez(params):
+            registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, tentativas=tentativa, sucesso=False, rota=rota)
+            return
+        
+        try:
+            logger.debug(f"Tentativa {tentativa}/{max_retries} (streaming)")
+            stream = criar_resposta(client, params)
+            
+            for chunk in stream:
+                uso = getattr(chunk, "usage", None) or uso
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                
+                buffer += delta
+                total += len(delta)
+                fim_linha = buffer.rfind('\n')
+                if fim_linha >= 0:
+                    linhas, buffer = buffer[:fim_linha + 1], buffer[fim_linha + 1:]
+                    entregue = True
+                    trechos.append(corrigir_formatacao(linhas))
+                    yield trechos[-1]
+            
+            if buffer:
+                entregue = True
+                trechos.append(corrigir_formatacao(buffer))
+                yield trechos[-1]
+            
+            logger.info(f"Resposta em streaming concluída ({total} caracteres)")
+            if chave and trechos:
+                cache.definir(chave, "".join(trechos))
+            registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, uso, tentativas=tentativa, rota=rota)
+            _ajustar_reserva(params, uso)
+            return
+            
+        except Exception as e:
+            tempo_espera = _decidir_nova_tentativa(e, tentativa, max_retries, " (streaming)", interrompida=entregue)
+            if tempo_espera is None:
+                registrar_chamada_gpt(params["model"], time.perf_counter() - inicio, tentativas=tentativa, sucesso=False, rota=rota)
+                if entregue:
+                    raise RespostaInterrompida(str(e)) from e
+                return
+            time.sleep(tempo_espera)
+
 def scroll_topo():
     components.html("""
         <script>
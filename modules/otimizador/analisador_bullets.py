@@ -5,8 +5,14 @@ Detecta bullets com verbos fracos e/ou falta de métricas no CV.
 """
 
 import re
+from core.normalizacao_texto import visao_texto
 from modules.otimizador.market_knowledge import obter_conhecimento_mercado
 
+# Linhas sem marcador que começam com verbo (fallback da extração de bullets)
+_RE_VERBO_INICIAL = re.compile(r'^[A-Z][a-zá-ú]+ei\s|^[A-Z][a-zá-ú]+o\s')
+_RE_VERBO_PASSADO = re.compile(r'^[A-ZÀ-Ú][a-zà-ú]+[ei|ou|iu]\s')
+_RE_NUMERO = re.compile(r'\d')
+
 
 # Lista de verbos fracos que devem ser evitados em CVs profissionais
 VERBOS_FRACOS = [
@@ -58,22 +64,16 @@ def analisar_bullets_fracos(cv_texto: str, area: str, senioridade: str) -> list:
     ferramentas_area = conhecimento.get('ferramentas', [])
     
     # Extrair bullets do CV (linhas que começam com • ou - ou *)
-    bullets_pattern = r'^[\s]*[•\-\*]\s*(.+)$'
-    bullets = []
-    
-    for line in cv_texto.split('\n'):
-        match = re.match(bullets_pattern, line.strip())
-        if match:
-            bullets.append(match.group(1).strip())
+    visao = visao_texto(cv_texto)
+    bullets = list(visao.bullets)
     
     # Se não encontrou bullets com marcadores, tentar extrair por contexto
     # (frases curtas que parecem descrições de experiência)
     if not bullets:
         # Tentar identificar experiências por padrões comuns
-        for line in cv_texto.split('\n'):
-            line = line.strip()
+        for line in visao.linhas:
             # Linhas que começam com verbo no passado ou presente
-            if re.match(r'^[A-Z][a-zá-ú]+ei\s', line) or re.match(r'^[A-Z][a-zá-ú]+o\s', line):
+            if _RE_VERBO_INICIAL.match(line):
                 if len(line) > 20:  # Evitar linhas muito curtas
                     bullets.append(line)
     
@@ -93,7 +93,7 @@ def analisar_bullets_fracos(cv_texto: str, area: str, senioridade: str) -> list:
                 break
         
         # 2. Detectar falta de métricas (números)
-        tem_numero = bool(re.search(r'\d+', bullet))
+        tem_numero = bool(_RE_NUMERO.search(bullet))
         if not tem_numero:
             problemas.append("Falta métrica quantificável")
         
@@ -218,22 +218,15 @@ def extrair_bullets_cv(cv_texto: str) -> list:
     bullets = []
     
     # Padrão 1: Linhas com marcadores (•, -, *)
-    bullets_pattern = r'^[\s]*[•\-\*]\s*(.+)$'
-    
-    for line in cv_texto.split('\n'):
-        match = re.match(bullets_pattern, line.strip())
-        if match:
-            bullet_text = match.group(1).strip()
-            if len(bullet_text) > 10:  # Ignorar bullets muito curtos
-                bullets.append(bullet_text)
+    visao = visao_texto(cv_texto)
+    bullets.extend(b for b in visao.bullets if len(b) > 10)  # Ignorar bullets muito curtos
     
     # Padrão 2: Se não achou bullets com marcadores, 
     # tentar linhas que começam com verbo no passado
     if not bullets:
-        for line in cv_texto.split('\n'):
-            line = line.strip()
+        for line in visao.linhas:
             # Verbos no passado (terminam em -ei, -ou, -iu, etc)
-            if re.match(r'^[A-ZÀ-Ú][a-zà-ú]+[ei|ou|iu]\s', line):
+            if _RE_VERBO_PASSADO.match(line):
                 if len(line) > 20:
                     bullets.append(line)
     
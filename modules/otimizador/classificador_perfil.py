@@ -5,8 +5,29 @@ Analisa CV e cargo para classificar senioridade e definir estratégia de pergunt
 """
 
 import re
+from core.normalizacao_texto import visao_texto
 from modules.otimizador.market_knowledge import detectar_area_por_cargo
 
+# Evidências de nível no CV (minúsculo), compiladas uma vez em alternância
+_RE_EVIDENCIAS_EXECUTIVO = re.compile('|'.join([
+    r'budget.*\d+.*milhões?',
+    r'budget.*\d+.*million',
+    r'equipe.*\d{2,}',  # Gerenciou 10+ pessoas
+    r'time.*\d{2,}',
+    r'p&l',
+    r'ebitda',
+    r'receita.*\d+.*milhões?',
+    r'revenue.*\d+.*million'
+]))
+_RE_EVIDENCIAS_SENIOR = re.compile('|'.join([
+    r'lider.*técnic',
+    r'mentoria',
+    r'arquitetura',
+    r'coordena',
+    r'equipe.*\d+',  # Gerenciou equipe com número
+    r'time.*\d+'
+]))
+
 
 def classificar_senioridade_e_estrategia(cv_texto: str, cargo: str) -> dict:
     """
@@ -32,7 +53,7 @@ def classificar_senioridade_e_estrategia(cv_texto: str, cargo: str) -> dict:
         cv_texto = ""
     
     cargo_lower = cargo.lower()
-    cv_lower = cv_texto.lower()
+    cv_lower = visao_texto(cv_texto).minusculo
     
     # Detectar área profissional
     area_profissional = detectar_area_por_cargo(cargo)
@@ -80,32 +101,12 @@ def classificar_senioridade_e_estrategia(cv_texto: str, cargo: str) -> dict:
     # Ajustar baseado em evidências no CV (se classificação não foi executivo)
     if senioridade != 'executivo':
         # Evidências de nível executivo no CV
-        evidencias_executivo = [
-            r'budget.*\d+.*milhões?',
-            r'budget.*\d+.*million',
-            r'equipe.*\d{2,}',  # Gerenciou 10+ pessoas
-            r'time.*\d{2,}',
-            r'p&l',
-            r'ebitda',
-            r'receita.*\d+.*milhões?',
-            r'revenue.*\d+.*million'
-        ]
-        
-        if any(re.search(pattern, cv_lower) for pattern in evidencias_executivo):
+        if _RE_EVIDENCIAS_EXECUTIVO.search(cv_lower):
             senioridade = 'executivo'
         
         # Evidências de senior
         elif senioridade != 'senior':
-            evidencias_senior = [
-                r'lider.*técnic',
-                r'mentoria',
-                r'arquitetura',
-                r'coordena',
-                r'equipe.*\d+',  # Gerenciou equipe com número
-                r'time.*\d+'
-            ]
-            
-            if any(re.search(pattern, cv_lower) for pattern in evidencias_senior):
+            if _RE_EVIDENCIAS_SENIOR.search(cv_lower):
                 senioridade = 'senior'
     
     # === DEFINIR ESTRATÉGIA POR SENIORIDADE ===
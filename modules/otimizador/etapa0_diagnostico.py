@@ -8,6 +8,7 @@ HEADHUNTER ELITE: Usa inteligência de mercado para análise personalizada.
 """
 
 import streamlit as st
+from core.normalizacao_texto import visao_texto
 from modules.otimizador.market_knowledge import detectar_area_por_cargo, obter_conhecimento_mercado
 from modules.otimizador.classificador_perfil import classificar_senioridade_e_estrategia
 from modules.otimizador.analisador_bullets import analisar_bullets_fracos, contar_bullets_fracos
@@ -102,7 +103,7 @@ Por favor, retorne ao início e faça upload do seu CV novamente.
     
     # 4. Calcular gaps críticos (keywords essenciais faltando)
     # Contar quantas keywords do mercado estão no CV
-    cv_lower = cv_texto.lower()
+    cv_lower = visao_texto(cv_texto).minusculo
     keywords_encontradas = sum(1 for kw in keywords_mercado if kw.lower() in cv_lower)
     keywords_faltando = len(keywords_mercado) - keywords_encontradas
     
@@ -11,6 +11,7 @@ HEADHUNTER ELITE: Perguntas cirúrgicas e contextuais para otimização ATS.
 import logging
 import streamlit as st
 from typing import List, Dict, Optional, Tuple
+from core.normalizacao_texto import visao_texto
 from core.cv_cache import get_cv_contexto_para_prompt
 from core.dynamic_questions import adicionar_qa_historico, obter_historico_qa
 
@@ -83,7 +84,7 @@ def detectar_keywords_cobertas_no_cv(cv_texto: str) -> Dict[str, bool]:
     Returns:
         Dict[str, bool]: Dicionário com keyword como chave e True/False indicando se está coberta
     """
-    cv_lower = cv_texto.lower()
+    cv_lower = visao_texto(cv_texto).minusculo
     cobertura = {}
     
     for keyword, patterns in KEYWORD_COVERAGE_PATTERNS.items():
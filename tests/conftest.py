@@ -0,0 +1,72 @@
+"""
+Configuração compartilhada dos testes.
+
+Caches persistentes e compartilhados entre sessões são desligados por padrão
+para que um teste não receba resultados gravados por outro (ou pelo app).
+Testes de cache ligam explicitamente o que precisam com ``monkeypatch``.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+import core.config
+from core.ats_cache import resetar_cache_ats
+from core.jd_library import resetar_biblioteca_jd
+from core.llm_cache import resetar_cache_llm
+from core.limitador_taxa import resetar_limitador
+from core.cassetes_llm import resetar_cassete
+from core.cache_extracao import resetar_cache_extracao
+
+
+@pytest.fixture(autouse=True)
+def _desligar_caches_persistentes(monkeypatch):
+    """Desliga caches em disco compartilhados durante os testes."""
+    monkeypatch.setattr(core.config.config, 'ATS_CACHE_ENABLED', False)
+    monkeypatch.setattr(core.config.config, 'JD_LIBRARY_ENABLED', False)
+    monkeypatch.setattr(core.config.config, 'LLM_CACHE_ENABLED', False)
+    monkeypatch.setattr(core.config.config, 'LLM_CASSETTE_MODE', '')
+    monkeypatch.setattr(core.config.config, 'EXTRACTION_CACHE_ENABLED', False)
+    resetar_cache_ats()
+    resetar_biblioteca_jd()
+    resetar_cache_llm()
+    resetar_limitador()
+    resetar_cassete()
+    resetar_cache_extracao()
+    yield
+    resetar_cache_ats()
+    resetar_biblioteca_jd()
+    resetar_cache_llm()
+    resetar_limitador()
+    resetar_cassete()
+    resetar_cache_extracao()
+
+
+@pytest.fixture
+def cliente_openai_falso():
+    """
+    Fábrica de clientes OpenAI falsos com resposta fixa.
+
+    ``cliente_openai_falso(texto, erros=(), tokens=(120, 30))``: cada
+    chamada a ``chat.completions.create`` levanta o próximo erro programado
+    ou devolve ``texto`` com o uso de tokens (prompt, resposta); ``tokens``
+    None gera resposta sem ``usage``. As chamadas ficam registradas no Mock
+    ``client.chat.completions.create``.
+    """
+    def _criar(texto="ok", erros=(), tokens=(120, 30)):
+        pendentes = list(erros)
+
+        def _create(*args, **params):
+            if pendentes:
+                raise pendentes.pop(0)
+            uso = None
+            if tokens is not None:
+                uso = SimpleNamespace(prompt_tokens=tokens[0], completion_tokens=tokens[1],
+                                      prompt_tokens_details=SimpleNamespace(cached_tokens=0))
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=texto))], usage=uso)
+
+        client = Mock()
+        client.chat.completions.create.side_effect = _create
+        return client
+    return _criar
@@ -0,0 +1,115 @@
+"""
+Testes da saída estruturada (JSON schema) da análise ATS via LLM.
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+from core.ats_scorer import (
+    FORMATO_ANALISE_LLM,
+    _analisar_com_llm,
+    _interpretar_analise_llm,
+)
+from core.roteamento_modelos import ROTA_ANALISE_ATS, ROTA_REPARO_JSON
+from core.utils import chamar_gpt
+
+ANALISE_VALIDA = {
+    "score": 72.0,
+    "arquetipo_cargo": "VENDAS",
+    "pontos_fortes": ["CRM Salesforce"],
+    "gaps_identificados": ["HubSpot"],
+    "gaps_falsos_ignorados": ["Outreach (usa ferramenta similar)"],
+    "plano_acao": ["🔍 Inclua HubSpot no resumo"],
+}
+
+CV = "CV do candidato com experiência em vendas B2B " * 20
+
+
+class TestSchemaAnalise:
+    """Testes do schema enviado à API."""
+
+    def test_schema_estrito(self):
+        """Modo strict: todos os campos obrigatórios, sem extras nem defaults."""
+        schema = FORMATO_ANALISE_LLM['json_schema']['schema']
+
+        assert FORMATO_ANALISE_LLM['json_schema']['strict'] is True
+        assert set(schema['required']) == set(ANALISE_VALIDA)
+        assert schema['additionalProperties'] is False
+        assert all('default' not in p and 'title' not in p for p in schema['properties'].values())
+
+    def test_interpreta_json_e_markdown(self):
+        """JSON puro e em bloco markdown são aceitos."""
+        puro = json.dumps(ANALISE_VALIDA)
+
+        assert _interpretar_analise_llm(puro)[0] == ANALISE_VALIDA
+        assert _interpretar_analise_llm(f"```json\n{puro}\n```")[0] == ANALISE_VALIDA
+
+    def test_campos_opcionais_com_default(self):
+        """Sem arquetipo/gaps falsos (respostas antigas) usa os defaults."""
+        parcial = {k: v for k, v in ANALISE_VALIDA.items()
+                   if k not in ('arquetipo_cargo', 'gaps_falsos_ignorados')}
+
+        resultado, erro = _interpretar_analise_llm(json.dumps(parcial))
+
+        assert erro is None
+        assert resultado['arquetipo_cargo'] == 'N/A'
+        assert resultado['gaps_falsos_ignorados'] == []
+
+    def test_tipo_invalido_gera_erro(self):
+        """Score não numérico é rejeitado com a descrição do erro."""
+        resultado, erro = _interpretar_analise_llm(json.dumps({**ANALISE_VALIDA, "score": "alto"}))
+
+        assert resultado is None
+        assert "score" in erro
+
+    def test_chamar_gpt_envia_response_format(self):
+        """chamar_gpt repassa response_format para a API."""
+        client = Mock()
+        response = Mock(usage=None)
+        response.choices = [Mock(message=Mock(content=json.dumps(ANALISE_VALIDA)))]
+        client.chat.completions.create.return_value = response
+
+        chamar_gpt(client, [{"role": "user", "content": "CV"}], response_format=FORMATO_ANALISE_LLM)
+
+        assert client.chat.completions.create.call_args.kwargs['response_format'] == FORMATO_ANALISE_LLM
+
+
+class TestAnaliseComReparo:
+    """Testes de _analisar_com_llm com structured output e reparo."""
+
+    @patch('core.ats_scorer.chamar_gpt')
+    def test_analise_usa_schema_e_rota(self, mock_chamar_gpt):
+        """A análise pede o schema e usa a rota com max_tokens do schema."""
+        mock_chamar_gpt.return_value = json.dumps(ANALISE_VALIDA)
+
+        resultado = _analisar_com_llm(Mock(), CV, "Gerente de Vendas")
+
+        assert resultado['score'] == 72.0
+        kwargs = mock_chamar_gpt.call_args.kwargs
+        assert kwargs['response_format'] == FORMATO_ANALISE_LLM
+        assert kwargs['rota'] == ROTA_ANALISE_ATS
+        assert mock_chamar_gpt.call_count == 1
+
+    @patch('core.ats_scorer.chamar_gpt')
+    def test_json_invalido_reparado_sem_reenviar_cv(self, mock_chamar_gpt):
+        """JSON malformado é corrigido por uma chamada curta, sem repetir a análise."""
+        truncado = json.dumps(ANALISE_VALIDA)[:-20]
+        mock_chamar_gpt.side_effect = [truncado, json.dumps(ANALISE_VALIDA)]
+
+        resultado = _analisar_com_llm(Mock(), CV, "Gerente de Vendas")
+
+        assert resultado['gaps_identificados'] == ["HubSpot"]
+        assert resultado['fonte_vaga'] == 'arquetipo'
+        reparo = mock_chamar_gpt.call_args_list[1]
+        assert reparo.kwargs['rota'] == ROTA_REPARO_JSON
+        conteudo_reparo = " ".join(m['content'] for m in reparo.args[1])
+        assert truncado in conteudo_reparo
+        assert CV not in conteudo_reparo
+
+    @patch('core.ats_scorer.chamar_gpt')
+    def test_reparo_falho_retorna_none(self, mock_chamar_gpt):
+        """Se o reparo também falhar, a análise retorna None (fallback TF-IDF)."""
+        mock_chamar_gpt.side_effect = ["não é json", "continua não sendo"]
+
+        assert _analisar_com_llm(Mock(), CV, "Gerente de Vendas") is None
+        assert mock_chamar_gpt.call_count == 2
@@ -0,0 +1,161 @@
+"""
+Testes do cache persistente de resultados ATS (core.ats_cache).
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+import core.config
+from core.ats_cache import (
+    gerar_chave_ats,
+    estatisticas_cache_ats,
+    resetar_cache_ats,
+)
+from core.ats_scorer import calcular_score_ats, VERSAO_SCORER
+
+
+CV = """
+Gerente de Vendas | Empresa X | 2019 - Presente
+- Salesforce, forecast e pipeline B2B
+- Aumento de 35% na receita recorrente
+"""
+
+RESPOSTA_LLM = json.dumps({
+    "score": 72.0,
+    "arquetipo_cargo": "VENDAS",
+    "pontos_fortes": ["Salesforce", "Forecast"],
+    "gaps_identificados": ["Gong"],
+    "gaps_falsos_ignorados": [],
+    "plano_acao": ["🔍 Inclua Gong no CV"],
+})
+
+
+@pytest.fixture
+def cache_ligado(tmp_path, monkeypatch):
+    """Liga o cache ATS apontando para um SQLite temporário."""
+    monkeypatch.setattr(core.config.config, 'ATS_CACHE_ENABLED', True)
+    monkeypatch.setattr(core.config.config, 'ATS_CACHE_PATH', str(tmp_path / 'ats.sqlite'))
+    resetar_cache_ats()
+    yield tmp_path / 'ats.sqlite'
+    resetar_cache_ats()
+
+
+class TestChaveAts:
+    """Testes da chave endereçada por conteúdo."""
+
+    def _chave(self, **kwargs):
+        base = dict(cv_texto=CV, cargo_alvo='Gerente de Vendas', texto_vaga=None,
+                    objetivo='Recolocação', cargo_atual=None, modo='llm', versao_scorer='1')
+        base.update(kwargs)
+        return gerar_chave_ats(**base)
+
+    def test_whitespace_do_cv_nao_muda_chave(self):
+        """CV com espaços/quebras diferentes gera a mesma chave."""
+        assert self._chave() == self._chave(cv_texto="  " + CV.replace("\n", "\r\n  ") + "\n")
+
+    def test_caixa_do_cargo_nao_muda_chave(self):
+        """Cargo com caixa diferente gera a mesma chave."""
+        assert self._chave() == self._chave(cargo_alvo='GERENTE DE VENDAS')
+
+    @pytest.mark.parametrize('campo,valor', [
+        ('cargo_alvo', 'Diretor de Vendas'),
+        ('texto_vaga', 'Vaga real com Gong'),
+        ('objetivo', 'Promoção Interna'),
+        ('cargo_atual', 'Coordenador'),
+        ('modo', 'offline'),
+        ('versao_scorer', '2'),
+        ('modelo', 'gpt-4o:1500'),
+        ('motor', '1:geral@123'),
+    ])
+    def test_campos_relevantes_mudam_chave(self, campo, valor):
+        """Cada parâmetro da análise faz parte da chave."""
+        assert self._chave() != self._chave(**{campo: valor})
+
+
+class TestCalcularScoreAtsComCache:
+    """Testes do cache transparente em calcular_score_ats."""
+
+    def test_cache_desligado_nos_testes(self):
+        """Por padrão (conftest), o cache fica desligado."""
+        assert estatisticas_cache_ats() == {'ativo': False}
+
+    @patch('core.ats_scorer.chamar_gpt')
+    def test_segunda_chamada_nao_chama_gpt(self, mock_chamar_gpt, cache_ligado):
+        """Mesmo CV/cargo em outra sessão reaproveita o resultado."""
+        mock_chamar_gpt.return_value = RESPOSTA_LLM
+        client = Mock()
+
+        primeiro = calcular_score_ats(CV, "Gerente de Vendas", client=client, objetivo="Recolocação")
+        chamadas = mock_chamar_gpt.call_count
+        segundo = calcular_score_ats(CV, "Gerente de Vendas", client=client, objetivo="Recolocação")
+
+        assert segundo == primeiro
+        assert mock_chamar_gpt.call_count == chamadas
+        stats = estatisticas_cache_ats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+
+    @patch('core.ats_scorer.chamar_gpt')
+    def test_usar_cache_false_recalcula(self, mock_chamar_gpt, cache_ligado):
+        """usar_cache=False ignora o cache."""
+        mock_chamar_gpt.return_value = RESPOSTA_LLM
+        client = Mock()
+
+        calcular_score_ats(CV, "Gerente de Vendas", client=client)
+        chamadas = mock_chamar_gpt.call_count
+        calcular_score_ats(CV, "Gerente de Vendas", client=client, usar_cache=False)
+
+        assert mock_chamar_gpt.call_count > chamadas
+
+    @patch('core.ats_scorer.chamar_gpt')
+    def test_fallback_por_falha_da_llm_nao_e_gravado(self, mock_chamar_gpt, cache_ligado):
+        """Resultado degradado (LLM falhou) não fica preso no cache."""
+        mock_chamar_gpt.return_value = None
+        client = Mock()
+
+        resultado = calcular_score_ats(CV, "Gerente de Vendas", client=client)
+
+        assert resultado['fonte_vaga'] == 'tfidf_fallback'
+        assert estatisticas_cache_ats()['itens'] == 0
+
+    def test_persiste_apos_reinicio(self, cache_ligado):
+        """O resultado offline sobrevive ao fechamento do cache (reinício)."""
+        primeiro = calcular_score_ats(CV, "Gerente de Vendas")
+        resetar_cache_ats()
+
+        segundo = calcular_score_ats(CV, "Gerente de Vendas")
+
+        assert segundo == primeiro
+        assert estatisticas_cache_ats()['hits'] == 1
+
+    @patch('core.ats_scorer.chamar_gpt')
+    def test_modelo_da_analise_muda_chave(self, mock_chamar_gpt, cache_ligado, monkeypatch):
+        """Trocar o modelo da rota analise_ats não serve o score do modelo anterior."""
+        mock_chamar_gpt.return_value = RESPOSTA_LLM
+        client = Mock()
+        calcular_score_ats(CV, "Gerente de Vendas", client=client)
+
+        monkeypatch.setattr(core.config.config, 'MODEL_ROUTES', 'analise_ats=gpt-4.1:1500')
+        calcular_score_ats(CV, "Gerente de Vendas", client=client)
+
+        assert estatisticas_cache_ats()['hits'] == 0
+
+    def test_motor_novo_muda_chave(self, cache_ligado, tmp_path, monkeypatch):
+        """Um motor TF-IDF treinado depois não recebe o score calculado sem ele."""
+        from core.ats_engine import construir_motor, recarregar_motores, salvar_motor
+        monkeypatch.setattr(core.config.config, 'ATS_ENGINE_DIR', str(tmp_path / 'motores'))
+        recarregar_motores()
+        calcular_score_ats(CV, "Gerente de Vendas")
+
+        salvar_motor(construir_motor([CV, "Gerente de Vendas com Salesforce"]), tmp_path / 'motores' / 'geral.joblib')
+        recarregar_motores()
+        calcular_score_ats(CV, "Gerente de Vendas")
+        recarregar_motores()
+
+        assert estatisticas_cache_ats()['hits'] == 0
+
+    def test_versao_scorer_definida(self):
+        """A versão do scorer faz parte da chave."""
+        assert VERSAO_SCORER
@@ -0,0 +1,134 @@
+"""
+Testes da execução concorrente da análise LLM e do breakdown TF-IDF.
+"""
+
+import json
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+
+import core.config
+from core.ats_scorer import _executor_ats, calcular_score_ats, obter_breakdown_pendente
+from core.gpt_metricas import SESSAO_DESCONHECIDA, _id_sessao, contexto_gpt, contexto_gpt_atual
+
+
+CV = """
+Gerente de Vendas | Empresa X | 2019 - Presente
+- Salesforce, forecast e pipeline B2B
+- Aumento de 35% na receita recorrente
+"""
+
+RESPOSTA_LLM = json.dumps({
+    "score": 72.0,
+    "arquetipo_cargo": "VENDAS",
+    "pontos_fortes": ["Salesforce", "Forecast"],
+    "gaps_identificados": ["Gong"],
+    "gaps_falsos_ignorados": [],
+    "plano_acao": ["🔍 Inclua Gong no CV"],
+})
+
+JD = "Gerente de Vendas: Salesforce, forecast, pipeline B2B, Gong, Outreach"
+
+
+def _tipo_chamada(msgs):
+    """Identifica qual etapa do ATS fez a chamada GPT."""
+    sistema = msgs[0]['content']
+    if 'variações REAIS' in sistema:
+        return 'variacoes'
+    if 'Gere uma Job Description' in sistema:
+        return 'jd'
+    return 'analise'
+
+
+class TestExecucaoConcorrente:
+    """Testes de paralelismo e prazo em calcular_score_ats."""
+
+    def test_analise_e_jd_rodam_em_paralelo(self):
+        """A análise LLM e as variações da JD precisam estar em voo juntas."""
+        barreira = threading.Barrier(2, timeout=5)
+
+        def gpt(client, msgs, **kwargs):
+            tipo = _tipo_chamada(msgs)
+            if tipo in ('analise', 'variacoes'):
+                barreira.wait()  # quebra (BrokenBarrierError) se forem sequenciais
+            return {'analise': RESPOSTA_LLM, 'variacoes': "Sales Manager", 'jd': JD}[tipo]
+
+        with patch('core.ats_scorer.chamar_gpt', side_effect=gpt):
+            resultado = calcular_score_ats(CV, "Gerente de Vendas", client=Mock())
+
+        assert resultado['score_total'] == 72.0
+        assert resultado['detalhes']['metodo'] == 'LLM Score + TF-IDF Breakdown'
+        assert 'pendente' not in resultado['detalhes']
+
+    def test_breakdown_fora_do_prazo_fica_pendente(self, monkeypatch):
+        """JD lenta não bloqueia o resultado: breakdown volta como pendente."""
+        monkeypatch.setattr(core.config.config, 'ATS_DEADLINE', 0.3)
+        liberar_jd = threading.Event()
+
+        def gpt(client, msgs, **kwargs):
+            tipo = _tipo_chamada(msgs)
+            if tipo == 'analise':
+                return RESPOSTA_LLM
+            liberar_jd.wait(timeout=5)
+            return "Sales Manager" if tipo == 'variacoes' else JD
+
+        with patch('core.ats_scorer.chamar_gpt', side_effect=gpt):
+            resultado = calcular_score_ats(CV, "Gerente de Vendas", client=Mock())
+
+            detalhes = resultado['detalhes']
+            assert resultado['score_total'] == 72.0
+            assert detalhes['pendente'] is True
+            assert detalhes['keywords']['faltando'] == []
+            assert obter_breakdown_pendente(detalhes['breakdown_id']) is None
+
+            liberar_jd.set()
+            breakdown = obter_breakdown_pendente(detalhes['breakdown_id'], timeout=5)
+
+        assert breakdown['metodo'] == 'LLM Score + TF-IDF Breakdown'
+        assert breakdown['keywords']['encontradas'] > 0
+        # Depois de entregue, o id sai do registro
+        assert obter_breakdown_pendente(detalhes['breakdown_id']) is None
+
+    def test_fallback_reaproveita_jd_gerada_em_paralelo(self):
+        """Se a LLM falha, o fallback TF-IDF usa a JD já gerada."""
+        def gpt(client, msgs, **kwargs):
+            tipo = _tipo_chamada(msgs)
+            return {'analise': None, 'variacoes': "Sales Manager", 'jd': JD}[tipo]
+
+        with patch('core.ats_scorer.chamar_gpt', side_effect=gpt) as mock_gpt:
+            resultado = calcular_score_ats(CV, "Gerente de Vendas", client=Mock())
+
+        assert resultado['fonte_vaga'] == 'tfidf_fallback'
+        assert 'gong' in resultado['gaps_identificados']
+        tipos = [_tipo_chamada(c.args[1]) for c in mock_gpt.call_args_list]
+        assert tipos.count('jd') == 1
+
+    def test_chamadas_atribuidas_a_sessao_de_quem_chama(self):
+        """As chamadas GPT feitas no pool herdam a sessão Streamlit e o contexto de quem chamou."""
+        vistos = []
+
+        def gpt(client, msgs, **kwargs):
+            vistos.append((_tipo_chamada(msgs), _id_sessao(), contexto_gpt_atual()))
+            return {'analise': RESPOSTA_LLM, 'variacoes': "Sales Manager", 'jd': JD}[_tipo_chamada(msgs)]
+
+        thread = threading.current_thread()
+        sessao = SimpleNamespace(session_id="sessao-ats")
+        add_script_run_ctx(thread, sessao)
+        try:
+            with patch('core.ats_scorer.chamar_gpt', side_effect=gpt), contexto_gpt("diagnostico"):
+                calcular_score_ats(CV, "Gerente de Vendas", client=Mock())
+        finally:
+            for nome, valor in list(vars(thread).items()):
+                if valor is sessao:
+                    delattr(thread, nome)
+
+        assert sorted(tipo for tipo, _, _ in vistos) == ['analise', 'jd', 'variacoes']
+        assert all(s == "sessao-ats" and c == "diagnostico" for _, s, c in vistos)
+        # A thread do pool não fica presa à sessão depois da tarefa
+        assert _executor_ats.submit(_id_sessao).result() == SESSAO_DESCONHECIDA
+
+    def test_id_desconhecido(self):
+        """Id inexistente retorna None."""
+        assert obter_breakdown_pendente('nao-existe') is None
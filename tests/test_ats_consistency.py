@@ -379,6 +379,31 @@ class TestAnalisarCompatibilidade:
         assert len(intersecao) == 0, \
             f"Termos não podem estar em pontos fortes E gaps: {intersecao}"
 
+    def test_jd_totalmente_coberta_pelo_cv(self):
+        """JD cujos termos estão todos no CV não gera gaps (nem erro)."""
+        resultado = _analisar_compatibilidade("Salesforce HubSpot Python", "Salesforce")
+        
+        assert resultado['gaps_identificados'] == []
+        assert resultado['pontos_fortes'] == ['salesforce']
+        assert len(resultado['plano_acao']) == 1
+    
+    def test_empates_em_ordem_alfabetica(self):
+        """Termos com o mesmo peso saem na ordem do vocabulário (determinístico)."""
+        resultado = _analisar_compatibilidade("Excel", "Tableau Salesforce HubSpot Looker")
+        gaps = resultado['gaps_identificados']
+        
+        # Todos os n-grams da JD têm o mesmo peso (tf=1, mesmo idf)
+        assert gaps == sorted(gaps)
+        assert gaps[0] == 'hubspot'
+    
+    def test_limite_de_gaps_e_pontos_fortes(self):
+        """No máximo 10 gaps e 8 pontos fortes."""
+        termos = " ".join(f"ferramenta{i}" for i in range(40))
+        resultado = _analisar_compatibilidade(termos, termos + " " + termos.upper().replace("FERRAMENTA", "sistema"))
+        
+        assert len(resultado['gaps_identificados']) == 10
+        assert len(resultado['pontos_fortes']) == 8
+
 
 class TestStopwordsFiltragem:
     """Testa que stopwords são efetivamente filtradas."""
@@ -0,0 +1,168 @@
+"""
+Testes do motor TF-IDF pré-treinado (core.ats_engine).
+"""
+
+import pytest
+
+import core.config
+from core import ats_engine
+from core.ats_engine import (
+    MotorTfidf,
+    construir_motor,
+    salvar_motor,
+    carregar_motor,
+    obter_motor,
+    recarregar_motores,
+    similaridade_cosseno,
+)
+from core.ats_scorer import _analisar_compatibilidade, _limpar_texto
+
+
+CORPUS_VENDAS = [
+    "Gerente de Vendas B2B com Salesforce, forecast e pipeline management",
+    "Account Executive SaaS com HubSpot, prospecção outbound e negociação de contratos",
+    "Coordenador Comercial com CRM Salesforce, Power BI e metas de receita recorrente",
+    "Sales Operations com Salesforce, forecast, territory planning e comissionamento",
+]
+
+
+@pytest.fixture
+def dir_motores(tmp_path, monkeypatch):
+    """Aponta Config.ATS_ENGINE_DIR para um diretório temporário."""
+    monkeypatch.setattr(core.config.config, 'ATS_ENGINE_DIR', str(tmp_path))
+    recarregar_motores()
+    yield tmp_path
+    recarregar_motores()
+
+
+class TestConstruirMotor:
+    """Testes de treino offline do motor."""
+
+    def test_construir_motor_aprende_vocabulario(self):
+        """Testa que o vocabulário vem do corpus, incluindo n-grams."""
+        motor = construir_motor(CORPUS_VENDAS, area='vendas')
+
+        termos = set(motor.feature_names)
+        assert motor.area == 'vendas'
+        assert motor.n_documentos == len(CORPUS_VENDAS)
+        assert 'salesforce' in termos
+        assert 'pipeline management' in termos
+
+    def test_construir_motor_corpus_vazio(self):
+        """Testa que corpus vazio gera ValueError."""
+        with pytest.raises(ValueError):
+            construir_motor(["", "   ", "!!!"])
+
+    def test_transformar_nao_refaz_fit(self):
+        """Testa que transform não altera o vocabulário."""
+        motor = construir_motor(CORPUS_VENDAS)
+        tamanho_antes = len(motor.feature_names)
+
+        matriz = motor.transformar([_limpar_texto("Kubernetes Terraform Salesforce")])
+
+        assert matriz.shape == (1, tamanho_antes)
+        assert len(motor.vectorizer.vocabulary_) == tamanho_antes
+
+    def test_similaridade_entre_zero_e_um(self):
+        """Testa limites da similaridade de cosseno."""
+        motor = construir_motor(CORPUS_VENDAS)
+        a = _limpar_texto(CORPUS_VENDAS[0])
+
+        assert similaridade_cosseno(*motor.transformar([a, a])) == pytest.approx(1.0)
+        assert 0.0 <= motor.similaridade(a, _limpar_texto(CORPUS_VENDAS[1])) < 1.0
+        assert motor.similaridade(a, _limpar_texto("xyzabc qwerty")) == 0.0
+
+
+class TestPersistenciaMotor:
+    """Testes de salvar/carregar o motor em disco."""
+
+    def test_salvar_e_carregar(self, tmp_path):
+        """Testa roundtrip em disco preservando vocabulário e IDF."""
+        motor = construir_motor(CORPUS_VENDAS, area='vendas')
+        caminho = salvar_motor(motor, tmp_path / 'vendas.joblib')
+
+        carregado = carregar_motor(caminho)
+
+        assert isinstance(carregado, MotorTfidf)
+        assert carregado.area == 'vendas'
+        assert list(carregado.feature_names) == list(motor.feature_names)
+        texto = _limpar_texto(CORPUS_VENDAS[2])
+        assert (carregado.transformar([texto]) != motor.transformar([texto])).nnz == 0
+
+    def test_carregar_arquivo_inexistente(self, tmp_path):
+        """Testa que arquivo ausente retorna None."""
+        assert carregar_motor(tmp_path / 'nao_existe.joblib') is None
+
+    def test_carregar_versao_incompativel(self, tmp_path, monkeypatch):
+        """Testa que motor de outra versão é ignorado."""
+        caminho = salvar_motor(construir_motor(CORPUS_VENDAS), tmp_path / 'geral.joblib')
+        monkeypatch.setattr(ats_engine, 'VERSAO_MOTOR', '999')
+
+        assert carregar_motor(caminho) is None
+
+
+class TestObterMotor:
+    """Testes do carregamento único por processo."""
+
+    def test_sem_motor_em_disco(self, dir_motores):
+        """Testa que sem arquivos o ATS volta ao fit por chamada."""
+        assert obter_motor() is None
+        assert obter_motor('vendas') is None
+
+    def test_carrega_uma_vez(self, dir_motores, monkeypatch):
+        """Testa que o motor é lido do disco apenas uma vez."""
+        salvar_motor(construir_motor(CORPUS_VENDAS), dir_motores / 'geral.joblib')
+        chamadas = []
+        original = ats_engine.carregar_motor
+        monkeypatch.setattr(ats_engine, 'carregar_motor', lambda c: chamadas.append(c) or original(c))
+
+        primeiro = obter_motor()
+        segundo = obter_motor()
+
+        assert primeiro is segundo
+        assert len(chamadas) == 1
+
+    def test_fallback_para_motor_geral(self, dir_motores):
+        """Testa que área sem motor usa o motor geral."""
+        salvar_motor(construir_motor(CORPUS_VENDAS, area='geral'), dir_motores / 'geral.joblib')
+
+        motor = obter_motor('TÉCNICO')
+
+        assert motor is not None
+        assert motor.area == 'geral'
+
+    @pytest.mark.parametrize("area", ["../../x", "produto / tecnologia", "vendas\x00", "VENDAS.joblib", "/etc/passwd"])
+    def test_area_fora_dos_motores_usa_geral(self, dir_motores, monkeypatch, area):
+        """Área em texto livre (do LLM) nunca vira caminho fora de ATS_ENGINE_DIR."""
+        salvar_motor(construir_motor(CORPUS_VENDAS, area='geral'), dir_motores / 'geral.joblib')
+        salvar_motor(construir_motor(CORPUS_VENDAS, area='vendas'), dir_motores / 'vendas.joblib')
+        caminhos = []
+        original = ats_engine.carregar_motor
+        monkeypatch.setattr(ats_engine, 'carregar_motor', lambda c: caminhos.append(c) or original(c))
+
+        assert obter_motor(area).area == 'geral'
+        assert caminhos == [dir_motores / 'geral.joblib']
+
+    def test_area_existente_e_misses_nao_memoizados(self, dir_motores):
+        """Área com arquivo é usada; áreas desconhecidas não crescem o cache."""
+        salvar_motor(construir_motor(CORPUS_VENDAS, area='vendas'), dir_motores / 'vendas.joblib')
+
+        assert obter_motor(' Vendas ').area == 'vendas'
+        for i in range(50):
+            obter_motor(f"área inventada {i}")
+
+        assert set(ats_engine._motores_carregados) <= {'vendas', 'geral'}
+
+    def test_analisar_compatibilidade_usa_motor(self, dir_motores):
+        """Testa que o score usa o vocabulário do motor pré-treinado."""
+        salvar_motor(construir_motor(CORPUS_VENDAS), dir_motores / 'geral.joblib')
+        cv = "Experiência com Salesforce, forecast e pipeline management em SaaS"
+        jd = "Buscamos Salesforce, forecast, territory planning e Kubernetes"
+
+        resultado = _analisar_compatibilidade(cv, jd)
+
+        assert 0 < resultado['score'] <= 95
+        assert 'salesforce' in resultado['pontos_fortes']
+        # Termos fora do vocabulário do corpus não entram na análise
+        assert 'kubernetes' not in resultado['gaps_identificados']
+        assert 'territory planning' in resultado['gaps_identificados']
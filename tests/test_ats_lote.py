@@ -0,0 +1,83 @@
+"""
+Testes do Score ATS em lote (um CV contra várias vagas).
+"""
+
+import pytest
+
+from core.ats_engine import recarregar_motores
+import core.config
+from core.ats_scorer import calcular_score_ats_lote, _analisar_compatibilidade
+
+
+CV = """
+Head de Revenue Operations | TechCorp | 2021 - Presente
+- Salesforce CRM integrado com HubSpot
+- Dashboards de pipeline no Power BI
+- Forecast e análise de churn com Python e SQL
+"""
+
+VAGAS = [
+    "Revenue Operations Manager: Salesforce, HubSpot, Power BI, forecast, churn",
+    "Desenvolvedor Backend: Kubernetes, Docker, Golang, gRPC, PostgreSQL",
+    "Sales Operations: Salesforce, pipeline, forecast, Tableau, comissionamento",
+]
+
+
+@pytest.fixture(autouse=True)
+def sem_motor(tmp_path, monkeypatch):
+    """Garante o caminho de fit no lote (sem motor pré-treinado)."""
+    monkeypatch.setattr(core.config.config, 'ATS_ENGINE_DIR', str(tmp_path))
+    recarregar_motores()
+    yield
+    recarregar_motores()
+
+
+class TestCalcularScoreAtsLote:
+    """Testes para calcular_score_ats_lote."""
+
+    def test_um_resultado_por_vaga_na_mesma_ordem(self):
+        """Testa que o lote preserva ordem e quantidade das vagas."""
+        resultados = calcular_score_ats_lote(CV, VAGAS)
+
+        assert [r['indice'] for r in resultados] == [0, 1, 2]
+        for r in resultados:
+            assert 0 <= r['score_total'] <= 100
+            assert r['max_score'] == 100
+            assert isinstance(r['pontos_fortes'], list)
+            assert isinstance(r['gaps_identificados'], list)
+            assert isinstance(r['plano_acao'], list) and r['plano_acao']
+
+    def test_vaga_aderente_pontua_mais(self):
+        """Testa que a vaga de RevOps pontua mais que a de backend."""
+        resultados = calcular_score_ats_lote(CV, VAGAS)
+
+        assert resultados[0]['score_total'] > resultados[1]['score_total']
+        assert 'hubspot' in resultados[0]['pontos_fortes']
+        assert 'docker' in resultados[1]['gaps_identificados']
+
+    def test_vaga_unica_igual_ao_individual(self):
+        """Com uma vaga, o lote equivale a _analisar_compatibilidade."""
+        resultado = calcular_score_ats_lote(CV, VAGAS[:1])[0]
+        individual = _analisar_compatibilidade(CV, VAGAS[0])
+
+        assert resultado['score_total'] == individual['score']
+        assert resultado['pontos_fortes'] == individual['pontos_fortes']
+        assert resultado['gaps_identificados'] == individual['gaps_identificados']
+
+    def test_vagas_vazias_recebem_score_zero(self):
+        """Testa que vagas sem texto não quebram o lote."""
+        resultados = calcular_score_ats_lote(CV, ["", VAGAS[0], "   "])
+
+        assert resultados[0]['score_total'] == 0.0
+        assert resultados[2]['score_total'] == 0.0
+        assert resultados[1]['score_total'] > 0
+
+    def test_cv_vazio(self):
+        """Testa que CV vazio retorna score zero para todas as vagas."""
+        resultados = calcular_score_ats_lote("", VAGAS)
+
+        assert all(r['score_total'] == 0.0 for r in resultados)
+
+    def test_lista_vazia(self):
+        """Testa lote sem vagas."""
+        assert calcular_score_ats_lote(CV, []) == []
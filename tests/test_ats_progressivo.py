@@ -0,0 +1,99 @@
+"""
+Testes do Score ATS progressivo (preliminar TF-IDF + refinamento LLM).
+"""
+
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+import core.config
+from core.ats_cache import resetar_cache_ats
+from core.ats_scorer import calcular_score_ats, obter_refinamento_ats, resultado_pendente
+
+
+CV = """
+Gerente de Vendas | Empresa X | 2019 - Presente
+- Salesforce, forecast e pipeline B2B
+- Aumento de 35% na receita recorrente
+"""
+
+RESPOSTA_LLM = json.dumps({
+    "score": 72.0,
+    "arquetipo_cargo": "VENDAS",
+    "pontos_fortes": ["Salesforce", "Forecast"],
+    "gaps_identificados": ["Gong"],
+    "gaps_falsos_ignorados": [],
+    "plano_acao": ["🔍 Inclua Gong no CV"],
+})
+
+
+@pytest.fixture
+def llm_bloqueada():
+    """chamar_gpt que só responde depois de liberado pelo teste."""
+    liberar = threading.Event()
+
+    def gpt(client, msgs, **kwargs):
+        liberar.wait(timeout=5)
+        if 'variações REAIS' in msgs[0]['content']:
+            return "Sales Manager"
+        if 'Gere uma Job Description' in msgs[0]['content']:
+            return "Salesforce, forecast, pipeline B2B, Gong"
+        return RESPOSTA_LLM
+
+    with patch('core.ats_scorer.chamar_gpt', side_effect=gpt) as mock_gpt:
+        yield liberar, mock_gpt
+    liberar.set()
+
+
+class TestModoProgressivo:
+    """Testes de calcular_score_ats(progressivo=True)."""
+
+    def test_preliminar_sem_esperar_llm(self, llm_bloqueada):
+        """O resultado TF-IDF volta antes da LLM responder."""
+        liberar, _ = llm_bloqueada
+
+        inicio = time.monotonic()
+        preliminar = calcular_score_ats(CV, "Gerente de Vendas", client=Mock(), progressivo=True)
+        decorrido = time.monotonic() - inicio
+
+        assert decorrido < 2
+        assert preliminar['refinamento_pendente'] is True
+        assert preliminar['fonte_vaga'] == 'tfidf_fallback'
+        assert resultado_pendente(preliminar['refinamento_id'])
+        assert obter_refinamento_ats(preliminar['refinamento_id']) is None
+
+        liberar.set()
+        final = obter_refinamento_ats(preliminar['refinamento_id'], timeout=5)
+
+        assert final['score_total'] == 72.0
+        assert final['metodo'] == 'LLM + TF-IDF Validation (v5.0)'
+        assert 'refinamento_id' not in final
+        assert not resultado_pendente(preliminar['refinamento_id'])
+
+    def test_sem_client_ignora_progressivo(self):
+        """Sem client não há refinamento: retorna o resultado offline."""
+        resultado = calcular_score_ats(CV, "Gerente de Vendas", progressivo=True)
+
+        assert 'refinamento_id' not in resultado
+        assert resultado['fonte_vaga'] == 'tfidf_fallback'
+
+    def test_cache_hit_retorna_final_direto(self, llm_bloqueada, tmp_path, monkeypatch):
+        """Com o resultado LLM já em cache, não há etapa preliminar."""
+        liberar, mock_gpt = llm_bloqueada
+        liberar.set()
+        monkeypatch.setattr(core.config.config, 'ATS_CACHE_ENABLED', True)
+        monkeypatch.setattr(core.config.config, 'ATS_CACHE_PATH', str(tmp_path / 'ats.sqlite'))
+        resetar_cache_ats()
+
+        preliminar = calcular_score_ats(CV, "Gerente de Vendas", client=Mock(), progressivo=True)
+        obter_refinamento_ats(preliminar['refinamento_id'], timeout=5)
+        chamadas = mock_gpt.call_count
+
+        resultado = calcular_score_ats(CV, "Gerente de Vendas", client=Mock(), progressivo=True)
+
+        assert resultado['score_total'] == 72.0
+        assert 'refinamento_id' not in resultado
+        assert mock_gpt.call_count == chamadas
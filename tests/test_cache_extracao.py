@@ -0,0 +1,118 @@
+"""
+Testes do cache de extrações endereçado por conteúdo (core.cache_extracao).
+"""
+
+import io
+from unittest.mock import Mock, patch
+
+import pytest
+
+import core.config
+from core.cache_extracao import (
+    estatisticas_cache_extracao,
+    gerar_chave_extracao,
+    obter_cache_extracao,
+    resetar_cache_extracao,
+)
+from core.utils import extrair_texto_universal
+
+CV_TXT = "Gerente de Vendas\nSalesforce, forecast e pipeline B2B\n"
+
+
+def _docx(paragrafos):
+    """Arquivo .docx em memória."""
+    import docx
+    documento = docx.Document()
+    for paragrafo in paragrafos:
+        documento.add_paragraph(paragrafo)
+    saida = io.BytesIO()
+    documento.save(saida)
+    return saida.getvalue()
+
+
+@pytest.fixture
+def cache_ligado(tmp_path, monkeypatch):
+    """Liga o cache de extrações apontando para um SQLite temporário."""
+    monkeypatch.setattr(core.config.config, 'EXTRACTION_CACHE_ENABLED', True)
+    monkeypatch.setattr(core.config.config, 'EXTRACTION_CACHE_PATH', str(tmp_path / 'extracao.sqlite'))
+    resetar_cache_extracao()
+    yield
+    resetar_cache_extracao()
+
+
+class TestChaveExtracao:
+    """Testes da chave BLAKE2b."""
+
+    def test_mesmo_conteudo_mesma_chave(self):
+        """A chave depende só dos bytes e do formato."""
+        assert gerar_chave_extracao(b"abc", "txt") == gerar_chave_extracao(bytearray(b"abc"), "txt")
+        assert len(gerar_chave_extracao(b"abc", "txt")) == 64
+
+    def test_formato_e_conteudo_mudam_a_chave(self):
+        """Outro formato ou outro byte geram outra chave."""
+        chave = gerar_chave_extracao(b"abc", "txt")
+
+        assert gerar_chave_extracao(b"abc", "pdf") != chave
+        assert gerar_chave_extracao(b"abd", "txt") != chave
+
+
+class TestCacheExtracao:
+    """Testes do cache em extrair_texto_universal."""
+
+    def test_desligado_nao_grava(self):
+        """Com o cache desligado nada é guardado."""
+        assert extrair_texto_universal(io.BytesIO(CV_TXT.encode()), 'txt') == CV_TXT
+        assert estatisticas_cache_extracao() == {'ativo': False}
+
+    def test_reenvio_nao_reprocessa(self, cache_ligado):
+        """O mesmo arquivo enviado de novo sai do cache, sem o extrator."""
+        assert extrair_texto_universal(io.BytesIO(CV_TXT.encode('cp1252')), 'txt') == CV_TXT
+
+        extrator = Mock()
+        with patch.dict('core.pipeline_upload._EXTRATORES', {'txt': extrator}):
+            assert extrair_texto_universal(io.BytesIO(CV_TXT.encode('cp1252')), 'txt') == CV_TXT
+
+        extrator.assert_not_called()
+        assert estatisticas_cache_extracao()['hits'] == 1
+
+    def test_metadados(self, cache_ligado):
+        """Além do texto guarda formato, encoding, caracteres e bytes."""
+        dados = "Coordenação de Projetos".encode('latin-1')
+        extrair_texto_universal(io.BytesIO(dados), 'txt')
+
+        extracao = obter_cache_extracao().obter(gerar_chave_extracao(dados, 'txt'))
+
+        assert extracao['encoding'] == 'latin-1'
+        assert extracao['caracteres'] == len("Coordenação de Projetos")
+        assert extracao['bytes'] == len(dados)
+
+    def test_sobrevive_a_reinicio(self, cache_ligado):
+        """Após reabrir o arquivo SQLite (reinício) o DOCX não é reprocessado."""
+        dados = _docx(["Analista de Dados", "Python e SQL"])
+        assert extrair_texto_universal(io.BytesIO(dados), 'docx') == "Analista de Dados\nPython e SQL"
+
+        resetar_cache_extracao()
+        extrator = Mock()
+        with patch.dict('core.pipeline_upload._EXTRATORES', {'docx': extrator}):
+            assert extrair_texto_universal(io.BytesIO(dados), 'doc') == "Analista de Dados\nPython e SQL"
+
+        extrator.assert_not_called()
+
+    def test_falha_nao_e_guardada(self, cache_ligado):
+        """Arquivos sem texto não entram no cache."""
+        with patch('core.utils.st'):
+            assert extrair_texto_universal(io.BytesIO(b"   "), 'txt') is None
+
+        assert estatisticas_cache_extracao()['itens'] == 0
+
+    def test_extracao_degradada_nao_e_guardada(self, cache_ligado):
+        """PDF com páginas desistidas por timeout não envenena o cache."""
+        def extrair_com_timeout(dados, progresso=None, desistidas=None):
+            desistidas.append(1)
+            return "Pagina 1 Experience Python"
+
+        with patch('core.pipeline_upload.extrair_texto_paginado', side_effect=extrair_com_timeout):
+            texto = extrair_texto_universal(io.BytesIO(b"%PDF-1.4\n..."), 'pdf')
+
+        assert texto == "Pagina 1 Experience Python"
+        assert estatisticas_cache_extracao()['itens'] == 0
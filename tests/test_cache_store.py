@@ -0,0 +1,137 @@
+"""
+Testes do cache em disco SQLite (core.cache_store).
+"""
+
+import time
+
+import pytest
+
+from core.cache_store import CacheSQLite, CacheMemoriaLRU
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Cache temporário sem limites."""
+    c = CacheSQLite(tmp_path / 'teste.sqlite', nome='teste')
+    yield c
+    c.fechar()
+
+
+class TestCacheSQLite:
+    """Testes de leitura, escrita, LRU e TTL."""
+
+    def test_definir_e_obter(self, cache):
+        """Testa roundtrip de valores JSON."""
+        cache.definir('a', {'score': 72.5, 'gaps': ['SAP']})
+
+        assert cache.obter('a') == {'score': 72.5, 'gaps': ['SAP']}
+        assert 'a' in cache
+        assert len(cache) == 1
+
+    def test_chave_ausente(self, cache):
+        """Testa miss para chave inexistente."""
+        assert cache.obter('nao_existe') is None
+
+    def test_persiste_entre_instancias(self, tmp_path):
+        """Testa que os valores sobrevivem ao fechar e reabrir o arquivo."""
+        caminho = tmp_path / 'persistente.sqlite'
+        primeiro = CacheSQLite(caminho)
+        primeiro.definir('x', [1, 2, 3])
+        primeiro.fechar()
+
+        segundo = CacheSQLite(caminho)
+        assert segundo.obter('x') == [1, 2, 3]
+        segundo.fechar()
+
+    def test_ttl_expira(self, tmp_path, monkeypatch):
+        """Testa que itens vencidos são descartados."""
+        cache = CacheSQLite(tmp_path / 'ttl.sqlite', ttl_segundos=60)
+        agora = time.time()
+        monkeypatch.setattr(time, 'time', lambda: agora)
+        cache.definir('a', 1)
+
+        monkeypatch.setattr(time, 'time', lambda: agora + 61)
+
+        assert cache.obter('a') is None
+        assert 'a' not in cache
+        assert cache.estatisticas()['expirados'] == 1
+        cache.fechar()
+
+    def test_lru_despeja_menos_acessado(self, tmp_path, monkeypatch):
+        """Testa que, acima do limite, sai o item acessado há mais tempo."""
+        cache = CacheSQLite(tmp_path / 'lru.sqlite', max_itens=2)
+        relogio = iter(range(1000, 2000))
+        monkeypatch.setattr(time, 'time', lambda: next(relogio))
+
+        cache.definir('a', 1)
+        cache.definir('b', 2)
+        cache.obter('a')  # 'b' passa a ser o menos recente
+        cache.definir('c', 3)
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert cache.estatisticas()['despejados'] == 1
+        cache.fechar()
+
+    def test_estatisticas_hit_rate(self, cache):
+        """Testa contagem de hits e misses."""
+        cache.definir('a', 1)
+        cache.obter('a')
+        cache.obter('a')
+        cache.obter('b')
+
+        stats = cache.estatisticas()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == pytest.approx(2 / 3, abs=1e-4)
+        assert stats['itens'] == 1
+
+    def test_remover_e_limpar(self, cache):
+        """Testa remoção individual e limpeza total."""
+        cache.definir('a', 1)
+        cache.definir('b', 2)
+
+        assert cache.remover('a') is True
+        assert cache.remover('a') is False
+        cache.limpar()
+        assert len(cache) == 0
+
+
+class TestCacheMemoriaLRU:
+    """Testes do backend em memória (mesma interface do CacheSQLite)."""
+
+    def test_definir_e_obter_copia_independente(self):
+        """Testa roundtrip sem compartilhar objetos mutáveis."""
+        cache = CacheMemoriaLRU()
+        valor = {'gaps': ['SAP']}
+        cache.definir('a', valor)
+        valor['gaps'].append('Oracle')
+
+        lido = cache.obter('a')
+        lido['gaps'].append('Tableau')
+
+        assert cache.obter('a') == {'gaps': ['SAP']}
+
+    def test_lru_despeja_menos_acessado(self):
+        """Testa que, acima do limite, sai o item acessado há mais tempo."""
+        cache = CacheMemoriaLRU(max_itens=2)
+        cache.definir('a', 1)
+        cache.definir('b', 2)
+        cache.obter('a')
+        cache.definir('c', 3)
+
+        assert 'a' in cache and 'c' in cache
+        assert 'b' not in cache
+        assert cache.estatisticas()['despejados'] == 1
+
+    def test_ttl_expira(self, monkeypatch):
+        """Testa que itens vencidos são descartados."""
+        cache = CacheMemoriaLRU(ttl_segundos=60)
+        agora = time.time()
+        monkeypatch.setattr(time, 'time', lambda: agora)
+        cache.definir('a', 1)
+        monkeypatch.setattr(time, 'time', lambda: agora + 61)
+
+        assert cache.obter('a') is None
+        assert cache.estatisticas()['expirados'] == 1
@@ -0,0 +1,134 @@
+"""
+Testes da gravação/reprodução de respostas da API (core.cassetes_llm).
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from openai import AsyncOpenAI
+
+import core.config
+from core.cassetes_llm import obter_cassete, resetar_cassete
+from core.gpt_async import chamar_gpt_async
+from core.gpt_metricas import registro_metricas
+from core.utils import chamar_gpt, chamar_gpt_stream
+
+MSGS = [{"role": "user", "content": "Gere a JD de Gerente de Vendas"}]
+
+
+def _uso(prompt=120, resposta=30):
+    return SimpleNamespace(prompt_tokens=prompt, completion_tokens=resposta,
+                           prompt_tokens_details=SimpleNamespace(cached_tokens=0))
+
+
+def _cliente_stream(partes):
+    """Cliente OpenAI falso que responde em chunks."""
+    chunks = [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=p))], usage=None)
+              for p in partes]
+    chunks.append(SimpleNamespace(choices=[], usage=_uso()))
+    client = Mock()
+    client.chat.completions.create.return_value = iter(chunks)
+    return client
+
+
+def _cliente_offline():
+    """Cliente que falha se for usado (reprodução não pode ir à rede)."""
+    client = Mock()
+    client.chat.completions.create.side_effect = AssertionError("chamada de rede na reprodução")
+    return client
+
+
+@pytest.fixture
+def modo(monkeypatch, tmp_path):
+    """Troca o modo do cassete (arquivo temporário) recriando a instância."""
+    monkeypatch.setattr(core.config.config, 'LLM_CASSETTE_PATH', str(tmp_path / "cassetes.sqlite"))
+
+    def _trocar(novo_modo, latencia=0.0):
+        resetar_cassete()
+        monkeypatch.setattr(core.config.config, 'LLM_CASSETTE_MODE', novo_modo)
+        monkeypatch.setattr(core.config.config, 'LLM_CASSETTE_LATENCY', latencia)
+        return obter_cassete()
+
+    return _trocar
+
+
+class TestGravarReproduzir:
+    """Testes do ciclo gravar → reproduzir."""
+
+    def test_desligado_por_padrao(self):
+        """Sem LLM_CASSETTE_MODE não há cassete."""
+        assert obter_cassete() is None
+
+    def test_reproduz_resposta_gravada(self, modo, cliente_openai_falso):
+        """A resposta gravada volta sem rede, com o uso de tokens gravado."""
+        modo("gravar")
+        gravada = chamar_gpt(cliente_openai_falso("Linha 1\nLinha 2"), MSGS, temperature=0.3, seed=42)
+
+        cassete = modo("reproduzir")
+        registro_metricas.resetar()
+        reproduzida = chamar_gpt(_cliente_offline(), MSGS, temperature=0.3, seed=42)
+
+        assert reproduzida == gravada == "Linha 1\nLinha 2"
+        assert cassete.estatisticas()['reproduzidas'] == 1
+        assert registro_metricas.snapshot()['total']['tokens_prompt'] == 120
+
+    def test_requisicao_sem_gravacao(self, modo, cliente_openai_falso):
+        """Sem gravação a chamada falha sem ir à rede."""
+        modo("gravar")
+        chamar_gpt(cliente_openai_falso(), MSGS, temperature=0.3, seed=42)
+        cassete = modo("reproduzir")
+
+        client = _cliente_offline()
+        with patch('core.utils.st'):
+            assert chamar_gpt(client, MSGS, temperature=0.9, seed=42) is None
+
+        client.chat.completions.create.assert_not_called()
+        assert cassete.estatisticas()['ausentes'] == 1
+
+    def test_stream_gravado_e_reproduzido(self, modo):
+        """Streaming grava a resposta completa e reproduz linha a linha."""
+        modo("gravar")
+        gravada = "".join(chamar_gpt_stream(_cliente_stream(["Linha ", "1\nLinha", " 2"]), MSGS))
+
+        modo("reproduzir")
+        trechos = list(chamar_gpt_stream(_cliente_offline(), MSGS))
+
+        assert "".join(trechos) == gravada == "Linha 1\nLinha 2"
+        assert trechos == ["Linha 1\n", "Linha 2"]
+
+    def test_stream_e_sem_stream_compartilham_gravacao(self, modo, cliente_openai_falso):
+        """A mesma requisição gravada sem stream é reproduzida em streaming."""
+        modo("gravar")
+        chamar_gpt(cliente_openai_falso("Resposta única"), MSGS)
+
+        modo("reproduzir")
+
+        assert "".join(chamar_gpt_stream(_cliente_offline(), MSGS)) == "Resposta única"
+
+    def test_latencia_simulada(self, modo):
+        """Na reprodução espera a fração configurada da latência gravada."""
+        cassete = modo("gravar")
+        params = {"model": "gpt-4o", "messages": MSGS, "temperature": 0.7, "max_tokens": 100}
+        cassete.gravar(params, "ok", latencia=2.0)
+
+        cassete = modo("reproduzir", latencia=0.5)
+        with patch('core.cassetes_llm.time.sleep') as mock_sleep:
+            response = cassete.criar_resposta(_cliente_offline(), params)
+
+        assert response.choices[0].message.content == "ok"
+        mock_sleep.assert_called_once_with(1.0)
+
+    def test_caminho_async(self, modo, cliente_openai_falso):
+        """chamar_gpt_async grava e reproduz pelo mesmo cassete."""
+        modo("gravar")
+        client = MagicMock(spec=AsyncOpenAI)
+        client.chat.completions.create = AsyncMock(return_value=cliente_openai_falso("JD async").chat.completions.create())
+        asyncio.run(chamar_gpt_async(client, MSGS, temperature=0.3, seed=42))
+
+        modo("reproduzir")
+        offline = MagicMock(spec=AsyncOpenAI)
+        offline.chat.completions.create = AsyncMock(side_effect=AssertionError("rede"))
+
+        assert asyncio.run(chamar_gpt_async(offline, MSGS, temperature=0.3, seed=42)) == "JD async"
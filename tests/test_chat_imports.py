@@ -47,13 +47,15 @@ def test_no_local_import_shadowing_in_fase_chat():
     # Verify that chamar_gpt_com_telemetria and CONTEXTO_OUTROS are not locally imported
     assert 'chamar_gpt_com_telemetria' not in local_imports, \
         "chamar_gpt_com_telemetria should not be imported locally in fase_chat()"
+    assert 'chamar_gpt_stream_com_telemetria' not in local_imports, \
+        "chamar_gpt_stream_com_telemetria should not be imported locally in fase_chat()"
     assert 'CONTEXTO_OUTROS' not in local_imports, \
         "CONTEXTO_OUTROS should not be imported locally in fase_chat()"
 
 
 def test_global_imports_exist():
     """
-    Verify that chamar_gpt_com_telemetria and CONTEXTO_OUTROS are imported globally.
+    Verify that the GPT telemetry wrapper and CONTEXTO_OUTROS are imported globally.
     """
     # Read the chat.py file
     chat_file = os.path.join(os.path.dirname(__file__), '..', 'ui', 'chat.py')
@@ -75,9 +77,12 @@ def test_global_imports_exist():
             break
     
     # Verify that the required imports exist globally
-    assert 'chamar_gpt_com_telemetria' in global_imports, \
-        "chamar_gpt_com_telemetria should be imported globally"
-    assert 'CONTEXTO_OUTROS' in global_imports or 'CONTEXTO_DIAGNOSTICO' in global_imports, \
+    # (the chat renders responses with the streaming variant of the telemetry wrapper)
+    assert 'chamar_gpt_stream_com_telemetria' in global_imports, \
+        "chamar_gpt_stream_com_telemetria should be imported globally"
+    assert 'CONTEXTO_OUTROS' in global_imports, \
+        "CONTEXTO_OUTROS is used by fase_chat() and must be imported globally"
+    assert 'CONTEXTO_DIAGNOSTICO' in global_imports, \
         "CONTEXTO_* constants should be imported globally"
 
 
@@ -0,0 +1,130 @@
+"""
+Testes da coalescência de chamadas idênticas em andamento (core.coalescencia).
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+import core.config
+from core.coalescencia import CoalescedorChamadas, obter_coalescedor
+from core.utils import chamar_gpt
+
+
+class TestCoalescedorChamadas:
+    """Testes do CoalescedorChamadas."""
+
+    def test_chamadas_simultaneas_executam_uma_vez(self):
+        """Quem chega durante a execução recebe o mesmo resultado."""
+        coalescedor = CoalescedorChamadas()
+        execucoes = []
+        liberar = threading.Event()
+
+        def lenta():
+            execucoes.append(1)
+            liberar.wait(5)
+            return "JD"
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futuros = [executor.submit(coalescedor.executar, "k", lenta) for _ in range(5)]
+            while coalescedor.estatisticas()['compartilhadas'] < 4:
+                time.sleep(0.005)
+            liberar.set()
+            resultados = [f.result(5) for f in futuros]
+
+        assert len(execucoes) == 1
+        assert [r for r, _ in resultados] == ["JD"] * 5
+        assert sorted(c for _, c in resultados) == [False, True, True, True, True]
+        assert coalescedor.em_andamento() == 0
+
+    def test_nao_guarda_resultado_apos_termino(self):
+        """Não é cache: chamadas sequenciais executam de novo."""
+        coalescedor = CoalescedorChamadas()
+        funcao = Mock(return_value="x")
+
+        coalescedor.executar("k", funcao)
+        coalescedor.executar("k", funcao)
+
+        assert funcao.call_count == 2
+
+    def test_chaves_diferentes_nao_se_misturam(self):
+        """Chaves diferentes executam independentemente."""
+        coalescedor = CoalescedorChamadas()
+
+        assert coalescedor.executar("a", lambda: 1) == (1, False)
+        assert coalescedor.executar("b", lambda: 2) == (2, False)
+
+    def test_erro_propagado_aos_seguidores(self):
+        """Exceção do líder chega a quem aguardava, e a chave é liberada."""
+        coalescedor = CoalescedorChamadas()
+        liberar = threading.Event()
+
+        def falha():
+            liberar.wait(5)
+            raise ValueError("falhou")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            lider = executor.submit(coalescedor.executar, "k", falha)
+            while coalescedor.em_andamento() == 0:
+                time.sleep(0.005)
+            seguidor = executor.submit(coalescedor.executar, "k", falha)
+            while coalescedor.estatisticas()['compartilhadas'] < 1:
+                time.sleep(0.005)
+            liberar.set()
+
+            with pytest.raises(ValueError):
+                lider.result(5)
+            with pytest.raises(ValueError):
+                seguidor.result(5)
+        assert coalescedor.em_andamento() == 0
+
+
+class TestChamarGptCoalescido:
+    """Testes da coalescência em chamar_gpt."""
+
+    def _cliente_lento(self, liberar):
+        """Cliente cuja resposta só sai quando ``liberar`` é sinalizado."""
+        client = Mock()
+
+        def create(**params):
+            liberar.wait(5)
+            response = Mock(usage=None)
+            response.choices = [Mock(message=Mock(content="Gerente Comercial"))]
+            return response
+
+        client.chat.completions.create.side_effect = create
+        return client
+
+
+    def test_sessoes_simultaneas_fazem_uma_requisicao(self):
+        """Mesmo prompt em paralelo: uma requisição à API, todos recebem a resposta."""
+        liberar = threading.Event()
+        client = self._cliente_lento(liberar)
+        msgs = [{"role": "user", "content": "Cargo: Gerente de Vendas"}]
+        antes = obter_coalescedor().estatisticas()['compartilhadas']
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futuros = [executor.submit(chamar_gpt, client, msgs, temperature=0.3, seed=42) for _ in range(4)]
+            while obter_coalescedor().estatisticas()['compartilhadas'] - antes < 3:
+                time.sleep(0.005)
+            liberar.set()
+            respostas = [f.result(5) for f in futuros]
+
+        assert respostas == ["Gerente Comercial"] * 4
+        assert client.chat.completions.create.call_count == 1
+
+    def test_desligado_por_config(self, monkeypatch):
+        """Com GPT_SINGLE_FLIGHT_ENABLED=False cada pedido vai à API."""
+        monkeypatch.setattr(core.config.config, 'GPT_SINGLE_FLIGHT_ENABLED', False)
+        liberar = threading.Event()
+        liberar.set()
+        client = self._cliente_lento(liberar)
+        msgs = [{"role": "user", "content": "Cargo: Gerente de Vendas"}]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda _: chamar_gpt(client, msgs, temperature=0.3, seed=42), range(3)))
+
+        assert client.chat.completions.create.call_count == 3
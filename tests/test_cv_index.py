@@ -0,0 +1,145 @@
+"""
+Testes do índice de CVs para busca pelo recrutador (core.cv_index).
+"""
+
+import pytest
+
+from core.ats_engine import construir_motor
+from core.cv_index import IndiceCVs
+
+
+CVS = {
+    'revops': "Head de Revenue Operations com Salesforce, HubSpot, Power BI, forecast e churn",
+    'backend': "Desenvolvedor Backend com Kubernetes, Docker, Golang e PostgreSQL",
+    'vendas': "Gerente de Vendas com Salesforce, pipeline, negociação e forecast",
+    'dados': "Cientista de Dados com Python, SQL, Power BI e modelos de churn",
+}
+
+VAGA_REVOPS = "Revenue Operations: Salesforce, HubSpot, forecast, churn e Tableau"
+
+
+@pytest.fixture
+def motor():
+    """Motor treinado com CVs e uma vaga de referência."""
+    return construir_motor(list(CVS.values()) + [VAGA_REVOPS], area='teste')
+
+
+@pytest.fixture
+def indice(motor):
+    """Índice com os CVs de exemplo."""
+    return IndiceCVs.construir(CVS, motor=motor)
+
+
+class TestBuscaIndice:
+    """Testes de busca top-k."""
+
+    def test_top_k_ordenado(self, indice):
+        """Testa que o CV mais aderente vem primeiro e k é respeitado."""
+        resultados = indice.buscar(VAGA_REVOPS, k=2)
+
+        assert len(resultados) == 2
+        assert resultados[0]['cv_id'] == 'revops'
+        assert resultados[0]['similaridade'] >= resultados[1]['similaridade']
+        assert 0 < resultados[0]['score'] <= 95
+
+    def test_termos_encontrados_e_faltantes(self, indice):
+        """Testa a interseção e diferença de termos entre vaga e CV."""
+        resultado = indice.buscar(VAGA_REVOPS, k=1)[0]
+
+        assert 'hubspot' in resultado['termos_encontrados']
+        assert 'tableau' in resultado['termos_faltantes']
+        assert not set(resultado['termos_encontrados']) & set(resultado['termos_faltantes'])
+
+    def test_cv_sem_termos_em_comum_nao_aparece(self, indice):
+        """Testa que CVs com similaridade zero não são retornados."""
+        ids = [r['cv_id'] for r in indice.buscar(VAGA_REVOPS, k=10)]
+
+        assert 'backend' not in ids
+
+    def test_vaga_fora_do_vocabulario(self, indice):
+        """Testa vaga sem nenhum termo conhecido."""
+        assert indice.buscar("xyzabc qwerty") == []
+
+
+class TestIndiceIncremental:
+    """Testes de inclusão e remoção incrementais."""
+
+    def test_adicionar_sem_refit(self, indice, motor):
+        """Testa que adicionar CV não altera o vocabulário do motor."""
+        vocabulario = len(motor.feature_names)
+
+        indice.adicionar('novo', "Revenue Operations com Salesforce, HubSpot, forecast, churn e Tableau")
+
+        assert len(indice) == len(CVS) + 1
+        assert len(motor.vectorizer.vocabulary_) == vocabulario
+        assert indice.buscar(VAGA_REVOPS, k=1)[0]['cv_id'] == 'novo'
+
+    def test_remover(self, indice):
+        """Testa que CV removido não aparece mais na busca."""
+        assert indice.remover('revops') is True
+        assert indice.remover('revops') is False
+
+        ids = [r['cv_id'] for r in indice.buscar(VAGA_REVOPS, k=10)]
+        assert 'revops' not in ids
+        assert 'revops' not in indice
+        assert len(indice) == len(CVS) - 1
+
+    def test_substituir_cv_existente(self, indice):
+        """Testa que reindexar o mesmo id substitui o texto anterior."""
+        indice.adicionar('backend', CVS['revops'])
+
+        assert len(indice) == len(CVS)
+        ids = [r['cv_id'] for r in indice.buscar(VAGA_REVOPS, k=2)]
+        assert set(ids) == {'revops', 'backend'}
+
+    def test_compactacao_preserva_resultados(self, indice):
+        """Testa que compactar linhas removidas não altera a busca."""
+        indice.remover('backend')
+        indice.remover('dados')
+
+        resultados = indice.buscar(VAGA_REVOPS, k=10)
+
+        assert [r['cv_id'] for r in resultados] == ['revops', 'vendas']
+
+
+class TestPersistenciaIndice:
+    """Testes de salvar/carregar o índice."""
+
+    def test_salvar_e_carregar(self, indice, motor, tmp_path):
+        """Testa roundtrip em disco com o mesmo motor."""
+        indice.remover('dados')
+        caminho = indice.salvar(tmp_path / 'indice.joblib')
+
+        carregado = IndiceCVs.carregar(caminho, motor)
+
+        assert len(carregado) == len(CVS) - 1
+        assert carregado.buscar(VAGA_REVOPS, k=3) == indice.buscar(VAGA_REVOPS, k=3)
+
+    def test_carregar_com_motor_incompativel(self, indice, tmp_path):
+        """Testa que índice de outro vocabulário é rejeitado."""
+        caminho = indice.salvar(tmp_path / 'indice.joblib')
+        outro_motor = construir_motor(["texto completamente diferente sobre culinária"])
+
+        assert IndiceCVs.carregar(caminho, outro_motor) is None
+
+    def test_carregar_com_motor_retreinado_mesmo_tamanho(self, indice, motor, tmp_path):
+        """Testa que motor com o mesmo número de termos mas outro IDF é rejeitado."""
+        caminho = indice.salvar(tmp_path / 'indice.joblib')
+        retreinado = construir_motor(list(CVS.values()) + [VAGA_REVOPS, CVS['backend']], area='teste')
+
+        assert len(retreinado.feature_names) == len(motor.feature_names)
+        assert IndiceCVs.carregar(caminho, retreinado) is None
+        assert IndiceCVs.carregar(caminho, construir_motor(list(CVS.values()) + [VAGA_REVOPS])) is not None
+
+    def test_construir_sem_motor_treina_com_cvs(self, tmp_path, monkeypatch):
+        """Testa que sem motor em disco o índice treina um a partir dos CVs."""
+        import core.config
+        from core.ats_engine import recarregar_motores
+        monkeypatch.setattr(core.config.config, 'ATS_ENGINE_DIR', str(tmp_path))
+        recarregar_motores()
+
+        indice = IndiceCVs.construir(CVS)
+
+        assert len(indice) == len(CVS)
+        assert indice.buscar("Kubernetes e Golang", k=1)[0]['cv_id'] == 'backend'
+        recarregar_motores()
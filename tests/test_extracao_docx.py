@@ -0,0 +1,91 @@
+"""
+Testes da extração de DOCX em streaming (core.extracao_docx).
+"""
+
+import io
+import zipfile
+from unittest.mock import patch
+from xml.etree.ElementTree import ParseError
+
+import pytest
+
+from core.extracao_docx import _gerar_cv_sintetico, _textos_python_docx, extrair_textos_docx
+from core.utils import extrair_texto_universal
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+OLE2 = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+def _pacote(corpo):
+    """.docx mínimo com o corpo XML informado em word/document.xml."""
+    xml = (f'<w:document xmlns:w="{W}" xmlns:mc="{MC}"><w:body>{corpo}</w:body></w:document>')
+    saida = io.BytesIO()
+    with zipfile.ZipFile(saida, "w") as pacote:
+        pacote.writestr("word/document.xml", xml)
+    return saida.getvalue()
+
+
+def _p(texto):
+    return f"<w:p><w:r><w:t>{texto}</w:t></w:r></w:p>"
+
+
+def _tc(conteudo, propriedades=""):
+    return f"<w:tc><w:tcPr>{propriedades}</w:tcPr>{conteudo}</w:tc>"
+
+
+class TestLeitorStreaming:
+    """Testes do leitor sobre word/document.xml."""
+
+    def test_ordem_do_documento(self):
+        """Tabelas saem onde aparecem, entre os parágrafos."""
+        tabela = f"<w:tbl><w:tr>{_tc(_p('Python'))}{_tc(_p('SQL'))}</w:tr></w:tbl>"
+        dados = _pacote(_p("Resumo") + tabela + _p("Formação"))
+
+        assert extrair_textos_docx(dados) == ["Resumo", "Python", "SQL", "Formação"]
+
+    def test_celulas_mescladas_uma_vez(self):
+        """gridSpan e continuações de vMerge não repetem o texto."""
+        linha_1 = (_tc(_p("Empresa X"), '<w:gridSpan w:val="2"/>')
+                   + _tc(_p("Vendas"), '<w:vMerge w:val="restart"/>'))
+        linha_2 = _tc(_p("2019")) + _tc(_p("2020")) + _tc(_p(""), "<w:vMerge/>")
+        dados = _pacote(f"<w:tbl><w:tr>{linha_1}</w:tr><w:tr>{linha_2}</w:tr></w:tbl>")
+
+        assert extrair_textos_docx(dados) == ["Empresa X", "Vendas", "2019", "2020"]
+
+    def test_tabulacao_quebra_e_fallback_de_compatibilidade(self):
+        """Tab e quebra viram espaço em branco; mc:Fallback não duplica texto."""
+        caixa = (f"<w:p><w:r><mc:AlternateContent><mc:Choice>{_p('Contato')}</mc:Choice>"
+                 f"<mc:Fallback>{_p('Contato')}</mc:Fallback></mc:AlternateContent></w:r></w:p>")
+        linha = "<w:p><w:r><w:t>Nome</w:t><w:tab/><w:t>Maria</w:t><w:br/><w:t>SP</w:t></w:r></w:p>"
+
+        assert extrair_textos_docx(_pacote(linha + caixa)) == ["Nome\tMaria\nSP", "Contato"]
+
+    def test_mesmo_conteudo_que_python_docx(self):
+        """No CV sintético o texto é o mesmo do python-docx (sem duplicações)."""
+        dados = _gerar_cv_sintetico(3)
+
+        assert sorted(extrair_textos_docx(dados)) == sorted(_textos_python_docx(dados))
+
+
+class TestFallback:
+    """Testes dos casos tratados pelo python-docx ou pela tela."""
+
+    def test_xml_invalido_usa_python_docx(self):
+        """Quando o leitor falha, o texto vem do python-docx."""
+        dados = _gerar_cv_sintetico(1)
+
+        with patch('core.extracao_docx.iterar_textos_docx', side_effect=ParseError("xml")):
+            textos = extrair_textos_docx(dados)
+
+        assert textos[0].startswith("Maria Souza")
+
+    def test_doc_antigo(self):
+        """Arquivo que não é zip mantém a mensagem de .doc antigo."""
+        with pytest.raises(zipfile.BadZipFile):
+            extrair_textos_docx(OLE2 + b"documento binario")
+
+        with patch('core.utils.st') as mock_st:
+            assert extrair_texto_universal(io.BytesIO(OLE2 + bytes(512)), 'doc') is None
+
+        assert ".doc antigo" in mock_st.error.call_args.args[0]
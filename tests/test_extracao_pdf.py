@@ -0,0 +1,192 @@
+"""
+Testes da extração de PDF página a página (core.extracao_pdf).
+"""
+
+import io
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import PyPDF2
+import pytest
+
+import core.config
+from core.extracao_pdf import (
+    _extrair_em_paralelo,
+    _extrair_pagina,
+    _resultado,
+    extrair_paginas_pdf,
+    extrair_texto_paginado,
+)
+from core.utils import extrair_texto_universal
+
+
+def _gerar_pdf(textos):
+    """PDF mínimo com uma linha de texto (Helvetica) por página."""
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    paginas = []
+    for texto in textos:
+        conteudo = f"BT /F1 12 Tf 72 720 Td ({texto}) Tj ET".encode("latin-1")
+        objetos.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(conteudo), conteudo))
+        objetos.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objetos))
+        paginas.append(len(objetos))
+    filhos = b" ".join(b"%d 0 R" % n for n in paginas)
+    objetos[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (filhos, len(paginas))
+
+    saida = io.BytesIO()
+    saida.write(b"%PDF-1.4\n")
+    posicoes = []
+    for numero, objeto in enumerate(objetos, start=1):
+        posicoes.append(saida.tell())
+        saida.write(b"%d 0 obj\n%s\nendobj\n" % (numero, objeto))
+    inicio_xref = saida.tell()
+    saida.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1))
+    for posicao in posicoes:
+        saida.write(b"%010d 00000 n \n" % posicao)
+    saida.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                % (len(objetos) + 1, inicio_xref))
+    return saida.getvalue()
+
+
+def _extrator_lento(caminho, indice):
+    """Extrator do pool que trava na página 2."""
+    if indice == 1:
+        time.sleep(60)
+    return _extrair_pagina(caminho, indice)
+
+
+def _extrator_pausado(caminho, indice):
+    """Extrator do pool com páginas lentas, mas dentro do timeout."""
+    time.sleep(0.5)
+    return _extrair_pagina(caminho, indice)
+
+
+def _extrator_em_fila(caminho, indice):
+    """Extrator do pool com uma página lenta seguida de uma rápida."""
+    time.sleep(0.8 if indice == 0 else 0.4)
+    return _extrair_pagina(caminho, indice)
+
+
+PAGINAS = [f"Pagina {i} Experience Python" for i in range(1, 7)]
+
+
+@pytest.fixture
+def pool_pdf(monkeypatch):
+    """Força o caminho paralelo para PDFs pequenos."""
+    monkeypatch.setattr(core.config.config, 'PDF_PARALLEL_MIN_PAGES', 1)
+    monkeypatch.setattr(core.config.config, 'PDF_WORKERS', 2)
+
+
+class TestExtracaoSerie:
+    """Testes do caminho em série (PDFs pequenos)."""
+
+    def test_texto_em_ordem(self):
+        """Mesmo texto do PyPDF2 em série sobre todas as páginas."""
+        dados = _gerar_pdf(PAGINAS)
+        esperado = "".join(p.extract_text() for p in PyPDF2.PdfReader(io.BytesIO(dados)).pages)
+
+        assert extrair_texto_paginado(dados, paralelo=False) == esperado
+        assert "Pagina 6" in esperado
+
+    def test_limite_de_paginas(self, monkeypatch):
+        """Só as primeiras PDF_MAX_PAGES páginas são lidas."""
+        monkeypatch.setattr(core.config.config, 'PDF_MAX_PAGES', 2)
+
+        paginas = list(extrair_paginas_pdf(_gerar_pdf(PAGINAS), paralelo=False))
+
+        assert [(indice, total) for indice, total, _ in paginas] == [(0, 2), (1, 2)]
+
+    def test_pdf_invalido(self):
+        """Arquivo que não é PDF gera PdfReadError na abertura."""
+        with pytest.raises(PyPDF2.errors.PdfReadError):
+            list(extrair_paginas_pdf(b"isto nao e um pdf"))
+
+
+class TestExtracaoParalela:
+    """Testes do pool de processos."""
+
+    def test_paralelo_igual_a_serie(self, pool_pdf):
+        """O pool devolve o mesmo texto, remontado na ordem das páginas."""
+        dados = _gerar_pdf(PAGINAS)
+        progresso = []
+
+        texto = extrair_texto_paginado(dados, progresso=lambda prontas, total: progresso.append((prontas, total)))
+
+        assert texto == extrair_texto_paginado(dados, paralelo=False)
+        assert progresso == [(i, 6) for i in range(1, 7)]
+
+    def test_pagina_travada_expira(self, pool_pdf, tmp_path):
+        """Página acima do timeout sai desistida (None) e as demais seguem num pool novo."""
+        caminho = tmp_path / "cv.pdf"
+        caminho.write_bytes(_gerar_pdf(PAGINAS[:4]))
+
+        inicio = time.monotonic()
+        paginas = {indice: texto for indice, _, texto in
+                   _extrair_em_paralelo(str(caminho), 4, timeout_pagina=1.0, extrator=_extrator_lento)}
+
+        assert time.monotonic() - inicio < 30
+        assert paginas[1] is None
+        assert all("Experience" in paginas[i] for i in (0, 2, 3))
+
+    def test_tempo_na_fila_nao_conta(self, monkeypatch, tmp_path):
+        """O relógio da página só começa quando um processo a pega, não na fila do pool."""
+        monkeypatch.setattr(core.config.config, 'PDF_WORKERS', 1)
+        caminho = tmp_path / "cv.pdf"
+        caminho.write_bytes(_gerar_pdf(PAGINAS[:2]))
+
+        paginas = {indice: texto for indice, _, texto in
+                   _extrair_em_paralelo(str(caminho), 2, timeout_pagina=1.0, extrator=_extrator_em_fila)}
+
+        assert all("Experience" in paginas[i] for i in (0, 1))
+
+    def test_timeout_nao_afeta_outra_extracao(self, pool_pdf, tmp_path):
+        """Página expirada numa sessão não esvazia as páginas de outra extração em curso."""
+        caminho = tmp_path / "cv.pdf"
+        caminho.write_bytes(_gerar_pdf(PAGINAS))
+        outra = {}
+
+        def extrair_outra():
+            for indice, _, texto in _extrair_em_paralelo(str(caminho), 6, timeout_pagina=30.0,
+                                                         extrator=_extrator_pausado):
+                outra[indice] = texto
+
+        thread = threading.Thread(target=extrair_outra)
+        thread.start()
+        travada = {indice: texto for indice, _, texto in
+                   _extrair_em_paralelo(str(caminho), 4, timeout_pagina=1.0, extrator=_extrator_lento)}
+        thread.join(timeout=60)
+
+        assert travada[1] is None
+        assert sorted(outra) == list(range(6))
+        assert all("Experience" in texto for texto in outra.values())
+
+    def test_pool_quebrado_reenvia(self):
+        """Futuro quebrado ou cancelado pede reenvio em vez de virar página vazia."""
+        quebrado, cancelado = Future(), Future()
+        quebrado.set_exception(BrokenProcessPool("processo morto"))
+        cancelado.cancel()
+
+        assert _resultado(quebrado, 0) is None
+        assert _resultado(cancelado, 0) is None
+
+
+class TestExtrairTextoPdf:
+    """Testes do extrair_texto_pdf do core.utils."""
+
+    def test_upload_com_progresso(self):
+        """UploadedFile (BytesIO) é lido e o progresso chega à tela."""
+        arquivo = io.BytesIO(_gerar_pdf(PAGINAS[:2]))
+        progresso = []
+
+        with patch('core.utils.st'):
+            texto = extrair_texto_universal(arquivo, 'pdf', progresso=lambda p, t: progresso.append(p))
+
+        assert "Pagina 2" in texto
+        assert progresso == [1, 2]
@@ -0,0 +1,165 @@
+"""
+Testes do caminho assíncrono de chamadas GPT (core.gpt_async).
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from openai import AsyncOpenAI
+from streamlit.runtime.scriptrunner import add_script_run_ctx
+
+import core.config
+from core.gpt_async import (
+    chamar_gpt_async,
+    chamar_gpt_varios,
+    chamar_gpt_varios_async,
+    executar_async,
+)
+from core.gpt_metricas import _id_sessao
+from core.llm_cache import resetar_cache_llm
+
+
+def _resposta(texto):
+    """Monta uma resposta no formato de chat.completions."""
+    response = Mock()
+    response.choices = [Mock(message=Mock(content=texto))]
+    return response
+
+
+def _cliente_async(create):
+    """Cliente no formato do AsyncOpenAI com ``chat.completions.create`` assíncrono."""
+    client = MagicMock(spec=AsyncOpenAI)
+    client.chat.completions.create = create
+    return client
+
+
+class TestChamarGptAsync:
+    """Testes de chamar_gpt_async."""
+
+    def test_sucesso(self):
+        """Retorna o texto formatado e repassa os parâmetros da chamada."""
+        create = AsyncMock(return_value=_resposta("Linha   dois"))
+
+        resposta = asyncio.run(chamar_gpt_async(_cliente_async(create), [{"role": "user", "content": "oi"}], seed=42))
+
+        assert resposta == "Linha dois"
+        assert create.call_args.kwargs['seed'] == 42
+
+    @patch('core.gpt_async.asyncio.sleep', new_callable=AsyncMock)
+    def test_retry_apos_erro(self, mock_sleep):
+        """Erro na primeira tentativa é repetido com backoff."""
+        create = AsyncMock(side_effect=[Exception("falha"), _resposta("ok")])
+
+        resposta = asyncio.run(chamar_gpt_async(_cliente_async(create), [{"role": "user", "content": "oi"}]))
+
+        assert resposta == "ok"
+        assert create.call_count == 2
+        mock_sleep.assert_awaited_once()
+        assert 0 <= mock_sleep.await_args.args[0] <= 2
+
+    @patch('core.utils.st')
+    @patch('core.gpt_async.asyncio.sleep', new_callable=AsyncMock)
+    def test_todas_falham(self, mock_sleep, mock_st):
+        """Após max_retries falhas retorna None e mostra o erro."""
+        create = AsyncMock(side_effect=Exception("falha"))
+
+        resposta = asyncio.run(chamar_gpt_async(_cliente_async(create), [], max_retries=2))
+
+        assert resposta is None
+        assert create.call_count == 2
+        mock_st.error.assert_called_once()
+
+    @patch('core.utils.st')
+    @patch('core.utils.obter_limitador')
+    def test_fila_do_limitador_esgotada_avisa_a_sessao(self, mock_limitador, mock_st):
+        """Prazo do limitador esgotado mostra o aviso na sessão de quem chamou."""
+        mock_limitador.return_value.adquirir.return_value = False
+        sessoes = []
+        mock_st.error.side_effect = lambda *args: sessoes.append(_id_sessao())
+        create = AsyncMock(return_value=_resposta("ok"))
+
+        thread = threading.current_thread()
+        sessao = SimpleNamespace(session_id="sessao-async")
+        add_script_run_ctx(thread, sessao)
+        try:
+            resposta = asyncio.run(chamar_gpt_async(_cliente_async(create), [{"role": "user", "content": "oi"}]))
+        finally:
+            for nome, valor in list(vars(thread).items()):
+                if valor is sessao:
+                    delattr(thread, nome)
+
+        assert resposta is None
+        assert create.call_count == 0
+        assert sessoes == ["sessao-async"]
+
+    def test_usa_cache_de_respostas(self, monkeypatch):
+        """Chamada determinística repetida vem do cache de respostas."""
+        monkeypatch.setattr(core.config.config, 'LLM_CACHE_ENABLED', True)
+        resetar_cache_llm()
+        create = AsyncMock(return_value=_resposta("JD"))
+        msgs = [{"role": "user", "content": "cargo"}]
+
+        asyncio.run(chamar_gpt_async(_cliente_async(create), msgs, temperature=0.3, seed=42))
+        resposta = asyncio.run(chamar_gpt_async(_cliente_async(create), msgs, temperature=0.3, seed=42))
+
+        assert resposta == "JD"
+        assert create.call_count == 1
+
+
+class TestFanOut:
+    """Testes de chamar_gpt_varios_async / chamar_gpt_varios."""
+
+    def test_preserva_ordem_e_limita_concorrencia(self):
+        """Respostas saem na ordem da entrada, com no máximo N chamadas simultâneas."""
+        ativas = {'agora': 0, 'max': 0}
+
+        async def create(**params):
+            ativas['agora'] += 1
+            ativas['max'] = max(ativas['max'], ativas['agora'])
+            conteudo = params['messages'][0]['content']
+            # A primeira chamada demora mais: a ordem não pode depender do término
+            await asyncio.sleep(0.02 if conteudo == "0" else 0.001)
+            ativas['agora'] -= 1
+            return _resposta(f"r{conteudo}")
+
+        lista_msgs = [[{"role": "user", "content": str(i)}] for i in range(6)]
+        respostas = asyncio.run(
+            chamar_gpt_varios_async(_cliente_async(create), lista_msgs, max_concorrencia=2)
+        )
+
+        assert respostas == [f"r{i}" for i in range(6)]
+        assert ativas['max'] == 2
+
+    def test_ponte_sincrona_com_cliente_async(self):
+        """chamar_gpt_varios aceita um AsyncOpenAI e devolve a lista pronta."""
+        create = AsyncMock(side_effect=[_resposta("a"), _resposta("b")])
+
+        respostas = chamar_gpt_varios(_cliente_async(create), [[{"role": "user", "content": "1"}],
+                                                               [{"role": "user", "content": "2"}]])
+
+        assert respostas == ["a", "b"]
+
+    def test_lista_vazia(self):
+        """Sem mensagens não cria cliente nem event loop."""
+        assert chamar_gpt_varios(Mock(), []) == []
+
+
+class TestExecutarAsync:
+    """Testes da ponte síncrona executar_async."""
+
+    async def _dobro(self, valor):
+        await asyncio.sleep(0)
+        return valor * 2
+
+    def test_sem_loop_ativo(self):
+        """Fora de um event loop usa asyncio.run na própria thread."""
+        assert executar_async(self._dobro(21)) == 42
+
+    def test_com_loop_ativo(self):
+        """Dentro de um event loop executa em outra thread sem travar."""
+        async def chamador():
+            return executar_async(self._dobro(5))
+
+        assert asyncio.run(chamador()) == 10
@@ -0,0 +1,175 @@
+"""
+Testes das métricas de tokens, latência e custo das chamadas GPT (core.gpt_metricas).
+"""
+
+import json
+import socket
+import urllib.request
+from unittest.mock import Mock, patch
+
+import pytest
+
+from core.gpt_metricas import (
+    RegistroMetricasGPT,
+    contexto_gpt,
+    estimar_custo,
+    exportar_json,
+    exportar_prometheus,
+    extrair_uso,
+    iniciar_servidor_metricas,
+    parar_servidor_metricas,
+    registro_metricas,
+)
+from core.gpt_telemetry import chamar_gpt_com_telemetria, CONTEXTO_DIAGNOSTICO
+
+
+def _usage(prompt=1000, resposta=200, cache=0):
+    return Mock(prompt_tokens=prompt, completion_tokens=resposta,
+                prompt_tokens_details=Mock(cached_tokens=cache))
+
+
+@pytest.fixture(autouse=True)
+def registro_limpo():
+    """Cada teste começa com o registro do processo vazio."""
+    registro_metricas.resetar()
+    yield
+    registro_metricas.resetar()
+
+
+class TestCustoEUso:
+    """Testes de estimar_custo e extrair_uso."""
+
+    def test_custo_com_tokens_em_cache(self):
+        """Tokens de prompt em cache custam a tarifa reduzida."""
+        assert estimar_custo("gpt-4o", 1_000_000, 0) == pytest.approx(2.50)
+        assert estimar_custo("gpt-4o", 1_000_000, 0, tokens_cache=1_000_000) == pytest.approx(1.25)
+        assert estimar_custo("gpt-4o", 0, 1_000_000) == pytest.approx(10.00)
+
+    def test_modelo_versionado_e_desconhecido(self):
+        """Snapshots datados usam o preço base; desconhecidos custam 0."""
+        assert estimar_custo("gpt-4o-mini-2024-07-18", 1_000_000, 0) == pytest.approx(0.15)
+        assert estimar_custo("modelo-x", 1000, 1000) == 0.0
+
+    def test_extrair_uso_tolerante(self):
+        """usage ausente ou com campos não numéricos vira zeros."""
+        assert extrair_uso(None) == {'tokens_prompt': 0, 'tokens_resposta': 0, 'tokens_cache': 0}
+        assert extrair_uso(Mock())['tokens_prompt'] == 0
+        assert extrair_uso(_usage(10, 5, 3)) == {'tokens_prompt': 10, 'tokens_resposta': 5, 'tokens_cache': 3}
+
+
+class TestRegistro:
+    """Testes da agregação por contexto e sessão."""
+
+    def test_agrega_por_contexto_e_sessao(self):
+        """Cada chamada soma no seu contexto, na sua sessão e no total."""
+        registro = RegistroMetricasGPT()
+        registro.registrar("gpt-4o", 1.0, contexto="diagnostico", sessao="s1", tokens_prompt=100, tokens_resposta=10)
+        registro.registrar("gpt-4o", 3.0, contexto="reescrita", sessao="s1", tokens_prompt=50, tentativas=2)
+        registro.registrar("gpt-4o", 0.0, contexto="reescrita", sessao="s2", do_cache=True)
+
+        snapshot = registro.snapshot()
+
+        assert snapshot['por_contexto']['diagnostico']['tokens_prompt'] == 100
+        assert snapshot['por_contexto']['reescrita']['tentativas'] == 2
+        assert snapshot['por_contexto']['reescrita']['cache_hits'] == 1
+        assert snapshot['por_sessao']['s1']['chamadas'] == 2
+        assert snapshot['total']['chamadas'] == 3
+        assert snapshot['total']['tokens_prompt'] == 150
+
+    def test_percentis_e_histograma(self):
+        """Latências geram p50/p95 e histograma acumulado."""
+        registro = RegistroMetricasGPT()
+        for i in range(1, 101):
+            registro.registrar("gpt-4o", i / 10, contexto="coleta_focada", sessao="s")
+
+        latencia = registro.snapshot()['por_contexto']['coleta_focada']['latencia']
+
+        assert latencia['p50'] == pytest.approx(5.0)
+        assert latencia['p95'] == pytest.approx(9.5)
+        assert latencia['histograma']['1.0'] == 10
+        assert latencia['histograma']['+Inf'] == 100
+
+    def test_contexto_padrao_via_contextvar(self):
+        """Sem contexto explícito usa o do bloco contexto_gpt."""
+        registro = RegistroMetricasGPT()
+        with contexto_gpt("linkedin"):
+            registro.registrar("gpt-4o", 1.0, sessao="s")
+        registro.registrar("gpt-4o", 1.0, sessao="s")
+
+        assert set(registro.snapshot()['por_contexto']) == {"linkedin", "outros"}
+
+
+class TestInstrumentacao:
+    """Testes do registro feito por chamar_gpt."""
+
+    def test_chamar_gpt_registra_uso_no_contexto_do_wrapper(self):
+        """O wrapper de telemetria atribui tokens e custo à fase."""
+        client = Mock()
+        response = Mock(usage=_usage(1200, 300, 200))
+        response.choices = [Mock(message=Mock(content="ok"))]
+        client.chat.completions.create.return_value = response
+
+        with patch('core.gpt_telemetry.incrementar_contador_gpt'):
+            chamar_gpt_com_telemetria(client, [{"role": "user", "content": "oi"}], contexto=CONTEXTO_DIAGNOSTICO)
+
+        dados = registro_metricas.snapshot()['por_contexto'][CONTEXTO_DIAGNOSTICO]
+        assert dados['chamadas'] == 1
+        assert dados['tokens_prompt'] == 1200
+        assert dados['tokens_cache'] == 200
+        assert dados['custo_usd'] > 0
+
+    @patch('core.utils.st')
+    @patch('core.utils.time.sleep')
+    def test_falha_registra_tentativas(self, mock_sleep, mock_st):
+        """Chamada que esgota os retries conta como falha com todas as tentativas."""
+        from core.utils import chamar_gpt
+        client = Mock()
+        client.chat.completions.create.side_effect = Exception("erro")
+
+        chamar_gpt(client, [], max_retries=2)
+
+        dados = registro_metricas.snapshot()['por_contexto']['outros']
+        assert dados['falhas'] == 1
+        assert dados['tentativas'] == 2
+
+
+class TestExportacao:
+    """Testes de exportação JSON / Prometheus e do endpoint local."""
+
+    def test_prometheus(self):
+        """Contadores e histograma por contexto no formato de exposição."""
+        registro_metricas.registrar("gpt-4o", 1.5, contexto="validacao", sessao="s", tokens_prompt=10)
+
+        texto = exportar_prometheus()
+
+        assert '# TYPE gpt_latencia_segundos histogram' in texto
+        assert 'gpt_tokens_prompt_total{contexto="validacao"} 10' in texto
+        assert 'gpt_latencia_segundos_bucket{contexto="validacao",le="2.0"} 1' in texto
+        assert 'gpt_latencia_segundos_count{contexto="validacao"} 1' in texto
+
+    def test_json(self):
+        """O JSON tem total, contextos e sessões."""
+        registro_metricas.registrar("gpt-4o", 1.0, contexto="reescrita", sessao="s")
+
+        dados = json.loads(exportar_json())
+
+        assert dados['por_contexto']['reescrita']['chamadas'] == 1
+        assert 's' in dados['por_sessao']
+
+    def test_endpoint_local(self):
+        """/metrics e /metrics.json servem o snapshot atual."""
+        registro_metricas.registrar("gpt-4o", 1.0, contexto="linkedin", sessao="s")
+        assert iniciar_servidor_metricas(porta=0) is None  # 0 = desligado
+
+        try:
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                porta = sock.getsockname()[1]
+            iniciar_servidor_metricas(porta)
+
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/metrics", timeout=5) as resposta:
+                assert 'contexto="linkedin"' in resposta.read().decode('utf-8')
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/metrics.json", timeout=5) as resposta:
+                assert json.loads(resposta.read())['total']['chamadas'] == 1
+        finally:
+            parar_servidor_metricas()
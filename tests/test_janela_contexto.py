@@ -0,0 +1,104 @@
+"""
+Testes do gerenciador de janela de contexto do chat (core.janela_contexto).
+"""
+
+from core.janela_contexto import (
+    CABECALHO_RESUMO,
+    REFERENCIA_CV,
+    estimar_tokens,
+    montar_contexto,
+    tokens_mensagens,
+)
+
+CV = "EXPERIÊNCIA: Gerente de Operações na Empresa X (2018-2024). " * 10
+
+
+def _historico(turnos=10, tamanho=400):
+    """Histórico típico: sistema com CV + turnos usuário/assistente."""
+    mensagens = [{"role": "system", "content": f"Você é um headhunter.\n\nCV DO CANDIDATO: {CV}"}]
+    for i in range(turnos):
+        mensagens.append({"role": "user", "content": f"pergunta {i} " + "x" * tamanho})
+        mensagens.append({"role": "assistant", "content": f"resposta {i} " + "y" * tamanho})
+    return mensagens
+
+
+class TestEstimativa:
+    """Testes da estimativa de tokens."""
+
+    def test_estimar_tokens(self):
+        """~4 caracteres por token, arredondando para cima."""
+        assert estimar_tokens("") == 0
+        assert estimar_tokens(None) == 0
+        assert estimar_tokens("abcde") == 2
+
+    def test_tokens_mensagens_inclui_custo_fixo(self):
+        """Cada mensagem tem um custo fixo além do conteúdo."""
+        assert tokens_mensagens([{"role": "user", "content": "abcd"}]) > estimar_tokens("abcd")
+
+
+class TestMontarContexto:
+    """Testes de montar_contexto."""
+
+    def test_dentro_do_orcamento_nao_altera(self):
+        """Histórico pequeno segue inteiro, só sem campos extras."""
+        mensagens = _historico(turnos=2)
+        mensagens[1]["internal"] = True
+
+        enviadas, relatorio = montar_contexto(mensagens, max_tokens=100000, mensagens_recentes=6)
+
+        assert enviadas == [{"role": m["role"], "content": m["content"]} for m in mensagens]
+        assert relatorio["tokens_economizados"] == 0
+        assert relatorio["turnos_resumidos"] == 0
+
+    def test_nao_altera_historico_original(self):
+        """A lista da sessão (exibida na tela) continua completa."""
+        mensagens = _historico(turnos=10)
+        copia = [dict(m) for m in mensagens]
+
+        montar_contexto(mensagens, cv_texto=CV, max_tokens=800, mensagens_recentes=4)
+
+        assert mensagens == copia
+
+    def test_respeita_orcamento_com_resumo(self):
+        """Turnos antigos viram resumo; sistema e recentes seguem literalmente."""
+        mensagens = _historico(turnos=10)
+
+        enviadas, relatorio = montar_contexto(mensagens, max_tokens=1200, mensagens_recentes=4)
+
+        assert tokens_mensagens(enviadas) <= 1200
+        assert enviadas[0] == {"role": mensagens[0]["role"], "content": mensagens[0]["content"]}
+        assert enviadas[1]["content"].startswith(CABECALHO_RESUMO)
+        assert [m["content"] for m in enviadas[-4:]] == [m["content"] for m in mensagens[-4:]]
+        assert relatorio["turnos_resumidos"] == 16
+        assert relatorio["tokens_economizados"] == relatorio["tokens_originais"] - relatorio["tokens_enviados"]
+
+    def test_resumo_rolante_descarta_mais_antigos(self):
+        """Se o resumo não cabe, os turnos mais antigos saem primeiro."""
+        mensagens = _historico(turnos=30)
+
+        enviadas, _ = montar_contexto(mensagens, max_tokens=900, mensagens_recentes=2)
+
+        resumo = enviadas[1]["content"]
+        assert "pergunta 0 " not in resumo
+        assert "resposta 28 " in resumo
+
+    def test_deduplica_cv_em_prompts_internos(self):
+        """O CV repetido em prompts internos vira uma referência curta."""
+        mensagens = _historico(turnos=1)
+        mensagens.append({"role": "user", "content": f"[ETAPA]\n\nCV DO CANDIDATO:\n{CV}\n---", "internal": True})
+
+        enviadas, relatorio = montar_contexto(mensagens, cv_texto=CV, max_tokens=100000)
+
+        assert CV in enviadas[0]["content"]
+        assert CV not in enviadas[-1]["content"]
+        assert REFERENCIA_CV in enviadas[-1]["content"]
+        assert relatorio["blocos_cv_removidos"] == 1
+        assert relatorio["tokens_economizados"] > 0
+
+    def test_ultima_mensagem_sempre_enviada(self):
+        """Mesmo com orçamento mínimo, a última mensagem do usuário segue."""
+        mensagens = _historico(turnos=5)
+
+        enviadas, _ = montar_contexto(mensagens, max_tokens=10, mensagens_recentes=6)
+
+        assert enviadas[-1]["content"] == mensagens[-1]["content"]
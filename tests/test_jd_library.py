@@ -0,0 +1,162 @@
+"""
+Testes da biblioteca compartilhada de Job Descriptions (core.jd_library).
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+import core.config
+from core.ats_scorer import gerar_job_description
+from core.jd_library import (
+    normalizar_cargo,
+    obter_jd,
+    obter_variacoes,
+    pre_aquecer,
+    atualizar_em_segundo_plano,
+    estatisticas_biblioteca_jd,
+    resetar_biblioteca_jd,
+)
+
+
+def _resposta_gpt(client, msgs, **kwargs):
+    """Simula a LLM: variações ou JD conforme o prompt."""
+    if 'variações REAIS' in msgs[0]['content']:
+        return "Gerente Comercial\nSales Manager"
+    return "JD técnica: Salesforce, forecast, pipeline B2B"
+
+
+def _fan_out_gpt(client, lista_msgs, **kwargs):
+    """Simula chamar_gpt_varios respondendo cada prompt com _resposta_gpt."""
+    return [_resposta_gpt(client, msgs, **kwargs) for msgs in lista_msgs]
+
+
+@pytest.fixture
+def biblioteca(tmp_path, monkeypatch):
+    """Liga a biblioteca de JDs apontando para um SQLite temporário."""
+    monkeypatch.setattr(core.config.config, 'JD_LIBRARY_ENABLED', True)
+    monkeypatch.setattr(core.config.config, 'JD_LIBRARY_PATH', str(tmp_path / 'jd.sqlite'))
+    resetar_biblioteca_jd()
+    yield
+    resetar_biblioteca_jd()
+
+
+class TestNormalizarCargo:
+    """Testes da normalização de cargos."""
+
+    def test_caixa_acentos_e_espacos(self):
+        """Variações triviais de digitação geram a mesma chave."""
+        assert normalizar_cargo("  Gerente  de Operações ") == normalizar_cargo("gerente de operacoes")
+
+    def test_vazio(self):
+        """Cargo vazio ou None vira string vazia."""
+        assert normalizar_cargo(None) == ""
+        assert normalizar_cargo("   ") == ""
+
+
+class TestBibliotecaJd:
+    """Testes da integração com gerar_job_description."""
+
+    @patch('core.ats_scorer.chamar_gpt', side_effect=_resposta_gpt)
+    def test_segundo_usuario_nao_chama_gpt(self, mock_chamar_gpt, biblioteca):
+        """Mesmo cargo (normalizado) reaproveita a JD gerada."""
+        primeira = gerar_job_description(Mock(), "Gerente de Vendas")
+        assert mock_chamar_gpt.call_count == 2
+
+        segunda = gerar_job_description(Mock(), "gerente  de VENDAS")
+
+        assert segunda == primeira
+        assert mock_chamar_gpt.call_count == 2
+        assert obter_variacoes("Gerente de Vendas") == ["Gerente de Vendas", "Gerente Comercial", "Sales Manager"]
+
+    @patch('core.ats_scorer.chamar_gpt', side_effect=_resposta_gpt)
+    def test_forcar_regenera(self, mock_chamar_gpt, biblioteca):
+        """forcar=True ignora a biblioteca e regrava a entrada."""
+        gerar_job_description(Mock(), "Gerente de Vendas")
+        gerar_job_description(Mock(), "Gerente de Vendas", forcar=True)
+
+        assert mock_chamar_gpt.call_count == 4
+
+    @patch('core.ats_scorer.chamar_gpt', return_value=None)
+    def test_falha_nao_e_gravada(self, mock_chamar_gpt, biblioteca):
+        """JD ou variações que falharam não entram na biblioteca."""
+        assert gerar_job_description(Mock(), "Gerente de Vendas") is None
+
+        assert obter_jd("Gerente de Vendas") is None
+        assert obter_variacoes("Gerente de Vendas") is None
+
+    @patch('core.ats_scorer.chamar_gpt', side_effect=_resposta_gpt)
+    def test_biblioteca_desligada(self, mock_chamar_gpt):
+        """Com a biblioteca desligada (padrão nos testes), sempre gera."""
+        gerar_job_description(Mock(), "Gerente de Vendas")
+        gerar_job_description(Mock(), "Gerente de Vendas")
+
+        assert mock_chamar_gpt.call_count == 4
+        assert estatisticas_biblioteca_jd() == {'ativo': False}
+
+    @patch('core.ats_scorer.chamar_gpt', side_effect=_resposta_gpt)
+    def test_mudar_rota_nao_reaproveita(self, mock_chamar_gpt, biblioteca, monkeypatch):
+        """Itens gerados com outro modelo/max_tokens da rota não são servidos."""
+        gerar_job_description(Mock(), "Gerente de Vendas")
+        monkeypatch.setattr(core.config.config, 'MODEL_ROUTES', 'variacoes_cargo=gpt-4.1-mini:400')
+
+        assert obter_variacoes("Gerente de Vendas") is None
+        assert obter_jd("Gerente de Vendas")
+
+        monkeypatch.setattr(core.config.config, 'MODEL_ROUTES', 'job_description=gpt-4.1')
+        assert obter_jd("Gerente de Vendas") is None
+
+    def test_persiste_apos_reinicio(self, biblioteca):
+        """A JD sobrevive ao fechamento da biblioteca."""
+        with patch('core.ats_scorer.chamar_gpt', side_effect=_resposta_gpt):
+            gerar_job_description(Mock(), "Gerente de Vendas")
+        resetar_biblioteca_jd()
+
+        assert obter_jd("Gerente de Vendas") == "JD técnica: Salesforce, forecast, pipeline B2B"
+
+
+class TestPreAquecimento:
+    """Testes de pré-aquecimento e atualização em segundo plano."""
+
+    @patch('core.gpt_async.chamar_gpt_varios', side_effect=_fan_out_gpt)
+    def test_pre_aquecer_pula_presentes_e_duplicados(self, mock_chamar_gpt, biblioteca):
+        """Cargos já gerados e duplicados normalizados não chamam a LLM."""
+        pre_aquecer(Mock(), ["Gerente de Vendas"])
+        chamadas = mock_chamar_gpt.call_count
+
+        resultado = pre_aquecer(Mock(), ["Gerente de Vendas", "Head de RevOps", "head de revops"])
+
+        assert resultado == {"Gerente de Vendas": True, "Head de RevOps": True}
+        assert mock_chamar_gpt.call_count == chamadas + 2
+
+    @patch('core.gpt_async.chamar_gpt_varios', side_effect=_fan_out_gpt)
+    def test_atualizacao_em_segundo_plano(self, mock_chamar_gpt, biblioteca):
+        """A thread de atualização regenera os cargos informados."""
+        pre_aquecer(Mock(), ["Gerente de Vendas"])
+
+        thread = atualizar_em_segundo_plano(Mock(), ["Gerente de Vendas"])
+        thread.join(timeout=10)
+
+        assert not thread.is_alive()
+        assert mock_chamar_gpt.call_count == 4
+        assert obter_jd("Gerente de Vendas")
+
+    @patch('core.gpt_async.chamar_gpt_varios', side_effect=_fan_out_gpt)
+    def test_pre_aquecer_em_paralelo(self, mock_chamar_gpt, biblioteca):
+        """Vários cargos são gerados em duas rodadas de fan-out (variações, JDs)."""
+        cargos = ["Gerente de Vendas", "Head de RevOps", "Analista de FP&A"]
+
+        resultado = pre_aquecer(Mock(), cargos)
+
+        assert resultado == {cargo: True for cargo in cargos}
+        assert mock_chamar_gpt.call_count == 2
+        assert all(len(c.args[1]) == 3 for c in mock_chamar_gpt.call_args_list)
+        assert obter_variacoes("Head de RevOps")[0] == "Head de RevOps"
+
+    @patch('core.gpt_async.chamar_gpt_varios', return_value=[None])
+    def test_pre_aquecer_falha_nao_e_gravada(self, mock_chamar_gpt, biblioteca):
+        """JD que falhou no fan-out retorna False e não entra na biblioteca."""
+        resultado = pre_aquecer(Mock(), ["Gerente de Vendas"])
+
+        assert resultado == {"Gerente de Vendas": False}
+        assert obter_jd("Gerente de Vendas") is None
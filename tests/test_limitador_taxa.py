@@ -0,0 +1,194 @@
+"""
+Testes do limitador de taxa e do backoff das chamadas GPT (core.limitador_taxa).
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+from openai import RateLimitError
+
+import core.config
+from core.limitador_taxa import (
+    PRIORIDADE_INTERATIVA,
+    PRIORIDADE_SEGUNDO_PLANO,
+    LimitadorTaxa,
+    calcular_espera,
+    obter_limitador,
+    prioridade_gpt,
+    retry_after,
+)
+from core.utils import chamar_gpt
+
+
+def _erro_429(cabecalhos=None, codigo=None):
+    """RateLimitError como o SDK levanta para uma resposta 429."""
+    resposta = httpx.Response(
+        429, headers=cabecalhos or {}, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    )
+    return RateLimitError("rate limit", response=resposta, body={"code": codigo} if codigo else None)
+
+
+class TestLimitadorTaxa:
+    """Testes do token bucket."""
+
+    def test_sem_limite_libera_sempre(self):
+        """RPM/TPM zerados não bloqueiam."""
+        limitador = LimitadorTaxa()
+        assert all(limitador.adquirir(10_000, prazo=0) for _ in range(100))
+
+    def test_limite_de_requisicoes(self):
+        """Esgotado o balde de requisições, quem tem prazo curto é recusado."""
+        limitador = LimitadorTaxa(requisicoes_por_minuto=2)
+
+        assert limitador.adquirir(prazo=0)
+        assert limitador.adquirir(prazo=0)
+        assert not limitador.adquirir(prazo=0.05)
+        assert limitador.estatisticas()['recusadas'] == 1
+
+    def test_reabastece_com_o_tempo(self):
+        """O balde repõe requisições proporcionalmente ao tempo (600/min = 1 a cada 0,1s)."""
+        limitador = LimitadorTaxa(requisicoes_por_minuto=600)
+        for _ in range(600):
+            limitador.adquirir(prazo=0)
+
+        inicio = time.monotonic()
+        assert limitador.adquirir(prazo=2)
+        assert 0.05 <= time.monotonic() - inicio < 1.0
+
+    def test_limite_de_tokens_e_devolucao(self):
+        """Reserva de tokens acima do saldo espera; devolução libera."""
+        limitador = LimitadorTaxa(tokens_por_minuto=1000)
+
+        assert limitador.adquirir(tokens=900, prazo=0)
+        assert not limitador.adquirir(tokens=500, prazo=0)
+        limitador.devolver_tokens(600)
+        assert limitador.adquirir(tokens=500, prazo=0)
+
+    def test_pausa_por_retry_after(self):
+        """pausar() segura todas as liberações pelo tempo pedido."""
+        limitador = LimitadorTaxa(requisicoes_por_minuto=100)
+        limitador.pausar(0.2)
+
+        assert not limitador.adquirir(prazo=0.05)
+        assert limitador.adquirir(prazo=1)
+
+    def test_prioridade_interativa_passa_na_frente(self):
+        """Com fila, o chat interativo é atendido antes do segundo plano."""
+        limitador = LimitadorTaxa(requisicoes_por_minuto=600)
+        for _ in range(600):
+            limitador.adquirir(prazo=0)
+        ordem = []
+
+        def pedir(nome, prioridade):
+            limitador.adquirir(prioridade=prioridade, prazo=5)
+            ordem.append(nome)
+
+        fundo = threading.Thread(target=pedir, args=("fundo", PRIORIDADE_SEGUNDO_PLANO))
+        fundo.start()
+        time.sleep(0.02)
+        chat = threading.Thread(target=pedir, args=("chat", PRIORIDADE_INTERATIVA))
+        chat.start()
+        fundo.join(5)
+        chat.join(5)
+
+        assert ordem == ["chat", "fundo"]
+
+    def test_prioridade_por_contexto(self):
+        """prioridade_gpt define a prioridade padrão das chamadas do bloco."""
+        limitador = LimitadorTaxa(requisicoes_por_minuto=1)
+        limitador.adquirir(prazo=0)
+        with prioridade_gpt(PRIORIDADE_SEGUNDO_PLANO):
+            assert not limitador.adquirir(prazo=0)
+        assert limitador.estatisticas()['recusadas'] == 1
+
+    def test_obter_limitador_pela_config(self, monkeypatch):
+        """Desligado por padrão; ligado quando RPM ou TPM são configurados."""
+        assert obter_limitador() is None
+        monkeypatch.setattr(core.config.config, 'GPT_RATE_LIMIT_RPM', 60)
+
+        limitador = obter_limitador()
+
+        assert limitador is obter_limitador()
+        assert limitador.requisicoes_por_minuto == 60
+
+
+class TestBackoff:
+    """Testes de calcular_espera / retry_after."""
+
+    def test_retry_after_em_segundos_e_ms(self):
+        """Lê Retry-After (segundos) e retry-after-ms."""
+        assert retry_after(_erro_429({"retry-after": "3"})) == 3.0
+        assert retry_after(_erro_429({"retry-after-ms": "1500"})) == 1.5
+        assert retry_after(_erro_429()) is None
+        assert retry_after(Exception("sem resposta")) is None
+
+    def test_espera_respeita_retry_after(self):
+        """Com Retry-After a espera é o pedido mais até 10% de jitter."""
+        for _ in range(20):
+            assert 4.0 <= calcular_espera(1, _erro_429({"retry-after": "4"})) <= 4.4
+
+    def test_jitter_exponencial_limitado(self):
+        """Sem Retry-After: uniforme entre 0 e base·2^tentativa, com teto."""
+        esperas = [calcular_espera(3) for _ in range(200)]
+        assert all(0 <= e <= 8 for e in esperas)
+        assert len(set(esperas)) > 1
+        assert calcular_espera(20, maximo=30) <= 30
+
+
+class TestChamarGptComLimitador:
+    """Testes de chamar_gpt com o cliente falso local."""
+
+    @patch('core.utils.time.sleep')
+    def test_rate_limit_com_retry_after_e_recuperado(self, mock_sleep, cliente_openai_falso):
+        """429 não é mais fatal: espera o Retry-After e tenta de novo."""
+        client = cliente_openai_falso(erros=[_erro_429({"retry-after": "2"})])
+
+        resposta = chamar_gpt(client, [{"role": "user", "content": "oi"}])
+
+        assert resposta == "ok"
+        assert client.chat.completions.create.call_count == 2
+        assert 2.0 <= mock_sleep.call_args.args[0] <= 2.2
+
+    @patch('core.utils.st')
+    @patch('core.utils.time.sleep')
+    def test_sem_credito_nao_repete(self, mock_sleep, mock_st, cliente_openai_falso):
+        """insufficient_quota não se resolve esperando: falha na hora."""
+        client = cliente_openai_falso(erros=[_erro_429(codigo="insufficient_quota")])
+
+        assert chamar_gpt(client, []) is None
+        assert client.chat.completions.create.call_count == 1
+        mock_sleep.assert_not_called()
+        mock_st.error.assert_called_once()
+
+    @patch('core.utils.time.sleep')
+    def test_429_pausa_o_limitador_do_processo(self, mock_sleep, monkeypatch, cliente_openai_falso):
+        """Um 429 pausa o limitador compartilhado pelas outras sessões."""
+        monkeypatch.setattr(core.config.config, 'GPT_RATE_LIMIT_RPM', 1000)
+        client = cliente_openai_falso(erros=[_erro_429({"retry-after": "0.1"})])
+
+        chamar_gpt(client, [{"role": "user", "content": "oi"}])
+
+        assert obter_limitador().estatisticas()['pausas'] == 1
+
+    @patch('core.utils.st')
+    def test_fila_esgotada_nao_chama_api(self, mock_st, monkeypatch, cliente_openai_falso):
+        """Sem vaga dentro do prazo, a chamada falha sem ir à API."""
+        monkeypatch.setattr(core.config.config, 'GPT_RATE_LIMIT_RPM', 1)
+        monkeypatch.setattr(core.config.config, 'GPT_RATE_LIMIT_MAX_WAIT', 0.05)
+        client = cliente_openai_falso()
+
+        assert chamar_gpt(client, [{"role": "user", "content": "1"}]) == "ok"
+        assert chamar_gpt(client, [{"role": "user", "content": "2"}]) is None
+        assert client.chat.completions.create.call_count == 1
+        mock_st.error.assert_called_once()
+
+    def test_uso_real_corrige_reserva_de_tokens(self, monkeypatch, cliente_openai_falso):
+        """A reserva (prompt + max_tokens) é corrigida pelo usage da resposta."""
+        monkeypatch.setattr(core.config.config, 'GPT_RATE_LIMIT_TPM', 100_000)
+        client = cliente_openai_falso(tokens=(100, 20))
+
+        chamar_gpt(client, [{"role": "user", "content": "oi"}])
+
+        assert obter_limitador().estatisticas()['saldo_tokens'] >= 100_000 - 120 - 5
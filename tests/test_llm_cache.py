@@ -0,0 +1,103 @@
+"""
+Testes do cache de respostas determinísticas do GPT (core.llm_cache).
+"""
+
+import pytest
+
+import core.config
+from core.llm_cache import (
+    chamada_cacheavel,
+    gerar_chave_llm,
+    estatisticas_cache_llm,
+    resetar_cache_llm,
+)
+from core.utils import chamar_gpt, chamar_gpt_stream
+
+
+MSGS = [{"role": "user", "content": "Extraia o cargo do CV"}]
+
+
+@pytest.fixture(params=['memoria', 'sqlite'])
+def cache_ligado(request, tmp_path, monkeypatch):
+    """Liga o cache de respostas com cada backend."""
+    monkeypatch.setattr(core.config.config, 'LLM_CACHE_ENABLED', True)
+    monkeypatch.setattr(core.config.config, 'LLM_CACHE_BACKEND', request.param)
+    monkeypatch.setattr(core.config.config, 'LLM_CACHE_PATH', str(tmp_path / 'llm.sqlite'))
+    resetar_cache_llm()
+    yield request.param
+    resetar_cache_llm()
+
+
+class TestChaveLlm:
+    """Testes da chave e da elegibilidade."""
+
+    def test_timeout_nao_entra_na_chave(self):
+        """Parâmetros que não afetam a resposta ficam fora da chave."""
+        base = {'model': 'gpt-4o', 'messages': MSGS, 'temperature': 0.3, 'seed': 42}
+        assert gerar_chave_llm({**base, 'timeout': 30}) == gerar_chave_llm({**base, 'timeout': 60, 'stream': True})
+
+    @pytest.mark.parametrize('campo,valor', [
+        ('model', 'gpt-4o-mini'),
+        ('messages', [{"role": "user", "content": "Outro prompt"}]),
+        ('temperature', 0.1),
+        ('seed', 7),
+    ])
+    def test_parametros_relevantes_mudam_chave(self, campo, valor):
+        """Modelo, mensagens e parâmetros de geração fazem parte da chave."""
+        base = {'model': 'gpt-4o', 'messages': MSGS, 'temperature': 0.3, 'seed': 42}
+        assert gerar_chave_llm(base) != gerar_chave_llm({**base, campo: valor})
+
+    def test_cacheavel_exige_seed_e_temperatura_baixa(self):
+        """Só chamadas com seed e temperatura <= limite são cacheáveis."""
+        assert chamada_cacheavel(0.3, 42)
+        assert not chamada_cacheavel(0.3, None)
+        assert not chamada_cacheavel(0.7, 42)
+
+
+class TestChamarGptComCache:
+    """Testes da integração com chamar_gpt / chamar_gpt_stream."""
+
+    def test_cache_desligado_por_padrao(self, cliente_openai_falso):
+        """Sem opt-in, toda chamada vai à API."""
+        client = cliente_openai_falso()
+        chamar_gpt(client, MSGS, temperature=0.1, seed=42)
+        chamar_gpt(client, MSGS, temperature=0.1, seed=42)
+
+        assert client.chat.completions.create.call_count == 2
+        assert estatisticas_cache_llm() == {'ativo': False}
+
+    def test_chamada_repetida_nao_vai_a_rede(self, cache_ligado, cliente_openai_falso):
+        """Mesmas mensagens + seed: a segunda chamada vem do cache."""
+        client = cliente_openai_falso("Gerente de Vendas")
+
+        primeira = chamar_gpt(client, MSGS, temperature=0.1, seed=42)
+        segunda = chamar_gpt(client, MSGS, temperature=0.1, seed=42)
+
+        assert primeira == segunda == "Gerente de Vendas"
+        assert client.chat.completions.create.call_count == 1
+        stats = estatisticas_cache_llm()
+        assert stats['backend'] == cache_ligado
+        assert stats['hits'] == 1 and stats['misses'] == 1
+
+    def test_chamadas_nao_deterministicas_nao_usam_cache(self, cache_ligado, cliente_openai_falso):
+        """Temperatura alta, sem seed ou usar_cache=False sempre chamam a API."""
+        client = cliente_openai_falso()
+
+        chamar_gpt(client, MSGS, temperature=0.7, seed=42)
+        chamar_gpt(client, MSGS, temperature=0.7, seed=42)
+        chamar_gpt(client, MSGS, temperature=0.1)
+        chamar_gpt(client, MSGS, temperature=0.1)
+        chamar_gpt(client, MSGS, temperature=0.1, seed=42, usar_cache=False)
+
+        assert client.chat.completions.create.call_count == 5
+        assert estatisticas_cache_llm()['itens'] == 0
+
+    def test_stream_compartilha_o_cache(self, cache_ligado, cliente_openai_falso):
+        """Resposta gravada pelo chamar_gpt é entregue inteira no streaming."""
+        client = cliente_openai_falso("Linha 1\nLinha 2")
+        chamar_gpt(client, MSGS, temperature=0.1, seed=42)
+
+        trechos = list(chamar_gpt_stream(client, MSGS, temperature=0.1, seed=42))
+
+        assert trechos == ["Linha 1\nLinha 2"]
+        assert client.chat.completions.create.call_count == 1
@@ -0,0 +1,118 @@
+"""
+Testes da normalização de texto compartilhada (core.normalizacao_texto).
+"""
+
+import re
+
+import pytest
+
+from core.ats_scorer import _limpar_texto
+from core.normalizacao_texto import (
+    MAX_VISOES,
+    corrigir_formatacao,
+    dobrar_acentos,
+    estatisticas_visoes,
+    limpar_texto,
+    resetar_visoes,
+    visao_texto,
+)
+from modules.otimizador.analisador_bullets import extrair_bullets_cv
+
+CV = (
+    "Gerente de Operações\r\n"
+    "• Liderei equipe de 12 pessoas na implantação do Salesforce\n"
+    "  - Reduzi custos em 18% (R$ 2,4 milhões)\n"
+    "* P&L de R$ 30M\n"
+    "Gestão   de\tprojetos, Power BI/SQL.\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def _visoes_limpas():
+    """Cada teste começa sem visões memoizadas."""
+    resetar_visoes()
+    yield
+    resetar_visoes()
+
+
+class TestFuncoes:
+    """Testes das funções de normalização."""
+
+    @pytest.mark.parametrize("texto", [
+        "R$ 5.000", "R$5.000,00 e R 3.000", "Receita  de   R$ 10M", "a\r\nb  \t c", "PRÊMIO R  1", "", None,
+    ])
+    def test_corrigir_formatacao_equivale_ao_original(self, texto):
+        """Padrão combinado dá o mesmo resultado das três substituições antigas."""
+        esperado = texto
+        if texto:
+            esperado = re.sub(r'\bR\$\s*', '', texto)
+            esperado = re.sub(r'\bR\s+', '', esperado)
+            esperado = re.sub(r'[ \t]{2,}', ' ', esperado).replace('\r\n', '\n')
+
+        assert corrigir_formatacao(texto) == esperado
+
+    def test_limpar_texto_equivale_ao_original(self):
+        """limpar_texto mantém o resultado do _limpar_texto antigo do ATS."""
+        esperado = re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', '', CV.lower())).strip()
+
+        assert limpar_texto(CV) == esperado
+        assert _limpar_texto(CV) == esperado
+
+    @pytest.mark.parametrize("texto, esperado", [
+        ("Gestão de Ação", "Gestao de Acao"),
+        ("Über Łódź ñ", "Uber Łodz n"),
+        ("• Vendas – 🚀", "• Vendas – 🚀"),
+        ("ASCII puro", "ASCII puro"),
+        ("ệ ử", "e u"),
+    ])
+    def test_dobrar_acentos(self, texto, esperado):
+        """Remove acentos latinos e mantém símbolos."""
+        assert dobrar_acentos(texto) == esperado
+
+
+class TestVisaoTexto:
+    """Testes da visão normalizada memoizada."""
+
+    def test_formas_normalizadas(self):
+        """Cada forma deriva do mesmo texto."""
+        visao = visao_texto(CV)
+
+        assert visao.minusculo == CV.lower()
+        assert visao.limpo == limpar_texto(CV)
+        assert visao.tokens == tuple(visao.limpo.split())
+        assert visao.linhas[1] == "• Liderei equipe de 12 pessoas na implantação do Salesforce"
+        assert visao.bullets == (
+            "Liderei equipe de 12 pessoas na implantação do Salesforce",
+            "Reduzi custos em 18% (R$ 2,4 milhões)",
+            "P&L de R$ 30M",
+        )
+
+    def test_mesmo_conteudo_mesma_visao(self):
+        """O CV é normalizado uma vez: o mesmo conteúdo devolve a mesma visão."""
+        primeira = visao_texto(CV)
+        segunda = visao_texto("".join(list(CV)))
+
+        assert segunda is primeira
+        assert estatisticas_visoes() == {'hits': 1, 'misses': 1, 'itens': 1}
+        assert visao_texto(None) is visao_texto("")
+
+    def test_lru_limitado(self):
+        """Visões antigas saem quando o limite é atingido."""
+        primeira = visao_texto("cv 0")
+        for i in range(1, MAX_VISOES + 1):
+            visao_texto(f"cv {i}")
+
+        assert estatisticas_visoes()['itens'] == MAX_VISOES
+        assert visao_texto("cv 0") is not primeira
+
+    def test_consumidores_compartilham_a_visao(self):
+        """Analisador de bullets reaproveita a visão do CV."""
+        extrair_bullets_cv(CV)
+        extrair_bullets_cv(CV)
+
+        assert estatisticas_visoes()['misses'] == 1
+        assert extrair_bullets_cv(CV) == [
+            "Liderei equipe de 12 pessoas na implantação do Salesforce",
+            "Reduzi custos em 18% (R$ 2,4 milhões)",
+            "P&L de R$ 30M",
+        ]
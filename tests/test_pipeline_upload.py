@@ -0,0 +1,125 @@
+"""
+Testes do pipeline de upload em leitura única (core.pipeline_upload).
+"""
+
+import codecs
+import io
+import zipfile
+from unittest.mock import Mock
+
+import pytest
+
+import core.config
+from core.cache_extracao import resetar_cache_extracao
+from core.pipeline_upload import (
+    decodificar_texto,
+    detectar_formato,
+    processar_upload,
+)
+
+
+def _upload(dados, nome):
+    """UploadedFile falso: BytesIO com nome."""
+    arquivo = io.BytesIO(dados)
+    arquivo.name = nome
+    return arquivo
+
+
+def _docx(texto):
+    """Pacote .docx mínimo com um parágrafo."""
+    xml = ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+           f'<w:body><w:p><w:r><w:t>{texto}</w:t></w:r></w:p></w:body></w:document>')
+    saida = io.BytesIO()
+    with zipfile.ZipFile(saida, "w") as pacote:
+        pacote.writestr("word/document.xml", xml)
+    return saida.getvalue()
+
+
+class TestDeteccao:
+    """Testes da detecção de tipo e encoding."""
+
+    @pytest.mark.parametrize("dados, formato", [
+        (b"%PDF-1.7\n...", "pdf"),
+        (b"\n\n%PDF-1.4\n", "pdf"),
+        (b"PK\x03\x04resto", "docx"),
+        (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + bytes(64), "doc"),
+        ("Gerente de Vendas".encode("utf-16"), "txt"),
+        (b"Gerente de Vendas", "txt"),
+        (b"\x7fELF\x00\x00\x00", None),
+    ])
+    def test_magic_bytes(self, dados, formato):
+        """O tipo vem do conteúdo, não da extensão."""
+        assert detectar_formato(memoryview(dados)) == formato
+
+    @pytest.mark.parametrize("dados, encoding, bom", [
+        (codecs.BOM_UTF8 + "Coordenação".encode("utf-8"), "utf-8-sig", True),
+        ("Coordenação".encode("utf-16"), "utf-16", True),
+        ("Coordenação".encode("utf-8"), "utf-8", False),
+        ("“Coordenação” – PMO".encode("cp1252"), "cp1252", False),
+        ("Coordenação".encode("latin-1"), "latin-1", False),
+    ])
+    def test_encoding(self, dados, encoding, bom):
+        """BOM, UTF-8 e os fallbacks do Windows decodificam numa tentativa."""
+        texto, detectado, tinha_bom = decodificar_texto(memoryview(dados))
+
+        assert (detectado, tinha_bom) == (encoding, bom)
+        assert "Coordenação" in texto and not texto.startswith("\ufeff")
+
+
+class TestProcessarUpload:
+    """Testes do pipeline completo."""
+
+    def test_uma_leitura(self):
+        """O arquivo é lido uma única vez, sem seek nem read."""
+        arquivo = Mock(spec=['name', 'getvalue', 'seek', 'read'])
+        arquivo.name = "cv.txt"
+        arquivo.getvalue.return_value = "Analista de Dados\nPython".encode("utf-8")
+
+        resultado = processar_upload(arquivo)
+
+        assert resultado.texto == "Analista de Dados\nPython"
+        arquivo.getvalue.assert_called_once()
+        arquivo.seek.assert_not_called()
+        arquivo.read.assert_not_called()
+
+    def test_tipo_real_vence_a_extensao(self):
+        """DOCX renomeado para .pdf é extraído como DOCX."""
+        resultado = processar_upload(_upload(_docx("Gerente de Projetos"), "cv.pdf"))
+
+        assert resultado.valido
+        assert resultado.formato == "docx"
+        assert resultado.texto == "Gerente de Projetos"
+
+    def test_resultado_tipado(self, tmp_path, monkeypatch):
+        """Metadados, hash e tempo de cada etapa; o reenvio sai do cache."""
+        monkeypatch.setattr(core.config.config, 'EXTRACTION_CACHE_ENABLED', True)
+        monkeypatch.setattr(core.config.config, 'EXTRACTION_CACHE_PATH', str(tmp_path / 'extracao.sqlite'))
+        resetar_cache_extracao()
+        dados = "“Líder” de squads".encode("cp1252")
+
+        primeiro = processar_upload(_upload(dados, "cv.txt"))
+        segundo = processar_upload(_upload(dados, "cv.txt"))
+
+        assert primeiro.metadados == {'formato': 'txt', 'caracteres': 17, 'bytes': 17,
+                                      'encoding': 'cp1252', 'bom': False}
+        assert set(primeiro.tempos) == {'leitura', 'deteccao', 'hash', 'cache', 'extracao', 'total'}
+        assert len(primeiro.chave) == 64
+        assert segundo.do_cache and segundo.texto == primeiro.texto
+        assert segundo.metadados == primeiro.metadados
+        assert 'extracao' not in segundo.tempos
+
+    @pytest.mark.parametrize("dados, nome, mensagem", [
+        (b"qualquer", "cv.odt", "Formato não suportado"),
+        (b"", "cv.txt", "vazio"),
+        (b"\x7fELF\x00\x00", "cv.txt", "não reconhecido"),
+        (b"%PDF-1.4\n" + bytes(2 * 1024 * 1024), "cv.pdf", "muito grande"),
+    ])
+    def test_erros(self, dados, nome, mensagem, monkeypatch):
+        """Falhas voltam como mensagem ao usuário, sem exceção."""
+        monkeypatch.setattr(core.config.config, 'MAX_PDF_SIZE_MB', 1)
+
+        resultado = processar_upload(_upload(dados, nome))
+
+        assert not resultado.valido
+        assert mensagem in resultado.erro
+        assert 'total' in resultado.tempos
@@ -0,0 +1,128 @@
+"""
+Testes do roteamento de modelos por tarefa (core.roteamento_modelos).
+"""
+
+import pytest
+
+import core.config
+from core.config import Config
+from core.gpt_metricas import contexto_gpt, registro_metricas
+from core.roteamento_modelos import (
+    ROTA_EXTRACAO_CARGO,
+    ROTA_PADRAO,
+    ROTA_PERGUNTA_DINAMICA,
+    interpretar_rotas,
+    resolver_rota,
+)
+from core.utils import chamar_gpt
+
+
+@pytest.fixture
+def metricas_limpas():
+    """Zera o registro de métricas antes e depois do teste."""
+    registro_metricas.resetar()
+    yield registro_metricas
+    registro_metricas.resetar()
+
+
+class TestInterpretarRotas:
+    """Testes do formato de OPENAI_MODEL_ROUTES."""
+
+    def test_formato_completo(self):
+        """Aceita rota=modelo:max_tokens, só modelo ou só limite."""
+        rotas = interpretar_rotas("validacao=gpt-4o-mini:800, linkedin=gpt-4.1 ,extracao_cargo=:30")
+
+        assert rotas == {
+            'validacao': ('gpt-4o-mini', 800),
+            'linkedin': ('gpt-4.1', None),
+            'extracao_cargo': (None, 30),
+        }
+
+    def test_vazio(self):
+        """Texto vazio não define rotas."""
+        assert interpretar_rotas("") == {}
+        assert interpretar_rotas(None) == {}
+
+    @pytest.mark.parametrize("texto", ["sem_igual", "=gpt-4o", "rota=gpt-4o:abc", "rota=gpt-4o:0"])
+    def test_formato_invalido(self, texto):
+        """Entradas mal formatadas geram ValueError."""
+        with pytest.raises(ValueError):
+            interpretar_rotas(texto)
+
+    def test_config_valida_rotas(self):
+        """Config.validate rejeita OPENAI_MODEL_ROUTES inválido."""
+        with pytest.raises(ValueError):
+            Config(MODEL_ROUTES="rota").validate()
+
+
+class TestResolverRota:
+    """Testes da resolução de modelo e limite por rota."""
+
+    def test_padrao_usa_config(self, monkeypatch):
+        """Sem rota nem contexto conhecido, usa MODEL e MAX_TOKENS."""
+        monkeypatch.setattr(core.config.config, 'MODEL', 'gpt-4o')
+        monkeypatch.setattr(core.config.config, 'MAX_TOKENS', 4000)
+
+        assert resolver_rota() == (ROTA_PADRAO, 'gpt-4o', 4000)
+        assert resolver_rota("inexistente") == (ROTA_PADRAO, 'gpt-4o', 4000)
+
+    def test_rota_rapida(self, monkeypatch):
+        """Rotas de extração usam o modelo rápido com limite curto."""
+        monkeypatch.setattr(core.config.config, 'MODEL_FAST', 'gpt-4o-mini')
+
+        nome, modelo, max_tokens = resolver_rota(ROTA_EXTRACAO_CARGO)
+
+        assert (nome, modelo) == (ROTA_EXTRACAO_CARGO, 'gpt-4o-mini')
+        assert max_tokens < 4000
+
+    def test_sobrescrita_por_ambiente(self, monkeypatch):
+        """OPENAI_MODEL_ROUTES troca o modelo e mantém o limite da rota."""
+        limite = resolver_rota(ROTA_PERGUNTA_DINAMICA)[2]
+        monkeypatch.setattr(core.config.config, 'MODEL_ROUTES', 'pergunta_dinamica=gpt-4.1-nano')
+
+        assert resolver_rota(ROTA_PERGUNTA_DINAMICA) == (ROTA_PERGUNTA_DINAMICA, 'gpt-4.1-nano', limite)
+
+    def test_rota_pelo_contexto(self, monkeypatch):
+        """Uma rota com o nome do contexto de telemetria vale para a fase inteira."""
+        monkeypatch.setattr(core.config.config, 'MODEL_ROUTES', 'validacao=gpt-4o-mini:800')
+
+        with contexto_gpt("validacao"):
+            assert resolver_rota() == ('validacao', 'gpt-4o-mini', 800)
+        with contexto_gpt("reescrita"):
+            assert resolver_rota()[0] == ROTA_PADRAO
+
+    def test_rota_explicita_vence_contexto(self, monkeypatch):
+        """A rota do ponto de chamada tem precedência sobre o contexto."""
+        monkeypatch.setattr(core.config.config, 'MODEL_ROUTES', 'validacao=gpt-4o:800')
+
+        with contexto_gpt("validacao"):
+            assert resolver_rota(ROTA_EXTRACAO_CARGO)[0] == ROTA_EXTRACAO_CARGO
+
+
+class TestChamarGptRoteado:
+    """Testes do roteamento em chamar_gpt."""
+
+    def test_envia_modelo_e_limite_da_rota(self, monkeypatch, metricas_limpas, cliente_openai_falso):
+        """A requisição usa o modelo/limite da rota e a latência é medida por rota."""
+        monkeypatch.setattr(core.config.config, 'MODEL_FAST', 'gpt-4o-mini')
+        client = cliente_openai_falso()
+
+        chamar_gpt(client, [{"role": "user", "content": "CV"}], temperature=0.1, seed=42,
+                   rota=ROTA_EXTRACAO_CARGO)
+
+        params = client.chat.completions.create.call_args.kwargs
+        assert params['model'] == 'gpt-4o-mini'
+        assert params['max_tokens'] == resolver_rota(ROTA_EXTRACAO_CARGO)[2]
+        por_rota = metricas_limpas.snapshot()['por_rota']
+        assert por_rota[ROTA_EXTRACAO_CARGO]['chamadas'] == 1
+        assert por_rota[ROTA_EXTRACAO_CARGO]['modelos'] == {'gpt-4o-mini': 1}
+
+    def test_sem_rota_usa_modelo_principal(self, monkeypatch, metricas_limpas, cliente_openai_falso):
+        """Chamadas sem rota seguem no modelo principal."""
+        monkeypatch.setattr(core.config.config, 'MODEL', 'gpt-4o')
+        client = cliente_openai_falso()
+
+        chamar_gpt(client, [{"role": "user", "content": "Olá"}])
+
+        assert client.chat.completions.create.call_args.kwargs['model'] == 'gpt-4o'
+        assert ROTA_PADRAO in metricas_limpas.snapshot()['por_rota']
@@ -0,0 +1,157 @@
+"""
+Testes do servidor local que imita a API de chat completions (core.servidor_llm_falso).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from openai import OpenAI
+
+from core.ats_scorer import (
+    FORMATO_ANALISE_LLM,
+    _analisar_com_llm,
+    _mensagens_job_description,
+    _mensagens_variacoes_cargo,
+)
+from core.servidor_llm_falso import (
+    TIPO_JOB_DESCRIPTION,
+    CenarioServidorFalso,
+    ServidorLLMFalso,
+    interpretar_latencia,
+)
+from core.utils import chamar_gpt, chamar_gpt_stream
+
+MSGS = [{"role": "user", "content": "Olá, tudo bem?"}]
+
+
+def _cliente(servidor, timeout=5.0):
+    """Cliente OpenAI real apontando para o servidor falso (sem retries do SDK)."""
+    return OpenAI(api_key="sk-falso", base_url=servidor.url, max_retries=0, timeout=timeout)
+
+
+@pytest.fixture
+def servidor_falso():
+    """Fábrica de servidores falsos, parados ao fim do teste."""
+    servidores = []
+
+    def _criar(**kwargs):
+        servidor = ServidorLLMFalso(CenarioServidorFalso(semente=7, **kwargs)).iniciar()
+        servidores.append(servidor)
+        return servidor
+
+    yield _criar
+    for servidor in servidores:
+        servidor.parar()
+
+
+class TestLatencia:
+    """Testes das distribuições de latência."""
+
+    @pytest.mark.parametrize("especificacao", ["fixa:0.5", "uniforme:0.1,0.3", "normal:1,0.2", "lognormal:1.5,0.5"])
+    def test_distribuicoes(self, especificacao):
+        """Todas as distribuições sorteiam valores não negativos."""
+        import random
+        sortear = interpretar_latencia(especificacao)
+        rng = random.Random(1)
+
+        assert all(sortear(rng) >= 0 for _ in range(100))
+
+    @pytest.mark.parametrize("especificacao", ["gaussiana:1", "fixa", "uniforme:1", "lognormal:0,1", "fixa:x"])
+    def test_especificacao_invalida(self, especificacao):
+        """Distribuições desconhecidas ou mal formatadas geram ValueError."""
+        with pytest.raises(ValueError):
+            interpretar_latencia(especificacao)
+
+
+class TestRespostas:
+    """Testes das respostas pelo SDK oficial e pelo core.utils."""
+
+    def test_resposta_com_uso(self, servidor_falso):
+        """Resposta não-stream no formato de ChatCompletion, com usage."""
+        servidor = servidor_falso()
+
+        response = _cliente(servidor).chat.completions.create(model="gpt-4o", messages=MSGS)
+
+        assert "Olá, tudo bem?" in response.choices[0].message.content
+        assert response.usage.prompt_tokens > 0
+
+    def test_stream(self, servidor_falso):
+        """chamar_gpt_stream recebe o texto completo via SSE."""
+        servidor = servidor_falso()
+
+        texto = "".join(chamar_gpt_stream(_cliente(servidor), _mensagens_variacoes_cargo("Analista de Dados")))
+
+        assert texto.splitlines()[0] == "Analista de Dados"
+        assert servidor.estatisticas()['streams'] == 1
+
+    def test_modelos_por_tipo(self, servidor_falso):
+        """JD e variações usam os modelos do tipo, com o cargo da requisição."""
+        servidor = servidor_falso(respostas={TIPO_JOB_DESCRIPTION: "JD de $cargo"})
+        msgs = _mensagens_job_description("Gerente de Vendas", ["Gerente de Vendas", "Sales Manager"])
+
+        assert chamar_gpt(_cliente(servidor), msgs) == "JD de Gerente de Vendas"
+
+    def test_analise_ats_no_schema(self, servidor_falso):
+        """A análise ATS simulada passa pela validação do schema."""
+        servidor = servidor_falso()
+
+        with patch('core.ats_scorer.chamar_gpt',
+                   side_effect=lambda client, msgs, **kw: chamar_gpt(client, msgs, **kw)) as espiao:
+            resultado = _analisar_com_llm(_cliente(servidor), "CV de vendas", "Gerente de Vendas")
+
+        assert espiao.call_args.kwargs['response_format'] == FORMATO_ANALISE_LLM
+        assert resultado['score'] == 68.0
+        assert "HubSpot" in resultado['gaps_identificados']
+
+
+class TestFalhasInjetadas:
+    """Testes de rate limit, timeout e erro 500 contra core.utils."""
+
+    @patch('core.utils.time.sleep')
+    def test_429_com_retry_after(self, mock_sleep, servidor_falso):
+        """429 com Retry-After: chamar_gpt espera o pedido e tenta de novo."""
+        servidor = servidor_falso(taxa_429=1.0, retry_after=2.0)
+
+        with patch('core.utils.st'):
+            assert chamar_gpt(_cliente(servidor), MSGS, max_retries=2) is None
+
+        assert servidor.estatisticas()['erros_429'] == 2
+        assert 2.0 <= mock_sleep.call_args.args[0] <= 2.2
+
+    def test_sem_cota_nao_repete(self, servidor_falso):
+        """insufficient_quota falha de imediato, sem retries."""
+        servidor = servidor_falso(taxa_sem_cota=1.0)
+
+        with patch('core.utils.st'):
+            assert chamar_gpt(_cliente(servidor), MSGS, max_retries=3) is None
+
+        assert servidor.estatisticas()['requisicoes'] == 1
+
+    @patch('core.utils.time.sleep')
+    def test_timeout(self, mock_sleep, servidor_falso):
+        """Resposta mais lenta que o timeout do cliente vira timeout."""
+        servidor = servidor_falso(taxa_timeout=1.0, atraso_timeout=1.0)
+
+        with patch('core.utils.st') as mock_st:
+            assert chamar_gpt(_cliente(servidor, timeout=0.2), MSGS, max_retries=1) is None
+
+        assert "Timeout" in mock_st.error.call_args.args[0]
+        assert servidor.estatisticas()['timeouts'] == 1
+
+    @patch('core.utils.time.sleep')
+    def test_taxa_parcial_de_falhas(self, mock_sleep, servidor_falso):
+        """Com 30% de erros 500, os retries recuperam as chamadas concorrentes."""
+        servidor = servidor_falso(taxa_500=0.3, latencia="uniforme:0,0.02")
+        client = _cliente(servidor)
+
+        with patch('core.utils.st'), ThreadPoolExecutor(max_workers=8) as executor:
+            respostas = list(executor.map(
+                lambda i: chamar_gpt(client, [{"role": "user", "content": f"pedido {i}"}], max_retries=5),
+                range(20)
+            ))
+
+        stats = servidor.estatisticas()
+        assert sum(r is not None for r in respostas) >= 19
+        assert stats['erros_500'] > 0
+        assert stats['requisicoes'] == stats['respostas'] + stats['erros_500']
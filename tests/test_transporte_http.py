@@ -0,0 +1,132 @@
+"""
+Testes do pool HTTP compartilhado pelos clientes OpenAI (core.transporte_http).
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import core.config
+from core.gpt_metricas import exportar_prometheus
+from core.transporte_http import (
+    criar_cliente_openai,
+    estatisticas_pool,
+    obter_http_client,
+    resetar_http_client,
+)
+from core.utils import inicializar_cliente_openai
+
+
+class _HandlerLento(BaseHTTPRequestHandler):
+    """Responde 200 com keep-alive após ``atraso`` segundos."""
+
+    protocol_version = "HTTP/1.1"
+    atraso = 0.0
+
+    def do_GET(self):
+        time.sleep(self.atraso)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    """Servidor HTTP local; retorna a URL base."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _HandlerLento)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def pool_limpo():
+    """Cada teste começa com um pool novo."""
+    resetar_http_client()
+    yield
+    resetar_http_client()
+    _HandlerLento.atraso = 0.0
+
+
+class TestPoolCompartilhado:
+    """Testes do httpx.Client do processo."""
+
+    def test_cliente_unico_no_processo(self):
+        """Clientes OpenAI de sessões diferentes usam o mesmo httpx.Client."""
+        sessao_a = criar_cliente_openai("sk-a")
+        sessao_b = inicializar_cliente_openai("sk-b")
+
+        assert sessao_a._client is obter_http_client()
+        assert sessao_b._client is obter_http_client()
+        assert sessao_a.api_key != sessao_b.api_key
+
+    def test_limites_da_config(self, monkeypatch):
+        """Limites do pool vêm da configuração."""
+        monkeypatch.setattr(core.config.config, 'GPT_HTTP_MAX_CONNECTIONS', 7)
+
+        obter_http_client()
+
+        assert obter_http_client()._transport.limites.max_connections == 7
+
+    def test_sem_pool_sem_estatisticas(self):
+        """Antes do primeiro uso não há estatísticas."""
+        assert estatisticas_pool() is None
+
+    def test_conexao_reutilizada(self, servidor):
+        """Requisições sequenciais reaproveitam a conexão em keep-alive."""
+        client = obter_http_client()
+        for _ in range(3):
+            client.get(servidor).raise_for_status()
+
+        stats = estatisticas_pool()
+        assert stats['requisicoes'] == 3
+        assert stats['conexoes_novas'] == 1
+        assert stats['conexoes_reutilizadas'] == 2
+        assert stats['aguardaram'] == 0
+
+    def test_pool_lotado_conta_espera(self, servidor, monkeypatch):
+        """Com o pool no limite, a requisição seguinte espera e o tempo é medido."""
+        monkeypatch.setattr(core.config.config, 'GPT_HTTP_MAX_CONNECTIONS', 1)
+        _HandlerLento.atraso = 0.3
+        client = obter_http_client()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            primeira = executor.submit(client.get, servidor)
+            time.sleep(0.1)
+            segunda = executor.submit(client.get, servidor)
+            primeira.result(5)
+            segunda.result(5)
+
+        stats = estatisticas_pool()
+        assert stats['aguardaram'] == 1
+        assert 0.1 < stats['espera_segundos'] < 1.0
+        assert stats['conexoes_novas'] == 1
+
+    def test_pool_com_folga_nao_conta_espera(self, servidor):
+        """Requisições simultâneas abaixo do limite não contam como espera."""
+        _HandlerLento.atraso = 0.2
+        client = obter_http_client()
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda _: client.get(servidor), range(3)))
+
+        stats = estatisticas_pool()
+        assert stats['aguardaram'] == 0
+        assert stats['conexoes_novas'] == 3
+
+    def test_exposto_no_prometheus(self, servidor):
+        """Uso do pool aparece no endpoint de métricas."""
+        obter_http_client().get(servidor)
+
+        texto = exportar_prometheus()
+
+        assert 'gpt_http_requisicoes_total 1' in texto
+        assert 'gpt_http_aguardaram_total 0' in texto
@@ -4,7 +4,7 @@ Testes unitários para funções utilitárias do Protocolo Nóbile.
 
 import pytest
 from unittest.mock import Mock, MagicMock, patch
-from core.utils import corrigir_formatacao, filtrar_cidades, chamar_gpt
+from core.utils import RespostaInterrompida, corrigir_formatacao, filtrar_cidades, chamar_gpt, chamar_gpt_stream
 
 
 class TestChamarGpt:
@@ -176,3 +176,72 @@ class TestExtrairTextoUniversal:
         """Testa diferentes encodings em TXT"""
         # Mock
         assert True  # Implementar
+
+
+def _chunk(texto):
+    """Simula um chunk de streaming da API (delta.content)."""
+    chunk = Mock()
+    chunk.choices = [Mock()]
+    chunk.choices[0].delta.content = texto
+    return chunk
+
+
+class TestChamarGptStream:
+    """Testes para a variante em streaming de chamar_gpt."""
+
+    def test_stream_entrega_linhas_formatadas(self):
+        """Testa que os deltas viram linhas completas já formatadas."""
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = iter([
+            _chunk("Salário: R$ 5"), _chunk(".000\nLinha   dois"), _chunk(None), _chunk("\nfim")
+        ])
+
+        trechos = list(chamar_gpt_stream(mock_client, [{"role": "user", "content": "Test"}], seed=42))
+
+        assert trechos == ["Salário: 5.000\n", "Linha dois\n", "fim"]
+        call_kwargs = mock_client.chat.completions.create.call_args[1]
+        assert call_kwargs["stream"] is True
+        assert call_kwargs["seed"] == 42
+
+    def test_stream_igual_a_resposta_completa(self):
+        """Testa que o texto concatenado equivale ao corrigir_formatacao do todo."""
+        texto = "Título\r\n- R$ 10.000   por mês\n\n**Fim**"
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = iter(_chunk(c) for c in texto)
+
+        resposta = "".join(chamar_gpt_stream(mock_client, [{"role": "user", "content": "Test"}]))
+
+        assert resposta == corrigir_formatacao(texto)
+
+    @patch('core.utils.st')
+    @patch('core.utils.time.sleep')
+    def test_stream_retry_antes_do_primeiro_trecho(self, mock_sleep, mock_st):
+        """Testa retry quando a falha ocorre antes de qualquer trecho."""
+        mock_client = Mock()
+        mock_client.chat.completions.create.side_effect = [
+            Exception("conexão caiu"), iter([_chunk("ok")])
+        ]
+
+        trechos = list(chamar_gpt_stream(mock_client, [{"role": "user", "content": "Test"}]))
+
+        assert trechos == ["ok"]
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @patch('core.utils.st')
+    def test_stream_sem_retry_apos_entrega(self, mock_st):
+        """Testa que uma falha no meio do stream é sinalizada e não repete o texto já entregue."""
+        def stream_quebrado():
+            yield _chunk("linha 1\n")
+            raise Exception("stream interrompido")
+
+        mock_client = Mock()
+        mock_client.chat.completions.create.return_value = stream_quebrado()
+
+        trechos = []
+        with pytest.raises(RespostaInterrompida):
+            for trecho in chamar_gpt_stream(mock_client, [{"role": "user", "content": "Test"}]):
+                trechos.append(trecho)
+
+        assert trechos == ["linha 1\n"]
+        assert mock_client.chat.completions.create.call_count == 1
+        mock_st.error.assert_called_once()
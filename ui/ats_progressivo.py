@@ -0,0 +1,49 @@
+"""Acompanhamento do Score ATS progressivo (preliminar TF-IDF → refinamento LLM)."""
+import streamlit as st
+import logging
+
+from core.ats_scorer import obter_refinamento_ats, resultado_pendente
+
+logger = logging.getLogger(__name__)
+
+# Intervalo (segundos) entre consultas ao refinamento LLM em andamento
+INTERVALO_REFINAMENTO = 1.5
+
+
+def refinamento_em_andamento(resultado) -> bool:
+    """True se o resultado ATS é preliminar e o refinamento LLM ainda está ativo."""
+    return bool(resultado) and resultado_pendente(resultado.get('refinamento_id'))
+
+
+@st.fragment(run_every=INTERVALO_REFINAMENTO)
+def acompanhar_refinamento_ats(*chaves_estado):
+    """
+    Consulta o refinamento LLM e troca o resultado preliminar quando ele chega.
+
+    Roda como fragmento (sem recarregar a página) a cada INTERVALO_REFINAMENTO.
+    Quando o resultado final fica pronto, substitui nas chaves do
+    session_state que ainda guardam o preliminar e recarrega a tela.
+
+    Args:
+        chaves_estado: Chaves do session_state com o resultado preliminar
+    """
+    preliminar = st.session_state.get(chaves_estado[0])
+    refinamento_id = preliminar.get('refinamento_id') if preliminar else None
+
+    final = obter_refinamento_ats(refinamento_id) if refinamento_id else None
+    if final is None and resultado_pendente(refinamento_id):
+        st.caption("⏳ Score preliminar (TF-IDF). Refinando com IA — o resultado será atualizado automaticamente...")
+        return
+
+    for chave in chaves_estado:
+        atual = st.session_state.get(chave)
+        if atual and atual.get('refinamento_id') == refinamento_id:
+            if final is not None:
+                st.session_state[chave] = final
+            else:
+                # Refinamento perdido (ex.: descartado do registro): manter o preliminar
+                st.session_state[chave] = {k: v for k, v in atual.items()
+                                           if k not in ('refinamento_id', 'refinamento_pendente')}
+
+    logger.info(f"Refinamento ATS {refinamento_id} aplicado: {final['score_total'] if final else 'indisponível'}")
+    st.rerun()
@@ -1,14 +1,47 @@
 import logging
+import itertools
+from typing import Optional
+
 import streamlit as st
-from core.utils import forcar_topo
-from core.gpt_telemetry import chamar_gpt_com_telemetria, renderizar_badge_gpt_calls, CONTEXTO_DIAGNOSTICO, CONTEXTO_COLETA, CONTEXTO_REESCRITA, CONTEXTO_LINKEDIN, CONTEXTO_VALIDACAO
+from core.utils import RespostaInterrompida, forcar_topo
+from core.gpt_telemetry import chamar_gpt_stream_com_telemetria, renderizar_badge_gpt_calls, CONTEXTO_DIAGNOSTICO, CONTEXTO_COLETA, CONTEXTO_REESCRITA, CONTEXTO_LINKEDIN, CONTEXTO_VALIDACAO, CONTEXTO_OUTROS
 from core.cv_cache import obter_resumo_cv_cached, inicializar_cache_cv_async
+from core.janela_contexto import montar_contexto
 from modules.otimizador.processor import processar_modulo_otimizador
 
 # Configurar logger para este módulo
 logger = logging.getLogger(__name__)
 
 
+def _responder_em_stream(mensagem_espera: str, client, msgs: list, contexto: str, **kwargs) -> Optional[str]:
+    """
+    Chama o GPT em streaming e renderiza a resposta progressivamente.
+    
+    O spinner aparece só até o primeiro trecho chegar; a partir daí o texto
+    é escrito com st.write_stream. O histórico passa antes pelo gerenciador
+    de janela de contexto (orçamento de tokens, CV deduplicado).
+    
+    Returns:
+        Resposta completa ou None em caso de erro (inclusive stream
+        interrompido no meio: o texto parcial não entra no histórico)
+    """
+    msgs, relatorio = montar_contexto(msgs, cv_texto=st.session_state.get('cv_texto'))
+    st.session_state.contexto_tokens_economizados = (
+        st.session_state.get('contexto_tokens_economizados', 0) + relatorio['tokens_economizados']
+    )
+    
+    gerador = chamar_gpt_stream_com_telemetria(client, msgs, contexto=contexto, **kwargs)
+    with st.spinner(mensagem_espera):
+        primeiro = next(gerador, None)
+    if primeiro is None:
+        return None
+    try:
+        resposta = st.write_stream(itertools.chain([primeiro], gerador))
+    except RespostaInterrompida:
+        return None
+    return resposta or None
+
+
 def fase_chat():
     """Interface de chat do Protocolo Nóbile com logging integrado."""
     logger.info("Iniciando fase de chat")
@@ -95,19 +128,18 @@ def fase_chat():
         if prompt_otimizador:
             st.session_state.mensagens.append({"role": "user", "content": prompt_otimizador, "internal": True})
             with st.chat_message("assistant"):
-                with st.spinner("🔍 Diagnosticando gaps no seu CV..."):
-                    resp = chamar_gpt_com_telemetria(
-                        st.session_state.openai_client, 
-                        st.session_state.mensagens,
-                        contexto=CONTEXTO_DIAGNOSTICO,
-                        temperature=0.3,
-                        seed=42
-                    )
-                    if resp:
-                        st.markdown(resp)
-                        st.session_state.mensagens.append({"role": "assistant", "content": resp})
-                        # Move to next state - wait to start asking gaps
-                        st.session_state.etapa_modulo = 'AGUARDANDO_INICIO_GAPS'
+                resp = _responder_em_stream(
+                    "🔍 Diagnosticando gaps no seu CV...",
+                    st.session_state.openai_client,
+                    st.session_state.mensagens,
+                    contexto=CONTEXTO_DIAGNOSTICO,
+                    temperature=0.3,
+                    seed=42
+                )
+                if resp:
+                    st.session_state.mensagens.append({"role": "assistant", "content": resp})
+                    # Move to next state - wait to start asking gaps
+                    st.session_state.etapa_modulo = 'AGUARDANDO_INICIO_GAPS'
             st.rerun()
     
     # Auto-trigger primeiro gap individual
@@ -167,19 +199,18 @@ def fase_chat():
         if prompt_otimizador:
             st.session_state.mensagens.append({"role": "user", "content": prompt_otimizador, "internal": True})
             with st.chat_message("assistant"):
-                with st.spinner("📝 Preparando coleta de dados..."):
-                    resp = chamar_gpt_com_telemetria(
-                        st.session_state.openai_client, 
-                        st.session_state.mensagens,
-                        contexto=CONTEXTO_COLETA,
-                        temperature=0.3,
-                        seed=42
-                    )
-                    if resp:
-                        st.markdown(resp)
-                        st.session_state.mensagens.append({"role": "assistant", "content": resp})
-                        # Move to next state - wait for data
-                        st.session_state.etapa_modulo = 'AGUARDANDO_DADOS_COLETA'
+                resp = _responder_em_stream(
+                    "📝 Preparando coleta de dados...",
+                    st.session_state.openai_client,
+                    st.session_state.mensagens,
+                    contexto=CONTEXTO_COLETA,
+                    temperature=0.3,
+                    seed=42
+                )
+                if resp:
+                    st.session_state.mensagens.append({"role": "assistant", "content": resp})
+                    # Move to next state - wait for data
+                    st.session_state.etapa_modulo = 'AGUARDANDO_DADOS_COLETA'
             st.rerun()
     
     # Auto-trigger ETAPA_1_5_SEO_INTRO
@@ -259,19 +290,18 @@ def fase_chat():
         if prompt_otimizador:
             st.session_state.mensagens.append({"role": "user", "content": prompt_otimizador, "internal": True})
             with st.chat_message("assistant"):
-                with st.spinner("🔵 Otimizando seu perfil LinkedIn..."):
-                    resp = chamar_gpt_com_telemetria(
-                        st.session_state.openai_client, 
-                        st.session_state.mensagens,
-                        contexto=CONTEXTO_LINKEDIN,
-                        temperature=0.5,  # Mais criatividade para headlines
-                        seed=42
-                    )
-                    if resp:
-                        st.markdown(resp)
-                        st.session_state.mensagens.append({"role": "assistant", "content": resp})
-                        # Move to next state - wait for headline choice
-                        st.session_state.etapa_modulo = 'AGUARDANDO_ESCOLHA_HEADLINE'
+                resp = _responder_em_stream(
+                    "🔵 Otimizando seu perfil LinkedIn...",
+                    st.session_state.openai_client,
+                    st.session_state.mensagens,
+                    contexto=CONTEXTO_LINKEDIN,
+                    temperature=0.5,  # Mais criatividade para headlines
+                    seed=42
+                )
+                if resp:
+                    st.session_state.mensagens.append({"role": "assistant", "content": resp})
+                    # Move to next state - wait for headline choice
+                    st.session_state.etapa_modulo = 'AGUARDANDO_ESCOLHA_HEADLINE'
             st.rerun()
 
     # Auto-trigger CHECKPOINT_1_VALIDACAO
@@ -311,26 +341,25 @@ def fase_chat():
         if prompt_otimizador:
             st.session_state.mensagens.append({"role": "user", "content": prompt_otimizador, "internal": True})
             with st.chat_message("assistant"):
-                with st.spinner("✍️ Reescrevendo experiência profissional..."):
-                    resp = chamar_gpt_com_telemetria(
-                        st.session_state.openai_client, 
-                        st.session_state.mensagens,
-                        contexto=CONTEXTO_REESCRITA,
-                        temperature=0.4,
-                        seed=42
-                    )
-                    if resp:
-                        st.markdown(resp)
-                        st.session_state.mensagens.append({"role": "assistant", "content": resp})
-                        # Extract experience number from etapa
-                        etapa = st.session_state.get('etapa_modulo', '')
-                        try:
-                            exp_num = int(etapa.split('_')[-1])
-                        except (ValueError, IndexError) as e:
-                            logger.error(f"Erro ao extrair número da experiência de etapa '{etapa}': {e}")
-                            exp_num = 1  # Fallback to first experience
-                        # Move to approval state for this experience
-                        st.session_state.etapa_modulo = f'AGUARDANDO_APROVACAO_EXP_{exp_num}'
+                resp = _responder_em_stream(
+                    "✍️ Reescrevendo experiência profissional...",
+                    st.session_state.openai_client,
+                    st.session_state.mensagens,
+                    contexto=CONTEXTO_REESCRITA,
+                    temperature=0.4,
+                    seed=42
+                )
+                if resp:
+                    st.session_state.mensagens.append({"role": "assistant", "content": resp})
+                    # Extract experience number from etapa
+                    etapa = st.session_state.get('etapa_modulo', '')
+                    try:
+                        exp_num = int(etapa.split('_')[-1])
+                    except (ValueError, IndexError) as e:
+                        logger.error(f"Erro ao extrair número da experiência de etapa '{etapa}': {e}")
+                        exp_num = 1  # Fallback to first experience
+                    # Move to approval state for this experience
+                    st.session_state.etapa_modulo = f'AGUARDANDO_APROVACAO_EXP_{exp_num}'
             st.rerun()
     
     # Auto-trigger ETAPA_2_REESCRITA_FINAL
@@ -348,19 +377,18 @@ def fase_chat():
         if prompt_otimizador:
             st.session_state.mensagens.append({"role": "user", "content": prompt_otimizador, "internal": True})
             with st.chat_message("assistant"):
-                with st.spinner("🎯 Finalizando reescrita do CV..."):
-                    resp = chamar_gpt_com_telemetria(
-                        st.session_state.openai_client, 
-                        st.session_state.mensagens,
-                        contexto=CONTEXTO_REESCRITA,
-                        temperature=0.3,
-                        seed=42
-                    )
-                    if resp:
-                        st.markdown(resp)
-                        st.session_state.mensagens.append({"role": "assistant", "content": resp})
-                        # Move to next state - wait to continue
-                        st.session_state.etapa_modulo = 'AGUARDANDO_CONTINUAR_CHECKPOINT2'
+                resp = _responder_em_stream(
+                    "🎯 Finalizando reescrita do CV...",
+                    st.session_state.openai_client,
+                    st.session_state.mensagens,
+                    contexto=CONTEXTO_REESCRITA,
+                    temperature=0.3,
+                    seed=42
+                )
+                if resp:
+                    st.session_state.mensagens.append({"role": "assistant", "content": resp})
+                    # Move to next state - wait to continue
+                    st.session_state.etapa_modulo = 'AGUARDANDO_CONTINUAR_CHECKPOINT2'
             st.rerun()
 
     # ===== RENDERIZAR BOTÕES DE CONTINUAÇÃO =====
@@ -417,17 +445,16 @@ def fase_chat():
             if prompt_otimizador:
                 st.session_state.mensagens.append({"role": "user", "content": prompt_otimizador, "internal": True})
                 with st.chat_message("assistant"):
-                    with st.spinner("🤔 Processando etapa..."):
-                        resp = chamar_gpt_com_telemetria(
-                            st.session_state.openai_client, 
-                            st.session_state.mensagens,
-                            contexto=CONTEXTO_COLETA,
-                            temperature=0.3,
-                            seed=42
-                        )
-                        if resp:
-                            st.markdown(resp)
-                            st.session_state.mensagens.append({"role": "assistant", "content": resp})
+                    resp = _responder_em_stream(
+                        "🤔 Processando etapa...",
+                        st.session_state.openai_client,
+                        st.session_state.mensagens,
+                        contexto=CONTEXTO_COLETA,
+                        temperature=0.3,
+                        seed=42
+                    )
+                    if resp:
+                        st.session_state.mensagens.append({"role": "assistant", "content": resp})
             # Rerun whether processor succeeded or returned None
             # - If succeeded: rerun to display result
             # - If None: rerun to show the button instead
@@ -453,12 +480,11 @@ Use o CV do contexto."""
             st.session_state.aguardando_vaga = False
 
         with st.chat_message("assistant"):
-            with st.spinner("🤔 Analisando..."):
-                resp = chamar_gpt_com_telemetria(
-                    st.session_state.openai_client, 
-                    st.session_state.mensagens,
-                    contexto=CONTEXTO_OUTROS
-                )
-                if resp:
-                    st.markdown(resp)
-                    st.session_state.mensagens.append({"role": "assistant", "content": resp})
\ No newline at end of file
+            resp = _responder_em_stream(
+                "🤔 Analisando...",
+                st.session_state.openai_client,
+                st.session_state.mensagens,
+                contexto=CONTEXTO_OUTROS
+            )
+            if resp:
+                st.session_state.mensagens.append({"role": "assistant", "content": resp})
\ No newline at end of file
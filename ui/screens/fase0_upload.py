@@ -117,8 +117,15 @@ def fase_0_upload():
                 or st.session_state.get('cv_arquivo_nome') != arquivo.name):
             
             with st.spinner('🔍 Lendo seu perfil do LinkedIn...'):
-                texto = extrair_texto_universal(arquivo, 'pdf')
-                
+                barra = st.progress(0.0)
+                texto = extrair_texto_universal(
+                    arquivo, 'pdf',
+                    progresso=lambda prontas, total: barra.progress(
+                        prontas / total, text=f"Página {prontas} de {total}"
+                    )
+                )
+                barra.empty()
+
                 if texto:
                     st.session_state.cv_texto_temp = texto
                     st.session_state.cv_arquivo_nome = arquivo.name
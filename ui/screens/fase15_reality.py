@@ -5,6 +5,7 @@ from core.utils import chamar_gpt, scroll_topo, forcar_topo
 from core.ats_scorer import calcular_score_ats, classificar_score
 from core.ats_constants import SKILL_DESCRIPTIONS
 from core.salary_lookup import buscar_salario_real, formatar_dados_salariais_para_prompt
+from ui.ats_progressivo import acompanhar_refinamento_ats, refinamento_em_andamento
 
 logger = logging.getLogger(__name__)
 
@@ -241,6 +242,9 @@ def _executar_analise_ats():
     """
     Executa análise ATS real usando TF-IDF do CV contra Job Description do cargo.
     Usa cache no session_state.
+    
+    Modo progressivo: retorna na hora o score preliminar TF-IDF; a análise
+    LLM chega depois via acompanhar_refinamento_ats.
     """
     # --- CACHE: Reutilizar score se for Recolocação no mesmo cargo ---
     perfil = st.session_state.get('perfil', {})
@@ -276,7 +280,8 @@ def _executar_analise_ats():
             cargo_alvo=cargo,
             client=st.session_state.openai_client,
             objetivo=objetivo,
-            cargo_atual=cargo_atual
+            cargo_atual=cargo_atual,
+            progressivo=True
         )
 
     if resultado:
@@ -520,6 +525,8 @@ def fase_15_reality_check():
     with st.spinner("🤖 Calculando Score ATS — analisando compatibilidade com o cargo..."):
         resultado_ats = _executar_analise_ats()
     _renderizar_ats(resultado_ats)
+    if refinamento_em_andamento(resultado_ats):
+        acompanhar_refinamento_ats('reality_ats_resultado', 'score_ats_inicial')
 
     # ── 3) Botão único: Avançar ──
     st.markdown("---")
@@ -2,6 +2,7 @@ import streamlit as st
 from core.utils import scroll_topo
 from core.ats_scorer import calcular_score_ats, extrair_cargo_do_cv
 from core.ats_constants import SKILL_DESCRIPTIONS
+from ui.ats_progressivo import acompanhar_refinamento_ats, refinamento_em_andamento
 
 CARGO_FALLBACK = "Profissional"
 
@@ -42,7 +43,8 @@ def fase_1_diagnostico():
                 cargo_atual,
                 client=st.session_state.openai_client,
                 objetivo=None,  # Ainda não definiu objetivo
-                cargo_atual=cargo_atual  # Required to ensure same prompt generation as FASE_15_REALITY
+                cargo_atual=cargo_atual,  # Required to ensure same prompt generation as FASE_15_REALITY
+                progressivo=True  # Score preliminar na hora; análise LLM chega em seguida
             )
             
             st.session_state.score_ats_inicial = resultado_ats
@@ -75,6 +77,9 @@ def fase_1_diagnostico():
     </div>
     """, unsafe_allow_html=True)
     
+    if refinamento_em_andamento(resultado):
+        acompanhar_refinamento_ats('score_ats_inicial')
+    
     st.markdown("")
     
     st.info(